@@ -0,0 +1,263 @@
+from array import array  # Importa os vetores compactos de números (uma coluna por vetor, sem objetos por linha)
+from datetime import date  # Importa o tipo de data para os períodos e o envelhecimento
+from itertools import islice  # Importa o fatiamento de geradores para ler as tabelas em blocos
+
+from catalogo import SUFIXOS_TIPO, TIPO_UNIDADE, TIPO_CAIXA  # Importa os tipos de venda (UN/CX) e os sufixos dos nomes antigos
+from configuracao import CAMPOS_CABECALHO, CAMPOS_ITENS, STATUS_EM_ABERTO  # Importa a ordem das colunas e os status com saldo a receber
+from dinheiro import formatar_reais, texto_para_centavos  # Importa a conversão e a formatação de dinheiro
+
+# =================================================================
+#          ANÁLISES DE VENDAS EM COLUNAS (ARRAYS POR CAMPO)
+# =================================================================
+#
+# Cabeçalhos e itens são lidos em blocos e guardados em colunas (array do
+# Python: inteiros compactos, sem um objeto por linha). Cada conversão de texto
+# (datas, dinheiro, nomes) é feita uma vez por VALOR DISTINTO e aplicada à coluna
+# inteira com map() sobre um dicionário de memória. Textos repetidos (formas de
+# pagamento, produtos, status) viram códigos inteiros densos, então cada
+# agregação é uma única passada sobre colunas de inteiros, acumulando em listas
+# indexadas pelo código (sem dicionários por linha).
+
+TAMANHO_BLOCO = 65536  # Linhas lidas de cada vez ao montar as colunas
+PERIODOS = ('dia', 'semana', 'mes')  # Agrupamentos aceitos no faturamento
+FAIXAS_ATRASO = (  # (rótulo, dias de atraso até) para o envelhecimento das contas a receber
+    ('A vencer', 0), ('1-30 dias', 30), ('31-60 dias', 60), ('61-90 dias', 90), ('Mais de 90 dias', None),
+)
+SEM_PRAZO = 'Sem prazo'  # Pedidos em aberto sem 'Data Vencimento Prazo'
+
+
+class _Memoria(dict):  # Dicionário que converte sob demanda
+    """Converte cada valor distinto uma única vez; as repetições são consultas ao dicionário."""
+
+    def __init__(self, converter):  # Recebe a função de conversão
+        super().__init__()  # Dicionário vazio
+        self.converter = converter  # Conversão de texto para o valor da coluna
+
+    def __missing__(self, texto):  # Primeira vez que o texto aparece
+        valor = self[texto] = self.converter(texto)  # Converte e guarda
+        return valor  # Valor convertido
+
+
+class _Codigos(dict):  # Dicionário texto -> código inteiro denso
+    """Troca textos repetidos por códigos 0, 1, 2... e guarda os rótulos na ordem dos códigos."""
+
+    def __init__(self):  # Sem códigos ainda
+        super().__init__()  # Dicionário vazio
+        self.rotulos = []  # código -> texto
+
+    def __missing__(self, texto):  # Texto novo
+        codigo = self[texto] = len(self.rotulos)  # Próximo código
+        self.rotulos.append(texto)  # Guarda o rótulo
+        return codigo  # Código do texto
+
+
+def dia_ordinal(texto):  # "27-01-2026 14:08" ou "10-02-2026" -> número do dia
+    """Converte o início DD-MM-AAAA de um texto no número ordinal do dia (0 se vazio ou inválido)."""
+    try:  # Datas antigas podem estar em outro formato
+        return date(int(texto[6:10]), int(texto[3:5]), int(texto[0:2])).toordinal()  # Fatiamento direto (sem strptime)
+    except ValueError:  # Vazio ou fora do formato
+        return 0  # Sem data
+
+
+def separar_tipo(nome, tipo):  # Itens antigos guardam o tipo só no nome ("Skol (CX)")
+    """Retorna (nome sem o sufixo, tipo de venda) de um item."""
+    for sufixo, tipo_sufixo in SUFIXOS_TIPO.items():  # " (UN)" e " (CX)"
+        if nome.endswith(sufixo):  # Nome com o tipo embutido
+            return nome[:-len(sufixo)], tipo or tipo_sufixo  # Tira o sufixo
+    return nome, tipo  # Nome já limpo
+
+
+class ColunasVendas:  # Histórico de vendas em formato de colunas
+    """Guarda cabeçalhos e itens como colunas de inteiros para as agregações."""
+
+    def __init__(self, catalogo=None):  # Colunas vazias (o catálogo identifica os itens antigos sem código)
+        self.catalogo = catalogo  # CatalogoProdutos (ou None: itens sem código ficam agrupados pelo nome)
+        self.dia_pedido = array('l')  # Dia ordinal da venda (0 = sem data)
+        self.total = array('q')  # Valor total do pedido (centavos)
+        self.pago = array('q')  # Valor pago do pedido (centavos)
+        self.forma = array('l')  # Código da forma de pagamento
+        self.status = array('l')  # Código do status do pagamento
+        self.vencimento = array('l')  # Dia ordinal do vencimento (0 = sem prazo)
+        self.produto = array('l')  # Código do produto de cada item
+        self.tipo = array('l')  # Código do tipo de venda de cada item
+        self.quantidade = array('q')  # Quantidade de cada item
+        self.valor_item = array('q')  # Valor de cada item (centavos)
+        self.formas = _Codigos()  # Formas de pagamento
+        self.situacoes = _Codigos()  # Status do pagamento
+        self.produtos = _Codigos()  # Produtos (código do catálogo ou, em itens antigos fora do catálogo, o nome)
+        self.nomes_produtos = {}  # Código do produto -> nome para exibição
+        self._chaves_antigas = _Memoria(self._chave_pelo_nome)  # Nome de item antigo -> código do catálogo (uma busca por nome distinto)
+        self.tipos = _Codigos()  # Tipos de venda (UN/CX; vazio em itens antigos sem sufixo)
+
+    def _chave_pelo_nome(self, nome):  # Itens gravados antes do código do produto
+        """Retorna o código do produto com esse nome no catálogo, como na edição de itens (ou o próprio nome, se não houver)."""
+        produto = self.catalogo.por_nome(nome) if self.catalogo else None  # Busca O(1) pelo nome normalizado
+        if produto is None:  # Produto fora do catálogo
+            return nome  # Agrupa pelo nome
+        self.nomes_produtos.setdefault(produto['Código'], produto['Nome do Produto'])  # Exibe com o nome do catálogo
+        return produto['Código']  # Mesmo produto dos itens novos
+
+    def carregar(self, cabecalhos, itens):  # Monta as colunas a partir de tuplas de texto
+        """Acrescenta às colunas as tuplas (na ordem das colunas do CSV) de cabeçalhos e itens; retorna self."""
+        dias = _Memoria(dia_ordinal)  # Datas já convertidas
+        dinheiro = _Memoria(texto_para_centavos)  # Valores já convertidos
+        p_data, p_total, p_pago, p_forma, p_status, p_venc = (CAMPOS_CABECALHO.index(c) for c in (  # Posições das colunas usadas
+            'Data do Pedido', 'Valor Total (R$)', 'Valor Pago (R$)', 'Forma de Pagamento', 'Status do Pagamento', 'Data Vencimento Prazo'
+        ))
+        for bloco in _blocos(cabecalhos):  # Um bloco de linhas por vez
+            colunas = list(zip(*bloco))  # Transpõe o bloco: uma tupla por coluna
+            self.dia_pedido.extend(map(dias.__getitem__, colunas[p_data]))  # Dias da venda
+            self.total.extend(map(dinheiro.__getitem__, colunas[p_total]))  # Totais
+            self.pago.extend(map(dinheiro.__getitem__, colunas[p_pago]))  # Valores pagos
+            self.forma.extend(map(self.formas.__getitem__, colunas[p_forma]))  # Formas de pagamento
+            self.status.extend(map(self.situacoes.__getitem__, colunas[p_status]))  # Status do pagamento
+            self.vencimento.extend(map(dias.__getitem__, colunas[p_venc]))  # Vencimentos
+        i_nome, i_qtd, i_valor, i_codigo, i_tipo = (CAMPOS_ITENS.index(c) for c in (  # Posições das colunas usadas
+            'Produto', 'Quantidade', 'Valor Item (R$)', 'Código do Produto', 'Tipo de Venda'
+        ))
+        inteiros = _Memoria(lambda texto: int(texto or 0))  # Quantidades já convertidas
+        produtos_tipos = _Memoria(lambda par: separar_tipo(*par))  # (nome, tipo) já separados
+        for bloco in _blocos(itens):  # Um bloco de linhas por vez
+            colunas = list(zip(*bloco))  # Transpõe o bloco
+            nomes_tipos = list(map(produtos_tipos.__getitem__, zip(colunas[i_nome], colunas[i_tipo])))  # (nome limpo, tipo) de cada item
+            chaves = [codigo or self._chaves_antigas[nome] for codigo, (nome, _) in zip(colunas[i_codigo], nomes_tipos)]  # Itens antigos sem código: código pelo nome no catálogo
+            self.produto.extend(map(self.produtos.__getitem__, chaves))  # Códigos densos dos produtos
+            nomes = dict(zip(chaves, (nome for nome, _ in nomes_tipos)))  # Nome de exibição de cada produto do bloco
+            nomes.update(self.nomes_produtos)  # Mantém os nomes já conhecidos
+            self.nomes_produtos = nomes  # Produtos novos entram com o nome do bloco
+            self.tipo.extend(map(self.tipos.__getitem__, (tipo for _, tipo in nomes_tipos)))  # Tipos de venda
+            self.quantidade.extend(map(inteiros.__getitem__, colunas[i_qtd]))  # Quantidades
+            self.valor_item.extend(map(dinheiro.__getitem__, colunas[i_valor]))  # Valores dos itens
+        return self  # Permite ColunasVendas().carregar(...)
+
+
+def _blocos(linhas):  # Leitura em blocos de um gerador
+    """Gera listas de até TAMANHO_BLOCO linhas, sem carregar a tabela inteira de uma vez."""
+    linhas = iter(linhas)  # Aceita listas e geradores
+    while True:  # Até esgotar
+        bloco = list(islice(linhas, TAMANHO_BLOCO))  # Próximo bloco
+        if not bloco:  # Fim das linhas
+            return  # Encerra
+        yield bloco  # Entrega o bloco
+
+
+def _somar_por_codigo(codigos, valores, quantidade_codigos):  # Agregação básica
+    """Soma os valores de cada código numa única passada (lista indexada pelo código)."""
+    somas = [0] * quantidade_codigos  # Um acumulador por código
+    for codigo, valor in zip(codigos, valores):  # Passada única pelas colunas
+        somas[codigo] += valor  # Acumula
+    return somas  # Soma por código
+
+
+# --- Agregações ---
+
+def faturamento_por_periodo(colunas, periodo='mes'):  # Vendas por dia, semana ou mês
+    """Retorna [(período, quantidade de pedidos, valor vendido)] em ordem cronológica ('dia', 'semana' ou 'mes')."""
+    if periodo not in PERIODOS:  # Agrupamento desconhecido
+        raise ValueError(f"Período inválido: {periodo!r} (use {', '.join(PERIODOS)}).")  # Avisa
+    datados = [d for d in set(colunas.dia_pedido) if d]  # Dias distintos com venda
+    if not datados:  # Nenhuma venda com data
+        return []  # Nada a mostrar
+    inicio = min(datados)  # Primeiro dia (as posições da lista são dias desde ele)
+    tamanho = max(datados) - inicio + 1  # Quantidade de dias do histórico
+    deslocados = [d - inicio if d else tamanho for d in colunas.dia_pedido]  # Posição de cada pedido (sem data vai para a última)
+    vendas = _somar_por_codigo(deslocados, colunas.total, tamanho + 1)  # Valor vendido por dia
+    pedidos = _somar_por_codigo(deslocados, (1 for _ in deslocados), tamanho + 1)  # Pedidos por dia
+    grupos = {}  # Período -> [pedidos, valor] (poucos dias distintos: fora da passada principal)
+    for posicao in range(tamanho):  # Cada dia do histórico
+        if not pedidos[posicao]:  # Dia sem vendas
+            continue  # Pula
+        dia = date.fromordinal(inicio + posicao)  # Data do dia
+        if periodo == 'dia':  # Agrupa por dia
+            chave = dia.strftime("%d-%m-%Y")  # Ex.: 27-01-2026
+        elif periodo == 'semana':  # Agrupa por semana ISO
+            ano, semana, _ = dia.isocalendar()  # Ano e número da semana
+            chave = f"{ano}-S{semana:02d}"  # Ex.: 2026-S05
+        else:  # Agrupa por mês
+            chave = f"{dia.month:02d}-{dia.year}"  # Ex.: 01-2026
+        acumulado = grupos.setdefault(chave, [0, 0])  # Acumulador do período
+        acumulado[0] += pedidos[posicao]  # Soma os pedidos
+        acumulado[1] += vendas[posicao]  # Soma o valor
+    return [(chave, qtd, valor) for chave, (qtd, valor) in grupos.items()]  # Ordem cronológica (dias percorridos em ordem)
+
+
+def produtos_mais_vendidos(colunas, limite=10, criterio='quantidade'):  # Ranking de produtos
+    """Retorna [(produto, quantidade, valor)] dos produtos mais vendidos por 'quantidade' ou 'valor'."""
+    total_codigos = len(colunas.produtos.rotulos)  # Produtos distintos
+    quantidades = _somar_por_codigo(colunas.produto, colunas.quantidade, total_codigos)  # Quantidade por produto
+    valores = _somar_por_codigo(colunas.produto, colunas.valor_item, total_codigos)  # Valor por produto
+    ordem = quantidades if criterio == 'quantidade' else valores  # Critério do ranking
+    melhores = sorted(range(total_codigos), key=ordem.__getitem__, reverse=True)[:limite]  # Ordenação em C
+    return [  # Monta o resultado
+        (colunas.nomes_produtos[colunas.produtos.rotulos[c]], quantidades[c], valores[c]) for c in melhores
+    ]
+
+
+def mix_unidade_caixa(colunas):  # Proporção de vendas por unidade e por caixa
+    """Retorna {produto: {tipo: quantidade}} com as quantidades vendidas por tipo de venda (UN, CX ou '' em itens antigos)."""
+    total_tipos = len(colunas.tipos.rotulos)  # Tipos distintos
+    combinados = [p * total_tipos + t for p, t in zip(colunas.produto, colunas.tipo)] if total_tipos else []  # Código único produto+tipo
+    somas = _somar_por_codigo(combinados, colunas.quantidade, len(colunas.produtos.rotulos) * total_tipos)  # Quantidade por par
+    mix = {}  # Resultado
+    for indice, quantidade in enumerate(somas):  # Pares com venda
+        if quantidade:  # Ignora combinações sem venda
+            produto, tipo = divmod(indice, total_tipos)  # Separa os códigos
+            nome = colunas.nomes_produtos[colunas.produtos.rotulos[produto]]  # Nome para exibição
+            mix.setdefault(nome, {})[colunas.tipos.rotulos[tipo]] = quantidade  # Quantidade do tipo
+    return mix  # Mix por produto
+
+
+def envelhecimento_recebiveis(colunas, hoje=None):  # Contas a receber por faixa de atraso
+    """Retorna [(faixa, quantidade de pedidos, saldo)] dos pedidos em aberto, pela 'Data Vencimento Prazo'."""
+    hoje = (hoje or date.today()).toordinal()  # Dia de referência
+    em_aberto = {colunas.situacoes.get(s) for s in STATUS_EM_ABERTO} - {None}  # Códigos dos status em aberto
+    rotulos = [rotulo for rotulo, _ in FAIXAS_ATRASO] + [SEM_PRAZO]  # Faixas na ordem de exibição
+    faixas = []  # Faixa de cada pedido em aberto
+    saldos = []  # Saldo de cada pedido em aberto
+    for status, vencimento, total, pago in zip(colunas.status, colunas.vencimento, colunas.total, colunas.pago):  # Passada única
+        if status not in em_aberto or total <= pago:  # Quitado
+            continue  # Fora das contas a receber
+        if not vencimento:  # Sem data esperada de pagamento
+            faixas.append(len(FAIXAS_ATRASO))  # Última faixa
+        else:  # Dias de atraso
+            atraso = hoje - vencimento  # Negativo = ainda vai vencer
+            faixas.append(next(i for i, (_, ate) in enumerate(FAIXAS_ATRASO) if ate is None or atraso <= ate))  # Primeira faixa que cabe
+        saldos.append(total - pago)  # Saldo em aberto
+    valores = _somar_por_codigo(faixas, saldos, len(rotulos))  # Saldo por faixa
+    quantidades = _somar_por_codigo(faixas, (1 for _ in faixas), len(rotulos))  # Pedidos por faixa
+    return list(zip(rotulos, quantidades, valores))  # Todas as faixas (mesmo vazias)
+
+
+def formas_de_pagamento(colunas):  # Vendas por forma de pagamento
+    """Retorna [(forma, quantidade de pedidos, valor vendido, valor recebido)] por forma de pagamento."""
+    total_codigos = len(colunas.formas.rotulos)  # Formas distintas
+    quantidades = _somar_por_codigo(colunas.forma, (1 for _ in colunas.forma), total_codigos)  # Pedidos por forma
+    vendidos = _somar_por_codigo(colunas.forma, colunas.total, total_codigos)  # Valor vendido por forma
+    recebidos = _somar_por_codigo(colunas.forma, colunas.pago, total_codigos)  # Valor recebido por forma
+    return sorted(  # Maiores valores primeiro
+        ((colunas.formas.rotulos[c] or '(sem forma)', quantidades[c], vendidos[c], recebidos[c]) for c in range(total_codigos)),
+        key=lambda linha: linha[2], reverse=True
+    )
+
+
+# --- Exibição ---
+
+def imprimir_analises(colunas, periodo='mes', limite=10, hoje=None):  # Tela de análises
+    """Imprime todas as análises de vendas a partir das colunas carregadas."""
+    print(f"\n--- FATURAMENTO POR {periodo.upper()} ---")  # Título
+    for chave, quantidade, valor in faturamento_por_periodo(colunas, periodo):  # Cada período
+        print(f"{chave:<12} | {quantidade:>6} pedido(s) | {formatar_reais(valor):>16}")  # Linha do período
+    for criterio in ('quantidade', 'valor'):  # Dois rankings
+        print(f"\n--- PRODUTOS MAIS VENDIDOS (POR {criterio.upper()}) ---")  # Título
+        for nome, quantidade, valor in produtos_mais_vendidos(colunas, limite, criterio):  # Cada produto
+            print(f"{nome[:30]:<30} | {quantidade:>8} un. | {formatar_reais(valor):>16}")  # Linha do produto
+    print(f"\n--- MIX {TIPO_UNIDADE} x {TIPO_CAIXA} POR PRODUTO ---")  # Título
+    for nome, tipos in sorted(mix_unidade_caixa(colunas).items()):  # Cada produto
+        detalhes = " | ".join(f"{tipo or 'sem tipo'}: {quantidade}" for tipo, quantidade in sorted(tipos.items()))  # Tipos vendidos
+        print(f"{nome[:30]:<30} | {detalhes}")  # Linha do produto
+    print("\n--- CONTAS A RECEBER POR ATRASO ---")  # Título
+    for faixa, quantidade, valor in envelhecimento_recebiveis(colunas, hoje):  # Cada faixa
+        print(f"{faixa:<16} | {quantidade:>6} pedido(s) | {formatar_reais(valor):>16}")  # Linha da faixa
+    print("\n--- FORMAS DE PAGAMENTO ---")  # Título
+    for forma, quantidade, vendido, recebido in formas_de_pagamento(colunas):  # Cada forma
+        print(f"{forma:<12} | {quantidade:>6} pedido(s) | vendido {formatar_reais(vendido):>16} | recebido {formatar_reais(recebido):>16}")  # Linha da forma
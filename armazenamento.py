@@ -0,0 +1,462 @@
+import csv  # Importa a biblioteca para ler e gravar os snapshots CSV
+import json  # Importa a biblioteca para serializar os registros do diário
+import os  # Importa a biblioteca para manipular arquivos (fsync, replace, remove)
+import threading  # Importa a biblioteca para compactar o diário em segundo plano
+
+from cache_dados import assinatura_arquivo  # Importa a assinatura (tamanho, mtime, inode) para perceber compactações de outros terminais
+from colunar import SnapshotColunar, filtro_de_condicoes, gravar_colunar  # Importa a cópia colunar dos snapshots e o filtro por campo
+from configuracao import LIMITE_COMPACTACAO_DIARIO, SNAPSHOT_COLUNAR, SUFIXO_COLUNAR  # Importa o limite de registros antes da compactação e a cópia colunar
+from travas import TravaArquivo  # Importa a trava de arquivo entre terminais
+
+# =================================================================
+#        MOTOR DE ARMAZENAMENTO: SNAPSHOT CSV + DIÁRIO (JOURNAL)
+# =================================================================
+#
+# Cada tabela tem um snapshot no formato CSV de sempre e todas as alterações
+# posteriores são apenas ACRESCENTADAS ao diário (uma linha JSON por registro):
+#   {"t": "cabecalhos", "op": "I", "v": [...]}   -> inserção (linha completa)
+#   {"t": "cabecalhos", "op": "U", "v": [...]}   -> alteração (linha completa)
+#   {"t": "itens", "op": "D", "k": "12"}         -> exclusão pela chave
+# Assim, salvar um pedido custa O(linhas alteradas) e não O(histórico inteiro).
+# A compactação regrava os snapshots e esvazia o diário. Como reaplicar o diário
+# é idempotente (linhas completas e exclusões por chave), uma queda entre a troca
+# dos snapshots e o esvaziamento do diário não corrompe os dados.
+#
+# Gravações à prova de queda:
+#   - um lote com vários registros (ex.: cabeçalho + itens do pedido) vira UMA
+#     linha do diário {"lote": [...]}; uma linha cortada no meio é descartada
+#     inteira, então nunca sobra item sem cabeçalho;
+#   - a compactação grava os snapshots novos em arquivos .tmp (com fsync) e só
+#     então grava o manifesto ("pedidos.diario.manifesto") com as trocas
+#     pendentes; as trocas (os.replace), a remoção do diário e a do manifesto vêm
+#     depois. Se o programa cair no meio, a próxima operação (ou a inicialização)
+#     encontra o manifesto e conclui as trocas; .tmp sem manifesto é descartado.
+#
+# Vários terminais podem usar os mesmos arquivos ao mesmo tempo. Toda leitura e
+# gravação acontece sob uma trava de arquivo ("pedidos.diario.trava") e começa
+# aplicando só o trecho do diário que os outros terminais acrescentaram desde a
+# última vez, então a trava fica presa por O(registros novos) e nunca durante a
+# digitação do usuário. As gravações são por linha: pedidos diferentes nunca se
+# sobrescrevem. Nas tabelas com coluna de versão, gravar uma linha que outro
+# terminal alterou depois de ela ter sido lida gera ConflitoVersao e nada do lote
+# é gravado (em vez de apagar a alteração do outro terminal).
+#
+# Cópia colunar (colunar.py): cada compactação grava também
+# "<snapshot>.colunas", com a assinatura do CSV que a originou. As leituras usam
+# a cópia enquanto a assinatura bater e voltam ao CSV quando ele for mais novo
+# (ex.: editado no Excel); a leitura completa seguinte reconstrói a cópia.
+
+OP_INSERIR = 'I'  # Código do registro de inserção
+OP_ALTERAR = 'U'  # Código do registro de alteração
+OP_EXCLUIR = 'D'  # Código do registro de exclusão
+
+
+def ler_registros(texto):  # Interpreta uma linha do diário
+    """Retorna os registros de uma linha do diário (um registro ou um lote inteiro); linha corrompida não tem registros."""
+    try:  # Uma linha cortada (queda no meio da gravação) é descartada inteira
+        registro = json.loads(texto)  # Converte o JSON
+    except ValueError:  # Linha corrompida, pela metade ou vazia
+        return []  # Nenhum registro
+    return registro['lote'] if 'lote' in registro else [registro]  # Lote gravado de uma só vez ou registro avulso
+
+
+def gravar_pasta(caminho):  # Torna as trocas de nome duráveis
+    """Força a gravação da pasta do arquivo (as renomeações) no disco; no Windows não é necessário."""
+    if os.name == 'nt':  # O Windows não permite abrir pastas para fsync
+        return  # Nada a fazer
+    pasta = os.open(os.path.dirname(os.path.abspath(caminho)), os.O_RDONLY)  # Abre a pasta
+    try:  # Fecha mesmo em caso de erro
+        os.fsync(pasta)  # Grava a tabela de nomes da pasta
+    finally:  # Sempre fecha
+        os.close(pasta)  # Libera o descritor
+
+
+class ConflitoVersao(Exception):  # Edição sobre uma versão desatualizada
+    """Linhas alteradas por outro terminal depois de terem sido lidas; nada do lote foi gravado."""
+
+    def __init__(self, tabela, chaves):  # Recebe a tabela e as chaves em conflito
+        self.tabela = tabela  # Tabela com conflito
+        self.chaves = list(chaves)  # Chaves das linhas em conflito
+        super().__init__(f"Registro(s) {', '.join(self.chaves)} de '{tabela}' alterado(s) em outro terminal.")  # Mensagem do erro
+
+
+def verificar_versoes(nome, tuplas, atuais, pos_chave, pos_versao):  # Controle otimista de versão (usado pelos dois motores)
+    """Compara cada tupla com a do disco; retorna [(índice, tupla com a versão seguinte)] do que precisa ser gravado."""
+    gravar = []  # Linhas que realmente mudaram
+    conflitos = []  # Chaves alteradas por outro terminal
+    for indice, tupla in enumerate(tuplas):  # Percorre as linhas alteradas
+        atual = atuais.get(tupla[pos_chave])  # Linha no disco (None = nova)
+        if atual == tupla:  # Nada mudou de fato
+            continue  # Não grava
+        if pos_versao is not None:  # Tabela com coluna de versão
+            versao = int(tupla[pos_versao] or 0)  # Versão lida por este terminal
+            if versao != (int(atual[pos_versao] or 0) if atual else 0):  # Outro terminal gravou depois
+                conflitos.append(tupla[pos_chave])  # Não sobrescreve a alteração alheia
+                continue  # Próxima linha
+            tupla = tupla[:pos_versao] + (str(versao + 1),) + tupla[pos_versao + 1:]  # Próxima versão
+        gravar.append((indice, tupla))  # Separa para gravar
+    if conflitos:  # Alguma linha desatualizada
+        raise ConflitoVersao(nome, conflitos)  # Interrompe antes de gravar qualquer coisa
+    return gravar  # Linhas a gravar
+
+
+class ArmazenamentoDiario:  # Classe que gerencia os snapshots CSV e o diário de alterações
+    """Guarda tabelas em snapshots CSV e acrescenta as alterações num diário."""
+
+    def __init__(self, caminho_diario, limite_compactacao=LIMITE_COMPACTACAO_DIARIO, colunar=SNAPSHOT_COLUNAR):  # Construtor do motor
+        self.caminho_diario = caminho_diario  # Caminho do arquivo de diário compartilhado pelas tabelas
+        self.limite_compactacao = limite_compactacao  # Quantos registros no diário disparam a compactação
+        self.colunar = colunar  # Mantém e usa a cópia colunar de cada snapshot
+        self._tabelas = {}  # nome -> (caminho do CSV, lista de campos, campo chave)
+        self._versoes = {}  # nome -> coluna de versão (None = sem controle de versão)
+        self._estado = None  # nome -> {chave: tupla de valores} com o que já está persistido (None = ainda não lido)
+        self._assinaturas = None  # Assinaturas dos snapshots lidos (mudam quando algum terminal compacta)
+        self._posicao_diario = 0  # Byte do diário até onde o estado já foi aplicado
+        self._inode_diario = None  # Identidade do arquivo de diário já aplicado
+        self._registros_diario = 0  # Quantidade de registros acumulados no diário desde a última compactação
+        self.geracao = 0  # Aumenta sempre que aparecem dados gravados por outro terminal
+        self._trava = threading.RLock()  # Trava que protege o estado contra a thread de compactação
+        self.trava_arquivo = TravaArquivo(caminho_diario + '.trava')  # Trava entre terminais (sempre obtida antes de _trava)
+        self.caminho_manifesto = caminho_diario + '.manifesto'  # Trocas de snapshots pendentes de uma compactação
+        self._thread_compactacao = None  # Referência para a compactação em segundo plano (se houver)
+        self.ao_compactar = None  # Função opcional chamada depois de cada compactação (ex.: atualizar caches)
+
+    def registrar_tabela(self, nome, caminho_csv, campos, chave, indices=(), versao=None):  # Declara uma tabela gerenciada pelo motor
+        """Cadastra uma tabela (snapshot CSV, colunas, coluna chave e coluna de versão opcional); 'indices' só é usado pelo motor SQLite."""
+        self._tabelas[nome] = (caminho_csv, list(campos), chave)  # Guarda a configuração da tabela
+        self._versoes[nome] = versao  # Coluna com o número de versão da linha (controle otimista)
+        self._estado = None  # A próxima leitura inclui a tabela nova
+
+    # --- Leitura ---
+
+    def _percorrer_snapshot(self, nome):  # Lê o snapshot CSV linha a linha
+        """Gera as tuplas do snapshot CSV na ordem dos campos configurados, sem carregar o arquivo inteiro."""
+        caminho_csv, campos, _ = self._tabelas[nome]  # Recupera a configuração da tabela
+        if not os.path.exists(caminho_csv):  # Se ainda não existe snapshot
+            return  # A tabela começa vazia
+        with open(caminho_csv, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Abre ignorando erros de caracteres
+            leitor = csv.reader(f)  # Leitor simples (mais rápido que o DictReader)
+            titulos = next(leitor, None)  # Primeira linha: nomes das colunas gravadas no arquivo
+            if not titulos:  # Arquivo vazio
+                return  # Nada para carregar
+            posicoes = [titulos.index(c) if c in titulos else None for c in campos]  # Mapeia cada campo para a coluna do arquivo
+            for linha in leitor:  # Percorre cada linha de dados
+                if not linha:  # Ignora linhas em branco
+                    continue  # Próxima linha
+                yield tuple(  # Monta a tupla na ordem dos campos configurados
+                    linha[p] if p is not None and p < len(linha) else '' for p in posicoes
+                )
+
+    def _caminho_colunar(self, nome):  # Onde fica a cópia colunar
+        """Retorna o caminho da cópia colunar do snapshot (ex.: 'pedidos_cabecalho.colunas')."""
+        return os.path.splitext(self._tabelas[nome][0])[0] + SUFIXO_COLUNAR  # Mesmo nome do CSV, outra extensão
+
+    def _abrir_colunar(self, nome):  # Cópia colunar em dia com o CSV
+        """Abre a cópia colunar se ela corresponder ao snapshot CSV atual; senão (ou desligada), retorna None."""
+        if not self.colunar:  # Cópia colunar desligada
+            return None  # Só o CSV
+        caminho_csv, campos, _ = self._tabelas[nome]  # Configuração da tabela
+        return SnapshotColunar.abrir(self._caminho_colunar(nome), assinatura_arquivo(caminho_csv), campos)  # None se o CSV for mais novo
+
+    def _gravar_colunar(self, nome, tuplas):  # Reconstrói a cópia colunar (chamar com as travas)
+        """Grava a cópia colunar do snapshot CSV atual a partir das suas tuplas."""
+        caminho_csv, campos, _ = self._tabelas[nome]  # Configuração da tabela
+        fonte = assinatura_arquivo(caminho_csv)  # A cópia vale só para este CSV
+        if self.colunar and fonte is not None:  # Só há o que copiar se o CSV existe
+            gravar_colunar(self._caminho_colunar(nome), campos, tuplas, fonte)  # Grava de forma atômica
+
+    def _linhas_snapshot(self, nome, condicoes=None):  # Fonte das linhas do snapshot
+        """Gera as tuplas do snapshot pela cópia colunar (filtrando pelas 'condicoes') ou, se ela não estiver em dia, pelo CSV."""
+        snapshot = self._abrir_colunar(nome)  # Cópia colunar em dia?
+        if snapshot is None:  # Ausente ou mais antiga que o CSV
+            yield from self._percorrer_snapshot(nome)  # Interpreta o CSV
+            return  # Fim do snapshot
+        with snapshot:  # Libera o mapeamento ao terminar
+            yield from snapshot.tuplas(condicoes)  # Só monta as linhas que passam no filtro
+
+    def _ler_snapshot(self, nome):  # Lê o snapshot de uma tabela
+        """Lê o snapshot (pela cópia colunar, se estiver em dia) e devolve um dicionário ordenado chave -> tupla."""
+        pos_chave = self._posicao_chave(nome)  # Posição da chave dentro da tupla
+        snapshot = self._abrir_colunar(nome)  # Cópia colunar em dia?
+        if snapshot is not None:  # Sem interpretar o CSV
+            with snapshot:  # Libera o mapeamento ao terminar
+                return {tupla[pos_chave]: tupla for tupla in snapshot.tuplas()}  # Indexa pela chave (preserva a ordem)
+        linhas = {tupla[pos_chave]: tupla for tupla in self._percorrer_snapshot(nome)}  # Indexa pela chave (preserva a ordem)
+        self._gravar_colunar(nome, list(linhas.values()))  # CSV mais novo (ou sem cópia): reconstrói para a próxima leitura
+        return linhas  # Linhas do snapshot
+
+    def _aplicar_diario(self):  # Aplica o trecho novo do diário
+        """Aplica os registros completos acrescentados ao diário desde a última leitura e retorna quantos foram."""
+        with open(self.caminho_diario, mode='rb') as f:  # Modo binário: a posição é contada em bytes
+            self._inode_diario = os.fstat(f.fileno()).st_ino  # Identidade do diário aplicado
+            f.seek(self._posicao_diario)  # Pula o que já foi aplicado
+            dados = f.read()  # Só o trecho novo
+        fim = dados.rfind(b'\n') + 1  # Só linhas completas (uma queda pode deixar a última pela metade)
+        total = 0  # Registros aplicados
+        for texto in dados[:fim].split(b'\n'):  # Percorre linha por linha
+            for registro in ler_registros(texto.decode('utf-8', errors='ignore')):  # Registro avulso ou lote inteiro
+                total += 1  # Conta o registro
+                linhas = self._estado.get(registro.get('t'))  # Estado da tabela do registro
+                if linhas is None:  # Tabela não registrada neste motor
+                    continue  # Pula
+                if registro['op'] == OP_EXCLUIR:  # Exclusão
+                    linhas.pop(registro['k'], None)  # Remove a chave (se existir)
+                else:  # Inserção ou alteração
+                    tupla = tuple(registro['v'])  # Linha completa
+                    linhas[tupla[self._posicao_chave(registro['t'])]] = tupla  # Insere ou substitui
+        self._posicao_diario += fim  # Avança até o fim da última linha completa
+        self._registros_diario += total  # Atualiza o contador de registros pendentes
+        return total  # Quantidade de registros aplicados
+
+    def _sincronizar(self):  # Atualiza o estado em memória com o disco (chamar com as travas)
+        """Relê tudo se algum terminal compactou; senão, aplica só o trecho novo do diário."""
+        self._recuperar()  # Conclui uma compactação interrompida antes de ler qualquer arquivo
+        assinaturas = tuple(assinatura_arquivo(caminho) for caminho, _, _ in self._tabelas.values())  # Snapshots atuais
+        try:  # O diário pode não existir
+            info = os.stat(self.caminho_diario)  # Tamanho e identidade do diário
+        except FileNotFoundError:  # Diário ausente (compactado)
+            info = None  # Nada pendente
+        completo = (  # Precisa reler os snapshots?
+            self._estado is None or assinaturas != self._assinaturas  # Primeira leitura ou snapshots trocados
+            or (info is None and self._posicao_diario > 0)  # Diário esvaziado por outro terminal
+            or (info is not None and self._inode_diario not in (None, info.st_ino))  # Diário recriado
+            or (info is not None and info.st_size < self._posicao_diario)  # Diário encolheu
+        )
+        if completo:  # Leitura completa
+            if self._estado is not None:  # Já havia estado: o disco mudou por fora
+                self.geracao += 1  # Avisa que há dados de outro terminal
+            self._estado = {nome: self._ler_snapshot(nome) for nome in self._tabelas}  # Snapshots base
+            self._assinaturas = assinaturas  # Lembra quais snapshots foram lidos
+            self._posicao_diario, self._inode_diario, self._registros_diario = 0, None, 0  # Diário ainda não aplicado
+        if info is not None and info.st_size > self._posicao_diario:  # Há trecho novo no diário
+            if self._aplicar_diario() and not completo:  # Registros acrescentados por outro terminal
+                self.geracao += 1  # Avisa que há dados de outro terminal
+
+    def _posicao_chave(self, nome):  # Auxiliar para achar a posição da chave
+        """Retorna a posição da coluna chave dentro da tupla da tabela."""
+        _, campos, chave = self._tabelas[nome]  # Recupera a configuração
+        return campos.index(chave)  # Índice da chave
+
+    def carregar(self, nome, fabrica=None):  # Ponto de entrada para leitura
+        """Carrega todas as linhas de uma tabela (dicionários ou objetos criados pela fábrica)."""
+        listas, _ = self.carregar_lote([(nome, fabrica)])  # Lote com uma única tabela
+        return listas[0]  # Linhas da tabela
+
+    def carregar_lote(self, lote):  # Leitura consistente de várias tabelas
+        """Carrega as tabelas de [(nome, fabrica)] a partir do mesmo estado do disco; retorna (listas, geração lida)."""
+        with self.trava_arquivo, self._trava:  # Travas presas só durante a sincronização
+            self._sincronizar()  # Aplica o que os outros terminais gravaram
+            tuplas = [list(self._estado[nome].values()) for nome, _ in lote]  # Linhas de cada tabela (mesmo instante)
+            geracao = self.geracao  # Geração que corresponde a essas linhas
+        listas = []  # Resultado por tabela
+        for (nome, fabrica), linhas in zip(lote, tuplas):  # Interpreta fora das travas
+            if fabrica:  # Registros tipados (ex.: Pedido.de_tupla)
+                listas.append([fabrica(tupla) for tupla in linhas])  # Interpreta cada linha uma vez
+            else:  # Dicionários
+                campos = self._tabelas[nome][1]  # Nomes das colunas
+                listas.append([dict(zip(campos, tupla)) for tupla in linhas])  # Converte em dicionários
+        return listas, geracao  # Linhas e geração
+
+    def iterar(self, nome, fabrica=None, condicoes=None):  # Leitura sob demanda (relatórios)
+        """Gera as linhas da tabela sob demanda: só o diário é lido antes; o snapshot é percorrido linha a linha; 'condicoes' {campo: função(texto)} filtra antes de criar os registros."""
+        campos = self._tabelas[nome][1]  # Nomes das colunas
+        atende = filtro_de_condicoes(campos, condicoes)  # None = sem filtro
+        pos_chave = self._posicao_chave(nome)  # Posição da chave na tupla
+        alteracoes = {}  # Chave -> tupla mais recente do diário (None = excluída); limitado pela compactação
+        if os.path.exists(self.caminho_diario):  # Há alterações ainda não compactadas
+            with open(self.caminho_diario, mode='r', encoding='utf-8', errors='ignore') as f:  # Abre o diário
+                for texto in f:  # Percorre linha por linha
+                    for registro in ler_registros(texto):  # Linhas pela metade são descartadas, como no carregamento
+                        if registro.get('t') != nome:  # Registro de outra tabela
+                            continue  # Pula
+                        if registro['op'] == OP_EXCLUIR:  # Exclusão
+                            alteracoes[registro['k']] = None  # Marca como excluída
+                        else:  # Inserção ou alteração
+                            alteracoes[registro['v'][pos_chave]] = tuple(registro['v'])  # Guarda a versão mais recente
+        converter = fabrica or (lambda tupla: dict(zip(campos, tupla)))  # Registros tipados ou dicionários
+        for tupla in self._linhas_snapshot(nome, condicoes):  # Snapshot linha a linha (a cópia colunar já vem filtrada)
+            chave = tupla[pos_chave]  # Chave da linha
+            if chave in alteracoes:  # O diário tem uma versão mais nova
+                tupla = alteracoes.pop(chave)  # Usa a versão do diário (e não a repete no fim)
+                if tupla is None:  # Foi excluída
+                    continue  # Não aparece
+            if atende is None or atende(tupla):  # Linhas do CSV e versões do diário também passam pelo filtro
+                yield converter(tupla)  # Entrega a linha
+        for tupla in alteracoes.values():  # Linhas que só existem no diário (pedidos novos e alterações de linhas filtradas)
+            if tupla is not None and (atende is None or atende(tupla)):  # Ignora exclusões de linhas que não estavam no snapshot
+                yield converter(tupla)  # Entrega a linha
+
+    # --- Escrita ---
+
+    @staticmethod
+    def _para_tupla(linha, campos):  # Serializa uma linha para comparação e gravação
+        """Converte um registro tipado ou um dicionário na tupla de textos das colunas."""
+        if hasattr(linha, 'para_tupla'):  # Registro tipado (Pedido/ItemPedido)
+            return linha.para_tupla()  # Usa a serialização do próprio registro
+        return tuple(str(linha.get(c) or '') for c in campos)  # Dicionário antigo: normaliza os valores como texto
+
+    def registrar(self, nome, alterados=(), removidos=()):  # Acrescenta alterações conhecidas ao diário
+        """Acrescenta ao diário apenas as linhas alteradas e as chaves removidas."""
+        return self.registrar_lote([(nome, alterados, removidos)])  # Lote com uma única tabela
+
+    def registrar_lote(self, lote):  # Grava alterações de várias tabelas de uma vez
+        """Acrescenta ao diário, numa única escrita, as alterações de (tabela, alterados, removidos) do lote."""
+        with self.trava_arquivo, self._trava:  # Exclusivo entre terminais e threads, só pelo tempo da gravação
+            self._sincronizar()  # Compara com o disco atual, não com o que foi lido antes
+            registros = []  # (tabela, chave, tupla ou None) na ordem de gravação
+            versoes = []  # (linha em memória, coluna de versão, nova versão) aplicadas depois da gravação
+            for nome, alterados, removidos in lote:  # Cada tabela do lote
+                _, campos, chave = self._tabelas[nome]  # Configuração da tabela
+                estado = self._estado[nome]  # Estado persistido
+                pos_chave = campos.index(chave)  # Posição da chave na tupla
+                coluna_versao = self._versoes.get(nome)  # Coluna de versão (se houver)
+                pos_versao = campos.index(coluna_versao) if coluna_versao else None  # Posição da versão na tupla
+                alterados = list(alterados)  # Permite indexar as linhas
+                tuplas = [self._para_tupla(linha, campos) for linha in alterados]  # Serializa as linhas
+                for indice, tupla in verificar_versoes(nome, tuplas, estado, pos_chave, pos_versao):  # Só o que mudou (ou ConflitoVersao)
+                    registros.append((nome, tupla[pos_chave], tupla))  # Inserção ou alteração
+                    if pos_versao is not None:  # A linha em memória precisa da nova versão
+                        versoes.append((alterados[indice], coluna_versao, tupla[pos_versao]))  # Aplicada após gravar
+                for k in removidos:  # Percorre as chaves excluídas
+                    k = str(k)  # Chaves sempre como texto
+                    if k in estado:  # Ainda existe no disco
+                        registros.append((nome, k, None))  # Exclusão
+            if not registros:  # Nenhuma alteração real
+                return 0  # Nada foi gravado
+            blocos = []  # Registros que serão acrescentados de uma só vez
+            for nome, k, tupla in registros:  # Monta os registros
+                if tupla is None:  # Exclusão
+                    blocos.append({'t': nome, 'op': OP_EXCLUIR, 'k': k})  # Registro de exclusão
+                else:  # Inserção ou alteração
+                    op = OP_ALTERAR if k in self._estado[nome] else OP_INSERIR  # Decide o tipo do registro
+                    blocos.append({'t': nome, 'op': op, 'v': list(tupla)})  # Registro com a linha completa
+            lote_gravado = blocos[0] if len(blocos) == 1 else {'lote': blocos}  # Vários registros: uma linha só (tudo ou nada)
+            texto = json.dumps(lote_gravado, ensure_ascii=False) + "\n"  # Uma única escrita
+            with open(self.caminho_diario, mode='ab') as f:  # Abre o diário apenas para acréscimo
+                if f.tell() > self._posicao_diario:  # Sobrou uma linha pela metade (queda anterior)
+                    texto = "\n" + texto  # Começa numa linha nova para não corromper o primeiro registro
+                f.write(texto.encode('utf-8'))  # Grava todos os registros
+                f.flush()  # Esvazia o buffer do Python
+                os.fsync(f.fileno())  # Garante que chegou ao disco
+                self._posicao_diario = f.tell()  # Este terminal já conhece o diário até aqui
+                self._inode_diario = os.fstat(f.fileno()).st_ino  # Identidade do diário (pode ter sido criado agora)
+            for nome, k, tupla in registros:  # Atualiza o estado persistido
+                if tupla is None:  # Exclusão
+                    self._estado[nome].pop(k, None)  # Remove
+                else:  # Inserção ou alteração
+                    self._estado[nome][k] = tupla  # Guarda a linha gravada
+            for linha, coluna, versao in versoes:  # Registros em memória passam a ter a versão gravada
+                linha[coluna] = versao  # A próxima gravação parte desta versão
+            self._registros_diario += len(blocos)  # Atualiza o contador do diário
+        if self._registros_diario >= self.limite_compactacao:  # Diário grande demais
+            self.compactar_em_segundo_plano()  # Compacta sem travar o usuário
+        return len(blocos)  # Retorna quantos registros foram gravados
+
+    def salvar(self, nome, linhas):  # Mantém o contrato antigo: recebe a lista inteira
+        """Compara a lista completa com o estado persistido e grava só a diferença."""
+        with self.trava_arquivo, self._trava:  # Protege o estado
+            self._sincronizar()  # Precisa do estado atual para comparar
+            _, campos, chave = self._tabelas[nome]  # Configuração da tabela
+            estado = self._estado[nome]  # Estado persistido
+            alterados = []  # Linhas que mudaram
+            presentes = set()  # Chaves presentes na lista recebida
+            pos_chave = campos.index(chave)  # Posição da chave na tupla
+            for linha in linhas:  # Percorre a lista atual
+                tupla = self._para_tupla(linha, campos)  # Serializa a linha
+                presentes.add(tupla[pos_chave])  # Marca a chave como presente
+                if estado.get(tupla[pos_chave]) != tupla:  # Nova ou alterada
+                    alterados.append(linha)  # Separa para gravar
+            removidos = [k for k in estado if k not in presentes]  # Chaves que sumiram da lista
+            return self.registrar(nome, alterados, removidos)  # Grava apenas a diferença
+
+    # --- Compactação ---
+
+    def _preparar_snapshot(self, nome):  # Grava o snapshot novo de uma tabela ao lado do atual
+        """Grava o snapshot CSV num arquivo temporário (com fsync) e retorna (temporário, definitivo)."""
+        caminho_csv, campos, _ = self._tabelas[nome]  # Configuração da tabela
+        temporario = caminho_csv + '.tmp'  # Arquivo temporário ao lado do definitivo
+        with open(temporario, mode='w', newline='', encoding='utf-8') as f:  # Abre o temporário
+            escritor = csv.writer(f)  # Gravador CSV simples
+            escritor.writerow(campos)  # Escreve os títulos das colunas
+            escritor.writerows(self._estado[nome].values())  # Escreve todas as linhas persistidas
+            f.flush()  # Esvazia o buffer
+            os.fsync(f.fileno())  # Garante a gravação física
+        return temporario, caminho_csv  # Troca a ser feita
+
+    def _gravar_manifesto(self, trocas):  # Ponto de confirmação da compactação
+        """Grava (de forma atômica) a lista de trocas [(temporário, definitivo)] pendentes."""
+        temporario = self.caminho_manifesto + '.tmp'  # O manifesto também nasce num temporário
+        with open(temporario, mode='w', encoding='utf-8') as f:  # Abre o temporário
+            json.dump({'trocas': trocas}, f, ensure_ascii=False)  # Lista de trocas
+            f.flush()  # Esvazia o buffer
+            os.fsync(f.fileno())  # Garante a gravação física
+        os.replace(temporario, self.caminho_manifesto)  # A partir daqui a compactação será concluída mesmo após uma queda
+        gravar_pasta(self.caminho_manifesto)  # Torna a troca de nome durável
+
+    def _concluir_manifesto(self, trocas):  # Aplica as trocas confirmadas
+        """Troca os snapshots pelos temporários, esvazia o diário e apaga o manifesto (pode ser repetido sem risco)."""
+        for temporario, definitivo in trocas:  # Cada snapshot novo
+            if os.path.exists(temporario):  # Ainda não trocado (numa repetição, parte já pode ter sido)
+                os.replace(temporario, definitivo)  # Troca atômica pelo snapshot antigo
+        if trocas:  # Houve renomeações
+            gravar_pasta(trocas[0][1])  # Torna as trocas duráveis antes de apagar o diário
+        if os.path.exists(self.caminho_diario):  # Se existe diário
+            os.remove(self.caminho_diario)  # Esvazia o diário (tudo já está nos snapshots)
+        os.remove(self.caminho_manifesto)  # Compactação concluída
+
+    def _recuperar(self):  # Chamado com as travas, antes de ler os arquivos
+        """Conclui a compactação com manifesto ou descarta temporários sem manifesto; retorna True se havia algo pendente."""
+        if os.path.exists(self.caminho_manifesto):  # Queda depois do ponto de confirmação
+            with open(self.caminho_manifesto, mode='r', encoding='utf-8') as f:  # Abre o manifesto (gravado de forma atômica)
+                trocas = json.load(f)['trocas']  # Trocas pendentes
+            self._concluir_manifesto(trocas)  # Termina o que faltou
+            return True  # Havia uma compactação interrompida
+        sobras = [c + '.tmp' for c, _, _ in self._tabelas.values()] + [self.caminho_manifesto + '.tmp']  # Temporários possíveis
+        sobras += [self._caminho_colunar(nome) + '.tmp' for nome in self._tabelas]  # Cópias colunares pela metade
+        sobras = [c for c in sobras if os.path.exists(c)]  # Queda antes do ponto de confirmação
+        for caminho in sobras:  # Os snapshots atuais e o diário continuam valendo
+            os.remove(caminho)  # Descarta o temporário incompleto
+        return bool(sobras)  # Havia temporários descartados
+
+    def recuperar(self):  # Usado na inicialização do sistema
+        """Recupera os arquivos após uma queda durante a compactação; retorna True se algo foi recuperado."""
+        with self.trava_arquivo, self._trava:  # Nenhum terminal lê ou grava durante a recuperação
+            return self._recuperar()  # Conclui ou descarta o que ficou pela metade
+
+    def compactar(self):  # Compactação sob demanda
+        """Regrava os snapshots CSV com o estado atual e esvazia o diário; retorna quantas linhas foram regravadas."""
+        with self.trava_arquivo, self._trava:  # Nenhum terminal grava durante a compactação
+            self._sincronizar()  # Inclui o que os outros terminais acrescentaram ao diário
+            if self._registros_diario == 0 and not os.path.exists(self.caminho_diario):  # Nada pendente
+                return 0  # Não há o que compactar
+            trocas = [self._preparar_snapshot(nome) for nome in self._tabelas]  # Snapshots novos em temporários
+            self._gravar_manifesto(trocas)  # Ponto de confirmação: todas as trocas serão feitas
+            self._concluir_manifesto(trocas)  # Troca os snapshots e esvazia o diário
+            self._assinaturas = tuple(assinatura_arquivo(caminho) for caminho, _, _ in self._tabelas.values())  # Snapshots gravados agora
+            self._posicao_diario, self._inode_diario, self._registros_diario = 0, None, 0  # Diário vazio
+            for nome, linhas in self._estado.items():  # Cópia colunar de cada snapshot novo
+                self._gravar_colunar(nome, list(linhas.values()))  # Uma queda aqui só deixa a cópia desatualizada (será reconstruída)
+            if self.ao_compactar:  # Se alguém quer ser avisado
+                self.ao_compactar()  # Avisa ainda com a trava, para as assinaturas refletirem os novos arquivos
+            return sum(len(linhas) for linhas in self._estado.values())  # Linhas regravadas nos snapshots
+
+    def substituir_snapshots(self, trocas):  # Snapshots regravados fora do motor (ex.: reparo de integridade)
+        """Troca os snapshots pelos temporários [(temporário, definitivo)] já gravados com fsync, pelo manifesto da compactação; o diário precisa estar vazio."""
+        with self.trava_arquivo, self._trava:  # Nenhum terminal lê ou grava durante a troca
+            if os.path.exists(self.caminho_diario) and os.path.getsize(self.caminho_diario):  # Alterações fora dos snapshots
+                raise ValueError("Há alterações no diário ainda não compactadas.")  # O chamador compacta antes
+            if trocas:  # Algo a trocar
+                self._gravar_manifesto(trocas)  # Ponto de confirmação: uma queda daqui em diante conclui as trocas
+                self._concluir_manifesto(trocas)  # Troca os snapshots (a próxima leitura percebe pelas assinaturas)
+
+    def compactar_em_segundo_plano(self):  # Compactação assíncrona
+        """Dispara a compactação numa thread para não bloquear o menu."""
+        if self._thread_compactacao and self._thread_compactacao.is_alive():  # Já existe uma em andamento
+            return  # Não dispara outra
+        self._thread_compactacao = threading.Thread(target=self.compactar, daemon=True)  # Cria a thread
+        self._thread_compactacao.start()  # Inicia a compactação
+
+    def aguardar_compactacao(self):  # Usado ao encerrar o programa
+        """Espera a compactação em segundo plano terminar (se houver)."""
+        if self._thread_compactacao:  # Se alguma foi disparada
+            self._thread_compactacao.join()  # Aguarda o término
@@ -0,0 +1,242 @@
+import sqlite3  # Importa o banco de dados SQLite (já incluso no Python)
+import threading  # Importa a biblioteca para proteger a conexão compartilhada entre threads
+
+from armazenamento import verificar_versoes  # Importa o controle otimista de versão (o mesmo do motor de diário)
+from colunar import filtro_de_condicoes  # Importa o filtro por campo (o mesmo do motor de diário)
+from travas import TravaArquivo  # Importa a trava de arquivo entre terminais
+
+# =================================================================
+#         MOTOR DE ARMAZENAMENTO ALTERNATIVO: BANCO SQLITE
+# =================================================================
+#
+# Mesmo contrato do ArmazenamentoDiario (registrar_tabela, carregar, registrar,
+# salvar, compactar), mas cada tabela vira uma tabela SQLite com as mesmas
+# colunas do CSV (valores guardados como texto, exatamente como no CSV). Cada
+# gravação é uma transação que só toca as linhas alteradas, e as colunas mais
+# consultadas ganham índices.
+#
+# Entre terminais, as gravações usam BEGIN IMMEDIATE (um gravador por vez) e o
+# mesmo controle de versão do motor de diário: as linhas do lote são relidas
+# dentro da transação e, se alguma tiver sido alterada por outro terminal, a
+# transação é desfeita com ConflitoVersao. A geração vem de PRAGMA data_version,
+# que muda sempre que outra conexão grava no banco.
+
+
+def _identificador(nome):  # Nomes de colunas com espaços e acentos
+    """Coloca um nome de tabela ou coluna entre aspas para uso no SQL."""
+    return '"' + nome.replace('"', '""') + '"'  # Escapa aspas internas
+
+
+class ArmazenamentoSQLite:  # Classe que gerencia as tabelas no banco SQLite
+    """Guarda as tabelas num banco SQLite, com transações só das linhas alteradas."""
+
+    def __init__(self, caminho_banco):  # Construtor do motor
+        self.caminho_banco = caminho_banco  # Caminho do arquivo .db
+        self._tabelas = {}  # nome -> (caminho do CSV de origem, lista de campos, campo chave)
+        self._versoes = {}  # nome -> coluna de versão (None = sem controle de versão)
+        self._conexao = None  # Conexão aberta sob demanda
+        self._trava = threading.RLock()  # Protege a conexão (o sqlite3 não permite uso simultâneo)
+        self.trava_arquivo = TravaArquivo(caminho_banco + '.trava')  # Mesma trava entre terminais do motor de diário (usada nas gravações)
+        self.ao_compactar = None  # Mantido por compatibilidade com o motor de diário
+
+    def _conectar(self):  # Abre a conexão uma única vez
+        """Retorna a conexão com o banco, abrindo-a na primeira chamada."""
+        if self._conexao is None:  # Ainda não conectado
+            self._conexao = sqlite3.connect(self.caminho_banco, timeout=30, check_same_thread=False)  # Abre (ou cria) o banco; espera até 30 s por outro terminal
+        return self._conexao  # Conexão pronta
+
+    def registrar_tabela(self, nome, caminho_csv, campos, chave, indices=(), versao=None):  # Declara uma tabela gerenciada pelo motor
+        """Cadastra uma tabela e cria (se preciso) a tabela, as colunas novas e os índices no banco."""
+        self._tabelas[nome] = (caminho_csv, list(campos), chave)  # Mesma configuração do motor de diário
+        self._versoes[nome] = versao  # Coluna com o número de versão da linha (controle otimista)
+        colunas = ", ".join(  # A chave é a chave primária (índice único); o rowid preserva a ordem de inserção
+            f"{_identificador(c)} TEXT PRIMARY KEY" if c == chave else f"{_identificador(c)} TEXT" for c in campos
+        )
+        with self._trava, self._conectar() as conexao:  # Transação de criação do esquema
+            conexao.execute(f"CREATE TABLE IF NOT EXISTS {_identificador(nome)} ({colunas})")  # Cria a tabela
+            existentes = {linha[1] for linha in conexao.execute(f"PRAGMA table_info({_identificador(nome)})")}  # Colunas já criadas
+            for campo in campos:  # Colunas acrescentadas depois (ex.: Código do Produto nos itens)
+                if campo not in existentes:  # Banco criado por uma versão anterior
+                    conexao.execute(f"ALTER TABLE {_identificador(nome)} ADD COLUMN {_identificador(campo)} TEXT DEFAULT ''")  # Acrescenta a coluna
+            for campo in indices:  # Índices secundários (cliente, status, pedido...)
+                conexao.execute(  # Cria o índice se ainda não existir
+                    f"CREATE INDEX IF NOT EXISTS {_identificador(f'idx_{nome}_{campo}')} "
+                    f"ON {_identificador(nome)} ({_identificador(campo)})"
+                )
+
+    # --- Leitura ---
+
+    @property
+    def geracao(self):  # Mesmo papel do contador do motor de diário
+        """Número que muda sempre que outra conexão (outro terminal) grava no banco."""
+        with self._trava:  # Uma consulta por vez na conexão
+            return self._conectar().execute("PRAGMA data_version").fetchone()[0]  # Não muda com as gravações desta conexão
+
+    def _selecao(self, nome):  # Lista de colunas do SELECT
+        """Monta as colunas da tabela, na mesma ordem do CSV, para uso no SELECT."""
+        return ", ".join(f"COALESCE({_identificador(c)}, '')" for c in self._tabelas[nome][1])  # Nulos viram texto vazio
+
+    def carregar(self, nome, fabrica=None):  # Ponto de entrada para leitura
+        """Carrega todas as linhas de uma tabela (dicionários ou objetos criados pela fábrica)."""
+        listas, _ = self.carregar_lote([(nome, fabrica)])  # Lote com uma única tabela
+        return listas[0]  # Linhas da tabela
+
+    def carregar_lote(self, lote):  # Leitura consistente de várias tabelas
+        """Carrega as tabelas de [(nome, fabrica)] numa única transação de leitura; retorna (listas, geração lida)."""
+        with self._trava:  # Uma operação por vez na conexão
+            conexao = self._conectar()  # Conexão aberta
+            conexao.execute("BEGIN")  # Nenhum terminal grava entre as consultas
+            try:  # Encerra a transação mesmo em caso de erro
+                tuplas = [  # Ordem de inserção
+                    conexao.execute(f"SELECT {self._selecao(nome)} FROM {_identificador(nome)} ORDER BY rowid").fetchall()
+                    for nome, _ in lote
+                ]
+                geracao = conexao.execute("PRAGMA data_version").fetchone()[0]  # Versão do banco que foi lida
+            finally:  # Libera o banco para os outros terminais
+                conexao.commit()  # Fim da transação de leitura
+        listas = []  # Resultado por tabela
+        for (nome, fabrica), linhas in zip(lote, tuplas):  # Interpreta fora da trava
+            if fabrica:  # Registros tipados (ex.: Pedido.de_tupla)
+                listas.append([fabrica(tupla) for tupla in linhas])  # Interpreta cada linha uma vez
+            else:  # Dicionários
+                campos = self._tabelas[nome][1]  # Nomes das colunas
+                listas.append([dict(zip(campos, tupla)) for tupla in linhas])  # Converte em dicionários
+        return listas, geracao  # Linhas e geração
+
+    def iterar(self, nome, fabrica=None, condicoes=None, tamanho_bloco=500):  # Leitura sob demanda (relatórios)
+        """Gera as linhas da tabela sob demanda, buscando no banco um bloco de cada vez; 'condicoes' {campo: função(texto)} filtra antes de criar os registros."""
+        _, campos, _ = self._tabelas[nome]  # Configuração da tabela
+        atende = filtro_de_condicoes(campos, condicoes)  # None = sem filtro
+        selecao = self._selecao(nome)  # Mesmas colunas do CSV
+        converter = fabrica or (lambda tupla: dict(zip(campos, tupla)))  # Registros tipados ou dicionários
+        with self._trava:  # Abre o cursor
+            cursor = self._conectar().execute(f"SELECT {selecao} FROM {_identificador(nome)} ORDER BY rowid")  # Consulta em ordem de inserção
+        while True:  # Busca bloco a bloco (a trava não fica presa enquanto o usuário lê a página)
+            with self._trava:  # Uma operação por vez na conexão
+                bloco = cursor.fetchmany(tamanho_bloco)  # Próximo bloco de linhas
+            if not bloco:  # Fim da tabela
+                return  # Encerra o gerador
+            for tupla in bloco:  # Linhas do bloco
+                if atende is None or atende(tupla):  # Aplica o filtro antes de criar o registro
+                    yield converter(tupla)  # Entrega a linha
+
+    # --- Escrita ---
+
+    @staticmethod
+    def _para_tupla(linha, campos):  # Serializa uma linha para gravação
+        """Converte um registro tipado ou um dicionário na tupla de textos das colunas."""
+        if hasattr(linha, 'para_tupla'):  # Registro tipado (Pedido/ItemPedido)
+            return linha.para_tupla()  # Usa a serialização do próprio registro
+        return tuple(str(linha.get(c) or '') for c in campos)  # Dicionário antigo: normaliza os valores como texto
+
+    def registrar(self, nome, alterados=(), removidos=()):  # Grava alterações conhecidas
+        """Grava numa única transação apenas as linhas alteradas e as chaves removidas."""
+        return self.registrar_lote([(nome, alterados, removidos)])  # Lote com uma única tabela
+
+    def _buscar(self, conexao, nome, chaves):  # Lê as linhas atuais de algumas chaves
+        """Retorna {chave: tupla} das linhas gravadas no banco para as chaves informadas."""
+        chave = self._tabelas[nome][2]  # Coluna chave
+        atuais = {}  # Resultado
+        for inicio in range(0, len(chaves), 500):  # Blocos abaixo do limite de parâmetros do SQLite
+            bloco = chaves[inicio:inicio + 500]  # Chaves do bloco
+            consulta = (  # Busca pela chave primária
+                f"SELECT {self._selecao(nome)} FROM {_identificador(nome)} "
+                f"WHERE {_identificador(chave)} IN ({', '.join('?' for _ in bloco)})"
+            )
+            pos_chave = self._tabelas[nome][1].index(chave)  # Posição da chave na tupla
+            atuais.update((tupla[pos_chave], tupla) for tupla in conexao.execute(consulta, bloco))  # Indexa pela chave
+        return atuais  # Linhas encontradas
+
+    def registrar_lote(self, lote):  # Grava alterações de várias tabelas de uma vez
+        """Grava numa única transação as alterações de (tabela, alterados, removidos) do lote."""
+        total = 0  # Linhas tocadas
+        versoes = []  # (linha em memória, coluna de versão, nova versão) aplicadas depois do COMMIT
+        with self.trava_arquivo, self._trava:  # Um gravador por vez (entre terminais e threads)
+            conexao = self._conectar()  # Conexão aberta
+            conexao.execute("BEGIN IMMEDIATE")  # Reserva a gravação antes de reler as versões
+            try:  # Transação: tudo ou nada (todas as tabelas juntas)
+                for nome, alterados, removidos in lote:  # Cada tabela do lote
+                    total += self._gravar_tabela(conexao, nome, list(alterados), removidos, versoes)  # Grava a tabela
+                conexao.commit()  # Confirma o lote inteiro
+            except BaseException:  # Conflito de versão ou erro do banco
+                conexao.rollback()  # Desfaz o que já tinha sido gravado no lote
+                raise  # Repassa o erro
+        for linha, coluna, versao in versoes:  # Registros em memória passam a ter a versão gravada
+            linha[coluna] = versao  # A próxima gravação parte desta versão
+        return total  # Quantidade de linhas tocadas
+
+    def _gravar_tabela(self, conexao, nome, alterados, removidos, versoes):  # Parte do lote de uma tabela
+        """Grava (dentro da transação aberta) as linhas alteradas e as exclusões de uma tabela."""
+        _, campos, chave = self._tabelas[nome]  # Configuração da tabela
+        tabela = _identificador(nome)  # Nome da tabela no SQL
+        pos_chave = campos.index(chave)  # Posição da chave na tupla
+        coluna_versao = self._versoes.get(nome)  # Coluna de versão (se houver)
+        pos_versao = campos.index(coluna_versao) if coluna_versao else None  # Posição da versão na tupla
+        tuplas = [self._para_tupla(linha, campos) for linha in alterados]  # Serializa as linhas alteradas
+        atuais = self._buscar(conexao, nome, [t[pos_chave] for t in tuplas]) if tuplas else {}  # Linhas atuais no banco
+        gravar = verificar_versoes(nome, tuplas, atuais, pos_chave, pos_versao)  # Só o que mudou (ou ConflitoVersao)
+        tuplas = [tupla for _, tupla in gravar]  # Tuplas já com a nova versão
+        if pos_versao is not None:  # A linha em memória precisa da nova versão
+            versoes.extend((alterados[indice], coluna_versao, tupla[pos_versao]) for indice, tupla in gravar)  # Aplicada após o COMMIT
+        chaves = [(str(k),) for k in removidos]  # Chaves excluídas sempre como texto
+        if tuplas:  # Linhas novas/alteradas
+            atualizacoes = ", ".join(f"{_identificador(c)} = excluded.{_identificador(c)}" for c in campos if c != chave)  # Colunas do UPSERT
+            conexao.executemany(  # Insere ou altera mantendo o rowid (e, portanto, a ordem original)
+                f"INSERT INTO {tabela} ({', '.join(_identificador(c) for c in campos)}) "
+                f"VALUES ({', '.join('?' for _ in campos)}) "
+                f"ON CONFLICT({_identificador(chave)}) DO UPDATE SET {atualizacoes}",
+                tuplas
+            )
+        if chaves:  # Linhas excluídas
+            conexao.executemany(f"DELETE FROM {tabela} WHERE {_identificador(chave)} = ?", chaves)  # Exclusão pela chave primária
+        return len(tuplas) + len(chaves)  # Linhas tocadas nesta tabela
+
+    def salvar(self, nome, linhas):  # Mantém o contrato antigo: recebe a lista inteira
+        """Compara a lista completa com o banco e grava só a diferença."""
+        _, campos, chave = self._tabelas[nome]  # Configuração da tabela
+        pos_chave = campos.index(chave)  # Posição da chave na tupla
+        atuais = {tupla[pos_chave]: tupla for tupla in self.carregar(nome, tuple)}  # Estado atual no banco
+        alterados = []  # Linhas que mudaram
+        presentes = set()  # Chaves presentes na lista recebida
+        for linha in linhas:  # Percorre a lista atual
+            tupla = self._para_tupla(linha, campos)  # Serializa a linha
+            presentes.add(tupla[pos_chave])  # Marca a chave como presente
+            if atuais.get(tupla[pos_chave]) != tupla:  # Nova ou alterada
+                alterados.append(linha)  # Separa para gravar
+        removidos = [k for k in atuais if k not in presentes]  # Chaves que sumiram da lista
+        return self.registrar(nome, alterados, removidos)  # Grava apenas a diferença
+
+    def quantidade(self, nome):  # Linhas de uma tabela
+        """Retorna quantas linhas a tabela tem no banco (sem carregá-las)."""
+        with self._trava:  # Uma consulta por vez na conexão
+            return self._conectar().execute(f"SELECT COUNT(*) FROM {_identificador(nome)}").fetchone()[0]  # Contagem feita pelo SQLite
+
+    def substituir(self, nome, tuplas):  # Usado pela importação dos CSVs
+        """Troca todo o conteúdo de uma tabela numa única transação."""
+        _, campos, _ = self._tabelas[nome]  # Configuração da tabela
+        tabela = _identificador(nome)  # Nome da tabela no SQL
+        with self._trava, self._conectar() as conexao:  # Transação: tudo ou nada
+            conexao.execute(f"DELETE FROM {tabela}")  # Esvazia a tabela
+            conexao.executemany(  # Insere todas as linhas de uma vez
+                f"INSERT INTO {tabela} ({', '.join(_identificador(c) for c in campos)}) VALUES ({', '.join('?' for _ in campos)})",
+                tuplas
+            )
+
+    # --- Manutenção ---
+
+    def compactar(self):  # Mesmo nome do motor de diário (chamado ao sair)
+        """Atualiza as estatísticas dos índices; no SQLite não há diário para consolidar (retorna 0 linhas regravadas)."""
+        with self._trava:  # Uma operação por vez na conexão
+            self._conectar().execute("PRAGMA optimize")  # Ajusta o planejador de consultas
+        if self.ao_compactar:  # Se alguém quer ser avisado
+            with self.trava_arquivo:  # Mesmo comportamento do motor de diário: avisa com a trava presa
+                self.ao_compactar()  # Atualiza caches
+        return 0  # Nenhuma linha regravada
+
+    def recuperar(self):  # Mesmo nome do motor de diário (chamado na inicialização)
+        """Nada a recuperar aqui: o próprio SQLite desfaz transações interrompidas ao abrir o banco."""
+        return False  # O journal do SQLite cuida das quedas
+
+    def aguardar_compactacao(self):  # Mesmo nome do motor de diário
+        """Nada a aguardar: o SQLite não compacta em segundo plano."""
+        return None  # Sem threads de compactação
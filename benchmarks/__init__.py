@@ -0,0 +1,12 @@
+# =================================================================
+#         MEDIÇÕES DE DESEMPENHO (DADOS SINTÉTICOS EM ESCALAS)
+# =================================================================
+#
+# gerador.py cria pedidos, itens e pagamentos sintéticos (com os produtos do
+# produtos.csv) numa pasta separada; executar.py mede as rotinas do sistema
+# sobre esses dados. Uso, a partir da pasta do projeto:
+#
+#     python -m benchmarks                      # escalas pequena e media
+#     python -m benchmarks --escalas grande     # 100 mil pedidos
+#     python -m benchmarks --salvar             # grava a referência
+#     python -m benchmarks --comparar           # compara com a referência
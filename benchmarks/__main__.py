@@ -0,0 +1,3 @@
+from benchmarks.executar import principal  # Importa o ponto de entrada das medições
+
+raise SystemExit(principal())  # Código de saída 1 quando --comparar encontra regressão
@@ -0,0 +1,236 @@
+import argparse  # Importa a biblioteca para ler as opções da linha de comando
+import json  # Importa a biblioteca para gravar e ler a referência das medições
+import os  # Importa a biblioteca para trocar de pasta e montar caminhos
+import platform  # Importa a identificação da máquina gravada com a referência
+import shutil  # Importa a remoção da pasta temporária
+import tempfile  # Importa a criação da pasta temporária de cada escala
+import time  # Importa o relógio de alta resolução
+import tracemalloc  # Importa a medição do pico de memória
+from collections import Counter  # Importa a contagem de pedidos por cliente
+from contextlib import contextmanager, redirect_stdout  # Importa o desvio da saída das telas
+from functools import partial  # Importa a fixação do "perguntar" da exibição em páginas
+from unittest import mock  # Importa a troca temporária do input() das telas
+
+import gerenciador_pedidos as sistema  # Importa o sistema medido (funções de carga, gravação, IDs e telas)
+from benchmarks.gerador import ESCALAS, SEMENTE, gerar_dados  # Importa o gerador de dados sintéticos
+from configuracao import ARQUIVO_SEQUENCIAS, BACKEND_CSV, BLOCO_IDS_ITENS  # Importa o arquivo de contadores e o motor padrão
+from sequencias import AlocadorSequencias  # Importa o alocador de IDs (um por pasta de dados)
+
+# =================================================================
+#            MEDIÇÃO DAS ROTINAS DO SISTEMA POR ESCALA
+# =================================================================
+#
+# Cada escala é gerada numa pasta temporária e o sistema é apontado para ela
+# (os caminhos dos arquivos são relativos à pasta atual). Cada cenário é
+# executado algumas vezes e o menor tempo é o registrado (o menos afetado por
+# outros programas); o pico de memória vem de uma execução extra com
+# tracemalloc ligado, para não inflar os tempos. As telas recebem respostas
+# prontas no lugar do input() e a saída delas é descartada.
+
+ARQUIVO_REFERENCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'referencia.json')  # Medições salvas para comparação
+ESCALAS_PADRAO = ['pequena', 'media']  # Escalas medidas quando nenhuma é informada
+REPETICOES = 3  # Execuções de cada cenário (vale o menor tempo)
+TOLERANCIA = 1.25  # Mais lento que a referência por mais do que isso é regressão
+FOLGA_SEGUNDOS = 0.005  # Diferenças menores que isso são ruído, não regressão
+BUSCAS_CLIENTES = 50  # Clientes abertos no cenário do painel do cliente
+IDS_ITENS = 10_000  # IDs de itens gerados no cenário do alocador
+FRACAO_ALTERADA = 0.01  # Parte dos registros alterada antes de cada gravação
+
+
+def responder(respostas):  # input() substituto
+    """Retorna uma função que responde às perguntas das telas pelo início do texto da pergunta (padrão: Enter)."""
+    def perguntar(mensagem=''):  # Mesma assinatura do input()
+        for inicio, resposta in respostas.items():  # Perguntas conhecidas
+            if mensagem.lstrip().startswith(inicio):  # Pergunta reconhecida
+                return resposta  # Resposta pronta
+        return ''  # Enter em todo o resto (filtros vazios, próxima página...)
+    return perguntar  # Função pronta
+
+
+@contextmanager
+def silencio():  # Descarta o que as telas imprimem
+    """Desvia a saída padrão para o nulo (a formatação das linhas continua sendo medida)."""
+    with open(os.devnull, 'w', encoding='utf-8') as nulo, redirect_stdout(nulo):  # Saída descartada
+        yield  # Executa o bloco
+
+
+def medir(funcao, preparar=None, repeticoes=REPETICOES):  # Mede um cenário
+    """Retorna (menor tempo em segundos, pico de memória em bytes) de 'funcao'; 'preparar' roda antes de cada execução, fora da medição."""
+    tempos = []  # Tempo de cada execução
+    for _ in range(repeticoes):  # Execuções cronometradas
+        if preparar:  # Estado inicial do cenário
+            preparar()  # Não entra no tempo
+        inicio = time.perf_counter()  # Início
+        funcao()  # Executa o cenário
+        tempos.append(time.perf_counter() - inicio)  # Tempo gasto
+    if preparar:  # Estado inicial da execução extra
+        preparar()  # Não entra no pico
+    tracemalloc.start()  # Liga o rastreio de memória
+    try:  # Sempre desliga o rastreio
+        funcao()  # Execução só para o pico de memória
+        pico = tracemalloc.get_traced_memory()[1]  # Maior uso durante a execução
+    finally:  # Mesmo se o cenário falhar
+        tracemalloc.stop()  # Desliga o rastreio
+    return min(tempos), pico  # Menor tempo e pico
+
+
+def apontar_para(pasta):  # Sistema lendo os dados da escala
+    """Troca para a pasta dos dados e recria o motor de armazenamento e o alocador de IDs do sistema."""
+    os.chdir(pasta)  # Caminhos dos arquivos são relativos à pasta atual
+    sistema.configurar_armazenamento(BACKEND_CSV)  # Motor novo, sem nada lido
+    sistema.armazenamento.limite_compactacao = float('inf')  # Compactação só no cenário dela (não no meio de outra medição)
+    sistema.sequencias = AlocadorSequencias(ARQUIVO_SEQUENCIAS, {'item': BLOCO_IDS_ITENS})  # Contadores da pasta nova
+
+
+def alterar_amostra(registros, alterar):  # Simula edições do usuário
+    """Aplica 'alterar' a uma fração dos registros (espalhada pela lista)."""
+    passo = max(int(1 / FRACAO_ALTERADA), 1)  # Um a cada N registros
+    for registro in registros[::passo]:  # Amostra espalhada
+        alterar(registro)  # Edita o registro
+
+
+def cenarios(nomes_clientes, repositorio):  # Rotinas medidas
+    """Retorna [(nome, quantidade processada, função, preparar)] de cada rotina medida."""
+    cabecalhos = sistema.carregar_cabecalhos()  # Listas usadas pelos cenários de gravação
+    itens = sistema.carregar_itens()  # Idem
+    pedidos = [p.id_pedido for p in repositorio.cabecalhos]  # IDs para o cálculo do total
+    clientes = nomes_clientes[:BUSCAS_CLIENTES]  # Clientes abertos no painel
+
+    def motor_novo():  # Leitura a frio (como ao abrir o programa)
+        sistema.configurar_armazenamento(BACKEND_CSV)  # Descarta o estado lido
+        sistema.armazenamento.limite_compactacao = float('inf')  # Compactação só no cenário dela
+
+    def alterar_cabecalhos():  # Edição de status em 1% dos pedidos
+        alterar_amostra(cabecalhos, lambda p: setattr(p, 'status_pedido', 'Entregue' if p.status_pedido == 'Pendente' else 'Pendente'))
+
+    def alterar_itens():  # Edição de quantidade em 1% dos itens
+        alterar_amostra(itens, lambda i: setattr(i, 'quantidade', i.quantidade + 1))
+
+    def gravar_alteracoes():  # Diário com alterações para a compactação consolidar
+        alterar_cabecalhos()  # Edita 1% dos pedidos
+        sistema.salvar_cabecalhos(cabecalhos)  # Acrescenta ao diário
+
+    def calcular_totais():  # Total de cada pedido pelos itens
+        for id_pedido in pedidos:  # Todos os pedidos
+            sistema.calcular_valor_total_pedido(id_pedido, repositorio)  # Soma pelo índice de itens
+
+    def gerar_ids():  # Novos IDs de itens
+        for _ in range(IDS_ITENS):  # Vários itens lançados
+            sistema.gerar_novo_id_item(repositorio)  # Próximo ID (reserva blocos no disco)
+
+    def abrir_clientes():  # Painel do cliente (filtro por cliente)
+        for nome in clientes:  # Cada cliente
+            perguntas = responder({'Digite o nome': nome, 'Escolha uma opção': '5'})  # Abre o painel e volta
+            with mock.patch('builtins.input', perguntas), silencio():  # Sem teclado e sem tela
+                sistema.gerenciar_por_cliente(repositorio)  # Busca, resumo e pedidos do cliente
+
+    def visao_geral():  # Relatório geral completo (todas as páginas)
+        perguntar = responder({})  # Filtros vazios e Enter em todas as páginas
+        with mock.patch('builtins.input', perguntar), \
+                mock.patch.object(sistema, 'imprimir_paginado', partial(sistema.imprimir_paginado, perguntar=perguntar)), silencio():
+            sistema.visualizar_pedidos()  # Lê e imprime todos os pedidos
+
+    return [  # (nome, quantidade, função, preparar)
+        ('carregar_cabecalhos', len(cabecalhos), sistema.carregar_cabecalhos, motor_novo),
+        ('carregar_itens', len(itens), sistema.carregar_itens, motor_novo),
+        ('montar_repositorio', len(cabecalhos) + len(itens), sistema.montar_repositorio, motor_novo),
+        ('salvar_cabecalhos', len(cabecalhos), lambda: sistema.salvar_cabecalhos(cabecalhos), alterar_cabecalhos),
+        ('salvar_itens', len(itens), lambda: sistema.salvar_itens(itens), alterar_itens),
+        ('compactar_dados', len(cabecalhos) + len(itens), sistema.compactar_dados, gravar_alteracoes),
+        ('calcular_valor_total_pedido', len(pedidos), calcular_totais, None),
+        ('gerar_novo_id_item', IDS_ITENS, gerar_ids, None),
+        ('gerenciar_por_cliente', len(clientes), abrir_clientes, None),
+        ('visualizar_pedidos', len(cabecalhos), visao_geral, None),
+    ]
+
+
+def medir_escala(escala, repeticoes=REPETICOES, semente=SEMENTE):  # Todas as rotinas numa escala
+    """Gera os dados da escala numa pasta temporária e retorna {cenário: medições}."""
+    pasta_original = os.getcwd()  # Volta para cá no fim
+    pasta = tempfile.mkdtemp(prefix=f'bench_{escala}_')  # Dados descartáveis
+    try:  # Sempre volta para a pasta original e apaga os dados
+        gerar_dados(pasta, *ESCALAS[escala], semente)  # Dados sintéticos
+        apontar_para(pasta)  # Sistema lendo a pasta nova
+        repositorio = sistema.montar_repositorio()  # Índices usados pelos cenários de consulta
+        nomes_clientes = [nome for nome, _ in Counter(p.nome_cliente for p in repositorio.cabecalhos).most_common()]  # Clientes com mais pedidos primeiro
+        resultados = {}  # Cenário -> medições
+        for nome, quantidade, funcao, preparar in cenarios(nomes_clientes, repositorio):  # Cada rotina
+            segundos, pico = medir(funcao, preparar, repeticoes)  # Tempo e memória
+            resultados[nome] = {  # Medições do cenário
+                'quantidade': quantidade,
+                'segundos': segundos,
+                'por_segundo': quantidade / segundos if segundos else 0.0,
+                'pico_mb': pico / (1024 * 1024),
+            }
+        return resultados  # Medições da escala
+    finally:  # Limpeza
+        sistema.armazenamento.aguardar_compactacao()  # Nenhuma thread ainda escrevendo na pasta
+        os.chdir(pasta_original)  # Pasta de antes
+        shutil.rmtree(pasta, ignore_errors=True)  # Apaga os dados sintéticos
+
+
+# --- Referência ---
+
+def salvar_referencia(resultados, caminho=ARQUIVO_REFERENCIA):  # Grava as medições atuais
+    """Grava as medições (e a identificação da máquina) como referência para comparações futuras."""
+    referencia = {'maquina': platform.node(), 'python': platform.python_version(), 'escalas': resultados}  # Medições com contexto
+    with open(caminho, mode='w', encoding='utf-8') as f:  # Substitui a referência anterior
+        json.dump(referencia, f, ensure_ascii=False, indent=2)  # JSON legível
+
+
+def comparar(resultados, caminho=ARQUIVO_REFERENCIA):  # Procura regressões
+    """Retorna [(escala, cenário, segundos da referência, segundos atuais)] dos cenários mais lentos que a referência."""
+    with open(caminho, mode='r', encoding='utf-8') as f:  # Referência gravada
+        referencia = json.load(f)['escalas']  # Medições por escala
+    regressoes = []  # Cenários mais lentos
+    for escala, medicoes in resultados.items():  # Cada escala medida agora
+        for cenario, atual in medicoes.items():  # Cada cenário
+            anterior = referencia.get(escala, {}).get(cenario)  # Mesma medição na referência
+            if anterior and atual['segundos'] > anterior['segundos'] * TOLERANCIA and atual['segundos'] - anterior['segundos'] > FOLGA_SEGUNDOS:  # Mais lento além do ruído
+                regressoes.append((escala, cenario, anterior['segundos'], atual['segundos']))  # Regressão
+    return regressoes  # Lista vazia = tudo dentro da tolerância
+
+
+# --- Exibição ---
+
+def imprimir_escala(escala, medicoes, referencia=None):  # Tabela de uma escala
+    """Imprime tempo, vazão e pico de memória de cada cenário (e a razão em relação à referência, se houver)."""
+    clientes, pedidos, itens = ESCALAS[escala]  # Tamanho da escala
+    print(f"\n--- ESCALA {escala.upper()} ({clientes} clientes, {pedidos} pedidos, {itens} itens) ---")  # Título
+    print(f"{'Cenário':<28} | {'Tempo (ms)':>10} | {'Registros/s':>12} | {'Pico (MB)':>9} | {'x Ref.':>6}")  # Títulos das colunas
+    for cenario, medicao in medicoes.items():  # Cada cenário
+        anterior = (referencia or {}).get(escala, {}).get(cenario)  # Mesma medição na referência
+        razao = f"{medicao['segundos'] / anterior['segundos']:.2f}" if anterior and anterior['segundos'] else '-'  # 1.00 = igual à referência
+        print(f"{cenario:<28} | {medicao['segundos'] * 1000:>10.1f} | {medicao['por_segundo']:>12,.0f} | {medicao['pico_mb']:>9.1f} | {razao:>6}")  # Linha do cenário
+
+
+def principal(argumentos=None):  # Ponto de entrada
+    """Mede as escalas pedidas, imprime as tabelas e grava ou compara a referência; retorna o código de saída."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Mede as rotinas do gerenciador de pedidos com dados sintéticos")  # Opções
+    parser.add_argument('--escalas', nargs='+', choices=ESCALAS, default=ESCALAS_PADRAO, help="Escalas medidas (padrão: pequena media)")  # Tamanhos
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES, help="Execuções de cada cenário (vale o menor tempo)")  # Repetições
+    parser.add_argument('--semente', type=int, default=SEMENTE, help="Semente do gerador de dados")  # Repetibilidade
+    parser.add_argument('--salvar', action='store_true', help=f"Grava as medições como referência ({os.path.basename(ARQUIVO_REFERENCIA)})")  # Nova referência
+    parser.add_argument('--comparar', action='store_true', help="Compara com a referência e termina com código 1 se houver regressão")  # Verificação
+    argumentos = parser.parse_args(argumentos)  # Lê as opções informadas
+    referencia = None  # Medições anteriores (para a coluna "x Ref.")
+    if os.path.exists(ARQUIVO_REFERENCIA):  # Já existe referência
+        with open(ARQUIVO_REFERENCIA, mode='r', encoding='utf-8') as f:  # Abre
+            referencia = json.load(f)['escalas']  # Medições por escala
+    elif argumentos.comparar:  # Nada para comparar
+        parser.error(f"referência '{ARQUIVO_REFERENCIA}' não encontrada (rode antes com --salvar)")  # Encerra com a mensagem de uso
+    resultados = {}  # Escala -> medições
+    for escala in argumentos.escalas:  # Cada escala pedida
+        resultados[escala] = medir_escala(escala, argumentos.repeticoes, argumentos.semente)  # Mede
+        imprimir_escala(escala, resultados[escala], referencia)  # Mostra assim que termina
+    if argumentos.salvar:  # Nova referência
+        salvar_referencia(resultados)  # Grava
+        print(f"\n✅ Referência gravada em '{ARQUIVO_REFERENCIA}'.")  # Confirma
+    if argumentos.comparar:  # Verificação de regressões
+        regressoes = comparar(resultados)  # Cenários mais lentos
+        for escala, cenario, antes, agora in regressoes:  # Cada regressão
+            print(f"⚠️ {escala}/{cenario}: {antes * 1000:.1f} ms -> {agora * 1000:.1f} ms ({agora / antes:.2f}x)")  # Detalhe
+        if regressoes:  # Houve regressão
+            return 1  # Código de saída para scripts
+        print("\n✅ Nenhuma regressão em relação à referência.")  # Tudo dentro da tolerância
+    return 0  # Sucesso
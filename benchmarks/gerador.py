@@ -0,0 +1,154 @@
+import argparse  # Importa a biblioteca para ler as opções da linha de comando
+import csv  # Importa a biblioteca para gravar os arquivos CSV
+import os  # Importa a biblioteca para montar os caminhos dos arquivos
+import random  # Importa o gerador de números pseudoaleatórios (com semente, resultados repetíveis)
+import shutil  # Importa a cópia do arquivo de produtos
+from datetime import datetime, timedelta  # Importa as datas dos pedidos, pagamentos e entregas
+
+from catalogo import CatalogoProdutos, TIPO_UNIDADE, TIPO_CAIXA  # Importa o catálogo de produtos e os tipos de venda
+from configuracao import (  # Importa os nomes dos arquivos e as colunas de cada tabela
+    ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_PAGAMENTOS, ARQUIVO_PRODUTOS,
+    CAMPOS_CABECALHO, CAMPOS_ITENS, CAMPOS_PAGAMENTOS, FORMAS_RECEBIMENTO, PRAZO_MAXIMO_PAGAMENTO_DIAS
+)
+from dinheiro import multiplicar, somar  # Importa a aritmética exata em centavos
+from registros import Pedido, ItemPedido, Pagamento  # Importa os registros tipados (mesma serialização do sistema)
+
+# =================================================================
+#          GERADOR DE DADOS SINTÉTICOS (PEDIDOS, ITENS, PAGAMENTOS)
+# =================================================================
+#
+# Os dados imitam o uso real: poucos clientes concentram a maior parte dos
+# pedidos, as vendas a prazo ficam em aberto ou parcialmente pagas, e parte dos
+# pedidos recentes ainda tem entrega agendada. A mesma semente gera sempre os
+# mesmos dados, então medições em dias diferentes são comparáveis.
+
+CAMINHO_PRODUTOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ARQUIVO_PRODUTOS)  # produtos.csv original do projeto
+SEMENTE = 2026  # Semente padrão do gerador
+ESCALAS = {  # nome -> (clientes, pedidos, itens)
+    'pequena': (100, 1_000, 3_000),
+    'media': (1_000, 10_000, 30_000),
+    'grande': (10_000, 100_000, 300_000),
+}
+NOMES = [  # Primeiros nomes (com acentos, como digitados no balcão)
+    'Ana', 'João', 'Maria', 'José', 'Antônio', 'Francisca', 'Carlos', 'Paulo', 'Lúcia', 'Pedro',
+    'Luís', 'Márcia', 'Rafael', 'Fernanda', 'Sebastião', 'Cláudia', 'Marcos', 'Patrícia', 'Luana', 'Tiago',
+]
+SOBRENOMES = [  # Sobrenomes
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Ferreira', 'Costa', 'Rodrigues', 'Almeida',
+    'Nascimento', 'Araújo', 'Carvalho', 'Gomes', 'Martins', 'Rocha', 'Ribeiro', 'Alves', 'Monteiro', 'Conceição',
+]
+NEGOCIOS = ['Bar', 'Mercearia', 'Depósito', 'Lanchonete', 'Distribuidora']  # Clientes que são estabelecimentos
+DIAS_HISTORICO = 365  # Período coberto pelos pedidos gerados
+DIAS_ENTREGAS = 14  # Pedidos deste período podem ter entrega pendente
+
+
+def ler_catalogo(caminho=CAMINHO_PRODUTOS):  # Produtos usados nos itens
+    """Lê o produtos.csv do projeto e monta o catálogo indexado."""
+    with open(caminho, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Abre o estoque
+        return CatalogoProdutos({linha['Código']: linha for linha in csv.DictReader(f)})  # Catálogo por código
+
+
+def gerar_clientes(rnd, quantidade):  # Nomes distintos
+    """Retorna 'quantidade' nomes de clientes distintos (pessoas e estabelecimentos)."""
+    nomes = {}  # Nome -> None (dicionário mantém a ordem de criação)
+    while len(nomes) < quantidade:  # Até ter nomes suficientes
+        pessoa = f"{rnd.choice(NOMES)} {rnd.choice(SOBRENOMES)}"  # Nome e sobrenome
+        if rnd.random() < 0.5:  # Nome completo
+            pessoa += f" {rnd.choice(SOBRENOMES)}"  # Segundo sobrenome
+        if rnd.random() < 0.3:  # Estabelecimento
+            pessoa = f"{rnd.choice(NEGOCIOS)} do {pessoa.split()[0]}"  # Ex.: "Bar do Pedro"
+        if pessoa in nomes:  # Nome repetido
+            pessoa += f" {len(nomes)}"  # Diferencia pelo número (como "Bar do Pedro 2")
+        nomes[pessoa] = None  # Guarda
+    return list(nomes)  # Nomes em ordem de criação
+
+
+def distribuir_itens(rnd, pedidos, itens):  # Quantos itens cada pedido tem
+    """Retorna a quantidade de itens de cada pedido (pelo menos 1, somando 'itens')."""
+    quantidades = [1] * pedidos  # Todo pedido tem ao menos um item
+    for _ in range(max(itens - pedidos, 0)):  # Itens restantes
+        quantidades[rnd.randrange(pedidos)] += 1  # Vão para pedidos sorteados
+    return quantidades  # Uma quantidade por pedido
+
+
+def gerar_pagamentos(rnd, pedido, proximo_id, agora):  # Parcelas de um pedido
+    """Retorna os pagamentos (parcelas) que somam o valor pago do pedido."""
+    if not pedido.valor_pago:  # Nada recebido
+        return []  # Sem parcelas
+    if pedido.forma_pagamento != 'Prazo':  # À vista: um recebimento no ato
+        return [Pagamento(id_pagamento=proximo_id, id_pedido=pedido.id_pedido, valor=pedido.valor_pago,
+                          forma_pagamento=pedido.forma_pagamento, data_pagamento=pedido.data_pedido)]
+    partes = [pedido.valor_pago]  # Uma parcela
+    if pedido.valor_pago > 1 and rnd.random() < 0.5:  # Duas parcelas
+        primeira = rnd.randint(1, pedido.valor_pago - 1)  # Divide o valor
+        partes = [primeira, pedido.valor_pago - primeira]  # Soma igual ao valor pago
+    pagamentos = []  # Parcelas geradas
+    data = pedido.data_pedido  # Parcelas em ordem cronológica
+    for numero, valor in enumerate(partes):  # Cada parcela
+        data = min(data + timedelta(days=rnd.randint(0, PRAZO_MAXIMO_PAGAMENTO_DIAS // len(partes)), minutes=rnd.randint(0, 600)), agora)  # Nunca no futuro
+        pagamentos.append(Pagamento(id_pagamento=proximo_id + numero, id_pedido=pedido.id_pedido, valor=valor,
+                                    forma_pagamento=rnd.choice(FORMAS_RECEBIMENTO), data_pagamento=data))
+    return pagamentos  # Parcelas do pedido
+
+
+def gerar_dados(pasta, clientes, pedidos, itens, semente=SEMENTE):  # Ponto de entrada do gerador
+    """Grava na pasta os CSVs de pedidos, itens e pagamentos (e uma cópia do produtos.csv); retorna as quantidades geradas."""
+    rnd = random.Random(semente)  # Mesma semente, mesmos dados
+    catalogo = ler_catalogo()  # Produtos reais do projeto
+    produtos = list(catalogo.values())  # Para sorteio
+    nomes = gerar_clientes(rnd, clientes)  # Clientes distintos
+    agora = datetime.now().replace(second=0, microsecond=0)  # Referência das datas (entregas pendentes ficam no futuro)
+    inicio = agora - timedelta(days=DIAS_HISTORICO)  # Pedido mais antigo possível
+    os.makedirs(pasta, exist_ok=True)  # Pasta dos dados
+    shutil.copyfile(CAMINHO_PRODUTOS, os.path.join(pasta, ARQUIVO_PRODUTOS))  # O sistema lê os produtos da mesma pasta
+    contagem = {'clientes': len(nomes), 'pedidos': 0, 'itens': 0, 'pagamentos': 0}  # Quantidades gravadas
+    with open(os.path.join(pasta, ARQUIVO_CABECALHO), mode='w', newline='', encoding='utf-8') as f_pedidos, \
+            open(os.path.join(pasta, ARQUIVO_ITENS), mode='w', newline='', encoding='utf-8') as f_itens, \
+            open(os.path.join(pasta, ARQUIVO_PAGAMENTOS), mode='w', newline='', encoding='utf-8') as f_pagamentos:
+        saida_pedidos, saida_itens, saida_pagamentos = csv.writer(f_pedidos), csv.writer(f_itens), csv.writer(f_pagamentos)  # Gravadores CSV
+        saida_pedidos.writerow(CAMPOS_CABECALHO)  # Títulos das colunas
+        saida_itens.writerow(CAMPOS_ITENS)  # Títulos das colunas
+        saida_pagamentos.writerow(CAMPOS_PAGAMENTOS)  # Títulos das colunas
+        datas = sorted(inicio + timedelta(minutes=rnd.randrange(DIAS_HISTORICO * 24 * 60)) for _ in range(pedidos))  # IDs crescem com a data, como no uso real
+        for id_pedido, (data_pedido, quantidade_itens) in enumerate(zip(datas, distribuir_itens(rnd, pedidos, itens)), 1):  # Cada pedido
+            pedido = Pedido(id_pedido=id_pedido, data_pedido=data_pedido, nome_cliente=nomes[int(len(nomes) * rnd.random() ** 2)])  # Clientes do início da lista compram mais
+            for _ in range(quantidade_itens):  # Itens do pedido
+                produto = rnd.choice(produtos)  # Produto sorteado
+                tipo = TIPO_UNIDADE if rnd.random() < 0.7 else TIPO_CAIXA  # Maioria das vendas por unidade
+                quantidade = rnd.randint(1, 24) if tipo == TIPO_UNIDADE else rnd.randint(1, 5)  # Quantidade típica
+                contagem['itens'] += 1  # Também é o ID do item
+                item = ItemPedido(id_item=contagem['itens'], id_pedido=id_pedido, produto=f"{produto['Nome do Produto']} ({tipo})",
+                                  quantidade=quantidade, valor_item=multiplicar(quantidade, catalogo.preco_centavos(produto, tipo)),
+                                  codigo_produto=produto['Código'], tipo_venda=tipo)
+                pedido.valor_total = somar((pedido.valor_total, item.valor_item))  # Total exato em centavos
+                saida_itens.writerow(item.para_tupla())  # Grava o item
+            pedido.forma_pagamento = rnd.choices(['Pix', 'Dinheiro', 'Prazo'], [45, 25, 30])[0]  # Formas de pagamento
+            pedido.status_pagamento = 'Pago' if pedido.forma_pagamento != 'Prazo' else rnd.choices(['Pago', 'Parcial', 'Pendente'], [30, 30, 40])[0]  # Vendas a prazo ficam em aberto
+            if pedido.status_pagamento == 'Pago':  # Quitado
+                pedido.valor_pago = pedido.valor_total  # Recebeu tudo
+            elif pedido.status_pagamento == 'Parcial':  # Parte recebida
+                pedido.valor_pago = pedido.valor_total * rnd.randint(20, 80) // 100  # Entre 20% e 80% do total
+            if pedido.status_pagamento != 'Pago':  # Em aberto
+                pedido.data_vencimento = data_pedido.replace(hour=0, minute=0) + timedelta(days=rnd.randint(1, PRAZO_MAXIMO_PAGAMENTO_DIAS))  # Até 30 dias após o pedido
+            pagamentos = gerar_pagamentos(rnd, pedido, contagem['pagamentos'] + 1, agora)  # Parcelas recebidas
+            for pagamento in pagamentos:  # Cada parcela
+                saida_pagamentos.writerow(pagamento.para_tupla())  # Grava a parcela
+            contagem['pagamentos'] += len(pagamentos)  # Próximo ID de pagamento
+            pedido.data_pagamento = pagamentos[-1].data_pagamento if pagamentos else None  # Data do último recebimento
+            pedido.status_pedido = 'Entregue'  # Pedidos antigos já foram entregues
+            if data_pedido >= agora - timedelta(days=DIAS_ENTREGAS) and rnd.random() < 0.3:  # Pedido recente ainda não entregue
+                pedido.status_pedido = 'Pendente'  # Entrega agendada
+                pedido.data_entrega = (agora + timedelta(days=rnd.randrange(DIAS_ENTREGAS))).replace(hour=rnd.randint(8, 17), minute=rnd.choice((0, 30)))  # Horários de meia em meia hora
+            saida_pedidos.writerow(pedido.para_tupla())  # Grava o pedido
+            contagem['pedidos'] += 1  # Conta o pedido
+    return contagem  # Quantidades gravadas
+
+
+if __name__ == "__main__":  # Gera um conjunto de dados para testes manuais
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos do gerenciador de pedidos")  # Opções da linha de comando
+    parser.add_argument('pasta', help="Pasta onde gravar os CSVs (o sistema pode ser executado dentro dela)")  # Destino
+    parser.add_argument('--escala', choices=ESCALAS, default='pequena', help="Tamanho dos dados (padrão: pequena)")  # Tamanho
+    parser.add_argument('--semente', type=int, default=SEMENTE, help="Semente do gerador")  # Repetibilidade
+    argumentos = parser.parse_args()  # Lê as opções informadas
+    gerados = gerar_dados(argumentos.pasta, *ESCALAS[argumentos.escala], argumentos.semente)  # Gera os arquivos
+    print(', '.join(f"{quantidade} {nome}" for nome, quantidade in gerados.items()) + f" gravados em '{argumentos.pasta}'.")  # Resumo
@@ -0,0 +1,51 @@
+import os  # Importa a biblioteca para consultar tamanho, data de modificação e inode dos arquivos
+
+# =================================================================
+#        CACHE DE DADOS VALIDADO PELA ASSINATURA DOS ARQUIVOS
+# =================================================================
+
+def assinatura_arquivo(caminho):  # Identifica a versão de um arquivo no disco
+    """Retorna (tamanho, mtime em ns, inode) do arquivo ou None se ele não existir."""
+    try:  # O arquivo pode não existir (ex.: diário já compactado)
+        info = os.stat(caminho)  # Consulta os metadados do arquivo
+    except FileNotFoundError:  # Arquivo ausente
+        return None  # Ausência também é uma assinatura válida
+    return (info.st_size, info.st_mtime_ns, info.st_ino)  # Qualquer gravação altera pelo menos um desses valores
+
+
+class CacheArquivos:  # Cache em nível de processo para dados lidos de arquivos
+    """Guarda dados já interpretados e só relê quando algum arquivo de origem mudou."""
+
+    def __init__(self):  # Construtor do cache
+        self._entradas = {}  # chave -> (lista de arquivos, assinaturas, valor)
+
+    def obter(self, chave, arquivos, carregador):  # Consulta com validação
+        """Retorna o valor em cache ou chama o carregador se os arquivos mudaram."""
+        assinaturas = tuple(assinatura_arquivo(a) for a in arquivos)  # Assinaturas atuais (antes da leitura)
+        entrada = self._entradas.get(chave)  # Entrada existente
+        if entrada and entrada[1] == assinaturas:  # Nada mudou no disco
+            return entrada[2]  # Usa o valor já interpretado
+        valor = carregador()  # Relê e interpreta os arquivos
+        self._entradas[chave] = (list(arquivos), assinaturas, valor)  # Guarda com as assinaturas lidas antes
+        return valor  # Retorna o valor novo
+
+    def valor(self, chave):  # Consulta sem validação
+        """Retorna o valor guardado para a chave (ou None), sem conferir os arquivos."""
+        entrada = self._entradas.get(chave)  # Entrada existente
+        return entrada[2] if entrada else None  # Valor já interpretado
+
+    def confirmar_escrita(self, chave, valor=None):  # Chamado depois das nossas próprias gravações
+        """Atualiza as assinaturas após uma gravação feita por este processo."""
+        entrada = self._entradas.get(chave)  # Entrada existente
+        if not entrada:  # Nada em cache para essa chave
+            return  # Nada a confirmar
+        arquivos = entrada[0]  # Mesmos arquivos de origem
+        novo_valor = entrada[2] if valor is None else valor  # Mantém o valor atual se nenhum outro foi informado
+        self._entradas[chave] = (arquivos, tuple(assinatura_arquivo(a) for a in arquivos), novo_valor)  # O estado em memória já é o do disco
+
+    def invalidar(self, chave=None):  # Descarta entradas
+        """Descarta uma entrada (ou todas) para forçar a releitura."""
+        if chave is None:  # Sem chave: limpa tudo
+            self._entradas.clear()  # Esvazia o cache
+        else:  # Com chave
+            self._entradas.pop(chave, None)  # Remove só a entrada informada
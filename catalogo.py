@@ -0,0 +1,70 @@
+from dinheiro import texto_para_centavos  # Importa a conversão exata dos preços para centavos
+from clientes import normalizar_nome  # Reaproveita a mesma normalização usada para nomes de clientes (sem acentos)
+
+# =================================================================
+#              CATÁLOGO DE PRODUTOS COM ÍNDICES (HASH)
+# =================================================================
+
+TIPO_UNIDADE = 'UN'  # Venda por unidade
+TIPO_CAIXA = 'CX'  # Venda por caixa
+SUFIXOS_TIPO = {f" ({TIPO_UNIDADE})": TIPO_UNIDADE, f" ({TIPO_CAIXA})": TIPO_CAIXA}  # Sufixos gravados no nome do item
+
+
+def separar_tipo(nome_item):  # Interpreta nomes antigos como "Skol 269 ml (CX)"
+    """Separa o nome base do produto e o tipo de venda (UN/CX) contido no nome do item."""
+    for sufixo, tipo in SUFIXOS_TIPO.items():  # Testa cada sufixo conhecido
+        if nome_item.endswith(sufixo):  # Se o nome termina com o sufixo
+            return nome_item[:-len(sufixo)].strip(), tipo  # Nome sem o sufixo e o tipo correspondente
+    return nome_item.strip(), None  # Itens antigos sem sufixo: tipo desconhecido
+
+
+class CatalogoProdutos:  # Catálogo carregado de produtos.csv
+    """Indexa os produtos por código e por nome normalizado (consultas O(1))."""
+
+    def __init__(self, produtos):  # Recebe o dicionário código -> linha do CSV
+        self._por_codigo = produtos  # Índice principal: código do produto
+        self._por_nome = {normalizar_nome(p['Nome do Produto']): p for p in produtos.values()}  # Índice por nome normalizado
+        self._precos = {  # Preços em centavos interpretados uma única vez: código -> {tipo: centavos}
+            codigo: {TIPO_UNIDADE: texto_para_centavos(p['Valor Unidade (R$)']), TIPO_CAIXA: texto_para_centavos(p['Valor Caixa (R$)'])}
+            for codigo, p in produtos.items()
+        }
+
+    # --- Compatibilidade com o dicionário antigo (código -> produto) ---
+
+    def __contains__(self, codigo):  # Permite "codigo in catalogo"
+        return codigo in self._por_codigo  # Consulta o índice por código
+
+    def __getitem__(self, codigo):  # Permite "catalogo[codigo]"
+        return self._por_codigo[codigo]  # Consulta o índice por código
+
+    def __len__(self):  # Permite "if not catalogo"
+        return len(self._por_codigo)  # Quantidade de produtos
+
+    def items(self):  # Permite percorrer (código, produto)
+        return self._por_codigo.items()  # Itens do índice por código
+
+    def values(self):  # Permite percorrer os produtos
+        return self._por_codigo.values()  # Valores do índice por código
+
+    # --- Consultas ---
+
+    def por_codigo(self, codigo):  # Busca O(1) pelo código
+        """Retorna o produto pelo código (ou None)."""
+        return self._por_codigo.get(codigo)  # Consulta o índice
+
+    def por_nome(self, nome):  # Busca O(1) pelo nome
+        """Retorna o produto pelo nome, ignorando maiúsculas e espaços repetidos (ou None)."""
+        return self._por_nome.get(normalizar_nome(nome))  # Consulta o índice por nome
+
+    def preco_centavos(self, produto, tipo):  # Preço conforme o tipo de venda
+        """Retorna o preço do produto em centavos para o tipo de venda (UN ou CX)."""
+        return self._precos[produto['Código']][TIPO_UNIDADE if tipo == TIPO_UNIDADE else TIPO_CAIXA]  # Consulta O(1) sem converter texto
+
+    def resolver_item(self, item):  # Descobre o produto base de um item de pedido
+        """Retorna (produto, tipo de venda) de um item, usando os campos estruturados quando existirem."""
+        codigo = item.get('Código do Produto') or ''  # Código gravado no item (itens novos)
+        tipo = item.get('Tipo de Venda') or None  # Tipo gravado no item (itens novos)
+        if codigo and codigo in self._por_codigo:  # Caminho rápido: o item já sabe o código
+            return self._por_codigo[codigo], tipo  # Produto e tipo sem interpretar o nome
+        nome_base, tipo_nome = separar_tipo(item.get('Produto') or '')  # Itens antigos: interpreta o nome
+        return self.por_nome(nome_base), tipo or tipo_nome  # Busca O(1) pelo nome normalizado
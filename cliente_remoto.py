@@ -0,0 +1,207 @@
+import json  # Importa a biblioteca para escrever e ler as mensagens (uma linha JSON por pedido/resposta)
+import socket  # Importa a conexão TCP com o servidor local
+
+from armazenamento import ConflitoVersao  # Importa o erro de edição concorrente (mesma mensagem das telas)
+from clientes import LIMITE_RESULTADOS, normalizar_nome  # Importa o tamanho da lista de sugestões e a normalização de nomes
+from configuracao import ENDERECO_SERVIDOR, PORTA_SERVIDOR, TEMPO_LIMITE_CONEXAO, DIAS_ALERTA_VENCIMENTO  # Importa o endereço e a porta do servidor e o tempo limite das respostas
+from registros import Pedido, ItemPedido, Pagamento, ler_data  # Importa os registros tipados e o leitor de datas
+from repositorio import RepositorioPedidos, converter_id  # Importa o repositório indexado (reaproveitado pelo balcão) e a conversão de IDs
+
+# =================================================================
+#        BALCÃO LIGADO AO SERVIDOR LOCAL (MESMAS TELAS DO MENU)
+# =================================================================
+#
+# Com --conectar, o menu continua o mesmo: só o repositório muda. Em vez de
+# ler os CSVs inteiros, cada tela começa com um RepositorioRemoto vazio que
+# busca no servidor (servidor.py) apenas o que ela mostra — os pedidos do
+# cliente escolhido, o pedido aberto para edição, os alertas, as entregas do
+# dia — e indexa esses registros com o mesmo código do repositório completo.
+# As alterações continuam sendo feitas em memória pelas telas; ao salvar, o
+# que mudou vai numa única mensagem para o servidor, que confere as versões e
+# grava junto com as alterações dos outros balcões.
+#
+# Os IDs continuam vindo do arquivo de contadores (o servidor grava nele o
+# maior ID existente ao subir), e as telas 2 e 3 (visão geral e análises)
+# continuam lendo os arquivos diretamente, só para leitura.
+
+
+class ConexaoServidor:  # Conexão TCP com o servidor local
+    """Envia uma mensagem por linha e espera a resposta; reabre a conexão se ela tiver caído."""
+
+    def __init__(self, endereco=ENDERECO_SERVIDOR, porta=PORTA_SERVIDOR, tempo_limite=TEMPO_LIMITE_CONEXAO):  # Recebe o endereço do servidor
+        self.endereco = endereco  # Máquina do servidor (a própria)
+        self.porta = porta  # Porta TCP
+        self.tempo_limite = tempo_limite  # Segundos de espera por resposta
+        self._socket = None  # Conexão aberta (None = fechada)
+        self._arquivo = None  # Leitura por linhas da conexão
+
+    def _abrir(self):  # Conecta sob demanda
+        """Abre a conexão com o servidor (ConnectionError se ele não estiver no ar)."""
+        try:  # O servidor pode não estar rodando
+            self._socket = socket.create_connection((self.endereco, self.porta), timeout=self.tempo_limite)  # Conexão TCP
+        except OSError as erro:  # Recusada ou sem resposta
+            raise ConnectionError(f"Servidor de pedidos indisponível em {self.endereco}:{self.porta} ({erro}).") from erro  # Mensagem para o balcão
+        self._arquivo = self._socket.makefile('rb')  # Respostas lidas linha a linha
+
+    def fechar(self):  # Encerra a conexão
+        """Fecha a conexão com o servidor (a próxima mensagem reconecta)."""
+        if self._socket:  # Conexão aberta
+            self._arquivo.close()  # Fecha a leitura
+            self._socket.close()  # Fecha o socket
+        self._socket = self._arquivo = None  # Estado fechado
+
+    def pedir(self, op, **campos):  # Uma ida e volta ao servidor
+        """Envia a operação e retorna a resposta; ValueError para erros de regra, ConflitoVersao para edição concorrente."""
+        mensagem = json.dumps(dict(op=op, **campos), ensure_ascii=False).encode('utf-8') + b'\n'  # Uma linha JSON
+        for tentativa in range(2):  # Uma reconexão se o servidor foi reiniciado
+            if self._socket is None:  # Sem conexão
+                self._abrir()  # Conecta (ou ConnectionError)
+            try:  # A conexão pode ter caído
+                self._socket.sendall(mensagem)  # Envia
+                linha = self._arquivo.readline()  # Espera a resposta
+            except OSError as erro:  # Servidor caiu ou demorou demais
+                self.fechar()  # Descarta a conexão
+                raise ConnectionError(f"Sem resposta do servidor de pedidos em {self.endereco}:{self.porta} ({erro}).") from erro  # Mensagem para o balcão
+            if linha:  # Resposta recebida
+                break  # Interpreta
+            self.fechar()  # Conexão antiga encerrada pelo servidor
+            if tentativa:  # Já reconectou uma vez
+                raise ConnectionError(f"O servidor de pedidos em {self.endereco}:{self.porta} encerrou a conexão.")  # Mensagem para o balcão
+        resposta = json.loads(linha)  # Dicionário de resposta
+        if resposta.get('ok'):  # Sucesso
+            return resposta  # Campos da resposta
+        if resposta.get('conflito'):  # Pedido alterado por outro balcão
+            raise ConflitoVersao('cabecalhos', [str(chave) for chave in resposta['conflito']])  # Mesmo erro do motor local
+        raise ValueError(resposta.get('erro') or "Erro no servidor de pedidos.")  # Regra violada
+
+
+def ler_dia(texto):  # Datas das respostas ("DD-MM-AAAA")
+    """Converte o texto DD-MM-AAAA enviado pelo servidor num dia (date)."""
+    return ler_data(texto).date()  # O servidor sempre envia datas válidas
+
+
+class RepositorioRemoto(RepositorioPedidos):  # Repositório parcial de uma tela do balcão
+    """Repositório que começa vazio e busca no servidor só os pedidos que as telas consultam (com itens e pagamentos)."""
+
+    def __init__(self, conexao):  # Recebe a conexão com o servidor
+        super().__init__([], [], [])  # Índices vazios
+        self.conexao = conexao  # Conexão compartilhada pelas telas
+        self._clientes_carregados = set()  # Nomes normalizados cujos pedidos já vieram do servidor
+        self._ids_clientes = {}  # Nome normalizado -> ID estável do cliente (numerado pelo servidor)
+
+    def _incorporar(self, resposta):  # Registros de uma resposta
+        """Indexa os pedidos, itens e pagamentos da resposta e retorna {ID do pedido: pedido em memória}."""
+        self.incorporar(  # Pedidos já carregados ficam como estão (podem ter alterações não gravadas)
+            [Pedido.de_tupla(tupla) for tupla in resposta['pedidos']],
+            [ItemPedido.de_tupla(tupla) for tupla in resposta['itens']],
+            [Pagamento.de_tupla(tupla) for tupla in resposta['pagamentos']],
+        )
+        return {int(tupla[0]): self._pedido_por_id[int(tupla[0])] for tupla in resposta['pedidos']}  # Objetos usados pelas telas
+
+    def _carregar_clientes(self, nomes):  # Pedidos dos clientes do painel
+        """Busca no servidor, uma vez por tela, os pedidos dos clientes informados."""
+        for nome in nomes:  # Normalmente um único cliente
+            chave = normalizar_nome(nome)  # Mesma chave do índice por cliente
+            if chave in self._clientes_carregados:  # Já veio do servidor
+                continue  # Próximo
+            resposta = self.conexao.pedir('cliente', nome=nome)  # Pedidos, itens e pagamentos do cliente
+            self._incorporar(resposta)  # Indexa
+            self._ids_clientes[chave] = resposta['id']  # ID numerado pelo servidor
+            self._clientes_carregados.add(chave)  # Não busca de novo
+
+    # --- Consultas respondidas pelo servidor ---
+
+    def clientes_semelhantes(self, texto, limite=LIMITE_RESULTADOS):  # Busca ranqueada
+        """Retorna [(ID do cliente, nome, quantidade de pedidos, pontuação)] calculados pelo servidor."""
+        return [tuple(cliente) for cliente in self.conexao.pedir('clientes', texto=texto, limite=limite)['clientes']]  # Mesmo formato do repositório completo
+
+    def cliente_por_id(self, id_cliente):  # Busca pelo ID estável
+        """Retorna o nome do cliente com o ID informado (ou None)."""
+        return self.conexao.pedir('cliente_por_id', id=id_cliente)['nome']  # Diretório do servidor
+
+    def id_do_cliente(self, nome):  # ID estável do cliente
+        """Retorna o ID do cliente numerado pelo servidor (ou None se não tiver pedidos)."""
+        self._carregar_clientes([nome])  # O ID vem junto com os pedidos
+        return self._ids_clientes.get(normalizar_nome(nome))  # Consulta O(1)
+
+    def pedidos_do_cliente(self, nome):  # Busca exata por cliente
+        """Retorna os pedidos do cliente, buscando-os no servidor na primeira consulta."""
+        self._carregar_clientes([nome])  # Garante os pedidos em memória
+        return super().pedidos_do_cliente(nome)  # Índice local
+
+    def pedidos_dos_clientes(self, nomes):  # Painel do cliente
+        """Retorna os pedidos dos clientes, buscando-os no servidor na primeira consulta."""
+        self._carregar_clientes(nomes)  # Garante os pedidos em memória
+        return super().pedidos_dos_clientes(nomes)  # Índice local (inclui os pedidos lançados nesta tela)
+
+    def resumo_dos_clientes(self, nomes, hoje=None):  # Contas a receber do painel
+        """Resumo calculado sobre os pedidos do cliente trazidos do servidor (todos eles)."""
+        self._carregar_clientes(nomes)  # Garante os pedidos em memória
+        return super().resumo_dos_clientes(nomes, hoje)  # Mesmo cálculo do repositório completo
+
+    def obter_pedido(self, id_pedido):  # Busca por ID
+        """Retorna o pedido da memória ou, se ainda não estiver nela, do servidor (com itens e pagamentos)."""
+        pedido = super().obter_pedido(id_pedido)  # Índice local
+        if pedido or converter_id(id_pedido) is None:  # Encontrado (ou ID inválido)
+            return pedido  # Sem ida ao servidor
+        return self._incorporar(self.conexao.pedir('pedidos', ids=[converter_id(id_pedido)])).get(converter_id(id_pedido))  # Pedido (ou None)
+
+    def alertas_vencimento(self, dias=DIAS_ALERTA_VENCIMENTO, hoje=None):  # Tela de alertas
+        """Retorna (vencidos, a vencer) calculados pelo índice de vencimentos do servidor."""
+        campos = {'dias': dias, 'hoje': hoje.strftime('%d-%m-%Y')} if hoje else {'dias': dias}  # Dia de referência do balcão
+        resposta = self.conexao.pedir('alertas', **campos)  # Pedidos das duas seções
+        pedidos = self._incorporar(resposta)  # Indexa
+        return [pedidos[i] for i in resposta['vencidos']], [pedidos[i] for i in resposta['a_vencer']]  # Mesma ordem do servidor
+
+    def entregas_do_dia(self, dia):  # Planejamento de entregas
+        """Retorna os pedidos com entrega pendente no dia, em ordem de horário (agenda do servidor)."""
+        resposta = self.conexao.pedir('entregas', dia=dia.strftime('%d-%m-%Y'))  # Pedidos do dia com itens
+        pedidos = self._incorporar(resposta)  # Indexa (o plano lê os itens pelo índice local)
+        return [pedidos[i] for i in resposta['ordem']]  # Ordem de horário
+
+    def dias_com_entregas(self, desde=None):  # Resumo da agenda
+        """Retorna [(dia, quantidade)] dos dias com entregas pendentes (agenda do servidor)."""
+        campos = {'desde': desde.strftime('%d-%m-%Y')} if desde else {}  # Início da agenda
+        return [(ler_dia(dia), quantidade) for dia, quantidade in self.conexao.pedir('dias_entregas', **campos)['dias']]  # Um item por dia
+
+    def fluxo_de_caixa(self, desde=None, ate=None):  # Recebimentos por dia
+        """Retorna [(dia, {forma: valor})] com os totais mantidos pelo servidor."""
+        campos = {chave: valor.strftime('%d-%m-%Y') for chave, valor in (('desde', desde), ('ate', ate)) if valor}  # Período informado
+        return [(ler_dia(dia), valores) for dia, valores in self.conexao.pedir('fluxo', **campos)['dias']]  # Um item por dia
+
+
+def salvar_remoto(conexao, repositorio):  # Substitui salvar_repositorio no balcão
+    """Envia ao servidor os pedidos, itens e pagamentos alterados; retorna False se houve conflito (nada é gravado)."""
+    pedidos, itens, itens_removidos, pagamentos = repositorio.extrair_alteracoes()  # Coleta as alterações pendentes
+    if not (pedidos or itens or itens_removidos or pagamentos):  # Nada mudou (ex.: edição cancelada)
+        return True  # Sem ida ao servidor
+    try:  # Outro balcão pode ter alterado os mesmos pedidos
+        resposta = conexao.pedir(  # Uma mensagem; o servidor grava junto com os outros balcões
+            'gravar',
+            cabecalhos=[pedido.para_tupla() for pedido in pedidos],
+            itens=[item.para_tupla() for item in itens],
+            itens_removidos=itens_removidos,
+            pagamentos=[pagamento.para_tupla() for pagamento in pagamentos],
+        )
+    except ConflitoVersao as erro:  # Pedido gravado por outro balcão depois de ter sido aberto aqui
+        print(f"\n⚠️ Pedido(s) {', '.join(erro.chaves)} alterado(s) em outro terminal enquanto você editava.")  # Avisa
+        print("Nada foi gravado; volte ao menu principal para ver os dados atuais e refaça a alteração.")  # Orienta
+        return False  # Nada foi gravado
+    except ValueError as erro:  # Regra violada no servidor
+        print(f"\n❌ O servidor recusou a gravação: {erro}")  # Avisa
+        return False  # Nada foi gravado
+    for pedido in pedidos:  # A próxima gravação parte da versão gravada
+        pedido.versao = resposta['versoes'][str(pedido.id_pedido)]  # Versão confirmada pelo servidor
+    return True  # Gravado
+
+
+def conectar(sistema, endereco=ENDERECO_SERVIDOR, porta=PORTA_SERVIDOR):  # Chamado por gerenciador_pedidos.py --conectar
+    """Liga as telas do módulo do sistema ao servidor local trocando o carregamento e a gravação do repositório."""
+    conexao = ConexaoServidor(endereco, porta)  # Conexão compartilhada pelas telas
+    conexao.pedir('ping')  # ConnectionError já na inicialização se o servidor não estiver no ar
+    sistema.carregar_repositorio = lambda: RepositorioRemoto(conexao)  # Cada tela começa vazia e busca só o que mostra
+    sistema.salvar_repositorio = lambda repositorio: salvar_remoto(conexao, repositorio)  # Gravação pelo servidor
+    sistema.inicializar_csv = lambda: None  # Arquivos preparados (e recuperados) pelo servidor
+    sistema.arquivar_quitados = lambda *argumentos, **opcoes: 0  # Arquivamento e compactação ficam com o servidor
+    sistema.compactar_dados = lambda: None  # O servidor compacta ao encerrar
+    return conexao  # Conexão aberta
@@ -0,0 +1,208 @@
+import heapq  # Importa a seleção dos melhores resultados sem ordenar todos os candidatos
+import unicodedata  # Importa a decomposição de caracteres usada para remover acentos
+from base64 import b32encode  # Importa a codificação curta (letras e números) do ID do cliente
+from bisect import bisect_left  # Importa a busca binária na lista ordenada de palavras
+from hashlib import blake2b  # Importa o resumo (hash) estável usado para gerar o ID do cliente
+from itertools import islice  # Importa o fatiamento de geradores para limitar os candidatos
+from math import ceil  # Importa o arredondamento para cima do mínimo de trigramas em comum
+
+# =================================================================
+#      DIRETÓRIO DE CLIENTES: NOMES NORMALIZADOS, PREFIXOS E TRIGRAMAS
+# =================================================================
+#
+# Cada cliente é identificado pelo nome normalizado (minúsculas, sem acentos e
+# com espaços simples), então "José  da Silva" e "jose da silva" são o mesmo
+# cliente. O índice é por PALAVRA: cada palavra do vocabulário (nomes e
+# sobrenomes distintos, bem menos numerosos que os clientes) aponta para o
+# conjunto de clientes que a usam. A busca combina três níveis, do mais forte
+# para o mais fraco:
+#   1. nome idêntico;
+#   2. prefixos: cada palavra digitada é o início de uma palavra do nome
+#      (lista ordenada do vocabulário + busca binária, e interseção dos
+#      conjuntos de clientes de cada palavra digitada);
+#   3. semelhança: cada palavra digitada é comparada por trigramas (trechos de
+#      3 letras) só com o vocabulário, o que tolera erros de digitação; uma
+#      palavra sem parecidas é tentada como duas palavras coladas
+#      ("mariasilva"). Só roda se os níveis anteriores não encherem a lista.
+
+SIMILARIDADE_MINIMA = 0.5  # Semelhança mínima (0 a 1) entre uma palavra digitada e uma palavra do vocabulário
+LIMITE_RESULTADOS = 10  # Quantidade padrão de clientes sugeridos por busca
+LIMITE_CANDIDATOS_CURTOS = 200  # Máximo de clientes avaliados quando só há palavras de 1 ou 2 letras
+PONTOS_IDENTICO, PONTOS_INICIO, PONTOS_PALAVRAS = 3.0, 2.0, 1.5  # Pontuação de cada nível (trigramas ficam entre 0 e 1)
+
+
+def normalizar_nome(nome):  # Padroniza nomes para comparação
+    """Normaliza o nome (minúsculas, sem acentos e com espaços simples) para uso como chave."""
+    texto = " ".join((nome or "").split()).casefold()  # Remove espaços repetidos e ignora maiúsculas/minúsculas
+    if not texto.isascii():  # Só nomes com acentos passam pela decomposição
+        texto = "".join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))  # "joão" -> "joao"
+    return texto  # Chave normalizada
+
+
+def id_cliente(chave):  # Identificador curto e estável
+    """Gera o ID do cliente a partir do nome normalizado (o mesmo em qualquer terminal e a cada carga)."""
+    return 'C' + b32encode(blake2b(chave.encode('utf-8'), digest_size=5).digest()).decode('ascii')  # Ex.: "C4ZQ7KX2M"
+
+
+def trigramas(chave):  # Trechos de 3 letras do nome
+    """Retorna o conjunto de trigramas do nome normalizado (com um espaço nas pontas)."""
+    texto = f" {chave} "  # Marca o começo e o fim do nome
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}  # Trechos sobrepostos
+
+
+class DiretorioClientes:  # Índice de busca dos clientes
+    """Clientes por nome normalizado, com ID estável, vocabulário de palavras ordenado e trigramas do vocabulário."""
+
+    def __init__(self):  # Diretório vazio
+        self._id_por_chave = {}  # Nome normalizado -> ID do cliente
+        self._chave_por_id = {}  # ID do cliente -> nome normalizado
+        self._palavras = {}  # Palavra do vocabulário -> nomes normalizados que a contêm
+        self._palavras_ordenadas = []  # Vocabulário em ordem alfabética (busca binária por prefixo)
+        self._palavras_novas = []  # Palavras ainda não incluídas na lista ordenada
+        self._trigramas = {}  # Trigrama -> palavras do vocabulário que o contêm
+
+    def __len__(self):  # Quantidade de clientes
+        return len(self._id_por_chave)  # Clientes indexados
+
+    def __contains__(self, chave):  # Permite "chave in diretorio"
+        return chave in self._id_por_chave  # Consulta O(1)
+
+    # --- Manutenção ---
+
+    def adicionar(self, chave):  # Cliente novo
+        """Inclui o cliente (nome normalizado) nos índices e retorna o ID dele."""
+        if chave in self._id_por_chave:  # Já indexado
+            return self._id_por_chave[chave]  # Mesmo ID
+        ident = id_cliente(chave)  # ID derivado do nome
+        while ident in self._chave_por_id:  # Colisão do resumo (rara): sufixo para diferenciar
+            ident += 'X'  # Mantém o ID único
+        self._id_por_chave[chave] = ident  # Índice por nome
+        self._chave_por_id[ident] = chave  # Índice por ID
+        for palavra in set(chave.split()):  # Cada palavra do nome
+            clientes = self._palavras.get(palavra)  # Clientes que já usam a palavra
+            if clientes is None:  # Palavra nova no vocabulário
+                clientes = self._palavras[palavra] = set()  # Conjunto de clientes
+                self._palavras_novas.append(palavra)  # Entra na lista ordenada na próxima busca
+                for trigrama in trigramas(palavra):  # Trechos da palavra
+                    self._trigramas.setdefault(trigrama, set()).add(palavra)  # Índice de trigramas do vocabulário
+            clientes.add(chave)  # Índice por palavra
+        return ident  # ID do cliente
+
+    def remover(self, chave):  # Cliente sem pedidos (nome trocado)
+        """Retira o cliente dos índices (e do vocabulário, as palavras que ninguém mais usa)."""
+        ident = self._id_por_chave.pop(chave, None)  # ID do cliente
+        if ident is None:  # Não estava indexado
+            return  # Nada a fazer
+        del self._chave_por_id[ident]  # Índice por ID
+        for palavra in set(chave.split()):  # Cada palavra do nome
+            clientes = self._palavras[palavra]  # Clientes com a palavra
+            clientes.discard(chave)  # Retira
+            if clientes:  # Outros clientes ainda usam a palavra
+                continue  # Próxima palavra
+            del self._palavras[palavra]  # Sai do vocabulário (a lista ordenada ignora palavras removidas)
+            for trigrama in trigramas(palavra):  # Trechos da palavra
+                palavras = self._trigramas[trigrama]  # Palavras com o trigrama
+                palavras.discard(palavra)  # Retira
+                if not palavras:  # Trigrama sem palavras
+                    del self._trigramas[trigrama]  # Libera a memória
+
+    # --- Consultas ---
+
+    def id_de(self, chave):  # ID pelo nome normalizado
+        """Retorna o ID do cliente (ou None)."""
+        return self._id_por_chave.get(chave)  # Consulta O(1)
+
+    def chave_de(self, ident):  # Nome normalizado pelo ID
+        """Retorna o nome normalizado do cliente com o ID informado (ou None)."""
+        return self._chave_por_id.get((ident or '').strip().upper())  # Aceita o ID digitado em minúsculas
+
+    def _vocabulario_com_prefixo(self, prefixo):  # Palavras começando pelo prefixo
+        """Gera as palavras do vocabulário que começam com o prefixo, em ordem alfabética."""
+        if self._palavras_novas:  # Palavras incluídas desde a última busca
+            self._palavras_ordenadas = sorted(set(self._palavras_ordenadas + self._palavras_novas))  # Mescla (quase ordenado: O(n))
+            self._palavras_novas = []  # Tudo ordenado
+        palavras = self._palavras_ordenadas  # Lista ordenada
+        for posicao in range(bisect_left(palavras, prefixo), len(palavras)):  # Só o intervalo do prefixo (busca binária)
+            palavra = palavras[posicao]  # Palavra da lista
+            if not palavra.startswith(prefixo):  # Saiu do intervalo
+                return  # Fim
+            if palavra in self._palavras:  # Ainda usada por algum cliente
+                yield palavra  # Entrega
+
+    def _clientes_de(self, palavras):  # União dos clientes de várias palavras
+        """Retorna o conjunto de clientes que usam alguma das palavras informadas."""
+        return set().union(*(self._palavras[palavra] for palavra in palavras))  # Operação de conjuntos (em C)
+
+    def buscar(self, texto, limite=LIMITE_RESULTADOS, peso=None):  # Busca ranqueada
+        """Retorna [(nome normalizado, pontuação)] dos clientes mais parecidos com o texto, do melhor para o pior."""
+        consulta = normalizar_nome(texto)  # Mesma normalização dos nomes
+        if not consulta:  # Nada digitado
+            return []  # Sem resultados
+        palavras = consulta.split()  # Palavras digitadas
+        longas = [q for q in palavras if len(q) >= 3]  # Palavras seletivas (poucas palavras do vocabulário por prefixo)
+        curtas = [q for q in palavras if len(q) < 3]  # Iniciais e abreviações (conferidas cliente a cliente)
+        if longas:  # Caso comum
+            conjuntos = sorted((self._clientes_de(self._vocabulario_com_prefixo(q)) for q in longas), key=len)  # Clientes de cada palavra
+            candidatos = conjuntos[0].intersection(*conjuntos[1:])  # Clientes com todas as palavras longas
+        else:  # Só palavras de 1 ou 2 letras: percorre o vocabulário em ordem, com limite
+            candidatos = set(islice((c for p in self._vocabulario_com_prefixo(max(curtas, key=len)) for c in self._palavras[p]), LIMITE_CANDIDATOS_CURTOS))  # Primeiros em ordem alfabética
+        pontos = {}  # Nome normalizado -> pontuação
+        for chave in candidatos:  # Confere as palavras curtas e pontua
+            palavras_nome = chave.split()  # Palavras do cliente
+            if all(any(p.startswith(q) for p in palavras_nome) for q in curtas):  # Todas as palavras digitadas aparecem
+                pontos[chave] = PONTOS_INICIO if chave.startswith(consulta) else PONTOS_PALAVRAS  # Começo do nome vale mais
+        if consulta in self._id_por_chave:  # Nome idêntico
+            pontos[consulta] = PONTOS_IDENTICO  # Melhor resultado possível
+        if len(pontos) < limite and longas:  # Ainda cabem resultados aproximados (que sempre ficam abaixo dos anteriores)
+            self._semelhantes(longas, curtas, pontos)  # Erros de digitação e palavras coladas
+        peso = peso or (lambda chave: 0)  # Desempate (ex.: quantidade de pedidos)
+        return heapq.nsmallest(limite, pontos.items(), key=lambda par: (-par[1], -peso(par[0]), par[0]))  # Pontuação, peso e nome
+
+    def _palavras_semelhantes(self, palavra):  # Vocabulário parecido com uma palavra digitada
+        """Retorna {palavra do vocabulário: semelhança} das palavras parecidas (prefixos valem 1)."""
+        semelhantes = {p: 1.0 for p in self._vocabulario_com_prefixo(palavra)}  # Começam com o que foi digitado
+        trigramas_palavra = trigramas(palavra)  # Trechos da palavra digitada
+        total = len(trigramas_palavra)  # Quantidade de trechos
+        minimo = max(1, ceil(SIMILARIDADE_MINIMA * total))  # Trechos em comum exigidos
+        listas = sorted((self._trigramas.get(t, ()) for t in trigramas_palavra), key=len)  # Do mais raro para o mais comum
+        for candidata in set().union(*listas[:total - minimo + 1]):  # Sem nenhum dos trechos mais raros, não atinge o mínimo
+            if candidata in semelhantes:  # Já é prefixo
+                continue  # Próxima
+            trigramas_candidata = trigramas(candidata)  # Trechos da palavra do vocabulário
+            comuns = len(trigramas_palavra & trigramas_candidata)  # Trechos em comum
+            nota = (comuns / total + 2 * comuns / (total + len(trigramas_candidata))) / 2  # Cobertura e tamanho parecido
+            if comuns >= minimo and nota >= SIMILARIDADE_MINIMA:  # Parecida o bastante
+                semelhantes[candidata] = nota  # Guarda a semelhança
+        return semelhantes  # Palavras parecidas
+
+    def _dividir(self, palavra):  # "josedasilva" -> ["jose", "da", "silva"]
+        """Retorna palavras do vocabulário que, coladas, formam a palavra digitada (ou None)."""
+        for corte in range(len(palavra) - 2, 1, -1):  # Cada ponto de corte, da primeira palavra mais longa para a mais curta
+            if palavra[:corte] not in self._palavras:  # Início não é uma palavra conhecida
+                continue  # Próximo corte
+            resto = palavra[corte:]  # Parte ainda colada
+            partes = [resto] if resto in self._palavras else self._dividir(resto)  # O resto é uma palavra ou outra junção
+            if partes:  # Junção completa
+                return [palavra[:corte]] + partes  # Palavras separadas
+        return None  # Não é uma junção de palavras conhecidas
+
+    def _semelhantes(self, longas, curtas, pontos):  # Nível 3: semelhança por palavra
+        """Pontua (entre 0 e 1) os clientes que têm uma palavra parecida com cada palavra longa digitada."""
+        alternativas = []  # Para cada palavra digitada: {palavra do vocabulário: semelhança}
+        for palavra in longas:  # Cada palavra digitada
+            semelhantes = self._palavras_semelhantes(palavra)  # Vocabulário parecido
+            partes = None if semelhantes else self._dividir(palavra)  # Sem parecidas: talvez sejam duas palavras coladas
+            if partes:  # "mariasilva"
+                alternativas.extend({parte: 1.0} for parte in partes)  # Cada parte precisa aparecer
+            elif semelhantes:  # Palavras parecidas
+                alternativas.append(semelhantes)  # Guarda
+            else:  # Nenhum cliente tem algo parecido com esta palavra
+                return  # Nenhum cliente atende a consulta inteira
+        conjuntos = sorted((self._clientes_de(semelhantes) for semelhantes in alternativas), key=len)  # Clientes por palavra
+        for chave in conjuntos[0].intersection(*conjuntos[1:]):  # Clientes com algo parecido com cada palavra
+            if chave in pontos:  # Já pontuado
+                continue  # Próximo
+            palavras_nome = chave.split()  # Palavras do cliente
+            if not all(any(p.startswith(q) for p in palavras_nome) for q in curtas):  # Iniciais digitadas não conferem
+                continue  # Próximo
+            pontos[chave] = sum(max(semelhantes.get(p, 0.0) for p in palavras_nome) for semelhantes in alternativas) / len(alternativas)  # Média das semelhanças
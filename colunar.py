@@ -0,0 +1,302 @@
+import json  # Importa a biblioteca para o cabeçalho do arquivo (colunas e tabelas de textos)
+import mmap  # Importa a biblioteca para mapear o arquivo na memória (lê só as colunas usadas)
+import operator  # Importa as funções de operador (combinação das máscaras de filtro)
+import os  # Importa a biblioteca para gravar o arquivo de forma atômica (fsync, replace)
+import struct  # Importa a biblioteca para o tamanho do cabeçalho gravado em binário
+import sys  # Importa a ordem dos bytes da máquina (as colunas são gravadas na ordem nativa)
+from array import array  # Importa os vetores compactos das colunas
+from datetime import date, datetime  # Importa as datas (dias e minutos contados a partir do ano 1)
+from functools import lru_cache  # Importa a memória das datas já formatadas
+from itertools import compress  # Importa o filtro de linhas pela máscara
+
+from dinheiro import centavos_para_texto, texto_para_centavos  # Importa a conversão exata entre texto e centavos
+
+# =================================================================
+#        SNAPSHOT COLUNAR BINÁRIO (LEITURA RÁPIDA DOS CSVs)
+# =================================================================
+#
+# Interpretar o CSV linha a linha é o custo dominante ao abrir o sistema e ao
+# reler os dados depois de uma compactação de outro terminal. Ao lado de cada
+# snapshot CSV fica uma cópia colunar ("pedidos_cabecalho.colunas"):
+#   - 8 bytes mágicos e o tamanho do cabeçalho;
+#   - o cabeçalho JSON: assinatura do CSV de origem, quantidade de linhas, as
+#     colunas e, para as colunas de texto, a tabela de textos distintos;
+#   - os dados de cada coluna, alinhados em 8 bytes: inteiros de 64 bits (IDs,
+#     quantidades, centavos, minutos de data/hora, dias de data) ou códigos de
+#     32 bits na tabela de textos (clientes, produtos, status...).
+# A codificação de cada coluna é escolhida ao gravar: só vira número se TODOS os
+# textos voltam idênticos ao serem formatados de novo ("02" continua texto, para
+# não virar "2"); assim as tuplas reconstruídas são exatamente as do CSV e o
+# restante do sistema não percebe de onde vieram.
+#
+# O arquivo é aberto com mmap: o filtro por cliente ou status consulta cada texto
+# distinto uma única vez e percorre só a coluna de códigos, e as linhas só são
+# montadas (em blocos) para o que passou no filtro. O CSV continua sendo o
+# formato de troca (Excel, planilhas): se ele for mais novo que a cópia colunar
+# (assinatura diferente), a cópia é ignorada e reconstruída na próxima leitura.
+
+MAGICO = b'GPCOL\x00\x01\x00'  # Identifica o formato (e a versão) do arquivo colunar
+TAMANHO_BLOCO = 65536  # Linhas montadas por vez ao reconstruir as tuplas
+VAZIO = -(1 << 63)  # Valor guardado nas colunas numéricas para o campo vazio
+
+TEXTO = 'texto'  # Códigos na tabela de textos distintos
+INTEIRO = 'inteiro'  # IDs, quantidades e versões
+CENTAVOS = 'centavos'  # Valores em reais ("915.90" -> 91590)
+DATA_HORA = 'data_hora'  # "DD-MM-AAAA HH:MM" em minutos
+DATA = 'data'  # "DD-MM-AAAA" em dias
+
+
+def _ler_inteiro(texto):  # "12" -> 12
+    """Converte o texto num inteiro de 64 bits (ValueError se não couber)."""
+    valor = int(texto)  # Conversão direta
+    if not VAZIO < valor < 1 << 63:  # Fora do intervalo da coluna
+        raise ValueError(texto)  # A coluna fica como texto
+    return valor  # Inteiro da coluna
+
+
+def _ler_centavos(texto):  # "915.90" -> 91590
+    """Converte o valor em reais em centavos de 64 bits (ValueError se não couber)."""
+    return _ler_inteiro(texto_para_centavos(texto))  # Mesma conversão do restante do sistema
+
+
+def _ler_data_hora(texto):  # "17-10-2026 14:30" -> minutos
+    """Converte "DD-MM-AAAA HH:MM" em minutos contados a partir do ano 1."""
+    momento = datetime(int(texto[6:10]), int(texto[3:5]), int(texto[0:2]), int(texto[11:13]), int(texto[14:16]))  # Fatias fixas
+    return momento.toordinal() * 1440 + momento.hour * 60 + momento.minute  # Minutos desde o ano 1
+
+
+def _ler_data(texto):  # "17-10-2026" -> dias
+    """Converte "DD-MM-AAAA" em dias contados a partir do ano 1."""
+    return date(int(texto[6:10]), int(texto[3:5]), int(texto[0:2])).toordinal()  # Número ordinal do dia
+
+
+HORARIOS = [f" {hora:02d}:{minuto:02d}" for hora in range(24) for minuto in range(60)]  # Minuto do dia -> " HH:MM"
+
+
+@lru_cache(maxsize=4096)
+def _formatar_data(dias):  # Dias -> "17-10-2026"
+    """Formata os dias desde o ano 1 como "DD-MM-AAAA" (os dias se repetem muito: guarda os mais recentes)."""
+    momento = date.fromordinal(dias)  # Data do dia
+    return f"{momento.day:02d}-{momento.month:02d}-{momento.year:04d}"  # Formato do CSV
+
+
+def _formatar_data_hora(minutos):  # Minutos -> "17-10-2026 14:30"
+    """Formata os minutos desde o ano 1 como "DD-MM-AAAA HH:MM"."""
+    dia, resto = divmod(minutos, 1440)  # Dia e minuto dentro do dia
+    return _formatar_data(dia) + HORARIOS[resto]  # Data e horário já formatados
+
+
+CODIFICACOES = [  # Tentadas em ordem; a primeira que reproduz todos os textos vence
+    (INTEIRO, _ler_inteiro, str),
+    (CENTAVOS, _ler_centavos, centavos_para_texto),
+    (DATA_HORA, _ler_data_hora, _formatar_data_hora),
+    (DATA, _ler_data, _formatar_data),
+]
+FORMATADORES = {tipo: formatar for tipo, _, formatar in CODIFICACOES}  # Tipo -> função que volta ao texto do CSV
+
+
+class _Formatados(dict):  # Número -> texto, formatado sob demanda
+    """Formata cada número distinto uma única vez; as repetições são consultas ao dicionário (em C)."""
+
+    def __init__(self, formatar):  # Recebe a função de formatação
+        super().__init__({VAZIO: ''})  # O vazio já vem pronto
+        self.formatar = formatar  # Número -> texto do CSV
+
+    def __missing__(self, numero):  # Primeira vez que o número aparece
+        texto = self[numero] = self.formatar(numero)  # Formata e guarda
+        return texto  # Texto do CSV
+
+
+def _codificar(distintos):  # Escolhe a codificação de uma coluna
+    """Retorna (tipo, {texto: número}) com a primeira codificação numérica sem perdas, ou (TEXTO, None)."""
+    preenchidos = [texto for texto in distintos if texto]  # O vazio tem valor reservado
+    if not preenchidos:  # Coluna sem nenhum valor
+        return TEXTO, None  # Fica como texto
+    for tipo, ler, formatar in CODIFICACOES:  # Da mais simples para a mais específica
+        try:  # Textos que não são desse tipo lançam exceção
+            numeros = {texto: ler(texto) for texto in preenchidos}  # Texto -> número
+        except (ValueError, OverflowError):  # Algum texto não é desse tipo
+            continue  # Tenta a próxima
+        if all(formatar(numero) == texto for texto, numero in numeros.items()):  # Volta idêntico ao texto do CSV
+            numeros[''] = VAZIO  # Campo vazio
+            return tipo, numeros  # Codificação escolhida
+    return TEXTO, None  # Nenhuma reproduz os textos: tabela de textos
+
+
+def _alinhar(tamanho):  # Arredonda para múltiplo de 8
+    """Retorna quantos bytes de preenchimento levam 'tamanho' ao próximo múltiplo de 8."""
+    return -tamanho % 8  # Bytes que faltam
+
+
+def gravar_colunar(caminho, campos, tuplas, fonte):  # Grava a cópia colunar de um snapshot
+    """Grava as tuplas (na ordem de 'campos') no arquivo colunar, de forma atômica; 'fonte' é a assinatura do CSV de origem."""
+    tuplas = tuplas if isinstance(tuplas, list) else list(tuplas)  # Percorrida uma vez por coluna
+    colunas = list(zip(*tuplas)) if tuplas else [()] * len(campos)  # Transpõe linhas em colunas
+    descricoes, blocos = [], []  # Cabeçalho e dados de cada coluna
+    for campo, valores in zip(campos, colunas):  # Cada coluna
+        distintos = dict.fromkeys(valores)  # Textos distintos (na ordem em que aparecem)
+        tipo, numeros = _codificar(distintos)  # Melhor codificação sem perdas
+        if tipo == TEXTO:  # Tabela de textos + códigos
+            tabela = list(distintos)  # Código = posição na tabela
+            codigos = {texto: codigo for codigo, texto in enumerate(tabela)}  # Texto -> código
+            descricoes.append({'campo': campo, 'tipo': tipo, 'tabela': tabela})  # A tabela vai no cabeçalho
+            blocos.append(array('i', map(codigos.__getitem__, valores)))  # Códigos de 32 bits
+        else:  # Coluna numérica
+            descricoes.append({'campo': campo, 'tipo': tipo, 'vazios': '' in distintos})  # Se há campos vazios
+            blocos.append(array('q', map(numeros.__getitem__, valores)))  # Inteiros de 64 bits
+    posicao = 0  # Deslocamento de cada coluna a partir do início dos dados
+    for descricao, bloco in zip(descricoes, blocos):  # Calcula onde cada coluna começa
+        tamanho = len(bloco) * bloco.itemsize  # Bytes da coluna
+        descricao['deslocamento'] = posicao  # Relativo ao início dos dados
+        posicao += tamanho + _alinhar(tamanho)  # Próxima coluna alinhada em 8 bytes
+    cabecalho = json.dumps({  # Tudo o que é preciso para ler as colunas
+        'fonte': list(fonte), 'linhas': len(tuplas), 'campos': list(campos), 'ordem': sys.byteorder,
+        'colunas': descricoes, 'dados': posicao,
+    }, ensure_ascii=False).encode('utf-8')  # Cabeçalho em JSON
+    temporario = caminho + '.tmp'  # O arquivo nasce num temporário
+    with open(temporario, mode='wb') as f:  # Abre o temporário
+        f.write(MAGICO + struct.pack('<Q', len(cabecalho)) + cabecalho + b'\x00' * _alinhar(len(cabecalho)))  # Identificação e cabeçalho
+        for bloco in blocos:  # Dados de cada coluna
+            bloco.tofile(f)  # Grava o vetor direto (sem conversão)
+            f.write(b'\x00' * _alinhar(len(bloco) * bloco.itemsize))  # Alinhamento da próxima coluna
+        f.flush()  # Esvazia o buffer
+        os.fsync(f.fileno())  # Garante a gravação física
+    os.replace(temporario, caminho)  # Troca atômica: quem lê nunca vê um arquivo pela metade
+
+
+def filtro_de_condicoes(campos, condicoes):  # Filtro equivalente ao aplicado nas colunas
+    """Retorna uma função tupla -> bool que aplica {campo: função(texto)} (cada texto distinto é avaliado uma vez), ou None sem condições."""
+    if not condicoes:  # Sem filtro
+        return None  # Todas as linhas valem
+    testes = []  # (posição do campo, respostas já calculadas, condição)
+    for campo, condicao in condicoes.items():  # Cada condição
+        testes.append((campos.index(campo), {}, condicao))  # Memória própria por campo
+
+    def atende(tupla):  # Aplicado a cada linha
+        for posicao, respostas, condicao in testes:  # Todas as condições precisam valer
+            texto = tupla[posicao]  # Valor do campo
+            resposta = respostas.get(texto)  # Já avaliado?
+            if resposta is None:  # Primeira vez que o texto aparece
+                resposta = respostas[texto] = bool(condicao(texto))  # Avalia e guarda
+            if not resposta:  # Reprovada
+                return False  # A linha fica de fora
+        return True  # Passou em todas
+
+    return atende  # Função de filtro
+
+
+class SnapshotColunar:  # Leitor do arquivo colunar (mapeado na memória)
+    """Dá acesso às colunas de um snapshot colunar; use com 'with' para liberar o mapeamento."""
+
+    def __init__(self, mapa, cabecalho, inicio):  # Construído por abrir()
+        self._mapa = mapa  # Arquivo mapeado na memória
+        self.campos = cabecalho['campos']  # Colunas, na ordem das tuplas
+        self.linhas = cabecalho['linhas']  # Quantidade de linhas
+        self.colunas = cabecalho['colunas']  # Descrição de cada coluna (tipo, deslocamento, tabela)
+        self._inicio = inicio  # Byte onde começam os dados
+
+    @classmethod
+    def abrir(cls, caminho, fonte, campos):  # Abre só se estiver em dia com o CSV
+        """Abre o arquivo colunar se ele foi gerado do CSV com a assinatura 'fonte' e tem as mesmas colunas; senão, retorna None."""
+        if fonte is None:  # CSV inexistente: a cópia não vale
+            return None  # Lê pelo caminho normal
+        try:  # O arquivo pode não existir ou estar corrompido
+            with open(caminho, mode='rb') as f:  # O mapeamento continua válido depois de fechar o arquivo
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # Mapeia o arquivo inteiro (somente leitura)
+        except (OSError, ValueError):  # Inexistente ou vazio
+            return None  # Lê pelo caminho normal
+        try:  # Confere identificação, cabeçalho e tamanho
+            tamanho, = struct.unpack_from('<Q', mapa, len(MAGICO))  # Tamanho do cabeçalho
+            cabecalho = json.loads(mapa[16:16 + tamanho].decode('utf-8'))  # Cabeçalho JSON
+            inicio = 16 + tamanho + _alinhar(tamanho)  # Início dos dados
+            valido = (
+                mapa[:len(MAGICO)] == MAGICO and cabecalho['fonte'] == list(fonte)  # Mesmo formato e mesmo CSV
+                and cabecalho['campos'] == list(campos) and cabecalho['ordem'] == sys.byteorder  # Mesmas colunas e máquina compatível
+                and len(mapa) == inicio + cabecalho['dados']  # Arquivo completo
+            )
+        except (ValueError, KeyError, TypeError, struct.error):  # Cabeçalho ilegível
+            valido = False  # Cópia descartada
+        if not valido:  # Desatualizada ou corrompida
+            mapa.close()  # Libera o mapeamento
+            return None  # Lê pelo caminho normal
+        return cls(mapa, cabecalho, inicio)  # Leitor pronto
+
+    def __enter__(self):  # Uso com 'with'
+        return self  # O próprio leitor
+
+    def __exit__(self, *excecao):  # Fim do bloco 'with'
+        self.fechar()  # Libera o mapeamento
+
+    def fechar(self):  # Libera o arquivo
+        """Desfaz o mapeamento do arquivo (no Windows, o arquivo mapeado não pode ser substituído)."""
+        self._mapa.close()  # Fecha o mapeamento
+
+    def valores(self, campo, inicio=0, fim=None):  # Coluna crua
+        """Retorna a lista de números da coluna (códigos na tabela de textos, ou o valor numérico) entre as linhas 'inicio' e 'fim'."""
+        return self._valores(self.campos.index(campo), inicio, self.linhas if fim is None else fim)  # Pela posição
+
+    def tabela(self, campo):  # Textos distintos
+        """Retorna a tabela de textos de uma coluna de texto (None nas numéricas)."""
+        return self.colunas[self.campos.index(campo)].get('tabela')  # Código -> texto
+
+    def _valores(self, indice, inicio, fim):  # Lê um trecho de uma coluna
+        """Lê as linhas [inicio, fim) da coluna na posição 'indice' como lista de inteiros."""
+        coluna = self.colunas[indice]  # Descrição da coluna
+        formato = 'i' if coluna['tipo'] == TEXTO else 'q'  # Códigos de 32 ou inteiros de 64 bits
+        largura = 4 if formato == 'i' else 8  # Bytes por linha
+        base = self._inicio + coluna['deslocamento']  # Início da coluna no arquivo
+        with memoryview(self._mapa)[base + inicio * largura:base + fim * largura] as bruto:  # Só o trecho pedido (sem cópia)
+            with bruto.cast(formato) as numeros:  # Interpreta os bytes como vetor
+                return numeros.tolist()  # Copia para uma lista (libera o mapeamento para ser fechado)
+
+    def _conversor(self, indice):  # Função número -> texto de uma coluna
+        """Retorna a função (em C sempre que possível) que converte os números da coluna nos textos do CSV."""
+        coluna = self.colunas[indice]  # Descrição da coluna
+        if coluna['tipo'] == TEXTO:  # Código -> texto
+            return coluna['tabela'].__getitem__  # Consulta direta na tabela
+        if coluna['tipo'] == INTEIRO and not coluna['vazios']:  # IDs: quase todos distintos
+            return str  # Formatação direta
+        return _Formatados(FORMATADORES[coluna['tipo']]).__getitem__  # Cada valor distinto é formatado uma única vez
+
+    def _selecionar(self, condicoes):  # Linhas que passam no filtro
+        """Retorna as posições das linhas que atendem a todas as condições {campo: função(texto)}."""
+        mascara = None  # Resultado acumulado das condições
+        for campo, condicao in condicoes.items():  # Cada condição
+            indice = self.campos.index(campo)  # Posição da coluna
+            numeros = self._valores(indice, 0, self.linhas)  # Só esta coluna é lida
+            coluna = self.colunas[indice]  # Descrição da coluna
+            if coluna['tipo'] == TEXTO:  # Avalia cada texto distinto uma vez
+                respostas = [bool(condicao(texto)) for texto in coluna['tabela']]  # Código -> aprovado?
+                atende = map(respostas.__getitem__, numeros)  # Resposta de cada linha
+            else:  # Coluna numérica: avalia cada valor distinto uma vez
+                converter, respostas = self._conversor(indice), {}  # Número -> texto; número -> aprovado?
+
+                def responder(numero, converter=converter, respostas=respostas, condicao=condicao):  # Consulta ou avalia
+                    resposta = respostas.get(numero)  # Já avaliado?
+                    if resposta is None:  # Primeira vez
+                        resposta = respostas[numero] = bool(condicao(converter(numero)))  # Avalia o texto do CSV
+                    return resposta  # Aprovado?
+
+                atende = map(responder, numeros)  # Resposta de cada linha
+            mascara = list(atende) if mascara is None else list(map(operator.and_, mascara, atende))  # Todas precisam valer
+        return list(compress(range(self.linhas), mascara))  # Posições aprovadas
+
+    def tuplas(self, condicoes=None):  # Linhas reconstruídas
+        """Gera as linhas como tuplas de texto idênticas às do CSV, em blocos; 'condicoes' {campo: função(texto)} filtra antes de montá-las."""
+        posicoes = self._selecionar(condicoes) if condicoes else None  # None = todas as linhas
+        total = self.linhas if posicoes is None else len(posicoes)  # Linhas a entregar
+        conversores = [self._conversor(indice) for indice in range(len(self.campos))]  # Um por coluna (a memória vale para todos os blocos)
+        for comeco in range(0, total, TAMANHO_BLOCO):  # Um bloco por vez (memória limitada)
+            if posicoes is None:  # Trecho contínuo
+                inicio, fim, relativas = comeco, min(comeco + TAMANHO_BLOCO, total), None  # Linhas do bloco
+            else:  # Só as linhas aprovadas
+                parte = posicoes[comeco:comeco + TAMANHO_BLOCO]  # Posições do bloco
+                inicio, fim = parte[0], parte[-1] + 1  # Trecho que as contém
+                relativas = [posicao - inicio for posicao in parte]  # Posições dentro do trecho
+            colunas = []  # Textos de cada coluna no bloco
+            for indice, converter in enumerate(conversores):  # Cada coluna
+                numeros = self._valores(indice, inicio, fim)  # Trecho da coluna
+                if relativas is not None:  # Descarta as reprovadas
+                    numeros = list(map(numeros.__getitem__, relativas))  # Só as aprovadas
+                colunas.append(list(map(converter, numeros)))  # Números -> textos do CSV
+            yield from zip(*colunas)  # Linhas do bloco
@@ -0,0 +1,84 @@
+# --- Configurações de Arquivos ---
+ARQUIVO_CABECALHO = 'pedidos_cabecalho.csv'  # Define o nome do arquivo que guarda o resumo dos pedidos
+ARQUIVO_ITENS = 'pedidos_itens.csv'  # Define o nome do arquivo que guarda os produtos de cada pedido
+ARQUIVO_PRODUTOS = 'produtos.csv'  # Define o nome do arquivo que serve como banco de dados de produtos
+ARQUIVO_PAGAMENTOS = 'pedidos_pagamentos.csv'  # Define o nome do arquivo com o histórico de pagamentos (só acréscimos)
+ARQUIVO_DIARIO = 'pedidos.diario'  # Define o nome do diário (journal) onde as alterações são acrescentadas
+ARQUIVO_BANCO = 'pedidos.db'  # Define o nome do banco SQLite (usado só com o motor 'sqlite')
+ARQUIVO_SEQUENCIAS = 'pedidos.sequencias'  # Define o nome do arquivo com os últimos IDs entregues (pedidos e itens)
+
+# --- Configurações do Motor de Armazenamento ---
+BACKEND_CSV = 'csv'  # Snapshots CSV + diário de alterações (padrão; os CSVs continuam abrindo no Excel)
+BACKEND_SQLITE = 'sqlite'  # Banco SQLite com índices (para históricos grandes)
+BACKENDS = [BACKEND_CSV, BACKEND_SQLITE]  # Motores disponíveis na inicialização
+BACKEND_PADRAO = BACKEND_CSV  # Motor usado quando nenhum é informado
+
+# --- Configurações do Diário ---
+LIMITE_COMPACTACAO_DIARIO = 5000  # Quantidade de registros no diário que dispara a compactação em segundo plano
+
+# --- Configurações do Snapshot Colunar ---
+SNAPSHOT_COLUNAR = True  # Mantém ao lado de cada CSV uma cópia colunar binária (lida com mmap, sem interpretar o texto)
+SUFIXO_COLUNAR = '.colunas'  # Extensão da cópia colunar (ex.: 'pedidos_cabecalho.colunas')
+
+# --- Configurações dos Relatórios ---
+TAMANHO_PAGINA = 20  # Quantidade de pedidos exibidos por página na visão geral
+
+# --- Configurações do Histórico Arquivado ---
+PASTA_HISTORICO = 'historico'  # Define a pasta das partições mensais de pedidos quitados (com o manifesto)
+DIAS_ARQUIVAMENTO = 60  # Pedidos pagos e entregues sem movimento há mais dias que isso saem dos CSVs ativos
+COMPRIMIR_HISTORICO = True  # Grava as partições novas compactadas (.csv.gz)
+
+# --- Configurações da Verificação de Integridade ---
+ARQUIVO_ITENS_ORFAOS = 'pedidos_itens_orfaos.csv'  # Define o arquivo que recebe os itens de pedidos inexistentes retirados pelo reparo
+
+# --- Configurações da Instrumentação (opcional) ---
+ARQUIVO_METRICAS = 'pedidos.metricas'  # Define o nome do arquivo de métricas (uma linha JSON por operação medida)
+PASTA_PERFIS = 'perfis'  # Define a pasta dos perfis do cProfile (um arquivo .prof por ação perfilada)
+VARIAVEL_METRICAS = 'GERENCIADOR_METRICAS'  # Variável de ambiente que liga as métricas ("1") sem precisar de --metricas
+VARIAVEL_PERFIL = 'GERENCIADOR_PERFIL'  # Variável de ambiente com as operações perfiladas ("1" = todas as ações; ou nomes separados por vírgula)
+
+# --- Configurações do Servidor Local ---
+ENDERECO_SERVIDOR = '127.0.0.1'  # Endereço do servidor de pedidos (só a máquina local; não há autenticação)
+PORTA_SERVIDOR = 8765  # Porta TCP do servidor de pedidos (--servidor / --conectar)
+JANELA_GRAVACAO = 0.05  # Segundos que o servidor espera juntando alterações antes de gravar o lote no disco
+TEMPO_LIMITE_CONEXAO = 30  # Segundos que o balcão espera por uma resposta do servidor
+LIMITE_MENSAGEM = 16 * 1024 * 1024  # Tamanho máximo (bytes) de uma mensagem JSON entre servidor e balcão
+
+# --- Configurações dos IDs ---
+BLOCO_IDS_ITENS = 20  # Quantidade de IDs de itens reservados por acesso ao arquivo de sequências
+
+# --- Constantes para os Menus ---
+OPCOES_STATUS_PAGAMENTO = ['Pago', 'Pendente', 'Parcial']  # Opções fixas para o estado financeiro do pedido
+OPCOES_STATUS_PEDIDO = ['Entregue', 'Pendente']  # Opções fixas para o estado de logística do pedido
+OPCOES_FORMA_PAGAMENTO = ['Pix', 'Dinheiro', 'Prazo']  # Opções fixas de métodos de pagamento
+FORMAS_RECEBIMENTO = ['Pix', 'Dinheiro']  # Formas de cada recebimento ('Prazo' é a condição da venda, não um meio de pagamento)
+FORMA_NAO_INFORMADA = 'Não informado'  # Forma dos pagamentos migrados de vendas a prazo (o meio real nunca foi registrado)
+FORMAS_HISTORICO = FORMAS_RECEBIMENTO + [FORMA_NAO_INFORMADA]  # Formas aceitas no histórico de pagamentos, na ordem dos relatórios
+PRAZO_MAXIMO_PAGAMENTO_DIAS = 30  # Limite de dias após o pedido para a data esperada de pagamento
+STATUS_EM_ABERTO = ('Pendente', 'Parcial')  # Status financeiros que ainda têm saldo a receber
+DIAS_ALERTA_VENCIMENTO = 7  # Janela padrão (em dias) dos pedidos "a vencer" na tela de alertas
+STATUS_PEDIDO_PENDENTE = 'Pendente'  # Status de logística dos pedidos que ainda serão entregues
+DIAS_FLUXO_CAIXA = 30  # Janela padrão (em dias) do relatório de fluxo de caixa
+DURACAO_ENTREGA_MINUTOS = 30  # Tempo reservado para cada entrega (horários mais próximos que isso são conflito)
+
+# Cabeçalhos dos arquivos
+CAMPOS_CABECALHO = [  # Lista com os nomes das colunas para o arquivo de cabeçalho
+    'ID do Pedido', 'Data do Pedido', 'Nome do Cliente',
+    'Valor Total (R$)', 'Valor Pago (R$)', 'Forma de Pagamento',
+    'Status do Pagamento', 'Data do Pagamento', 'Data Vencimento Prazo',
+    'Status do Pedido', 'Data/Hora Entrega', 'Versão'  # 'Versão' conta as gravações do pedido (edição concorrente)
+]
+
+CAMPOS_ITENS = [  # Lista com os nomes das colunas para o arquivo de itens detalhados
+    'ID do Item', 'ID do Pedido', 'Produto',
+    'Quantidade', 'Valor Item (R$)',
+    'Código do Produto', 'Tipo de Venda'  # Campos estruturados (vazios em itens antigos)
+]
+
+CAMPOS_PAGAMENTOS = [  # Lista com os nomes das colunas do histórico de pagamentos (uma linha por recebimento)
+    'ID do Pagamento', 'ID do Pedido', 'Valor (R$)', 'Forma de Pagamento', 'Data do Pagamento'
+]
+
+CAMPOS_PRODUTOS = [  # Lista com os nomes das colunas do arquivo de produtos
+    'Código', 'Nome do Produto', 'Valor Unidade (R$)', 'Qtd por Caixa', 'Valor Caixa (R$)'
+]
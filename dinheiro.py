@@ -0,0 +1,71 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP  # Importa o tipo decimal para conversões exatas de casos incomuns
+
+# =================================================================
+#                 VALORES MONETÁRIOS EM CENTAVOS (INT)
+# =================================================================
+
+def texto_para_centavos(texto):  # Converte "915.90" em 91590
+    """Converte um valor em reais (texto do CSV) para centavos inteiros, sem passar por float."""
+    texto = (texto or '').strip().replace(',', '.')  # Aceita vírgula como separador decimal
+    if not texto:  # Campo vazio
+        return 0  # Vale zero
+    negativo = texto.startswith('-')  # Guarda o sinal
+    inteiro, _, fracao = texto.lstrip('+-').partition('.')  # Separa reais e centavos
+    if (inteiro or fracao) and (inteiro + fracao).isdigit() and len(fracao) <= 2:  # Caminho rápido: formato comum do CSV
+        centavos = int(inteiro or '0') * 100 + int((fracao + '00')[:2])  # Monta os centavos sem arredondamento
+        return -centavos if negativo else centavos  # Reaplica o sinal
+    try:  # Casos incomuns (mais de duas casas decimais, notação científica...)
+        return int((Decimal(texto) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))  # Arredonda para o centavo mais próximo
+    except InvalidOperation:  # Texto que não é número
+        raise ValueError(f"Valor monetário inválido: {texto!r}")  # Mesmo tipo de erro que float() lançaria
+
+
+def centavos_para_texto(centavos):  # Converte 91590 em "915.90"
+    """Formata centavos inteiros no formato do CSV (ponto decimal e duas casas)."""
+    sinal = '-' if centavos < 0 else ''  # Sinal para valores negativos
+    reais, resto = divmod(abs(centavos), 100)  # Separa reais e centavos
+    return f"{sinal}{reais}.{resto:02d}"  # Texto com duas casas decimais
+
+
+def ler_valor_digitado(texto):  # Converte o que o usuário digitou ("50", "50,5", "R$ 12.30")
+    """Converte um valor digitado em reais para centavos inteiros (ValueError se inválido)."""
+    texto = (texto or '').strip().upper().replace('R$', '').strip()  # Remove espaços e o símbolo da moeda
+    if not texto:  # Nada digitado
+        raise ValueError("Valor vazio")  # Mesmo tipo de erro que float('') lançaria
+    return texto_para_centavos(texto)  # Conversão exata (sem float)
+
+
+def formatar_reais(centavos):  # Único ponto de formatação para exibição na tela
+    """Formata centavos para exibição (ex.: 'R$ 915.90')."""
+    return f"R$ {centavos_para_texto(centavos)}"  # Mesmo padrão de ponto decimal usado no sistema
+
+
+# --- Aritmética exata ---
+
+def somar(valores):  # Soma de vários valores em centavos
+    """Soma exata de valores em centavos (a soma de int do Python é feita em C, sem arredondamentos)."""
+    return sum(valores, 0)  # Inteiros não acumulam erro, mesmo com milhões de itens
+
+
+def multiplicar(quantidade, preco_centavos):  # Subtotal de um item
+    """Calcula o subtotal exato de um item: quantidade x preço em centavos."""
+    return int(quantidade) * preco_centavos  # Produto de inteiros é exato
+
+
+def status_por_valores(total_centavos, pago_centavos):  # Regra única de status financeiro
+    """Retorna 'Pago', 'Parcial' ou 'Pendente' conforme o total e o valor pago."""
+    if pago_centavos >= total_centavos:  # Quitou
+        return 'Pago'  # Sem saldo
+    if pago_centavos > 0:  # Pagou uma parte
+        return 'Parcial'  # Ainda deve
+    return 'Pendente'  # Nada pago
+
+
+def validar_pagamento(total_centavos, pago_centavos, novo_centavos):  # Regra única de pagamento
+    """Valida um novo pagamento e retorna o novo total pago (ValueError com a mensagem se inválido)."""
+    restante = total_centavos - pago_centavos  # Saldo atual
+    if novo_centavos <= 0:  # Valores negativos ou zero
+        raise ValueError("O valor do pagamento deve ser positivo.")  # Mensagem para o usuário
+    if novo_centavos > restante:  # Pagamento acima do saldo (comparação exata, sem margem de centavos)
+        raise ValueError(f"O novo valor excede o total. O máximo permitido para completar é {formatar_reais(restante)}.")  # Mensagem para o usuário
+    return pago_centavos + novo_centavos  # Novo total pago
@@ -0,0 +1,71 @@
+from datetime import timedelta  # Importa o intervalo usado para comparar horários de entrega
+
+from catalogo import TIPO_UNIDADE, TIPO_CAIXA, separar_tipo  # Importa os tipos de venda (UN/CX) e a leitura dos nomes antigos
+from configuracao import DURACAO_ENTREGA_MINUTOS  # Importa o tempo reservado para cada entrega
+from dinheiro import formatar_reais  # Importa a formatação de dinheiro para a tela
+
+# =================================================================
+#          PLANEJAMENTO DO DIA DE ENTREGAS (ROTA E SEPARAÇÃO)
+# =================================================================
+#
+# O repositório mantém as entregas pendentes agrupadas por dia, então montar o
+# plano de um dia percorre só os pedidos daquele dia e os itens deles (pelo
+# índice de itens por pedido), nunca o histórico inteiro.
+
+
+def lista_de_separacao(itens, catalogo):  # O que carregar no caminhão
+    """Retorna [(produto, caixas, unidades, total em unidades)] somando os itens informados, em ordem de nome."""
+    totais = {}  # Produto -> [caixas, unidades, unidades por caixa]
+    for item in itens:  # Itens de todos os pedidos do dia
+        produto, tipo = catalogo.resolver_item(item)  # Produto do catálogo (por código ou nome) e tipo de venda
+        nome = produto['Nome do Produto'] if produto else separar_tipo(item.produto)[0]  # Produto fora do catálogo: usa o nome do item
+        por_caixa = produto.get('Qtd por Caixa') or '' if produto else ''  # Unidades por caixa, como texto do CSV
+        por_caixa = int(por_caixa) if por_caixa.isdigit() else 0  # 0 se desconhecido
+        linha = totais.setdefault(nome, [0, 0, por_caixa])  # Acumulador do produto
+        linha[0 if tipo == TIPO_CAIXA else 1] += item.quantidade  # Itens antigos sem tipo contam como unidades
+    return [(nome, caixas, unidades, caixas * por_caixa + unidades) for nome, (caixas, unidades, por_caixa) in sorted(totais.items())]  # Uma linha por produto
+
+
+def detectar_conflitos(pedidos, duracao=DURACAO_ENTREGA_MINUTOS):  # Horários sobrepostos
+    """Retorna [(pedido, pedido)] cujas entregas começam a menos de 'duracao' minutos uma da outra (pedidos em ordem de horário)."""
+    intervalo = timedelta(minutes=duracao)  # Tempo reservado para cada entrega
+    conflitos = []  # Pares sobrepostos
+    for posicao, pedido in enumerate(pedidos):  # Cada entrega do dia
+        for seguinte in pedidos[posicao + 1:]:  # Só as entregas posteriores
+            if seguinte.data_entrega >= pedido.data_entrega + intervalo:  # As demais começam ainda mais tarde
+                break  # Para a varredura desta entrega
+            conflitos.append((pedido, seguinte))  # Sobreposição
+    return conflitos  # Pares em ordem de horário
+
+
+def montar_plano(repositorio, catalogo, dia, duracao=DURACAO_ENTREGA_MINUTOS):  # Plano de um dia
+    """Retorna {'entregas': [(pedido, itens)], 'separacao': [...], 'conflitos': [...]} das entregas pendentes do dia."""
+    pedidos = repositorio.entregas_do_dia(dia)  # Já em ordem de horário (índice por dia)
+    entregas = [(pedido, repositorio.itens_do_pedido(pedido.id_pedido)) for pedido in pedidos]  # Itens de cada pedido
+    return {  # Plano completo
+        'entregas': entregas,  # Rota em ordem de horário
+        'separacao': lista_de_separacao([item for _, itens in entregas for item in itens], catalogo),  # Totais por produto
+        'conflitos': detectar_conflitos(pedidos, duracao),  # Horários sobrepostos
+    }
+
+
+# --- Exibição ---
+
+def imprimir_plano(plano, dia):  # Tela do planejamento
+    """Imprime a rota do dia, a lista de separação por produto e os conflitos de horário."""
+    print(f"\n--- ENTREGAS DE {dia.strftime('%d-%m-%Y')} ({len(plano['entregas'])}) ---")  # Título
+    if not plano['entregas']:  # Dia sem entregas pendentes
+        print("Nenhuma entrega pendente agendada.")  # Avisa
+        return  # Nada mais a mostrar
+    for pedido, itens in plano['entregas']:  # Cada parada da rota
+        print(f"{pedido.data_entrega.strftime('%H:%M')} | Pedido {pedido.id_pedido:<6} | {pedido.nome_cliente[:20]:<20} | saldo {formatar_reais(pedido.saldo)}")  # Cabeçalho da parada
+        for item in itens:  # Itens da parada
+            print(f"        {item.quantidade:>5} x {item.produto}")  # Linha do item
+    print("\n--- SEPARAÇÃO (CARGA DO DIA) ---")  # Título
+    print(f"{'Produto':<30} | {TIPO_CAIXA:>6} | {TIPO_UNIDADE:>6} | {'Total un.':>9}")  # Títulos das colunas
+    for nome, caixas, unidades, total in plano['separacao']:  # Cada produto
+        print(f"{nome[:30]:<30} | {caixas:>6} | {unidades:>6} | {total:>9}")  # Linha do produto
+    if plano['conflitos']:  # Horários sobrepostos
+        print(f"\n--- ⚠️ CONFLITOS DE HORÁRIO ({len(plano['conflitos'])}) ---")  # Título
+        for primeiro, segundo in plano['conflitos']:  # Cada par
+            print(f"Pedido {primeiro.id_pedido} ({primeiro.data_entrega.strftime('%H:%M')}) x Pedido {segundo.id_pedido} ({segundo.data_entrega.strftime('%H:%M')})")  # Par sobreposto
@@ -1,36 +1,100 @@
+import argparse  # Importa a biblioteca para ler as opções da linha de comando
 import csv  # Importa a biblioteca para manipular arquivos CSV
+import itertools  # Importa o encadeamento dos pedidos ativos com os arquivados
 import os  # Importa a biblioteca para interagir com o sistema operacional (verificar arquivos)
+import sys  # Importa o acesso a este próprio módulo (para a instrumentação trocar as funções medidas)
 from datetime import datetime, timedelta  # Importa classes para manipulação de datas e horas
 
-# --- Configurações de Arquivos ---
-ARQUIVO_CABECALHO = 'pedidos_cabecalho.csv'  # Define o nome do arquivo que guarda o resumo dos pedidos
-ARQUIVO_ITENS = 'pedidos_itens.csv'  # Define o nome do arquivo que guarda os produtos de cada pedido
-ARQUIVO_PRODUTOS = 'produtos.csv'  # Define o nome do arquivo que serve como banco de dados de produtos
-
-# Cabeçalhos dos arquivos 
-CAMPOS_CABECALHO = [  # Lista com os nomes das colunas para o arquivo de cabeçalho
-    'ID do Pedido', 'Data do Pedido', 'Nome do Cliente', 
-    'Valor Total (R$)', 'Valor Pago (R$)', 'Forma de Pagamento', 
-    'Status do Pagamento', 'Data do Pagamento', 'Data Vencimento Prazo', 
-    'Status do Pedido', 'Data/Hora Entrega'
-]
+from analises import ColunasVendas, PERIODOS, imprimir_analises  # Importa as análises de vendas em colunas
+from armazenamento import ArmazenamentoDiario, ConflitoVersao  # Importa o motor de armazenamento com diário de alterações e o erro de edição concorrente
+from armazenamento_sqlite import ArmazenamentoSQLite  # Importa o motor de armazenamento alternativo em SQLite
+from cache_dados import CacheArquivos  # Importa o cache validado por tamanho, data de modificação e inode
+import cliente_remoto  # Importa o balcão ligado ao servidor local (--conectar)
+from catalogo import CatalogoProdutos, TIPO_UNIDADE, TIPO_CAIXA  # Importa o catálogo de produtos indexado por código e nome
+from clientes import PONTOS_IDENTICO  # Importa a pontuação do nome idêntico na busca de clientes
+from entregas import imprimir_plano, montar_plano  # Importa o planejamento do dia de entregas (rota, separação e conflitos)
+from historico import HistoricoArquivado, pedido_quitado  # Importa o histórico arquivado em partições mensais
+import instrumentacao  # Importa a instrumentação opcional (tempos, linhas lidas/gravadas e perfis)
+from dinheiro import (  # Importa a aritmética exata em centavos e a formatação para a tela
+    centavos_para_texto, formatar_reais, ler_valor_digitado, multiplicar, somar, status_por_valores, validar_pagamento
+)
+from configuracao import (  # Importa as configurações de arquivos e colunas compartilhadas entre os módulos
+    ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_PRODUTOS, ARQUIVO_PAGAMENTOS, ARQUIVO_DIARIO, ARQUIVO_BANCO, ARQUIVO_SEQUENCIAS, BLOCO_IDS_ITENS,
+    ARQUIVO_METRICAS, PASTA_PERFIS, ARQUIVO_ITENS_ORFAOS, VARIAVEL_METRICAS, VARIAVEL_PERFIL, PASTA_HISTORICO, DIAS_ARQUIVAMENTO, COMPRIMIR_HISTORICO,
+    BACKEND_CSV, BACKEND_SQLITE, BACKENDS, BACKEND_PADRAO,
+    CAMPOS_CABECALHO, CAMPOS_ITENS, CAMPOS_PAGAMENTOS, CAMPOS_PRODUTOS,
+    OPCOES_STATUS_PAGAMENTO, OPCOES_STATUS_PEDIDO, OPCOES_FORMA_PAGAMENTO, FORMAS_RECEBIMENTO, FORMAS_HISTORICO, FORMA_NAO_INFORMADA, PRAZO_MAXIMO_PAGAMENTO_DIAS,
+    DIAS_ALERTA_VENCIMENTO, DIAS_FLUXO_CAIXA, PORTA_SERVIDOR
+)
+from registros import Pedido, ItemPedido, Pagamento, ler_data, ler_data_hora  # Importa os registros tipados (com __slots__) de pedido, item e pagamento
+from relatorios import condicoes_pedidos, filtrar_pedidos, imprimir_paginado  # Importa o relatório geral em fluxo, com filtros (também aplicados pelo motor) e páginas
+from repositorio import RepositorioPedidos  # Importa o repositório em memória com índices de pedidos
+from sequencias import AlocadorSequencias  # Importa o alocador persistente de IDs
+import servidor  # Importa o servidor local de pedidos (--servidor)
+from verificacao import VerificadorIntegridade  # Importa a verificação de integridade em paralelo (relatório e reparo)
+from servico_pedidos import (  # Importa a camada de serviço (regras sem input()) e a importação em lote
+    ServicoPedidos, importar_pedidos, ler_pedidos_arquivo, validar_data_entrega, validar_data_vencimento
+)
+
+# --- Motor de Armazenamento ---
+def criar_armazenamento(backend):  # Monta o motor escolhido com as tabelas do sistema
+    """Cria o motor de armazenamento ('csv' ou 'sqlite') e retorna (motor, arquivos que o representam no disco)."""
+    if backend == BACKEND_SQLITE:  # Banco SQLite com índices
+        motor = ArmazenamentoSQLite(ARQUIVO_BANCO)  # Tudo num único arquivo .db
+        motor.registrar_tabela('produtos', ARQUIVO_PRODUTOS, CAMPOS_PRODUTOS, 'Código')  # Produtos também ficam no banco
+        arquivos = [ARQUIVO_BANCO]  # O cache observa só o banco
+    else:  # Padrão: snapshots CSV + diário
+        motor = ArmazenamentoDiario(ARQUIVO_DIARIO)  # Snapshots CSV + diário só de acréscimos
+        arquivos = [ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_PAGAMENTOS, ARQUIVO_DIARIO]  # Arquivos de origem do repositório de pedidos
+    motor.registrar_tabela(  # Tabela de pedidos (ID é a chave; cliente e status são consultados com frequência; 'Versão' detecta edições concorrentes)
+        'cabecalhos', ARQUIVO_CABECALHO, CAMPOS_CABECALHO, 'ID do Pedido', ['Nome do Cliente', 'Status do Pagamento'], versao='Versão'
+    )
+    motor.registrar_tabela('itens', ARQUIVO_ITENS, CAMPOS_ITENS, 'ID do Item', ['ID do Pedido'])  # Tabela de itens (índice pelo pedido)
+    motor.registrar_tabela('pagamentos', ARQUIVO_PAGAMENTOS, CAMPOS_PAGAMENTOS, 'ID do Pagamento', ['ID do Pedido'])  # Histórico de pagamentos (só acréscimos)
+    return motor, arquivos  # Motor pronto para uso
+
+def configurar_armazenamento(backend):  # Escolha do motor na inicialização
+    """Troca o motor de armazenamento global usado pelo sistema."""
+    global armazenamento, ARQUIVOS_REPOSITORIO, BACKEND_ATIVO  # Variáveis globais do módulo
+    armazenamento, ARQUIVOS_REPOSITORIO = criar_armazenamento(backend)  # Cria o motor escolhido
+    BACKEND_ATIVO = backend  # Guarda qual motor está ativo
+    armazenamento.ao_compactar = lambda: confirmar_repositorio()  # A compactação não muda o conteúdo, só os arquivos
+    if instrumentacao.ATIVO:  # Métricas ligadas
+        instrumentacao.instrumentar_motor(armazenamento)  # O motor novo também conta linhas lidas e gravadas
+    cache.invalidar()  # Dados em cache vieram do motor anterior
 
-CAMPOS_ITENS = [  # Lista com os nomes das colunas para o arquivo de itens detalhados
-    'ID do Item', 'ID do Pedido', 'Produto', 
-    'Quantidade', 'Valor Item (R$)'
+# --- Instrumentação (opcional) ---
+OPERACOES_MEDIDAS = [  # Leituras, gravações, cálculos e IDs (medidos, sem linha de status)
+    'carregar_cabecalhos', 'carregar_itens', 'montar_repositorio', 'carregar_repositorio', 'carregar_produtos', 'carregar_colunas_vendas',
+    'salvar_cabecalhos', 'salvar_itens', 'salvar_repositorio', 'compactar_dados', 'arquivar_quitados', 'verificar_integridade',
+    'calcular_valor_total_pedido', 'gerar_novo_id_pedido', 'gerar_novo_id_item', 'gerar_novo_id_pagamento',
 ]
+ACOES_MEDIDAS = [  # Telas do menu principal e do painel do cliente (mostram a linha de status ao terminar)
+    'gerenciar_por_cliente', 'visualizar_pedidos', 'analisar_vendas', 'visualizar_alertas', 'planejar_entregas', 'visualizar_fluxo_caixa',
+    'adicionar_pedido', 'editar_pedido', 'visualizar_detalhes_cliente', 'importar_pedidos_arquivo',
+]
+
+def ativar_instrumentacao(perfilar=None):  # Chamado na inicialização com --metricas/--perfil (ou pelas variáveis de ambiente)
+    """Liga as métricas em JSON-lines (e os perfis do cProfile, se pedidos) trocando as funções medidas deste módulo."""
+    instrumentacao.ativar(ARQUIVO_METRICAS, PASTA_PERFIS, perfilar)  # Abre o arquivo de métricas
+    instrumentacao.instrumentar(sys.modules[__name__], OPERACOES_MEDIDAS, ACOES_MEDIDAS)  # Troca as funções (desligada, nada é trocado)
+    instrumentacao.instrumentar_motor(armazenamento)  # Conta as linhas do motor atual
 
-# --- Constantes para os Menus ---
-OPCOES_STATUS_PAGAMENTO = ['Pago', 'Pendente', 'Parcial']  # Opções fixas para o estado financeiro do pedido
-OPCOES_STATUS_PEDIDO = ['Entregue', 'Pendente']  # Opções fixas para o estado de logística do pedido
-OPCOES_FORMA_PAGAMENTO = ['Pix', 'Dinheiro', 'Prazo']  # Opções fixas de métodos de pagamento
+# --- Cache de Dados ---
+cache = CacheArquivos()  # Evita reler os arquivos quando nada mudou no disco
+configurar_armazenamento(BACKEND_PADRAO)  # Motor padrão (pode ser trocado por --backend)
+
+sequencias = AlocadorSequencias(ARQUIVO_SEQUENCIAS, {'item': BLOCO_IDS_ITENS})  # IDs entregues em O(1) e persistidos entre execuções
+historico = HistoricoArquivado(PASTA_HISTORICO, COMPRIMIR_HISTORICO)  # Pedidos quitados antigos, fora dos CSVs ativos
 
 # =================================================================
 #               FUNÇÕES DE INICIALIZAÇÃO E UTILIDADE 
 # =================================================================
 
 def inicializar_csv():  # Define a função que prepara os arquivos do sistema
-    """Cria ou verifica os arquivos CSV com cabeçalhos."""
+    """Cria ou verifica os arquivos CSV com cabeçalhos e recupera uma gravação interrompida por queda."""
+    if armazenamento.recuperar():  # Compactação interrompida (queda de energia, Ctrl+C...)
+        print("\n🔧 Uma gravação interrompida foi recuperada; os dados estão íntegros.")  # Informa
     if not os.path.exists(ARQUIVO_CABECALHO):  # Verifica se o arquivo de cabeçalho já existe
         with open(ARQUIVO_CABECALHO, mode='w', newline='', encoding='utf-8') as f:  # Abre para escrita se não existir
             escritor = csv.DictWriter(f, fieldnames=CAMPOS_CABECALHO)  # Configura o gravador CSV com as colunas definidas
@@ -40,63 +104,219 @@ def inicializar_csv():  # Define a função que prepara os arquivos do sistema
         with open(ARQUIVO_ITENS, mode='w', newline='', encoding='utf-8') as f:  # Abre para escrita se não existir
             escritor = csv.DictWriter(f, fieldnames=CAMPOS_ITENS)  # Configura o gravador CSV
             escritor.writeheader()  # Escreve os títulos das colunas
-    
+
+    if not os.path.exists(ARQUIVO_PAGAMENTOS):  # Verifica se o histórico de pagamentos já existe
+        with open(ARQUIVO_PAGAMENTOS, mode='w', newline='', encoding='utf-8') as f:  # Abre para escrita se não existir
+            escritor = csv.DictWriter(f, fieldnames=CAMPOS_PAGAMENTOS)  # Configura o gravador CSV
+            escritor.writeheader()  # Escreve os títulos das colunas
+
+    for sequencia in ('pedido', 'item', 'pagamento'):  # IDs que já saíram dos CSVs ativos
+        sequencias.garantir_minimo(sequencia, historico.maior_id(sequencia))  # Nunca reaproveita um ID arquivado
+
+    migrados = migrar_pagamentos()  # Pedidos gravados antes do histórico de pagamentos
+    if migrados:  # Houve migração
+        print(f"\n🔧 {migrados} pedido(s) com valor pago ganharam o histórico de pagamentos.")  # Informa
+
 def carregar_cabecalhos():  # Define a função para ler os pedidos do disco
-    """Carrega todos os cabeçalhos de pedidos."""
-    if not os.path.exists(ARQUIVO_CABECALHO):  # Se o arquivo não existir
-        return []  # Retorna uma lista vazia
-    with open(ARQUIVO_CABECALHO, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Abre para leitura ignorando erros de caracteres
-        leitor = csv.DictReader(f)  # Cria um leitor que transforma linhas em dicionários
-        return list(leitor)  # Converte o leitor em uma lista de dados e retorna
+    """Carrega todos os cabeçalhos de pedidos (snapshot CSV + diário) como registros Pedido."""
+    return armazenamento.carregar('cabecalhos', Pedido.de_tupla)  # Interpreta cada linha uma única vez
 
 def carregar_itens():  # Define a função para ler os produtos vendidos do disco
-    """Carrega todos os itens de pedidos."""
-    if not os.path.exists(ARQUIVO_ITENS):  # Se o arquivo não existir
-        return []  # Retorna lista vazia
-    with open(ARQUIVO_ITENS, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Abre para leitura
-        leitor = csv.DictReader(f)  # Transforma linhas em dicionários
-        return list(leitor)  # Retorna a lista de todos os itens
+    """Carrega todos os itens de pedidos (snapshot CSV + diário) como registros ItemPedido."""
+    return armazenamento.carregar('itens', ItemPedido.de_tupla)  # Interpreta cada linha uma única vez
+
+def iterar_cabecalhos(condicoes=None):  # Define a função para percorrer os pedidos sem carregar tudo
+    """Percorre os cabeçalhos de pedidos sob demanda (um Pedido por vez), para relatórios; 'condicoes' filtra pelo texto das colunas."""
+    return armazenamento.iterar('cabecalhos', Pedido.de_tupla, condicoes)  # Gerador: só lê o que for consumido
 
 def salvar_cabecalhos(cabecalhos):  # Define a função para gravar pedidos no disco
-    """Salva a lista atualizada de cabeçalhos de pedidos."""
-    with open(ARQUIVO_CABECALHO, mode='w', newline='', encoding='utf-8') as f:  # Abre o arquivo em modo de sobreescrita
-        escritor = csv.DictWriter(f, fieldnames=CAMPOS_CABECALHO)  # Prepara o gravador
-        escritor.writeheader()  # Escreve o cabeçalho novamente
-        escritor.writerows(cabecalhos)  # Grava todos os dados da lista no arquivo
+    """Salva a lista atualizada de cabeçalhos, acrescentando ao diário só o que mudou."""
+    armazenamento.salvar('cabecalhos', cabecalhos)  # Grava apenas as linhas novas/alteradas/removidas
 
 def salvar_itens(itens):  # Define a função para gravar os itens no disco
-    """Salva a lista atualizada de itens de pedidos."""
-    with open(ARQUIVO_ITENS, mode='w', newline='', encoding='utf-8') as f:  # Abre em modo de sobreescrita
-        escritor = csv.DictWriter(f, fieldnames=CAMPOS_ITENS)  # Prepara o gravador
-        escritor.writeheader()  # Escreve o cabeçalho
-        escritor.writerows(itens)  # Grava a lista de itens
-
-def gerar_novo_id_pedido(cabecalhos):  # Define a função para auto-incremento de ID de pedido
-    """Gera o próximo ID sequencial para pedidos."""
-    if not cabecalhos:  # Se a lista estiver vazia
-        return 1  # Retorna o primeiro ID como 1
-    max_id = max(int(p['ID do Pedido']) for p in cabecalhos)  # Busca o maior ID numérico existente
-    return max_id + 1  # Retorna o maior ID somado de 1
-
-def gerar_novo_id_item(itens):  # Define a função para auto-incremento de ID de itens
-    """Gera o próximo ID sequencial para itens."""
-    if not itens:  # Se não houver itens
-        return 1  # Retorna 1
-    max_id = max(int(i['ID do Item']) for i in itens)  # Busca o maior ID de item existente
-    return max_id + 1  # Retorna o próximo número
+    """Salva a lista atualizada de itens, acrescentando ao diário só o que mudou."""
+    armazenamento.salvar('itens', itens)  # Grava apenas as linhas novas/alteradas/removidas
+
+def montar_repositorio():  # Define a função que lê pedidos e itens do mesmo estado do disco
+    """Carrega cabeçalhos e itens numa única leitura consistente e monta o repositório indexado."""
+    (cabecalhos, itens, pagamentos), geracao = armazenamento.carregar_lote([  # Nenhum terminal grava entre as tabelas
+        ('cabecalhos', Pedido.de_tupla),  # Cabeçalhos como registros Pedido
+        ('itens', ItemPedido.de_tupla),  # Itens como registros ItemPedido
+        ('pagamentos', Pagamento.de_tupla),  # Histórico de pagamentos como registros Pagamento
+    ])
+    repositorio = RepositorioPedidos(cabecalhos, itens, pagamentos)  # Indexa as listas carregadas do disco
+    repositorio.geracao = geracao  # Lembra qual versão do disco foi lida
+    return repositorio  # Repositório pronto
+
+def carregar_repositorio():  # Define a função que monta o repositório indexado
+    """Retorna o repositório em cache, relendo cabeçalhos e itens só se os arquivos mudaram."""
+    return cache.obter('repositorio', ARQUIVOS_REPOSITORIO, montar_repositorio)  # Consulta o cache validado pelas assinaturas dos arquivos
+
+def confirmar_repositorio(repositorio=None):  # Chamado (com a trava de arquivo) depois das nossas gravações e compactações
+    """Mantém o repositório em cache só se nenhum outro terminal gravou desde a leitura; senão, força a releitura."""
+    repositorio = repositorio or cache.valor('repositorio')  # Repositório gravado (ou o que está em cache)
+    if repositorio is not None and repositorio.geracao == armazenamento.geracao:  # O disco só tem as nossas gravações
+        cache.confirmar_escrita('repositorio', repositorio)  # O repositório em memória já reflete o disco
+    else:  # Outro terminal gravou: as listas em memória estão desatualizadas
+        cache.invalidar('repositorio')  # Relê no próximo menu
+
+def salvar_repositorio(repositorio):  # Define a função que grava só o que mudou no repositório
+    """Grava no diário apenas os pedidos e itens marcados como alterados ou removidos; retorna False se houve conflito."""
+    pedidos, itens, itens_removidos, pagamentos = repositorio.extrair_alteracoes()  # Coleta as alterações pendentes
+    try:  # Outro terminal pode ter alterado os mesmos pedidos
+        with armazenamento.trava_arquivo:  # Nenhum terminal grava entre a nossa gravação e a confirmação do cache
+            armazenamento.registrar_lote([  # Cabeçalhos e itens gravados juntos (uma escrita no diário / uma transação)
+                ('cabecalhos', pedidos, ()),  # Cabeçalhos novos/alterados
+                ('itens', itens, itens_removidos),  # Itens novos/alterados/removidos
+                ('pagamentos', pagamentos, ()),  # Pagamentos lançados (nunca alterados nem excluídos)
+            ])
+            confirmar_repositorio(repositorio)  # Mantém ou descarta o repositório em cache
+    except ConflitoVersao as erro:  # Pedido gravado por outro terminal depois de ter sido aberto aqui
+        cache.invalidar('repositorio')  # As alterações em memória são descartadas
+        print(f"\n⚠️ Pedido(s) {', '.join(erro.chaves)} alterado(s) em outro terminal enquanto você editava.")  # Avisa
+        print("Nada foi gravado; volte ao menu principal para ver os dados atuais e refaça a alteração.")  # Orienta
+        return False  # Nada foi gravado
+    return True  # Gravado
+
+def migrar_pagamentos():  # Pedidos gravados antes do histórico de pagamentos existir
+    """Lança como pagamento único o valor pago de cada pedido sem histórico; retorna quantos pedidos foram migrados."""
+    repositorio = carregar_repositorio()  # Mesmo repositório usado pelo menu (fica em cache)
+    antigos = [p for p in repositorio.cabecalhos if p.valor_pago > 0 and not repositorio.pagamentos_do_pedido(p.id_pedido)]  # Valor pago sem lançamentos
+    if not antigos:  # Histórico completo
+        return 0  # Nada a migrar
+    sequencias.garantir_minimo('pagamento', repositorio.maior_id_pagamento)  # Nunca abaixo do maior ID já gravado
+    primeiro = sequencias.reservar('pagamento', len(antigos))  # Uma reserva para todos os IDs
+    for numero, pedido in enumerate(antigos):  # Cada pedido antigo
+        repositorio.registrar_pagamento(pedido, Pagamento(  # A soma do histórico fica igual ao valor pago gravado
+            id_pagamento=primeiro + numero,
+            id_pedido=pedido.id_pedido,
+            valor=pedido.valor_pago,
+            forma_pagamento=pedido.forma_pagamento if pedido.forma_pagamento in FORMAS_RECEBIMENTO else FORMA_NAO_INFORMADA,  # 'Prazo' não é meio de pagamento (e o real não foi registrado)
+            data_pagamento=pedido.data_pagamento  # Data do último pagamento (a única conhecida)
+        ))
+    return len(antigos) if salvar_repositorio(repositorio) else 0  # Uma única gravação
+
+def compactar_dados():  # Define a função que consolida o diário nos arquivos CSV
+    """Regrava os CSVs com o estado atual e esvazia o diário de alterações."""
+    armazenamento.aguardar_compactacao()  # Espera alguma compactação em segundo plano terminar
+    armazenamento.compactar()  # Consolida o diário nos snapshots CSV
+
+def arquivar_quitados(dias=DIAS_ARQUIVAMENTO, agora=None):  # Move o histórico quitado para as partições mensais
+    """Arquiva (com itens e pagamentos) os pedidos pagos e entregues sem movimento há mais de 'dias' dias; retorna quantos foram arquivados."""
+    limite = (agora or datetime.now()) - timedelta(days=dias)  # Última movimentação aceita
+    with armazenamento.trava_arquivo:  # Nenhum terminal grava entre a leitura e a remoção
+        (cabecalhos, itens, pagamentos), _ = armazenamento.carregar_lote([  # Estado atual do disco (não o repositório em cache)
+            ('cabecalhos', Pedido.de_tupla),
+            ('itens', ItemPedido.de_tupla),
+            ('pagamentos', Pagamento.de_tupla),
+        ])
+        quitados = {pedido.id_pedido: pedido for pedido in cabecalhos if pedido_quitado(pedido, limite)}  # Pedidos a arquivar
+        if not quitados:  # Nada a arquivar
+            return 0  # CSVs intactos
+        itens = [item for item in itens if item.id_pedido in quitados]  # Itens dos pedidos arquivados
+        pagamentos = [pagamento for pagamento in pagamentos if pagamento.id_pedido in quitados]  # Pagamentos dos pedidos arquivados
+        historico.arquivar(list(quitados.values()), itens, pagamentos)  # Partições e manifesto gravados primeiro
+        armazenamento.registrar_lote([  # Só depois sai dos CSVs ativos (uma linha do diário / uma transação)
+            ('cabecalhos', (), list(quitados)),
+            ('itens', (), [item.id_item for item in itens]),
+            ('pagamentos', (), [pagamento.id_pagamento for pagamento in pagamentos]),
+        ])
+        cache.invalidar('repositorio')  # O repositório em memória ainda tem os pedidos arquivados
+    compactar_dados()  # CSVs regravados só com os pedidos ativos
+    return len(quitados)  # Quantidade arquivada
+
+def verificar_integridade(reparar=False, processos=None):  # Conferência dos CSVs (itens x cabeçalhos x pagamentos)
+    """Verifica os CSVs num pool de processos, imprime o relatório e, com 'reparar', corrige o que for seguro; retorna quantos problemas restam."""
+    if BACKEND_ATIVO != BACKEND_CSV:  # A verificação lê os snapshots CSV
+        print("⚠️ A verificação trabalha sobre os CSVs; use --backend csv.")  # Orienta
+        return None  # Nada verificado
+    armazenamento.aguardar_compactacao()  # Espera alguma compactação em segundo plano terminar (ela precisa da trava)
+    with armazenamento.trava_arquivo:  # Nenhum terminal grava durante a verificação e o reparo (os outros esperam)
+        armazenamento.recuperar()  # Conclui uma compactação interrompida antes de ler os CSVs
+        if os.path.exists(ARQUIVO_DIARIO):  # Alterações ainda fora dos CSVs
+            armazenamento.compactar()  # Os CSVs passam a ter o estado completo
+        verificador = VerificadorIntegridade(ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_PAGAMENTOS).verificar(processos)  # Itens somados em paralelo
+        verificador.imprimir()  # Relatório
+        problemas = sum(verificador.quantidade.values())  # Total encontrado
+        if reparar and verificador.corrigiveis():  # Há o que corrigir
+            armazenamento.substituir_snapshots(verificador.reparar(sequencias, ARQUIVO_ITENS_ORFAOS))  # Troca à prova de queda
+            cache.invalidar('repositorio')  # Relê os pedidos corrigidos
+            if verificador.orfaos:  # Itens retirados
+                print(f"\n📄 Itens órfãos movidos para '{ARQUIVO_ITENS_ORFAOS}'.")  # Onde ficaram
+            print(f"\n🔧 {verificador.corrigiveis()} problema(s) corrigido(s).")  # Resultado
+            problemas -= verificador.corrigiveis()  # Restam só os de relatório
+    return problemas  # Problemas que continuam nos dados
+
+def gerar_novo_id_pedido(repositorio):  # Define a função para auto-incremento de ID de pedido
+    """Gera o próximo ID sequencial para pedidos (O(1), único entre terminais)."""
+    sequencias.garantir_minimo('pedido', repositorio.maior_id_pedido)  # Nunca abaixo do maior ID já gravado
+    return sequencias.proximo('pedido')  # Próximo número do contador persistente
+
+def gerar_novo_id_pagamento(repositorio):  # Define a função para auto-incremento de ID de pagamentos
+    """Gera o próximo ID sequencial para pagamentos (O(1), único entre terminais)."""
+    sequencias.garantir_minimo('pagamento', repositorio.maior_id_pagamento)  # Nunca abaixo do maior ID já gravado
+    return sequencias.proximo('pagamento')  # Próximo número do contador persistente
+
+def gerar_novo_id_item(repositorio):  # Define a função para auto-incremento de ID de itens
+    """Gera o próximo ID sequencial para itens (O(1), único entre terminais)."""
+    sequencias.garantir_minimo('item', repositorio.maior_id_item)  # Nunca abaixo do maior ID já gravado
+    return sequencias.proximo('item')  # Próximo número (de um bloco já reservado no disco)
 
 def carregar_produtos():  # Define a função para carregar o catálogo de produtos
-    """Carrega todos os produtos do arquivo CSV de produtos (BD)."""
+    """Carrega todos os produtos do arquivo CSV de produtos (BD), usando o cache."""
+    if BACKEND_ATIVO == BACKEND_SQLITE:  # Produtos importados para o banco
+        return cache.obter('produtos', ARQUIVOS_REPOSITORIO, ler_produtos_banco)  # Só relê se o banco mudou
     if not os.path.exists(ARQUIVO_PRODUTOS):  # Se o arquivo de estoque não existir
         print(f"\n❌ Erro: Arquivo de produtos '{ARQUIVO_PRODUTOS}' não encontrado.")  # Exibe erro
-        return {}  # Retorna dicionário vazio
-    
+        return CatalogoProdutos({})  # Retorna catálogo vazio
+    return cache.obter('produtos', [ARQUIVO_PRODUTOS], ler_produtos)  # Só relê o CSV se ele mudou no disco
+
+def ler_produtos():  # Define a função que interpreta o CSV de produtos
+    """Lê o arquivo CSV de produtos e monta o catálogo indexado por código e nome."""
     produtos = {}  # Inicializa dicionário de produtos
     with open(ARQUIVO_PRODUTOS, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Abre o estoque
         leitor = csv.DictReader(f)  # Lê o CSV
         for linha in leitor:  # Percorre cada linha do estoque
             produtos[linha['Código']] = linha  # Armazena usando o 'Código' como chave do dicionário
-    return produtos  # Retorna o catálogo carregado
+    return CatalogoProdutos(produtos)  # Retorna o catálogo com os índices montados
+
+def ler_produtos_banco():  # Define a função que lê os produtos do banco SQLite
+    """Lê a tabela de produtos do banco e monta o catálogo indexado por código e nome."""
+    produtos = {p['Código']: p for p in armazenamento.carregar('produtos')}  # Mesmo formato do CSV
+    if not produtos:  # Banco ainda sem produtos
+        print("\n❌ Erro: Nenhum produto no banco. Execute com --importar-produtos para importar o produtos.csv.")  # Exibe erro
+    return CatalogoProdutos(produtos)  # Retorna o catálogo com os índices montados
+
+def importar_csv_para_sqlite(forcar=False):  # Importação única dos CSVs para o banco
+    """Copia pedidos (snapshot + diário), itens, pagamentos e produtos dos CSVs para o banco SQLite; retorna False se recusou sobrescrever pedidos já gravados no banco."""
+    origem, _ = criar_armazenamento(BACKEND_CSV)  # Lê com o motor de diário (inclui alterações não compactadas)
+    destino, _ = criar_armazenamento(BACKEND_SQLITE)  # Cria o banco e as tabelas
+    tabelas = ('cabecalhos', 'itens', 'pagamentos')  # Tabelas de pedidos
+    ocupadas = {nome: destino.quantidade(nome) for nome in tabelas if destino.quantidade(nome)}  # Tabelas que já têm dados no banco
+    if ocupadas and not forcar:  # O banco já está em uso: os CSVs podem estar desatualizados
+        print(f"❌ O banco '{ARQUIVO_BANCO}' já tem pedidos ({', '.join(f'{nome}: {total} linha(s)' for nome, total in ocupadas.items())}); nada foi importado.")  # Avisa
+        print("Para só atualizar os produtos, use --importar-produtos. Para substituir os pedidos do banco pelos dos CSVs, use --importar-csv --forcar.")  # Orienta
+        return False  # Nada foi alterado
+    for nome in tabelas:  # Tabelas de pedidos
+        tuplas = origem.carregar(nome, tuple)  # Linhas como tuplas de texto
+        destino.substituir(nome, tuplas)  # Grava tudo numa transação
+        print(f"{nome}: {len(tuplas)} linha(s) importada(s).")  # Informa o resultado
+    importar_produtos_para_sqlite(destino)  # Produtos vêm do CSV de estoque
+    print(f"\n✅ Dados importados para '{ARQUIVO_BANCO}'. Use --backend {BACKEND_SQLITE} para trabalhar com o banco.")  # Confirma
+    return True  # Importado
+
+def importar_produtos_para_sqlite(destino=None):  # Atualização do catálogo no banco
+    """Substitui só a tabela de produtos do banco SQLite pelo produtos.csv (pedidos, itens e pagamentos não são tocados)."""
+    destino = destino or criar_armazenamento(BACKEND_SQLITE)[0]  # Banco (criado se ainda não existir)
+    if not os.path.exists(ARQUIVO_PRODUTOS):  # Sem CSV de estoque
+        print(f"❌ Erro: Arquivo de produtos '{ARQUIVO_PRODUTOS}' não encontrado.")  # Exibe erro
+        return 0  # Nada importado
+    with open(ARQUIVO_PRODUTOS, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Abre o estoque
+        tuplas = [tuple(linha.get(c) or '' for c in CAMPOS_PRODUTOS) for linha in csv.DictReader(f)]  # Mesma ordem de colunas
+    destino.substituir('produtos', tuplas)  # Grava tudo numa transação
+    cache.invalidar('produtos')  # O catálogo em memória veio do banco antigo
+    print(f"produtos: {len(tuplas)} linha(s) importada(s).")  # Informa o resultado
+    return len(tuplas)  # Produtos importados
 
 def selecionar_opcao(titulo, opcoes):  # Função utilitária para menus numéricos
     """Exibe um menu de opções e força o usuário a escolher uma opção válida."""
@@ -124,24 +344,22 @@ def solicitar_data_hora_entrega():  # Função para validar agendamento
         
         try:  # Tenta processar as strings
             data_hora = datetime.strptime(f"{data_str} {hora_str}", "%d-%m-%Y %H:%M")  # Converte para objeto datetime
-            if data_hora < datetime.now() - timedelta(minutes=1):   # Compara com o horário atual (com margem de 1min)
-                print("⚠️ A data e hora de entrega não podem ser no passado.")  # Bloqueia datas passadas
-                continue  # Reinicia o loop
-            return data_hora.strftime("%d-%m-%Y %H:%M")  # Retorna a data formatada como string
         except ValueError:  # Se o formato estiver errado
             print("⚠️ Formato de data ou hora inválido. Use DD-MM-AAAA e HH:MM.")  # Avisa o formato correto
+            continue  # Reinicia o loop
+        try:  # Aplica a regra única de agendamento (mesma da importação em lote)
+            validar_data_entrega(data_hora)  # Não pode ser no passado
+        except ValueError as erro:  # Data passada
+            print(f"⚠️ {erro}")  # Bloqueia datas passadas
+            continue  # Reinicia o loop
+        return data_hora.strftime("%d-%m-%Y %H:%M")  # Retorna a data formatada como string
 
 def solicitar_data_limite_pagamento(data_pedido_str, status_pagamento):  # Função para controlar prazos de pagamento
     """Solicita a data esperada para o pagamento, validando limite de 30 dias."""
     DATA_FORMATO_PARSING = "%d-%m-%Y"  # Formato para entrada do usuário
-    DATA_FORMATO_DATETIME = "%d-%m-%Y %H:%M"  # Formato para ler do sistema
-    
-    try:  # Tenta extrair a data do pedido
-        data_base_pedido = datetime.strptime(data_pedido_str, DATA_FORMATO_DATETIME).date()  # Converte string para objeto date
-    except ValueError:  # Se falhar (formato antigo ou vazio)
-        data_base_pedido = datetime.now().date()  # Usa a data de hoje como base
-        
-    data_limite = data_base_pedido + timedelta(days=30)  # Calcula 30 dias à frente do pedido
+    data_pedido = ler_data_hora(data_pedido_str)  # Data do pedido (texto se estiver em formato antigo ou vazio)
+    data_base_pedido = data_pedido.date() if isinstance(data_pedido, datetime) else datetime.now().date()  # Sem data válida, usa hoje como base
+    data_limite = data_base_pedido + timedelta(days=PRAZO_MAXIMO_PAGAMENTO_DIAS)  # Calcula 30 dias à frente do pedido
     
     while True:  # Loop de validação de prazo
         prompt_status = "restante" if status_pagamento == 'Parcial' else ""  # Ajusta o texto conforme o status
@@ -149,79 +367,76 @@ def solicitar_data_limite_pagamento(data_pedido_str, status_pagamento):  # Funç
             f"Digite a Data Esperada para o Pagamento {prompt_status} (Máx: {data_limite.strftime(DATA_FORMATO_PARSING)}, DD-MM-AAAA): "
         )
         
-        try:  # Valida a entrada
-            data_esperada = datetime.strptime(data_str, DATA_FORMATO_PARSING).date()  # Converte entrada
-            data_atual = datetime.now().date()  # Pega data atual
-            
-            if data_esperada < data_atual:  # Verifica se não é passado
-                print("⚠️ A data esperada deve ser hoje ou no futuro.")  # Avisa o usuário
-                continue  # Reinicia
-            
-            if data_esperada > data_limite:  # Verifica se respeita o limite de 30 dias
-                print(f"⚠️ A data de pagamento não pode ultrapassar 30 dias após o pedido ({data_limite.strftime(DATA_FORMATO_PARSING)}).")  # Avisa limite
-                continue  # Reinicia
-            
-            return data_str  # Retorna a data validada
+        try:  # Converte a entrada
+            data_esperada = datetime.strptime(data_str, DATA_FORMATO_PARSING)  # Converte entrada
         except ValueError:  # Se digitar errado
             print("⚠️ Formato de data inválido. Use DD-MM-AAAA.")  # Avisa formato
+            continue  # Reinicia
+        try:  # Aplica a regra única de prazo (mesma da importação em lote)
+            validar_data_vencimento(data_pedido, data_esperada)  # Hoje ou depois, até 30 dias após o pedido
+        except ValueError as erro:  # Fora do prazo permitido
+            print(f"⚠️ {erro}")  # Avisa o motivo
+            continue  # Reinicia
+        return data_str  # Retorna a data validada
 
-def registrar_pagamento_parcial(cabecalho_alvo):  # Função para abater valores de uma dívida
-    """Permite registrar um novo pagamento para um pedido parcial."""
+def lancar_pagamento(repositorio, pedido, valor, forma_pagamento):  # Acrescenta um recebimento ao histórico
+    """Lança o pagamento no histórico do pedido; o valor pago e a data passam a refletir a soma dos lançamentos."""
+    repositorio.registrar_pagamento(pedido, Pagamento(  # Só acréscimo (nunca sobrescreve um pagamento anterior)
+        id_pagamento=gerar_novo_id_pagamento(repositorio),
+        id_pedido=pedido.id_pedido,
+        valor=valor,
+        forma_pagamento=forma_pagamento,
+        data_pagamento=datetime.now().replace(second=0, microsecond=0)
+    ))
+
+def registrar_pagamento_parcial(pedido, repositorio):  # Função para abater valores de uma dívida
+    """Permite registrar um novo pagamento para um pedido parcial (valores exatos em centavos), guardado no histórico."""
     while True:  # Loop para entrada de valor
-        try:  # Início do cálculo financeiro
-            valor_total = float(cabecalho_alvo['Valor Total (R$)'])  # Pega o custo total do pedido
-            valor_pago_atual = float(cabecalho_alvo.get('Valor Pago (R$)', '0.00'))   # Pega o que já foi pago
-            valor_restante = valor_total - valor_pago_atual  # Calcula a dívida atual
+        valor_restante = pedido.saldo  # Calcula a dívida atual (total - pago, em centavos)
 
-            print(f"\nTotal do Pedido: R$ {valor_total:.2f}")  # Mostra total
-            print(f"Valor já Pago: R$ {valor_pago_atual:.2f}")  # Mostra pago
-            print(f"Valor Restante: R$ {valor_restante:.2f}")  # Mostra o que falta
+        print(f"\nTotal do Pedido: {formatar_reais(pedido.valor_total)}")  # Mostra total
+        print(f"Valor já Pago: {formatar_reais(pedido.valor_pago)}")  # Mostra pago
+        print(f"Valor Restante: {formatar_reais(valor_restante)}")  # Mostra o que falta
 
-            if valor_restante <= 0:  # Se não houver dívida
-                print("\n✅ O valor restante é R$ 0,00. O status já está como 'Pago'.")  # Informa sucesso
-                return  # Sai da função
+        if valor_restante <= 0:  # Se não houver dívida
+            print("\n✅ O valor restante é R$ 0,00. O status já está como 'Pago'.")  # Informa sucesso
+            return  # Sai da função
 
-            novo_pagamento = float(input("Digite o valor do novo pagamento (R$): "))  # Pede novo valor
+        try:  # Converte o valor digitado
+            novo_pagamento = ler_valor_digitado(input("Digite o valor do novo pagamento (R$): "))  # Pede novo valor (em centavos, sem float)
+        except ValueError:  # Se digitar letras no valor
+            print("⚠️ Entrada inválida. Digite um valor numérico.")  # Pede números
+            continue  # Reinicia
 
-            if novo_pagamento <= 0:  # Bloqueia valores negativos ou zero
-                print("⚠️ O valor do pagamento deve ser positivo.")  # Avisa o erro
-                continue  # Reinicia
+        try:  # Aplica a regra única de pagamento (positivo e sem exceder o saldo)
+            validar_pagamento(pedido.valor_total, pedido.valor_pago, novo_pagamento)  # Soma exata
+        except ValueError as erro:  # Pagamento inválido
+            print(f"⚠️ {erro}")  # Avisa o motivo
+            continue  # Reinicia
 
-            novo_valor_pago = valor_pago_atual + novo_pagamento  # Soma o novo pagamento ao anterior
+        forma = pedido.forma_pagamento  # Recebido pela forma combinada na venda
+        if forma not in FORMAS_RECEBIMENTO:  # Venda a prazo: pergunta como o dinheiro entrou
+            forma = selecionar_opcao("Forma deste pagamento", FORMAS_RECEBIMENTO)  # Pix ou Dinheiro
+        lancar_pagamento(repositorio, pedido, novo_pagamento, forma)  # Acrescenta ao histórico (atualiza valor pago e data)
+        novo_valor_pago = pedido.valor_pago  # Soma dos pagamentos do pedido
+        pedido.status_pagamento = status_por_valores(pedido.valor_total, novo_valor_pago)  # 'Pago' se quitou, senão 'Parcial'
 
-            if novo_valor_pago > valor_total + 0.01:   # Verifica se não está pagando a mais que o total (margem de erro de centavos)
-                print(f"⚠️ O novo valor excede o total. O máximo permitido para completar é R$ {valor_restante:.2f}.")  # Avisa excesso
-                continue  # Reinicia
-            
-            cabecalho_alvo['Valor Pago (R$)'] = f"{novo_valor_pago:.2f}"  # Atualiza o dicionário com o novo total pago
-            
-            if novo_valor_pago >= valor_total:  # Se quitou a dívida
-                cabecalho_alvo['Status do Pagamento'] = 'Pago'  # Muda status para pago
-                cabecalho_alvo['Data do Pagamento'] = datetime.now().strftime("%d-%m-%Y %H:%M")  # Registra data da quitação
-                cabecalho_alvo['Data Vencimento Prazo'] = "" # Limpa o prazo pois já foi pago
-                print("\n✅ Pagamento completado! Status alterado para 'Pago'.")  # Avisa conclusão
-            else:  # Se ainda falta dinheiro
-                cabecalho_alvo['Status do Pagamento'] = 'Parcial'  # Mantém/Define como parcial
-                cabecalho_alvo['Data do Pagamento'] = datetime.now().strftime("%d-%m-%Y %H:%M")   # Atualiza data do último pagamento
-                print(f"\n✅ R$ {novo_pagamento:.2f} registrado. Novo valor pago: R$ {novo_valor_pago:.2f}")  # Mostra progresso
-            
-            return  # Finaliza a função com sucesso
+        if pedido.status_pagamento == 'Pago':  # Se quitou a dívida
+            pedido.data_vencimento = None  # Limpa o prazo pois já foi pago
+            print("\n✅ Pagamento completado! Status alterado para 'Pago'.")  # Avisa conclusão
+        else:  # Se ainda falta dinheiro
+            print(f"\n✅ {formatar_reais(novo_pagamento)} registrado. Novo valor pago: {formatar_reais(novo_valor_pago)}")  # Mostra progresso
         
-        except ValueError:  # Se digitar letras no valor
-            print("⚠️ Entrada inválida. Digite um valor numérico.")  # Pede números
+        return  # Finaliza a função com sucesso
 
-def calcular_valor_total_pedido(id_pedido_alvo, todos_itens):  # Função para somar os itens
-    """Calcula a soma total de todos os itens de um pedido específico."""
-    total = 0.0  # Inicializa soma
-    for item in todos_itens:  # Percorre a lista global de itens
-        if item['ID do Pedido'] == str(id_pedido_alvo):  # Se o item pertencer ao pedido em questão
-            total += float(item['Valor Item (R$)'])  # Acumula o valor do item no total
-    return total  # Retorna o valor final somado
+def calcular_valor_total_pedido(id_pedido_alvo, repositorio):  # Função para somar os itens
+    """Calcula a soma total (em centavos) de todos os itens de um pedido específico."""
+    return somar(item.valor_item for item in repositorio.itens_do_pedido(id_pedido_alvo))  # Soma exata dos itens do pedido (índice)
 
-def adicionar_item_a_pedido(id_pedido_alvo, todos_itens, produtos_disponiveis):  # Interface de gestão de itens
+def adicionar_item_a_pedido(id_pedido_alvo, repositorio, produtos_disponiveis):  # Interface de gestão de itens
     """Permite listar, adicionar, remover e EDITAR quantidade e tipo (UN/CX)."""
     while True:  # Loop do menu interno de itens
-        itens_atuais = [item for item in todos_itens if item['ID do Pedido'] == str(id_pedido_alvo)]  # Filtra itens desse pedido
+        itens_atuais = repositorio.itens_do_pedido(id_pedido_alvo)  # Busca os itens desse pedido no índice
         
         print("\n" + "─"*60)  # Linha decorativa
         print(f"📦 ITENS NO PEDIDO #{id_pedido_alvo}")  # Título
@@ -254,14 +469,14 @@ def adicionar_item_a_pedido(id_pedido_alvo, todos_itens, produtos_disponiveis):
                 if 0 <= idx < len(itens_atuais):  # Valida o índice
                     item_editando = itens_atuais[idx]  # Seleciona o item para edição
                     
-                    nome_limpo = item_editando['Produto'].replace(" (UN)", "").replace(" (CX)", "").strip()  # Remove sufixos para achar o nome base
-                    
-                    prod_info = next((info for info in produtos_disponiveis.values() if info['Nome do Produto'] == nome_limpo), None)  # Busca dados originais no estoque
+                    prod_info, _ = produtos_disponiveis.resolver_item(item_editando)  # Busca O(1) pelo código gravado no item (ou pelo nome, em itens antigos)
                     
                     if not prod_info:  # Se o produto sumiu do estoque
                         print("❌ Produto base não encontrado no estoque para recalcular.")  # Avisa erro
                         continue  # Reinicia
 
+                    nome_limpo = prod_info['Nome do Produto']  # Nome base do produto conforme o catálogo
+
                     print(f"\nEditando: {nome_limpo}")  # Mostra o que está editando
                     print("1. Mudar para UNIDADE (R$ " + prod_info['Valor Unidade (R$)'] + ")")  # Opção UN
                     print("2. Mudar para CAIXA (R$ " + prod_info['Valor Caixa (R$)'] + ")")  # Opção CX
@@ -273,16 +488,16 @@ def adicionar_item_a_pedido(id_pedido_alvo, todos_itens, produtos_disponiveis):
                         print("❌ Quantidade inválida.")  # Avisa erro
                         continue  # Reinicia
 
-                    if tipo_venda == '1':  # Se for unidade
-                        preco = float(prod_info['Valor Unidade (R$)'])  # Pega preço unitário
-                        novo_nome = f"{nome_limpo} (UN)"  # Define novo nome com sufixo
-                    else:  # Se for caixa
-                        preco = float(prod_info['Valor Caixa (R$)'])  # Pega preço da caixa
-                        novo_nome = f"{nome_limpo} (CX)"  # Define novo nome com sufixo
+                    tipo = TIPO_UNIDADE if tipo_venda == '1' else TIPO_CAIXA  # Define o tipo de venda escolhido
+                    preco = produtos_disponiveis.preco_centavos(prod_info, tipo)  # Pega o preço do tipo escolhido (centavos)
+                    novo_nome = f"{nome_limpo} ({tipo})"  # Define novo nome com sufixo
 
-                    item_editando['Produto'] = novo_nome  # Atualiza o nome do produto no item
-                    item_editando['Quantidade'] = str(nova_qtd)  # Atualiza a quantidade
-                    item_editando['Valor Item (R$)'] = f"{(nova_qtd * preco):.2f}"  # Recalcula o subtotal do item
+                    item_editando.produto = novo_nome  # Atualiza o nome do produto no item
+                    item_editando.codigo_produto = prod_info['Código']  # Guarda o código (edições futuras não precisam interpretar o nome)
+                    item_editando.tipo_venda = tipo  # Guarda o tipo de venda como campo próprio
+                    item_editando.quantidade = nova_qtd  # Atualiza a quantidade
+                    item_editando.valor_item = multiplicar(nova_qtd, preco)  # Recalcula o subtotal do item (exato, em centavos)
+                    repositorio.marcar_item_alterado(item_editando)  # Marca o item para gravação
                     
                     print(f"✅ Item atualizado: {novo_nome} x {nova_qtd}!")  # Confirma edição
                 else:  # Se o número da linha for inválido
@@ -300,33 +515,41 @@ def adicionar_item_a_pedido(id_pedido_alvo, todos_itens, produtos_disponiveis):
                 p = produtos_disponiveis[codigo]  # Pega dados do produto
                 t = input("1. Unidade | 2. Caixa: ")  # Pede tipo
                 q = int(input("Quantidade: "))  # Pede quantidade
-                pr = float(p['Valor Unidade (R$)']) if t == '1' else float(p['Valor Caixa (R$)'])  # Define preço baseado no tipo
-                nm = f"{p['Nome do Produto']} ({'UN' if t == '1' else 'CX'})"  # Define nome com sufixo
-                todos_itens.append({  # Adiciona novo dicionário à lista global de itens
-                    'ID do Pedido': str(id_pedido_alvo), 
-                    'ID do Item': str(gerar_novo_id_item(todos_itens)), # Gera ID único para o item
-                    'Produto': nm, 
-                    'Quantidade': str(q), 
-                    'Valor Item (R$)': f"{(q*pr):.2f}"
-                })
+                tipo = TIPO_UNIDADE if t == '1' else TIPO_CAIXA  # Define o tipo de venda
+                pr = produtos_disponiveis.preco_centavos(p, tipo)  # Define preço baseado no tipo (centavos)
+                nm = f"{p['Nome do Produto']} ({tipo})"  # Define nome com sufixo
+                repositorio.adicionar_item(ItemPedido(  # Adiciona novo item tipado à lista global de itens e aos índices
+                    id_pedido=int(id_pedido_alvo), 
+                    id_item=gerar_novo_id_item(repositorio), # Gera ID único para o item
+                    produto=nm, 
+                    quantidade=q, 
+                    valor_item=multiplicar(q, pr),  # Subtotal exato em centavos
+                    codigo_produto=codigo,  # Código do produto como campo estruturado
+                    tipo_venda=tipo  # Tipo de venda (UN/CX) como campo estruturado
+                ))
             else:  # Código inexistente
                 print("❌ Código inválido.")  # Avisa erro
 
         elif acao == 'R':  # Se escolher remover
             try:  # Tenta remover
                 idx = int(input("Linha para remover: ")) - 1  # Pede linha
-                todos_itens.remove(itens_atuais[idx])  # Remove o item da lista global
+                repositorio.remover_item(itens_atuais[idx])  # Remove o item da lista global e dos índices
                 print("🗑️ Item removido.")  # Confirma
             except:  # Qualquer erro na remoção
                 print("❌ Erro ao remover.")  # Avisa falha
 
-def visualizar_detalhes_cliente(pedidos_cliente, todos_itens):  # Função para ver o "espelho" do pedido
+def descartar_itens_do_pedido(id_pedido_alvo, repositorio):  # Função para limpar itens de um pedido abortado
+    """Remove da memória os itens de um pedido que não chegou a ser registrado."""
+    for item in repositorio.itens_do_pedido(id_pedido_alvo):  # Percorre os itens do pedido pelo índice
+        repositorio.remover_item(item)  # Remove da lista e dos índices
+
+def visualizar_detalhes_cliente(pedidos_cliente, repositorio):  # Função para ver o "espelho" do pedido
     """Permite escolher um pedido da lista do cliente para ver detalhes e itens."""
     id_escolhido = input("\nDigite o ID do pedido que deseja ver detalhes: ").strip()  # Pede o ID
     
-    pedido = next((p for p in pedidos_cliente if p['ID do Pedido'] == id_escolhido), None)  # Busca o pedido na lista do cliente
+    pedido = repositorio.obter_pedido(id_escolhido)  # Busca o pedido no índice por ID
     
-    if pedido:  # Se o pedido foi encontrado
+    if pedido and pedido in pedidos_cliente:  # Se o pedido foi encontrado e pertence a este cliente
         print("\n" + "═"*50)  # Decorativo
         print(f"      DETALHES DO PEDIDO #{id_escolhido}")  # Título
         print("═"*50)  # Decorativo
@@ -335,7 +558,7 @@ def visualizar_detalhes_cliente(pedidos_cliente, todos_itens):  # Função para
         
         print("-" * 50)  # Divisor
         print("ITENS DO PEDIDO:")  # Título da sublista
-        itens_pedido = [item for item in todos_itens if item['ID do Pedido'] == id_escolhido]  # Filtra itens desse pedido
+        itens_pedido = repositorio.itens_do_pedido(id_escolhido)  # Busca os itens desse pedido no índice
         
         if itens_pedido:  # Se houver itens
             for item in itens_pedido:  # Percorre itens
@@ -347,14 +570,29 @@ def visualizar_detalhes_cliente(pedidos_cliente, todos_itens):  # Função para
     else:  # ID digitado não pertence a este cliente ou não existe
         print("\n❌ ID não encontrado na lista deste cliente.")  # Avisa erro
 
-def adicionar_pedido(cabecalhos, todos_itens, nome_sugerido=None):  # Função de criação de venda
+def visualizar_arquivados_cliente(nome_cliente, repositorio):  # Histórico quitado do cliente
+    """Lista os pedidos arquivados do cliente com os itens, lendo só as partições em que ele aparece."""
+    ativos = {str(pedido.id_pedido) for pedido in repositorio.pedidos_do_cliente(nome_cliente)}  # Pedidos ainda nos CSVs ativos
+    arquivados = historico.pedidos_do_cliente(nome_cliente, excluir=ativos)  # [(pedido, itens)] das partições do cliente
+    print(f"\n--- PEDIDOS ARQUIVADOS DE {nome_cliente.upper()} ({len(arquivados)}) ---")  # Título
+    if not arquivados:  # Nada arquivado
+        print("Nenhum pedido arquivado para este cliente.")  # Avisa
+        return  # Volta ao painel
+    for pedido, itens in arquivados:  # Em ordem de data
+        print(f"\n#{pedido.id_pedido} | {pedido['Data do Pedido']} | Total {formatar_reais(pedido.valor_total)} | {pedido.forma_pagamento} | pago em {pedido['Data do Pagamento'] or '-'}")  # Cabeçalho
+        for item in itens:  # Itens do pedido
+            print(f"   • {item['Produto']} | Qtd: {item['Quantidade']} | Subtotal: R$ {item['Valor Item (R$)']}")  # Linha do item
+    print(f"\nTotal comprado (arquivado): {formatar_reais(somar(pedido.valor_total for pedido, _ in arquivados))}")  # Resumo
+    input("\nPressione Enter para voltar ao painel...")  # Pausa a tela
+
+def adicionar_pedido(repositorio, nome_sugerido=None):  # Função de criação de venda
     """Lança um novo pedido, permitindo nome automático ou manual."""
     produtos_disponiveis = carregar_produtos()  # Carrega o estoque atualizado
     if not produtos_disponiveis:  # Se não houver estoque disponível
         return  # Aborta a criação do pedido
 
-    novo_id = gerar_novo_id_pedido(cabecalhos)  # Gera o ID para a nova venda
-    data_pedido = datetime.now().strftime("%d-%m-%Y %H:%M")  # Define a data da venda agora
+    novo_id = gerar_novo_id_pedido(repositorio)  # Gera o ID para a nova venda
+    data_pedido = datetime.now().replace(second=0, microsecond=0)  # Define a data da venda agora
     
     if nome_sugerido:  # Se a função recebeu um nome pronto (da gestão de clientes)
         nome_cliente = nome_sugerido  # Usa o nome sugerido
@@ -363,81 +601,72 @@ def adicionar_pedido(cabecalhos, todos_itens, nome_sugerido=None):  # Função d
         nome_cliente = input("\nNome do Cliente: ")  # Pede o nome
 
     try:  # Tenta realizar o processo de venda
-        adicionar_item_a_pedido(novo_id, todos_itens, produtos_disponiveis)  # Abre a interface de inclusão de itens
+        adicionar_item_a_pedido(novo_id, repositorio, produtos_disponiveis)  # Abre a interface de inclusão de itens
         
-        valor_total = calcular_valor_total_pedido(novo_id, todos_itens)  # Soma tudo que foi incluído
-        if valor_total == 0.0:  # Se o usuário não adicionou nada e saiu
+        valor_total = calcular_valor_total_pedido(novo_id, repositorio)  # Soma tudo que foi incluído (centavos)
+        if valor_total == 0:  # Se o usuário não adicionou nada e saiu
             print("\n❌ Pedido sem itens. Cancelando operação.")  # Cancela o registro
+            descartar_itens_do_pedido(novo_id, repositorio)  # Retira itens sem valor que tenham ficado na memória
             return  # Aborta
 
         print(f"\n--- Finalizando Pedido ID {novo_id} ---")  # Início do fechamento financeiro
-        print(f"VALOR TOTAL: R$ {valor_total:.2f}")  # Mostra o valor total calculado
+        print(f"VALOR TOTAL: {formatar_reais(valor_total)}")  # Mostra o valor total calculado
 
         forma_pagamento = selecionar_opcao("Forma de Pagamento", OPCOES_FORMA_PAGAMENTO)  # Escolhe forma
         status_pagamento = selecionar_opcao("Status do Pagamento", OPCOES_STATUS_PAGAMENTO)  # Escolhe status financeiro
         status_pedido = selecionar_opcao("Status do Pedido", OPCOES_STATUS_PEDIDO)  # Escolhe status logístico
         
-        data_hora_entrega = ""  # Inicializa vazio
-        data_vencimento_prazo = ""  # Inicializa vazio
-        valor_pago = "0.00"  # Inicializa valor padrão
-        data_pagamento = ""  # Inicializa vazio
+        novo_pedido = Pedido(  # Monta o registro do pedido (valor pago começa zerado)
+            id_pedido=novo_id,
+            data_pedido=data_pedido,
+            nome_cliente=nome_cliente,
+            valor_total=valor_total,
+            forma_pagamento=forma_pagamento,
+            status_pagamento=status_pagamento,
+            status_pedido=status_pedido
+        )
         
         if status_pedido == 'Pendente':  # Se o pedido for para depois
-            data_hora_entrega = solicitar_data_hora_entrega()   # Pede agendamento
+            novo_pedido['Data/Hora Entrega'] = solicitar_data_hora_entrega()   # Pede agendamento
 
         if status_pagamento == 'Pago':  # Se já pagou tudo
-            valor_pago = f"{valor_total:.2f}"  # Valor pago é igual ao total
-            data_pagamento = datetime.now().strftime("%d-%m-%Y %H:%M")  # Data do pagamento é agora
+            forma_recebimento = forma_pagamento  # Recebido pela forma combinada na venda
+            if forma_recebimento not in FORMAS_RECEBIMENTO:  # Venda a prazo quitada no ato: pergunta como o dinheiro entrou
+                forma_recebimento = selecionar_opcao("Forma deste pagamento", FORMAS_RECEBIMENTO)  # Pix ou Dinheiro
+            lancar_pagamento(repositorio, novo_pedido, valor_total, forma_recebimento)  # Um pagamento do valor total, com data de agora
             
         elif status_pagamento == 'Parcial':  # Se deu uma entrada
             print("\n--- REGISTRO INICIAL DE PAGAMENTO PARCIAL ---")  # Título
-            temp_cabecalho = {'Valor Total (R$)': f"{valor_total:.2f}", 'Valor Pago (R$)': '0.00'}  # Cria objeto temporário
-            registrar_pagamento_parcial(temp_cabecalho)  # Chama função de abatimento
-            
-            valor_pago = temp_cabecalho['Valor Pago (R$)']  # Extrai o valor pago final do temporário
-            data_pagamento = temp_cabecalho.get('Data do Pagamento', "")  # Pega data do registro
-            status_pagamento = temp_cabecalho['Status do Pagamento']  # Pega status (pode ter virado 'Pago')
+            registrar_pagamento_parcial(novo_pedido, repositorio)  # Registra a entrada no histórico (atualiza valor pago, status e data)
 
-            if status_pagamento == 'Parcial':  # Se após o pagamento ainda faltar dinheiro
+            if novo_pedido.status_pagamento == 'Parcial':  # Se após o pagamento ainda faltar dinheiro
                 print("\n--- REGISTRO DE DATA ESPERADA PARA PAGAMENTO RESTANTE ---")  # Título
-                data_vencimento_prazo = solicitar_data_limite_pagamento(data_pedido, status_pagamento)  # Pede prazo de 30 dias
+                novo_pedido['Data Vencimento Prazo'] = solicitar_data_limite_pagamento(novo_pedido['Data do Pedido'], 'Parcial')  # Pede prazo de 30 dias
 
         elif status_pagamento == 'Pendente':  # Se não pagou nada (venda fiado/prazo)
-            valor_pago = "0.00"  # Zerado
             print("\n--- REGISTRO DE DATA ESPERADA PARA PAGAMENTO TOTAL ---")  # Título
-            data_vencimento_prazo = solicitar_data_limite_pagamento(data_pedido, status_pagamento)  # Pede prazo
+            novo_pedido['Data Vencimento Prazo'] = solicitar_data_limite_pagamento(novo_pedido['Data do Pedido'], status_pagamento)  # Pede prazo
         
-        novo_cabecalho = {  # Monta o dicionário final do pedido para o CSV
-            'ID do Pedido': str(novo_id),
-            'Data do Pedido': data_pedido,
-            'Nome do Cliente': nome_cliente,
-            'Valor Total (R$)': f"{valor_total:.2f}",
-            'Valor Pago (R$)': valor_pago,
-            'Forma de Pagamento': forma_pagamento,
-            'Status do Pagamento': status_pagamento,
-            'Data do Pagamento': data_pagamento,
-            'Data Vencimento Prazo': data_vencimento_prazo,
-            'Status do Pedido': status_pedido,
-            'Data/Hora Entrega': data_hora_entrega
-        }
-        
-        cabecalhos.append(novo_cabecalho)  # Adiciona à lista em memória
-        salvar_cabecalhos(cabecalhos)  # Salva tudo no arquivo de cabeçalhos
-        salvar_itens(todos_itens)  # Salva todos os itens (incluindo os novos)
-        print("\n✅ Pedido registrado com sucesso!")  # Feedback
+        repositorio.adicionar_pedido(novo_pedido)  # Adiciona à lista em memória e aos índices
+        if salvar_repositorio(repositorio):  # Grava o novo cabeçalho e os novos itens
+            print("\n✅ Pedido registrado com sucesso!")  # Feedback
         
     except Exception as e:  # Captura qualquer erro inesperado
+        descartar_itens_do_pedido(novo_id, repositorio)  # Não deixa itens sem cabeçalho na memória
+        repositorio.descartar_pagamentos_novos(novo_id)  # Nem pagamentos de um pedido que não foi registrado
         print(f"\n❌ Ocorreu um erro inesperado: {e}")  # Exibe erro para depuração
 
-def editar_pedido(cabecalhos, todos_itens):  # Função de manutenção de pedidos existentes
+def editar_pedido(repositorio):  # Função de manutenção de pedidos existentes
     """Edita um pedido existente com recálculo automático de valores."""
     id_pedido = input("\nDigite o ID do pedido que deseja editar: ").strip()  # Pede o ID
     
-    pedido = next((p for p in cabecalhos if p['ID do Pedido'] == id_pedido), None)  # Tenta localizar o pedido
+    pedido = repositorio.obter_pedido(id_pedido)  # Localiza o pedido no índice por ID
     
     if not pedido:  # Se não achar
         print(f"❌ Pedido ID {id_pedido} não encontrado.")  # Avisa erro
         return  # Sai
+    copia_cabecalho = pedido.copy()  # Guarda o cabeçalho original para o caso de cancelamento
+    copia_itens = [item.copy() for item in repositorio.itens_do_pedido(id_pedido)]  # Guarda os itens originais
     alterou_itens = False  # Flag para saber se precisaremos recalcular o total no fim
     while True:  # Menu de edição
         print(f"\n" + "═"*50)  # Decorativo
@@ -452,12 +681,12 @@ def editar_pedido(cabecalhos, todos_itens):  # Função de manutenção de pedid
         opcao = input("\nEscolha uma opção: ")  # Pede opção
 
         if opcao == '1':  # Editar produtos
-            adicionar_item_a_pedido(id_pedido, todos_itens, carregar_produtos())  # Abre interface de itens
+            adicionar_item_a_pedido(id_pedido, repositorio, carregar_produtos())  # Abre interface de itens
             alterou_itens = True  # Marca que o total financeiro pode ter mudado
             print("📝 Alteração de itens registrada.")  # Feedback
 
         elif opcao == '2':  # Dar baixa no pagamento
-            registrar_pagamento_parcial(pedido)  # Abre interface financeira
+            registrar_pagamento_parcial(pedido, repositorio)  # Abre interface financeira (lança no histórico)
 
         elif opcao == '3':  # Mudar status logístico
             novo_status = selecionar_opcao("Status do Pedido", OPCOES_STATUS_PEDIDO)  # Escolhe novo status
@@ -468,148 +697,358 @@ def editar_pedido(cabecalhos, todos_itens):  # Função de manutenção de pedid
         elif opcao == '4':  # Finalizar edições e salvar
             if alterou_itens:  # Se mexeu nos produtos
                 print("\n🔄 Recalculando valor total com base nos itens atualizados...")  # Título
-                novo_total = calcular_valor_total_pedido(id_pedido, todos_itens)  # Soma itens novamente
+                novo_total = calcular_valor_total_pedido(id_pedido, repositorio)  # Soma itens novamente (centavos)
                 
-                pedido['Valor Total (R$)'] = f"{novo_total:.2f}"  # Atualiza o custo total do pedido
+                pedido.valor_total = novo_total  # Atualiza o custo total do pedido
                 
-                valor_pago = float(pedido.get('Valor Pago (R$)', 0))  # Pega quanto o cliente já pagou
-                if valor_pago < novo_total:  # Se o que foi pago não cobre o novo total
-                    if pedido['Status do Pagamento'] == 'Pago':  # E o status era 'Pago'
-                        pedido['Status do Pagamento'] = 'Parcial'  # Rebaixa para parcial (deve dinheiro)
+                if pedido.valor_pago < novo_total:  # Se o que foi pago não cobre o novo total (comparação exata)
+                    if pedido.status_pagamento == 'Pago':  # E o status era 'Pago'
+                        pedido.status_pagamento = 'Parcial'  # Rebaixa para parcial (deve dinheiro)
                         print("⚠️ Alerta: O valor total aumentou. Status alterado para 'Parcial'.")  # Avisa
-                elif valor_pago >= novo_total and novo_total > 0:  # Se o novo total é menor ou igual ao que já foi pago
-                    pedido['Status do Pagamento'] = 'Pago'  # Garante status de quitado
+                elif novo_total > 0:  # Se o novo total é menor ou igual ao que já foi pago
+                    pedido.status_pagamento = 'Pago'  # Garante status de quitado
 
-            salvar_cabecalhos(cabecalhos)  # Grava no disco
-            salvar_itens(todos_itens)  # Grava no disco
-            print("\n✅ Alterações salvas com sucesso!")  # Feedback
+            repositorio.marcar_pedido_alterado(pedido)  # Marca o cabeçalho para gravação (a versão detecta edições de outro terminal)
+            if salvar_repositorio(repositorio):  # Grava no disco apenas o que mudou
+                print("\n✅ Alterações salvas com sucesso!")  # Feedback
             break  # Sai do menu de edição
 
-        elif opcao == '5':  # Desistir das mudanças (Nota: mudanças em itens são gravadas apenas no final nesta lógica)
+        elif opcao == '5':  # Desistir das mudanças (cabeçalho e itens voltam ao estado original)
+            repositorio.restaurar_pedido(pedido, copia_cabecalho, copia_itens)  # Desfaz as alterações em memória
+            salvar_repositorio(repositorio)  # Nada muda no disco; apenas limpa as marcas pendentes
             print("\nEdição descartada.")  # Feedback
             break  # Sai do menu
             
         else:  # Opção inválida
             print("\n⚠️ Opção inválida. Tente novamente.")  # Avisa erro
 
-def gerenciar_por_cliente(cabecalhos, todos_itens):  # Função principal de atendimento por pessoa
-    """Filtra pedidos por nome ou automatiza cadastro de novo cliente."""
-    nome_busca = input("\nDigite o nome do cliente para gerenciar: ").strip()  # Pede nome para buscar
+def escolher_cliente(repositorio, nome_busca):  # Desambiguação entre clientes parecidos
+    """Retorna o nome do cliente escolhido entre os mais parecidos com o texto (None = cadastrar novo ou desistir)."""
+    nome_por_id = repositorio.cliente_por_id(nome_busca)  # O texto pode ser o ID do cliente
+    if nome_por_id:  # ID conhecido
+        return nome_por_id  # Cliente exato
+    sugestoes = repositorio.clientes_semelhantes(nome_busca)  # Ranqueados (sem acentos, com erros de digitação)
+    if not sugestoes:  # Ninguém parecido
+        return None  # Oferece o cadastro
+    identico = sugestoes[0][3] >= PONTOS_IDENTICO  # O primeiro tem exatamente o nome digitado
+    if len(sugestoes) == 1 and identico:  # Um único cliente, com o nome exato
+        return sugestoes[0][1]  # Sem perguntar
+    print(f"\nClientes encontrados para '{nome_busca}':")  # Lista para escolha
+    for numero, (ident, nome, pedidos, _) in enumerate(sugestoes, 1):  # Do mais parecido para o menos
+        print(f"{numero}. {nome:<30} | ID {ident} | {pedidos} pedido(s)")  # Opção numerada
+    if not identico:  # O nome digitado pode ser de um cliente novo
+        print(f"0. Nenhum destes (cadastrar '{nome_busca}')")  # Opção de cadastro
+    escolha = input("Escolha o cliente (Enter = 1): ").strip() or '1'  # O mais parecido por padrão
+    if escolha.isdigit() and 1 <= int(escolha) <= len(sugestoes):  # Cliente da lista
+        return sugestoes[int(escolha) - 1][1]  # Nome do cliente escolhido
+    return None  # Cadastro (ou desistência)
+
+def gerenciar_por_cliente(repositorio):  # Função principal de atendimento por pessoa
+    """Localiza o cliente pelo nome (aproximado) ou pelo ID, ou automatiza o cadastro de novo cliente."""
+    nome_busca = input("\nDigite o nome (ou o ID) do cliente para gerenciar: ").strip()  # Pede nome para buscar
     
     if not nome_busca:  # Se enter vazio
         print("⚠️ Nome não pode ser vazio.")  # Avisa erro
         return  # Sai
 
-    pedidos_cliente = [p for p in cabecalhos if nome_busca.lower() in p['Nome do Cliente'].lower()]  # Filtra pedidos que contenham o texto digitado
+    nome_cliente = escolher_cliente(repositorio, nome_busca)  # Cliente escolhido entre os parecidos
+    nomes_encontrados = [nome_cliente] if nome_cliente else []  # Painel de um único cliente
+    pedidos_cliente = repositorio.pedidos_dos_clientes(nomes_encontrados)  # Pedidos do cliente pelo índice
     
-    if not pedidos_cliente:  # Se não achou ninguém com esse nome
+    if not pedidos_cliente:  # Se não achou (ou não escolheu) ninguém
         print(f"\n🟡 Cliente '{nome_busca}' não encontrado.")  # Avisa
         confirmar = input(f"Deseja cadastrar e lançar pedido para '{nome_busca}' agora? (S/N): ").upper()  # Sugere cadastro novo
         if confirmar == 'S':  # Se aceitar
-            adicionar_pedido(cabecalhos, todos_itens, nome_sugerido=nome_busca)  # Abre venda com esse nome
+            adicionar_pedido(repositorio, nome_sugerido=nome_busca)  # Abre venda com esse nome
             return  # Sai para atualizar dados
         else:  # Se recusar
             return  # Sai
 
-    nome_exato = pedidos_cliente[0]['Nome do Cliente']  # Pega o nome como está no cadastro para o título
+    nome_exato = nome_cliente  # Nome como está no cadastro para o título
+    id_exato = repositorio.id_do_cliente(nome_cliente)  # ID estável do cliente
     
     while True:  # Painel do cliente
-        total_devedor_acumulado = 0.0  # Soma das dívidas
+        resumo = repositorio.resumo_dos_clientes(nomes_encontrados)  # Contas a receber mantidas a cada alteração (sem somar os pedidos)
         print(f"\n" + "═"*75)  # Decorativo
-        print(f"    PAINEL DE GESTÃO: {nome_exato.upper()}")  # Título com nome do cliente
+        print(f"    PAINEL DE GESTÃO: {nome_exato.upper()} (ID {id_exato})")  # Título com nome e ID do cliente
         print("═"*75)  # Decorativo
         
         print(f"{'ID':<5} | {'DATA PEDIDO':<18} | {'TOTAL':<10} | {'SALDO':<10} | {'STATUS'}")  # Cabeçalho da tabela
         print("-" * 75)  # Divisor
         
         for p in pedidos_cliente:  # Lista cada pedido do cliente
-            v_total = float(p['Valor Total (R$)'])  # Pega total
-            v_pago = float(p.get('Valor Pago (R$)', '0.00'))  # Pega pago
-            saldo = v_total - v_pago  # Calcula quanto falta pagar
-            total_devedor_acumulado += saldo  # Soma ao total devedor do cliente
-            print(f"{p['ID do Pedido']:<5} | {p['Data do Pedido']:<18} | {v_total:<10.2f} | {saldo:<10.2f} | {p['Status do Pagamento']}")  # Linha formatada
+            print(f"{p.id_pedido:<5} | {p['Data do Pedido']:<18} | {centavos_para_texto(p.valor_total):<10} | {centavos_para_texto(p.saldo):<10} | {p.status_pagamento}")  # Linha formatada
         
         print("\n💰 HISTÓRICO DE LANÇAMENTOS (PAGAMENTOS):")  # Seção de extrato
-        tem_pagamento = False  # Flag para verificar se houve algum pagamento
-        for p in pedidos_cliente:  # Busca nos pedidos
-            if p.get('Data do Pagamento') and float(p.get('Valor Pago (R$)', 0)) > 0:  # Se houver data e valor pago
-                print(f"   • {p['Data do Pagamento']} --> Recebido R$ {p['Valor Pago (R$)']} (Pedido #{p['ID do Pedido']})")  # Mostra recebimento
-                tem_pagamento = True  # Marca que houve registro
+        pagamentos = repositorio.pagamentos_dos_pedidos(pedidos_cliente)  # Cada parcela recebida, em ordem cronológica (índice por pedido)
+        for pagamento in pagamentos:  # Uma linha por recebimento
+            print(f"   • {pagamento['Data do Pagamento'] or '(sem data)'} --> Recebido R$ {pagamento['Valor (R$)']} em {pagamento.forma_pagamento or '-'} (Pedido #{pagamento.id_pedido})")  # Mostra recebimento
         
-        if not tem_pagamento:  # Se não houve nenhum pagamento
+        if not pagamentos:  # Se não houve nenhum pagamento
             print("   (Nenhum pagamento registrado)")  # Avisa histórico limpo
 
         print("-" * 75)  # Divisor
-        print(f"💸 TOTAL A RECEBER DESTE CLIENTE: R$ {total_devedor_acumulado:.2f}")  # Mostra dívida total do cliente
+        print(f"💸 TOTAL A RECEBER DESTE CLIENTE: {formatar_reais(resumo['saldo'])}")  # Mostra dívida total do cliente
+        ultimo = resumo['ultimo_pagamento'].strftime("%d-%m-%Y %H:%M") if resumo['ultimo_pagamento'] else '-'  # Último pagamento formatado
+        print(f"   Pedidos: {resumo['pedidos']} | Último pagamento: {ultimo} | Vencido: {formatar_reais(resumo['vencido'])}")  # Resumo de contas a receber
         print("-" * 75)  # Divisor
         
         print("1. Lançar Novo Pedido")  # Opção 1
         print("2. EDITAR PEDIDO (Pagamentos, Itens, Excluir)")  # Opção 2
         print("3. VER DETALHES DE UM PEDIDO (Ver Itens)")  # Opção 3
-        print("4. Voltar ao Menu Principal")  # Opção 4
+        print("4. Ver Pedidos Arquivados (Quitados)")  # Opção 4
+        print("5. Voltar ao Menu Principal")  # Opção 5
         
         op = input("\nEscolha uma opção: ")  # Pede opção
 
         if op == '1':  # Vender mais para este cliente
-            adicionar_pedido(cabecalhos, todos_itens, nome_sugerido=nome_exato)  # Abre venda
-            cabecalhos = carregar_cabecalhos()  # Recarrega dados do disco
-            pedidos_cliente = [p for p in cabecalhos if nome_exato.lower() in p['Nome do Cliente'].lower()]  # Re-filtra para atualizar painel
+            adicionar_pedido(repositorio, nome_sugerido=nome_exato)  # Abre venda
+            pedidos_cliente = repositorio.pedidos_dos_clientes(nomes_encontrados)  # Atualiza o painel pelo índice (sem reler o disco)
         elif op == '2':  # Editar algum pedido da lista
-            editar_pedido(cabecalhos, todos_itens)  # Abre edição por ID
-            cabecalhos = carregar_cabecalhos()  # Recarrega dados
-            pedidos_cliente = [p for p in cabecalhos if nome_exato.lower() in p['Nome do Cliente'].lower()]  # Re-filtra
+            editar_pedido(repositorio)  # Abre edição por ID
+            pedidos_cliente = repositorio.pedidos_dos_clientes(nomes_encontrados)  # Atualiza o painel pelo índice
         elif op == '3':  # Ver espelho do pedido
-            visualizar_detalhes_cliente(pedidos_cliente, todos_itens)  # Abre detalhes
-        elif op == '4':  # Sair do painel do cliente
+            visualizar_detalhes_cliente(pedidos_cliente, repositorio)  # Abre detalhes
+        elif op == '4':  # Histórico quitado do cliente
+            visualizar_arquivados_cliente(nome_exato, repositorio)  # Abre só as partições com o cliente
+        elif op == '5':  # Sair do painel do cliente
             break  # Sai do loop
 
-def visualizar_pedidos(cabecalhos):  # Função de visão geral
-    """Imprime todos os cabeçalhos de pedidos em formato de tabela."""
-    if not cabecalhos:  # Se não houver nenhum pedido no sistema
-        print("\nNenhum pedido encontrado.")  # Avisa
-        return  # Sai
+def ler_data_filtro(mensagem):  # Pergunta uma data opcional para o filtro
+    """Pede uma data DD-MM-AAAA (Enter para ignorar) e retorna datetime ou None."""
+    while True:  # Repete até uma data válida ou vazia
+        texto = input(mensagem).strip()  # Captura a data
+        if not texto:  # Sem filtro
+            return None  # Ignora
+        data = ler_data(texto)  # Interpreta a data
+        if isinstance(data, datetime):  # Data válida
+            return data  # Retorna
+        print("⚠️ Data inválida. Use o formato DD-MM-AAAA.")  # Avisa erro
 
+def visualizar_pedidos(cabecalhos=None):  # Função de visão geral
+    """Imprime os pedidos em páginas, com filtros, lendo os dados sob demanda."""
     print("\n--- Todos os Pedidos (Visão Geral) ---")  # Título
-    
-    larguras = {campo: len(campo) for campo in CAMPOS_CABECALHO}  # Calcula a largura mínima baseada no nome das colunas
-    for pedido in cabecalhos:  # Percorre todos os pedidos
-        for campo in CAMPOS_CABECALHO:  # Percorre cada campo
-            larguras[campo] = max(larguras[campo], len(pedido.get(campo, '')))  # Ajusta a largura da coluna para o maior dado encontrado
-
-    linha_cabecalho = " | ".join(campo.ljust(larguras[campo]) for campo in CAMPOS_CABECALHO)  # Monta a linha de títulos
-    print(linha_cabecalho)  # Imprime títulos
-    print("-" * len(linha_cabecalho))  # Imprime sublinhado
-
-    for pedido in cabecalhos:  # Percorre pedidos para imprimir dados
-        linha_dados = " | ".join(pedido.get(campo, '').ljust(larguras[campo]) for campo in CAMPOS_CABECALHO)  # Monta linha de dados alinhada
-        print(linha_dados)  # Imprime dados do pedido
-        
+    print("Filtros (Enter para ignorar):")  # Instrução
+    status_pagamento = input(f"Status do Pagamento ({'/'.join(OPCOES_STATUS_PAGAMENTO)}): ").strip().capitalize() or None  # Filtro financeiro
+    status_pedido = input(f"Status do Pedido ({'/'.join(OPCOES_STATUS_PEDIDO)}): ").strip().capitalize() or None  # Filtro de entrega
+    data_inicial = ler_data_filtro("Data inicial (DD-MM-AAAA): ")  # Início do período
+    data_final = ler_data_filtro("Data final (DD-MM-AAAA): ")  # Fim do período
+    cliente = input("Cliente (parte do nome): ").strip() or None  # Filtro por cliente
+    incluir_arquivados = cabecalhos is None and historico.meses() and input("Incluir pedidos arquivados (quitados)? (S/N): ").strip().upper() == 'S'  # Histórico sob demanda
+
+    if cabecalhos is None:  # Lidos do disco: o motor filtra antes de criar os pedidos (na cópia colunar, sem montar as outras linhas)
+        pedidos = iterar_cabecalhos(condicoes_pedidos(status_pagamento, status_pedido, data_inicial, data_final, cliente))  # Pedidos ativos
+    else:  # Lista já carregada
+        pedidos = cabecalhos  # Pedidos ativos
+    if incluir_arquivados:  # Ativos primeiro, depois só as partições do período/cliente
+        ativos = set()  # IDs ativos já percorridos (a cópia arquivada deles é ignorada)
+        pedidos = itertools.chain(  # Gerador: as partições só são abertas depois dos ativos
+            (ativos.add(pedido['ID do Pedido']) or pedido for pedido in pedidos),
+            historico.iterar_pedidos(data_inicial, data_final, cliente, excluir=ativos),
+        )
+    pedidos = filtrar_pedidos(  # Gerador: nada é lido até a impressão pedir
+        pedidos, status_pagamento, status_pedido, data_inicial, data_final, cliente
+    )
+    print()  # Linha em branco antes da tabela
+    if not imprimir_paginado(pedidos):  # Imprime página a página
+        print("Nenhum pedido encontrado.")  # Avisa
+
+def carregar_colunas_vendas():  # Define a função que monta as colunas das análises
+    """Lê cabeçalhos e itens (ativos e arquivados) em fluxo, como tuplas de texto, e monta as colunas das análises."""
+    ativos = set()  # IDs dos pedidos ativos (a cópia arquivada deles é ignorada)
+    return ColunasVendas(carregar_produtos()).carregar(  # Converte em blocos (itens antigos são identificados pelo catálogo)
+        itertools.chain(  # Cabeçalhos sob demanda: ativos, depois arquivados
+            (ativos.add(tupla[0]) or tupla for tupla in armazenamento.iterar('cabecalhos', tuple)),
+            historico.iterar('pedidos', excluir=ativos),
+        ),
+        itertools.chain(armazenamento.iterar('itens', tuple), historico.iterar('itens', excluir=ativos)),  # Itens sob demanda (os cabeçalhos já foram lidos)
+    )
+
+def analisar_vendas(periodo=None):  # Tela de análises de vendas
+    """Mostra faturamento por período, produtos mais vendidos, mix UN/CX, contas a receber por atraso e formas de pagamento."""
+    if periodo is None:  # Chamado pelo menu
+        periodo = PERIODOS[['Dia', 'Semana', 'Mês'].index(selecionar_opcao("Agrupar faturamento por", ['Dia', 'Semana', 'Mês']))]  # Escolhe o agrupamento
+    imprimir_analises(carregar_colunas_vendas(), periodo)  # Calcula e imprime
+
+def visualizar_alertas(repositorio):  # Tela de cobranças
+    """Lista os pedidos em aberto já vencidos e os que vencem nos próximos dias, com o saldo de cada um."""
+    texto = input(f"\nMostrar pedidos a vencer em quantos dias? (Enter = {DIAS_ALERTA_VENCIMENTO}): ").strip()  # Janela dos alertas
+    dias = int(texto) if texto.isdigit() else DIAS_ALERTA_VENCIMENTO  # Valor padrão se vazio ou inválido
+    hoje = datetime.now().date()  # Data de referência
+    vencidos, a_vencer = repositorio.alertas_vencimento(dias, hoje)  # Consulta no índice de vencimentos
+    for titulo, pedidos in ((f"🔴 VENCIDOS ({len(vencidos)})", vencidos), (f"🟡 A VENCER EM ATÉ {dias} DIA(S) ({len(a_vencer)})", a_vencer)):  # Duas seções
+        print(f"\n--- {titulo} ---")  # Título da seção
+        if not pedidos:  # Seção vazia
+            print("Nenhum pedido.")  # Avisa
+            continue  # Próxima seção
+        print(f"{'ID':<6} | {'Cliente':<20} | {'Vencimento':<10} | {'Dias':>5} | {'Saldo':>14}")  # Títulos das colunas
+        for pedido in pedidos:  # Pedidos em ordem de vencimento
+            dias_restantes = (pedido.data_vencimento.date() - hoje).days  # Negativo = dias de atraso
+            print(f"{pedido.id_pedido:<6} | {pedido.nome_cliente[:20]:<20} | {pedido['Data Vencimento Prazo']:<10} | {dias_restantes:>5} | {formatar_reais(pedido.saldo):>14}")  # Linha do pedido
+    total = sum(pedido.saldo for pedido in vencidos)  # Valor já vencido
+    print(f"\nTotal vencido: {formatar_reais(total)}")  # Resumo
+
+def visualizar_fluxo_caixa(repositorio):  # Tela de recebimentos por dia
+    """Mostra quanto entrou em cada dia (por forma de pagamento) a partir do histórico de pagamentos."""
+    texto = input(f"\nMostrar os recebimentos de quantos dias? (Enter = {DIAS_FLUXO_CAIXA}): ").strip()  # Janela do relatório
+    dias = int(texto) if texto.isdigit() else DIAS_FLUXO_CAIXA  # Valor padrão se vazio ou inválido
+    hoje = datetime.now().date()  # Data de referência
+    fluxo = repositorio.fluxo_de_caixa(hoje - timedelta(days=dias - 1), hoje)  # Totais por dia mantidos a cada lançamento
+    formas = sorted({forma for _, valores in fluxo for forma in valores}, key=lambda forma: (FORMAS_HISTORICO.index(forma) if forma in FORMAS_HISTORICO else len(FORMAS_HISTORICO), forma))  # Formas do período (Pix, Dinheiro, Não informado, outras)
+    print(f"\n--- FLUXO DE CAIXA: ÚLTIMOS {dias} DIA(S) ---")  # Título
+    if not fluxo:  # Nenhum recebimento
+        print("Nenhum pagamento recebido no período.")  # Avisa
+        return  # Volta ao menu
+    print(f"{'Dia':<10} | " + " | ".join(f"{forma or '-':>14}" for forma in formas) + f" | {'Total':>14}")  # Títulos das colunas
+    total_geral = 0  # Soma do período
+    por_forma = dict.fromkeys(formas, 0)  # Soma do período por forma
+    for dia, valores in fluxo:  # Dias em ordem
+        total_dia = sum(valores.values())  # Soma do dia
+        total_geral += total_dia  # Acumula
+        for forma, valor in valores.items():  # Cada forma do dia
+            por_forma[forma] += valor  # Acumula por forma
+        print(f"{dia.strftime('%d-%m-%Y'):<10} | " + " | ".join(f"{formatar_reais(valores.get(forma, 0)):>14}" for forma in formas) + f" | {formatar_reais(total_dia):>14}")  # Linha do dia
+    print("\nTotal por forma:")  # Resumo por forma ('Não informado' = pagamentos antigos sem o meio registrado)
+    for forma, valor in por_forma.items():  # Uma linha por forma
+        print(f"   {forma or '-':<14} {formatar_reais(valor):>14}")  # Linha da forma
+    print(f"\nTotal recebido no período: {formatar_reais(total_geral)}")  # Resumo
+
+def planejar_entregas(repositorio, dia=None):  # Tela de planejamento de entregas
+    """Mostra as entregas pendentes de um dia em ordem de horário, a carga por produto e os horários em conflito."""
+    if dia is None:  # Chamado pelo menu
+        proximos = repositorio.dias_com_entregas(datetime.now().date())[:7]  # Próximos dias com entregas
+        if proximos:  # Há entregas agendadas
+            print("\nPróximos dias com entregas: " + ", ".join(f"{d.strftime('%d-%m-%Y')} ({n})" for d, n in proximos))  # Resumo da agenda
+        texto = input("\nData das entregas (DD-MM-AAAA, Enter = hoje): ").strip()  # Dia do plano
+        dia = ler_data(texto) if texto else datetime.now()  # Hoje se vazio
+        if not isinstance(dia, datetime):  # Formato inválido
+            print("⚠️ Data inválida. Use DD-MM-AAAA.")  # Avisa
+            return  # Volta ao menu
+        dia = dia.date()  # Só o dia
+    imprimir_plano(montar_plano(repositorio, carregar_produtos(), dia), dia)  # Monta e imprime o plano do dia
+
+def importar_pedidos_arquivo(caminho):  # Importação em lote pela linha de comando
+    """Lança os pedidos de um arquivo CSV ou JSON-lines e grava todos de uma vez (nada é gravado se algum for inválido)."""
+    inicializar_csv()  # Garante que os arquivos existam
+    repositorio = carregar_repositorio()  # Pedidos e itens atuais (para os índices e os IDs)
+    servico = ServicoPedidos(repositorio, carregar_produtos(), sequencias)  # Mesmas regras das telas
+    try:  # Lê e valida o arquivo inteiro antes de gravar
+        pedidos = importar_pedidos(servico, ler_pedidos_arquivo(caminho))  # Lança todos os pedidos em memória
+    except (OSError, ValueError) as erro:  # Arquivo ausente ou pedido inválido
+        cache.invalidar('repositorio')  # Descarta os pedidos lançados só em memória
+        print(f"\n❌ Importação cancelada: {erro}")  # Exibe o motivo
+        return False  # Nada foi gravado
+    if not salvar_repositorio(repositorio):  # Uma única gravação para o lote inteiro
+        return False  # Nada foi gravado
+    compactar_dados()  # Consolida antes de encerrar (o processo termina logo em seguida)
+    print(f"\n✅ {len(pedidos)} pedido(s) importado(s) de '{caminho}'.")  # Confirma
+    return True  # Importação concluída
+
 def menu_principal():  # Função de entrada do sistema
     inicializar_csv()  # Garante que os arquivos existam ao iniciar
 
     while True:  # Loop do sistema principal
-        cabecalhos = carregar_cabecalhos()  # Carrega pedidos atualizados
-        todos_itens = carregar_itens()  # Carrega itens atualizados
+        repositorio = carregar_repositorio()  # Carrega pedidos e itens atualizados e monta os índices
 
         print("\n" + "="*40)  # Decorativo
         print("      SISTEMA DE GESTÃO v2.0")  # Título do sistema
         print("="*40)  # Decorativo
         print("1. GESTÃO DE CLIENTES (Venda/Edição/Detalhes)")  # Botão 1
         print("2. Visualizar Todos os Pedidos (Geral)")  # Botão 2
-        print("3. Sair")  # Botão 3
+        print("3. Análises de Vendas")  # Botão 3
+        print("4. Alertas de Vencimento (Cobranças)")  # Botão 4
+        print("5. Planejamento de Entregas")  # Botão 5
+        print("6. Fluxo de Caixa (Recebimentos por Dia)")  # Botão 6
+        print("7. Sair")  # Botão 7
         print("-" * 40)  # Decorativo
 
         escolha = input("Escolha uma opção: ")  # Pede escolha
 
         if escolha == '1':  # Entrar no fluxo de clientes
-            gerenciar_por_cliente(cabecalhos, todos_itens)  # Chama função
+            gerenciar_por_cliente(repositorio)  # Chama função
         elif escolha == '2':  # Ver relatório geral
-            visualizar_pedidos(cabecalhos)  # Chama função
-        elif escolha == '3':  # Sair do programa
+            visualizar_pedidos()  # Chama função (lê os pedidos do disco sob demanda)
+        elif escolha == '3':  # Ver análises de vendas
+            analisar_vendas()  # Chama função (lê o histórico em colunas)
+        elif escolha == '4':  # Ver cobranças vencidas e a vencer
+            visualizar_alertas(repositorio)  # Chama função (consulta o índice de vencimentos)
+        elif escolha == '5':  # Ver a rota e a carga de um dia
+            planejar_entregas(repositorio)  # Chama função (consulta a agenda de entregas)
+        elif escolha == '6':  # Ver os recebimentos por dia
+            visualizar_fluxo_caixa(repositorio)  # Chama função (consulta os totais do histórico de pagamentos)
+        elif escolha == '7':  # Sair do programa
+            compactar_dados()  # Deixa os CSVs atualizados para consulta no Excel (arquivar é só com --arquivar)
             print("\nEncerrando sistema. Até logo!")  # Despedida
             break  # Quebra o loop principal e encerra
         else:  # Erro de menu
             print("\n⚠️ Opção inválida.")  # Avisa erro
 
 if __name__ == "__main__":  # Verifica se o script está sendo executado diretamente
-    menu_principal()  # Inicia o programa pela função principal
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Gerenciador de pedidos")  # Opções da linha de comando
+    parser.add_argument('--backend', choices=BACKENDS, default=BACKEND_PADRAO, help="Motor de armazenamento (padrão: csv)")  # Escolha do motor
+    parser.add_argument('--importar-csv', action='store_true', help="Importa os CSVs para o banco SQLite e encerra (recusa se o banco já tiver pedidos)")  # Importação única
+    parser.add_argument('--forcar', action='store_true', help="Com --importar-csv: substitui os pedidos já gravados no banco pelos dos CSVs")  # Sobrescrita explícita
+    parser.add_argument('--importar-produtos', action='store_true', help="Atualiza só os produtos do banco SQLite a partir do produtos.csv e encerra")  # Catálogo no banco
+    parser.add_argument('--importar-pedidos', metavar='ARQUIVO', help="Lança os pedidos de um arquivo CSV ou JSON-lines e encerra")  # Importação em lote
+    parser.add_argument('--analises', nargs='?', const='mes', choices=PERIODOS, metavar='PERIODO', help="Imprime as análises de vendas (faturamento por dia, semana ou mes) e encerra")  # Análises sem menu
+    parser.add_argument('--entregas', nargs='?', const='', metavar='DD-MM-AAAA', help="Imprime o plano de entregas do dia (padrão: hoje) e encerra")  # Plano de entregas sem menu
+    parser.add_argument('--arquivar', nargs='?', const=DIAS_ARQUIVAMENTO, type=int, metavar='DIAS', help=f"Arquiva os pedidos pagos e entregues sem movimento há mais de DIAS dias (padrão: {DIAS_ARQUIVAMENTO}) e encerra")  # Arquivamento sem menu
+    parser.add_argument('--verificar', action='store_true', help="Confere itens, pedidos e pagamentos (totais, status, órfãos, IDs repetidos) e encerra")  # Verificação de integridade
+    parser.add_argument('--reparar', action='store_true', help=f"Com --verificar: corrige totais, valores pagos e status, renumera IDs repetidos e move itens órfãos para {ARQUIVO_ITENS_ORFAOS}")  # Reparo
+    parser.add_argument('--processos', type=int, metavar='N', help="Processos usados por --verificar (padrão: um por processador)")  # Tamanho do pool
+    parser.add_argument('--metricas', action='store_true', help=f"Grava o tempo e as linhas de cada operação em {ARQUIVO_METRICAS} e mostra a duração de cada tela")  # Instrumentação
+    parser.add_argument('--perfil', nargs='*', metavar='OPERACAO', help=f"Liga as métricas e grava um perfil do cProfile em {PASTA_PERFIS}/ para cada tela (ou só para as operações informadas)")  # Perfis sob demanda
+    parser.add_argument('--servidor', action='store_true', help="Mantém os pedidos em memória num único processo e atende os balcões pela rede local (até o Ctrl+C)")  # Servidor local
+    parser.add_argument('--conectar', action='store_true', help="Abre o menu usando o servidor local (iniciado com --servidor) em vez de ler os arquivos")  # Balcão
+    parser.add_argument('--porta', type=int, default=PORTA_SERVIDOR, metavar='N', help=f"Porta do servidor local (padrão: {PORTA_SERVIDOR})")  # Porta TCP
+    argumentos = parser.parse_args()  # Lê as opções informadas
+    if argumentos.conectar:  # Balcão: troca o repositório antes da instrumentação medir as funções
+        try:  # O servidor precisa estar no ar
+            cliente_remoto.conectar(sys.modules[__name__], porta=argumentos.porta)  # Telas passam a usar o servidor
+        except ConnectionError as erro:  # Servidor fora do ar
+            print(f"❌ {erro} Inicie-o com --servidor.")  # Orienta
+            raise SystemExit(1)  # Código de saída para scripts
+    perfil_ambiente = os.environ.get(VARIAVEL_PERFIL, '').strip()  # Perfis pedidos pela variável de ambiente
+    if argumentos.perfil is None and perfil_ambiente:  # Sem --perfil na linha de comando
+        argumentos.perfil = [] if perfil_ambiente == '1' else [nome.strip() for nome in perfil_ambiente.split(',') if nome.strip()]  # "1" = todas as telas
+    if argumentos.metricas or argumentos.perfil is not None or os.environ.get(VARIAVEL_METRICAS, '').strip() not in ('', '0'):  # Instrumentação pedida
+        ativar_instrumentacao(argumentos.perfil)  # Troca as funções medidas antes de qualquer operação
+    if argumentos.importar_csv:  # Só importar
+        if not importar_csv_para_sqlite(argumentos.forcar):  # Copia os CSVs para o banco
+            raise SystemExit(1)  # Código de saída para scripts
+    elif argumentos.importar_produtos:  # Só o catálogo
+        importar_produtos_para_sqlite()  # Copia o produtos.csv para o banco
+    elif argumentos.analises:  # Só as análises
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        analisar_vendas(argumentos.analises)  # Imprime as análises
+    elif argumentos.entregas is not None:  # Só o plano de entregas
+        dia_entregas = ler_data(argumentos.entregas) if argumentos.entregas else datetime.now()  # Hoje se não informado
+        if not isinstance(dia_entregas, datetime):  # Formato inválido
+            parser.error("data inválida em --entregas (use DD-MM-AAAA)")  # Encerra com a mensagem de uso
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        inicializar_csv()  # Garante que os arquivos existam
+        planejar_entregas(carregar_repositorio(), dia_entregas.date())  # Imprime o plano
+    elif argumentos.arquivar is not None:  # Só o arquivamento
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        inicializar_csv()  # Garante que os arquivos existam (e recupera gravações interrompidas)
+        print(f"📦 {arquivar_quitados(argumentos.arquivar)} pedido(s) quitado(s) arquivado(s) em '{PASTA_HISTORICO}/'.")  # Resultado
+    elif argumentos.verificar or argumentos.reparar:  # Só a verificação
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        restantes = verificar_integridade(argumentos.reparar, argumentos.processos)  # Relatório (e reparo)
+        raise SystemExit(0 if restantes == 0 else 1)  # Código de saída para scripts
+    elif argumentos.importar_pedidos:  # Lote de pedidos sem interação
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        raise SystemExit(0 if importar_pedidos_arquivo(argumentos.importar_pedidos) else 1)  # Código de saída para scripts
+    elif argumentos.servidor:  # Dono dos dados para vários balcões
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        servidor.executar(sys.modules[__name__], argumentos.porta)  # Atende até o Ctrl+C
+    elif argumentos.conectar:  # Balcão ligado ao servidor
+        configurar_armazenamento(argumentos.backend)  # As telas 2 e 3 ainda leem os arquivos (só leitura)
+        try:  # O servidor pode cair durante o uso
+            menu_principal()  # Mesmo menu, com o repositório do servidor
+        except ConnectionError as erro:  # Servidor fora do ar
+            print(f"\n❌ {erro} As alterações ainda não salvas foram perdidas.")  # Avisa
+            raise SystemExit(1)  # Código de saída para scripts
+    else:  # Execução normal
+        configurar_armazenamento(argumentos.backend)  # Ativa o motor escolhido
+        menu_principal()  # Inicia o programa pela função principal
\ No newline at end of file
@@ -0,0 +1,208 @@
+import csv  # Importa a biblioteca para gravar e ler as partições
+import gzip  # Importa a compressão opcional das partições
+import io  # Importa os buffers de texto em memória (uma partição é montada inteira antes de gravar)
+import json  # Importa a gravação do manifesto
+import os  # Importa a biblioteca para montar caminhos e trocar arquivos de forma atômica
+from datetime import datetime  # Importa o tipo das datas dos pedidos
+
+from armazenamento import gravar_pasta  # Importa o fsync da pasta (torna as trocas de nome duráveis)
+from cache_dados import assinatura_arquivo  # Importa a assinatura que detecta manifestos gravados por outro terminal
+from clientes import normalizar_nome  # Importa a normalização dos nomes (mesma da busca de clientes)
+from configuracao import CAMPOS_CABECALHO, CAMPOS_ITENS, CAMPOS_PAGAMENTOS  # Importa a ordem das colunas de cada tabela
+from registros import Pedido, ItemPedido  # Importa os registros tipados das consultas
+from travas import TravaArquivo  # Importa a trava entre terminais
+
+# =================================================================
+#        HISTÓRICO ARQUIVADO (PARTIÇÕES MENSAIS DE PEDIDOS QUITADOS)
+# =================================================================
+#
+# Pedidos pagos e entregues, sem movimento há algum tempo, saem dos CSVs do
+# dia a dia e vão, com os itens e pagamentos deles, para uma partição por mês
+# do pedido (historico/AAAA-MM.pedidos.csv.gz, .itens e .pagamentos). O
+# manifesto guarda, por mês, as quantidades e os clientes de cada partição, e
+# os maiores IDs arquivados; com ele as consultas por período ou cliente abrem
+# só as partições que podem ter resultado.
+#
+# Ordem de gravação: partições (temporário + troca atômica), depois o
+# manifesto, e só então os pedidos são removidos dos CSVs ativos. Uma queda no
+# meio deixa, no máximo, pedidos nos dois lugares; as consultas ignoram a cópia
+# arquivada de pedidos que ainda estão ativos, e o próximo arquivamento refaz
+# a remoção.
+
+TABELAS = {  # tabela -> (colunas, coluna chave)
+    'pedidos': (CAMPOS_CABECALHO, 'ID do Pedido'),
+    'itens': (CAMPOS_ITENS, 'ID do Item'),
+    'pagamentos': (CAMPOS_PAGAMENTOS, 'ID do Pagamento'),
+}
+ARQUIVO_MANIFESTO = 'manifesto.json'  # Nome do manifesto dentro da pasta do histórico
+
+
+def pedido_quitado(pedido, limite):  # Critério de arquivamento
+    """Verdadeiro se o pedido está pago, entregue, sem saldo, e a última movimentação (pedido, pagamento ou entrega) é anterior a 'limite'."""
+    if pedido.status_pagamento != 'Pago' or pedido.status_pedido != 'Entregue' or pedido.saldo > 0:  # Ainda pode mudar
+        return False  # Continua ativo
+    datas = [d for d in (pedido.data_pedido, pedido.data_pagamento, pedido.data_entrega) if isinstance(d, datetime)]  # Movimentações conhecidas
+    return bool(datas) and max(datas) < limite  # Sem datas, não dá para saber a idade: continua ativo
+
+
+def mes_do_pedido(pedido):  # Partição do pedido
+    """Retorna 'AAAA-MM' da data do pedido."""
+    return pedido.data_pedido.strftime('%Y-%m')  # Mês da venda
+
+
+class HistoricoArquivado:  # Partições mensais + manifesto
+    """Arquiva pedidos quitados por mês e consulta as partições sob demanda (por período ou cliente)."""
+
+    def __init__(self, pasta, comprimir=True):  # Recebe a pasta das partições
+        self.pasta = pasta  # Pasta do histórico (relativa à pasta dos dados)
+        self.comprimir = comprimir  # Partições novas em .csv.gz
+        self._manifesto = None  # Manifesto lido
+        self._assinatura = None  # Assinatura do manifesto lido
+
+    # --- Manifesto ---
+
+    @property
+    def caminho_manifesto(self):  # Manifesto dentro da pasta
+        return os.path.join(self.pasta, ARQUIVO_MANIFESTO)  # Caminho completo
+
+    def manifesto(self):  # Manifesto atual
+        """Retorna o manifesto {'particoes': {mês: {...}}, 'maiores': {...}}, relendo só se o arquivo mudou."""
+        assinatura = assinatura_arquivo(self.caminho_manifesto)  # Versão no disco
+        if self._manifesto is None or assinatura != self._assinatura:  # Primeira leitura ou outro terminal arquivou
+            if assinatura is None:  # Nada arquivado ainda
+                self._manifesto = {'particoes': {}, 'maiores': {}}  # Manifesto vazio
+            else:  # Manifesto gravado
+                with open(self.caminho_manifesto, mode='r', encoding='utf-8') as f:  # Abre
+                    self._manifesto = json.load(f)  # Partições e maiores IDs
+            self._assinatura = assinatura  # Versão lida
+        return self._manifesto  # Manifesto em memória
+
+    def _gravar_manifesto(self, manifesto):  # Troca atômica do manifesto
+        """Grava o manifesto num temporário (com fsync) e troca pelo atual."""
+        temporario = self.caminho_manifesto + '.tmp'  # Temporário ao lado
+        with open(temporario, mode='w', encoding='utf-8') as f:  # Abre o temporário
+            json.dump(manifesto, f, ensure_ascii=False, indent=1, sort_keys=True)  # Legível
+            f.flush()  # Esvazia o buffer
+            os.fsync(f.fileno())  # Garante a gravação física
+        os.replace(temporario, self.caminho_manifesto)  # Troca atômica
+        gravar_pasta(self.caminho_manifesto)  # Torna a troca durável
+        self._manifesto, self._assinatura = manifesto, assinatura_arquivo(self.caminho_manifesto)  # Já conhecido
+
+    def maior_id(self, sequencia):  # Piso dos alocadores de IDs
+        """Retorna o maior ID arquivado da sequência ('pedido', 'item' ou 'pagamento'), ou 0."""
+        return self.manifesto()['maiores'].get(sequencia, 0)  # IDs arquivados nunca são reaproveitados
+
+    def meses(self, data_inicial=None, data_final=None, cliente=None):  # Partições que podem ter resultado
+        """Retorna os meses arquivados (em ordem) dentro do período e com algum cliente contendo o trecho 'cliente'."""
+        inicio = data_inicial.strftime('%Y-%m') if data_inicial else ''  # Primeiro mês do período
+        fim = data_final.strftime('%Y-%m') if data_final else '9999-99'  # Último mês do período
+        trecho = normalizar_nome(cliente) if cliente else None  # Parte do nome, normalizada
+        return [
+            mes for mes, particao in sorted(self.manifesto()['particoes'].items())
+            if inicio <= mes <= fim and (not trecho or any(trecho in nome for nome in particao['clientes']))
+        ]
+
+    # --- Partições ---
+
+    def _caminho(self, mes, tabela):  # Arquivo de uma partição
+        """Retorna o caminho do arquivo da tabela no mês (a extensão vem do manifesto, se já existir)."""
+        particao = self.manifesto()['particoes'].get(mes)  # Partição existente
+        if particao:  # Usa o nome gravado (pode ter sido criada com ou sem compressão)
+            return os.path.join(self.pasta, particao['arquivos'][tabela])  # Caminho existente
+        return os.path.join(self.pasta, f"{mes}.{tabela}.csv" + ('.gz' if self.comprimir else ''))  # Partição nova
+
+    @staticmethod
+    def _ler_arquivo(caminho, campos):  # Linhas de um arquivo de partição
+        """Retorna as tuplas de texto de uma partição (compactada ou não) na ordem de 'campos' (colunas ausentes ficam vazias)."""
+        if not os.path.exists(caminho):  # Tabela sem linhas nesse mês
+            return []  # Nada
+        with open(caminho, mode='rb') as f:  # Lê os bytes
+            dados = f.read()  # Partição de um mês cabe na memória
+        if caminho.endswith('.gz'):  # Compactada
+            dados = gzip.decompress(dados)  # Descompacta
+        linhas = csv.reader(io.StringIO(dados.decode('utf-8'), newline=''))  # Leitor CSV
+        titulos = next(linhas, None) or []  # Colunas gravadas na partição
+        posicoes = [titulos.index(c) if c in titulos else None for c in campos]  # Mesmo mapeamento dos snapshots
+        return [tuple(linha[p] if p is not None and p < len(linha) else '' for p in posicoes) for linha in linhas if linha]  # Tuplas na ordem das colunas
+
+    @staticmethod
+    def _gravar_arquivo(caminho, campos, tuplas):  # Grava uma partição
+        """Grava a partição num temporário (com fsync) e retorna (temporário, definitivo)."""
+        texto = io.StringIO(newline='')  # Monta o CSV em memória
+        escritor = csv.writer(texto)  # Gravador CSV
+        escritor.writerow(campos)  # Títulos
+        escritor.writerows(tuplas)  # Linhas
+        dados = texto.getvalue().encode('utf-8')  # Bytes do CSV
+        if caminho.endswith('.gz'):  # Compactada
+            dados = gzip.compress(dados, mtime=0)  # Mesmo conteúdo, mesmos bytes
+        temporario = caminho + '.tmp'  # Temporário ao lado
+        with open(temporario, mode='wb') as f:  # Abre o temporário
+            f.write(dados)  # Grava
+            f.flush()  # Esvazia o buffer
+            os.fsync(f.fileno())  # Garante a gravação física
+        return temporario, caminho  # Troca a ser feita
+
+    def arquivar(self, pedidos, itens, pagamentos):  # Move registros para as partições
+        """Acrescenta pedidos (com os itens e pagamentos deles) às partições do mês de cada pedido e atualiza o manifesto."""
+        if not pedidos:  # Nada a arquivar
+            return  # Nenhuma partição muda
+        os.makedirs(self.pasta, exist_ok=True)  # Cria a pasta na primeira vez
+        with TravaArquivo(self.caminho_manifesto + '.trava'):  # Um terminal arquiva por vez
+            manifesto = json.loads(json.dumps(self.manifesto()))  # Cópia (a atual só muda depois de gravar)
+            mes_por_pedido = {pedido.id_pedido: mes_do_pedido(pedido) for pedido in pedidos}  # Partição de cada pedido
+            novos = {}  # mês -> tabela -> [tuplas]
+            for tabela, registros in (('pedidos', pedidos), ('itens', itens), ('pagamentos', pagamentos)):  # Cada tabela
+                for registro in registros:  # Cada linha
+                    novos.setdefault(mes_por_pedido[registro.id_pedido], {}).setdefault(tabela, []).append(registro.para_tupla())  # Agrupa por mês
+            trocas = []  # (temporário, definitivo)
+            for mes, tabelas in novos.items():  # Cada partição afetada
+                particao = manifesto['particoes'].setdefault(mes, {'arquivos': {}, 'clientes': []})  # Partição nova ou existente
+                for tabela, (campos, chave) in TABELAS.items():  # Cada tabela da partição
+                    caminho = self._caminho(mes, tabela)  # Arquivo da tabela
+                    pos_chave = campos.index(chave)  # Posição da chave
+                    linhas = {linha[pos_chave]: linha for linha in self._ler_arquivo(caminho, campos)}  # Linhas já arquivadas
+                    linhas.update((linha[pos_chave], linha) for linha in tabelas.get(tabela, ()))  # Um arquivamento repetido substitui, não duplica
+                    trocas.append(self._gravar_arquivo(caminho, campos, linhas.values()))  # Partição nova ao lado da atual
+                    particao['arquivos'][tabela] = os.path.basename(caminho)  # Nome do arquivo
+                    particao[tabela] = len(linhas)  # Quantidade de linhas
+                    if tabela == 'pedidos':  # Clientes da partição (filtro das consultas)
+                        pos_cliente = campos.index('Nome do Cliente')  # Posição do nome
+                        particao['clientes'] = sorted({normalizar_nome(linha[pos_cliente]) for linha in linhas.values()})  # Sem repetições
+            for temporario, definitivo in trocas:  # Troca as partições
+                os.replace(temporario, definitivo)  # Troca atômica (uma partição por vez; o manifesto confirma o conjunto)
+            gravar_pasta(self.caminho_manifesto)  # Torna as trocas duráveis antes do manifesto
+            maiores = manifesto['maiores']  # Maiores IDs arquivados
+            for sequencia, registros, atributo in (('pedido', pedidos, 'id_pedido'), ('item', itens, 'id_item'), ('pagamento', pagamentos, 'id_pagamento')):  # Cada sequência
+                maiores[sequencia] = max([maiores.get(sequencia, 0)] + [getattr(r, atributo) for r in registros])  # Só aumenta
+            self._gravar_manifesto(manifesto)  # Ponto de confirmação do arquivamento
+
+    # --- Consultas ---
+
+    def iterar(self, tabela, meses=None, excluir=()):  # Linhas arquivadas sob demanda
+        """Gera as tuplas de texto da tabela nos meses informados (None = todos), pulando pedidos cujo ID (texto) está em 'excluir'."""
+        campos = TABELAS[tabela][0]  # Colunas da tabela
+        pos_pedido = campos.index('ID do Pedido')  # Todas as tabelas têm o ID do pedido
+        for mes in self.meses() if meses is None else meses:  # Uma partição por vez
+            for linha in self._ler_arquivo(self._caminho(mes, tabela), campos):  # Linhas da partição
+                if linha[pos_pedido] not in excluir:  # Pedido ainda ativo: vale a cópia dos CSVs
+                    yield linha  # Entrega a linha
+
+    def iterar_pedidos(self, data_inicial=None, data_final=None, cliente=None, excluir=()):  # Relatório geral com arquivados
+        """Gera os pedidos arquivados (Pedido) das partições que podem atender ao período e ao cliente."""
+        for linha in self.iterar('pedidos', self.meses(data_inicial, data_final, cliente), excluir):  # Só as partições úteis
+            yield Pedido.de_tupla(linha)  # Registro tipado (os filtros finos ficam com o relatório)
+
+    def pedidos_do_cliente(self, nome, excluir=()):  # Painel do cliente
+        """Retorna [(pedido, itens)] arquivados do cliente (nome exato, sem acentos), em ordem de data."""
+        chave = normalizar_nome(nome)  # Nome normalizado
+        meses = [mes for mes in self.meses(cliente=nome) if chave in self.manifesto()['particoes'][mes]['clientes']]  # Partições com o cliente
+        pedidos = [Pedido.de_tupla(linha) for linha in self.iterar('pedidos', meses, excluir)]  # Pedidos dessas partições
+        pedidos = [pedido for pedido in pedidos if normalizar_nome(pedido.nome_cliente) == chave]  # Só o cliente
+        ids = {str(pedido.id_pedido) for pedido in pedidos}  # Pedidos do cliente
+        pos_pedido = CAMPOS_ITENS.index('ID do Pedido')  # Posição do pedido no item
+        itens = {}  # ID do pedido -> itens
+        for linha in self.iterar('itens', meses):  # Itens das mesmas partições
+            if linha[pos_pedido] in ids:  # Item de um pedido do cliente
+                item = ItemPedido.de_tupla(linha)  # Registro tipado
+                itens.setdefault(item.id_pedido, []).append(item)  # Agrupa pelo pedido
+        return [(pedido, itens.get(pedido.id_pedido, [])) for pedido in pedidos]  # Pedidos com itens
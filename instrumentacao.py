@@ -0,0 +1,199 @@
+import builtins  # Importa o input() original (a digitação não entra no tempo das operações)
+import cProfile  # Importa o perfilador das ações do menu
+import functools  # Importa a cópia do nome e da documentação das funções medidas
+import json  # Importa a gravação das métricas em JSON-lines
+import os  # Importa a criação da pasta dos perfis e o PID do terminal
+import threading  # Importa a pilha de operações separada por thread
+import time  # Importa o relógio de alta resolução
+from datetime import datetime  # Importa o horário gravado em cada métrica
+
+# =================================================================
+#        INSTRUMENTAÇÃO OPCIONAL (TEMPOS, LINHAS E PERFIS)
+# =================================================================
+#
+# Desligada, não custa nada: nenhuma função é trocada. Ligada (--metricas ou
+# a variável de ambiente), as funções escolhidas do módulo principal e os
+# métodos do motor de armazenamento são substituídos por versões que medem o
+# tempo e contam as linhas lidas e gravadas. Cada chamada vira uma linha no
+# arquivo de métricas; as linhas de uma operação interna somam na operação de
+# fora (uma gravação dentro de "editar_pedido" conta para a edição). O tempo
+# em que o programa espera o usuário digitar é separado ("espera_ms"), para
+# que uma tela aberta por minutos não pareça lenta.
+
+ATIVO = False  # Instrumentação ligada neste processo
+_local = threading.local()  # Pilha de operações abertas (cada thread tem a sua; a compactação em segundo plano não mistura)
+_saida = None  # Arquivo de métricas aberto para acréscimo
+_pasta_perfis = None  # Onde gravar os perfis do cProfile
+_perfilar = None  # None = sem perfis; conjunto vazio = todas as ações; nomes = só essas operações
+_perfil_ativo = False  # O cProfile não aceita dois perfis ao mesmo tempo
+ultima = None  # Última ação concluída (para a linha de status)
+
+
+class Medicao:  # Uma chamada em andamento
+    """Tempo, espera e linhas de uma operação (as operações internas somam nela)."""
+
+    __slots__ = ('nome', 'inicio', 'espera', 'lidas', 'gravadas')  # Atributos fixos
+
+    def __init__(self, nome):  # Começa a medir
+        self.nome = nome  # Nome da função medida
+        self.inicio = time.perf_counter()  # Início
+        self.espera = 0.0  # Segundos esperando o usuário digitar
+        self.lidas = 0  # Linhas lidas do disco
+        self.gravadas = 0  # Linhas gravadas no disco
+
+
+def _pilha():  # Operações abertas nesta thread
+    """Retorna a pilha de medições abertas da thread atual."""
+    pilha = getattr(_local, 'pilha', None)  # Pilha já criada
+    if pilha is None:  # Primeira operação da thread
+        pilha = _local.pilha = []  # Cria
+    return pilha  # Pilha da thread
+
+
+def ativar(caminho_metricas, pasta_perfis, perfilar=None):  # Liga a instrumentação
+    """Abre o arquivo de métricas; 'perfilar' = None (sem perfis), vazio (todas as ações) ou nomes das operações perfiladas."""
+    global ATIVO, _saida, _pasta_perfis, _perfilar  # Estado do módulo
+    _saida = open(caminho_metricas, mode='a', encoding='utf-8', buffering=1)  # Uma linha por métrica, gravada na hora
+    _pasta_perfis = pasta_perfis  # Pasta dos perfis
+    _perfilar = set(perfilar) if perfilar is not None else None  # Operações perfiladas
+    ATIVO = True  # Ligada
+
+
+def contar(lidas=0, gravadas=0):  # Chamado pelos métodos medidos do motor
+    """Soma linhas lidas/gravadas na operação aberta (fora de uma operação, não conta)."""
+    pilha = _pilha()  # Operações abertas
+    if pilha:  # Há uma operação em andamento
+        pilha[-1].lidas += lidas  # Linhas lidas
+        pilha[-1].gravadas += gravadas  # Linhas gravadas
+
+
+def entrada(mensagem=''):  # Substitui o input() do módulo medido
+    """Lê uma linha do teclado e desconta o tempo de digitação de todas as operações abertas."""
+    inicio = time.perf_counter()  # Início da espera
+    try:  # Sempre desconta, mesmo com Ctrl+C
+        return builtins.input(mensagem)  # input() original
+    finally:  # Espera encerrada
+        espera = time.perf_counter() - inicio  # Tempo parado no teclado
+        for medicao in _pilha():  # Todas as operações abertas estavam esperando
+            medicao.espera += espera  # Não entra no tempo delas
+
+
+def _perfilar_agora(nome, acao):  # Decide se esta chamada gera perfil
+    """Verdadeiro se a operação deve ser perfilada (e nenhum perfil estiver em andamento)."""
+    if _perfilar is None or _perfil_ativo:  # Perfis desligados, ou outro já aberto
+        return False  # Sem perfil
+    return nome in _perfilar if _perfilar else acao  # Nomes escolhidos, ou todas as ações
+
+
+def _gravar_perfil(perfil, nome):  # Grava o .prof de uma operação
+    """Grava o perfil na pasta de perfis e retorna o caminho do arquivo."""
+    os.makedirs(_pasta_perfis, exist_ok=True)  # Cria a pasta na primeira vez
+    caminho = os.path.join(_pasta_perfis, f"{nome}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.prof")  # Um arquivo por chamada
+    perfil.dump_stats(caminho)  # Abra com: python -m pstats <arquivo>
+    return caminho  # Caminho gravado
+
+
+def _registrar(medicao, segundos, nivel, erro, perfil):  # Uma linha no arquivo de métricas
+    """Acrescenta a métrica da chamada ao arquivo de métricas (JSON-lines)."""
+    linha = {  # Campos da métrica
+        'quando': datetime.now().isoformat(timespec='seconds'),
+        'operacao': medicao.nome,
+        'ms': round(segundos * 1000, 3),
+        'espera_ms': round(medicao.espera * 1000, 3),
+        'lidas': medicao.lidas,
+        'gravadas': medicao.gravadas,
+        'nivel': nivel,
+        'pid': os.getpid(),
+    }
+    if erro:  # A chamada terminou com exceção
+        linha['erro'] = erro  # Nome da exceção
+    if perfil:  # Perfil gravado
+        linha['perfil'] = perfil  # Caminho do .prof
+    _saida.write(json.dumps(linha, ensure_ascii=False) + "\n")  # Uma linha por chamada
+
+
+def medir(funcao, nome=None, acao=False):  # Embrulha uma função
+    """Retorna a função embrulhada: mede tempo e linhas, grava a métrica e, se for ação do menu, mostra a linha de status."""
+    nome = nome or funcao.__name__  # Nome gravado nas métricas
+
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):  # Mesma assinatura da original
+        global _perfil_ativo, ultima  # Estado do módulo
+        pilha = _pilha()  # Operações abertas
+        medicao = Medicao(nome)  # Começa a medir
+        pilha.append(medicao)  # Operações internas somam nesta
+        perfil = cProfile.Profile() if _perfilar_agora(nome, acao) else None  # Perfil desta chamada
+        if perfil:  # Liga o perfil
+            _perfil_ativo = True  # Impede perfis aninhados
+            perfil.enable()  # Começa a perfilar
+        erro = None  # Nome da exceção (se houver)
+        try:  # Executa a função original
+            return funcao(*args, **kwargs)  # Resultado intacto
+        except BaseException as excecao:  # Inclui Ctrl+C e SystemExit
+            erro = type(excecao).__name__  # Registrado na métrica
+            raise  # Propaga sem alterar
+        finally:  # Sempre registra
+            segundos = time.perf_counter() - medicao.inicio - medicao.espera  # Tempo sem a digitação
+            caminho_perfil = None  # Arquivo do perfil
+            if perfil:  # Encerra o perfil
+                perfil.disable()  # Para de perfilar
+                _perfil_ativo = False  # Libera para a próxima
+                caminho_perfil = _gravar_perfil(perfil, nome)  # Grava o .prof
+            pilha.pop()  # Fecha esta operação
+            if pilha:  # Operação de fora
+                pilha[-1].lidas += medicao.lidas  # As linhas desta contam também lá
+                pilha[-1].gravadas += medicao.gravadas  # Idem
+            _registrar(medicao, segundos, len(pilha), erro, caminho_perfil)  # Linha no arquivo de métricas
+            if acao:  # Ação do menu
+                ultima = (nome, segundos, medicao.lidas, medicao.gravadas, caminho_perfil)  # Para consulta
+                print(linha_status())  # Mostra ao usuário
+
+    return medida  # Função embrulhada
+
+
+def linha_status():  # Texto da última ação
+    """Retorna "⏱️ ação: X ms, Y linha(s) gravada(s), Z lida(s)" da última ação medida."""
+    if ultima is None:  # Nenhuma ação ainda
+        return ""  # Nada a mostrar
+    nome, segundos, lidas, gravadas, perfil = ultima  # Última ação
+    texto = f"⏱️ {nome}: {segundos * 1000:.1f} ms, {gravadas} linha(s) gravada(s), {lidas} lida(s)"  # Resumo
+    return texto + (f" | perfil em {perfil}" if perfil else "")  # Indica o arquivo do perfil
+
+
+def instrumentar(modulo, operacoes, acoes=()):  # Troca as funções de um módulo
+    """Substitui no módulo as funções de 'operacoes' e 'acoes' (estas mostram a linha de status) e o input() dele."""
+    for nome in operacoes:  # Leituras, gravações, cálculos e IDs
+        setattr(modulo, nome, medir(getattr(modulo, nome)))  # Chamadas internas do módulo passam a usar a versão medida
+    for nome in acoes:  # Telas do menu e do painel do cliente
+        setattr(modulo, nome, medir(getattr(modulo, nome), acao=True))  # Com linha de status
+    modulo.input = entrada  # O input() do módulo desconta o tempo de digitação
+
+
+def instrumentar_motor(motor):  # Conta as linhas lidas e gravadas pelo motor
+    """Troca os métodos de leitura, gravação e compactação do motor (só nesta instância) por versões que contam linhas."""
+    carregar_lote, registrar_lote, compactar, iterar = motor.carregar_lote, motor.registrar_lote, motor.compactar, motor.iterar  # Originais
+
+    def carregar_lote_contado(lote):  # Leitura de várias tabelas
+        listas, geracao = carregar_lote(lote)  # Leitura original
+        contar(lidas=sum(len(linhas) for linhas in listas))  # Linhas entregues
+        return listas, geracao  # Resultado intacto
+
+    def registrar_lote_contado(lote):  # Gravação de várias tabelas
+        gravadas = registrar_lote(lote)  # Gravação original (retorna as linhas gravadas)
+        contar(gravadas=gravadas)  # Conta
+        return gravadas  # Resultado intacto
+
+    def compactar_contado():  # Compactação (inclusive em segundo plano, que não tem operação aberta)
+        regravadas = compactar()  # Compactação original (retorna as linhas regravadas)
+        contar(gravadas=regravadas)  # Conta
+        return regravadas  # Resultado intacto
+
+    def iterar_contado(*args, **kwargs):  # Leitura sob demanda
+        for linha in iterar(*args, **kwargs):  # Linhas do gerador original
+            contar(lidas=1)  # Uma por vez, conforme forem consumidas
+            yield linha  # Entrega a linha
+
+    motor.carregar_lote = carregar_lote_contado  # carregar() também passa por aqui
+    motor.registrar_lote = registrar_lote_contado  # registrar() e salvar() também passam por aqui
+    motor.compactar = compactar_contado  # A thread de compactação usa o método da instância
+    motor.iterar = iterar_contado  # Relatórios e análises
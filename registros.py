@@ -0,0 +1,252 @@
+from datetime import datetime  # Importa a classe usada para guardar as datas já interpretadas
+
+from configuracao import CAMPOS_CABECALHO, CAMPOS_ITENS, CAMPOS_PAGAMENTOS  # Importa a ordem oficial das colunas dos CSVs
+from dinheiro import texto_para_centavos, centavos_para_texto  # Importa as conversões exatas de dinheiro
+
+# =================================================================
+#           REGISTROS TIPADOS (PEDIDO E ITEM) COM __slots__
+# =================================================================
+#
+# Cada linha do CSV é interpretada UMA vez no carregamento: dinheiro vira
+# centavos (int), datas viram datetime e IDs viram int. Os registros continuam
+# aceitando o acesso antigo por nome de coluna (pedido['Valor Total (R$)']),
+# que devolve o texto exatamente no formato gravado no CSV.
+
+FORMATO_DATA_HORA = "%d-%m-%Y %H:%M"  # Formato de 'Data do Pedido', 'Data do Pagamento' e 'Data/Hora Entrega'
+FORMATO_DATA = "%d-%m-%Y"  # Formato de 'Data Vencimento Prazo'
+
+
+# --- Conversores de leitura (texto do CSV -> valor tipado) ---
+
+def ler_texto(texto):  # Campos de texto livre
+    """Mantém o texto como está (None vira vazio)."""
+    return texto or ''  # Garante sempre uma string
+
+
+def ler_inteiro(texto):  # IDs e quantidades
+    """Converte o texto em inteiro."""
+    return int(texto)  # Mesmo erro de antes se o CSV estiver corrompido
+
+
+def ler_inteiro_opcional(texto):  # Contadores que podem estar vazios
+    """Converte o texto em inteiro (vazio vale 0, como nas linhas gravadas antes da coluna existir)."""
+    return int(texto) if texto else 0  # Coluna nova em CSVs antigos
+
+
+def ler_data_hora(texto):  # "27-01-2026 14:08"
+    """Interpreta DD-MM-AAAA HH:MM; textos em outro formato são preservados como estão."""
+    if not texto:  # Campo vazio
+        return None  # Sem data
+    if len(texto) == 16 and texto[2] == '-' and texto[5] == '-' and texto[10] == ' ' and texto[13] == ':':  # Formato esperado
+        try:  # Fatiamento direto é bem mais rápido que strptime
+            return datetime(int(texto[6:10]), int(texto[3:5]), int(texto[0:2]), int(texto[11:13]), int(texto[14:16]))  # Monta a data
+        except ValueError:  # Data impossível (ex.: 31-02)
+            pass  # Cai no texto original
+    return texto  # Preserva o texto para gravar de volta sem alteração
+
+
+def ler_data(texto):  # "10-02-2026"
+    """Interpreta DD-MM-AAAA; textos em outro formato são preservados como estão."""
+    if not texto:  # Campo vazio
+        return None  # Sem data
+    if len(texto) == 10 and texto[2] == '-' and texto[5] == '-':  # Formato esperado
+        try:  # Fatiamento direto
+            return datetime(int(texto[6:10]), int(texto[3:5]), int(texto[0:2]))  # Monta a data (meia-noite)
+        except ValueError:  # Data impossível
+            pass  # Cai no texto original
+    return texto  # Preserva o texto original
+
+
+# --- Conversores de escrita (valor tipado -> texto do CSV) ---
+
+def escrever_texto(valor):  # Campos de texto livre
+    """Devolve o texto como está."""
+    return valor or ''  # None vira vazio
+
+
+def escrever_inteiro(valor):  # IDs e quantidades
+    """Converte o inteiro em texto."""
+    return str(valor)  # Ex.: 12 -> "12"
+
+
+def escrever_inteiro_opcional(valor):  # Contadores que podem estar vazios
+    """Converte o inteiro em texto (0 vira vazio, igual às linhas antigas)."""
+    return str(valor) if valor else ''  # Pedido nunca gravado fica igual ao CSV antigo
+
+
+def escrever_data_hora(valor):  # datetime -> "27-01-2026 14:08"
+    """Formata a data/hora no padrão do CSV (ou devolve o texto preservado)."""
+    if valor is None:  # Sem data
+        return ''  # Campo vazio
+    if isinstance(valor, str):  # Texto preservado na leitura
+        return valor  # Grava exatamente como veio
+    return f"{valor.day:02d}-{valor.month:02d}-{valor.year:04d} {valor.hour:02d}:{valor.minute:02d}"  # Mais rápido que strftime
+
+
+def escrever_data(valor):  # datetime -> "10-02-2026"
+    """Formata a data no padrão do CSV (ou devolve o texto preservado)."""
+    if valor is None:  # Sem data
+        return ''  # Campo vazio
+    if isinstance(valor, str):  # Texto preservado na leitura
+        return valor  # Grava exatamente como veio
+    return f"{valor.day:02d}-{valor.month:02d}-{valor.year:04d}"  # Apenas a data
+
+
+class Registro:  # Base comum de Pedido e ItemPedido
+    """Registro tipado que também se comporta como o dicionário antigo da linha do CSV."""
+
+    __slots__ = ()  # Sem __dict__: cada instância guarda apenas os atributos declarados nas subclasses
+    COLUNAS = ()  # (coluna do CSV, atributo, conversor de leitura, conversor de escrita) na ordem do arquivo
+    PADROES = {}  # Valor inicial de cada atributo
+    _POR_COLUNA = {}  # Coluna do CSV -> definição (montado automaticamente em cada subclasse)
+
+    def __init_subclass__(cls, **kwargs):  # Executado quando Pedido/ItemPedido são definidos
+        super().__init_subclass__(**kwargs)  # Mantém o comportamento padrão
+        cls._POR_COLUNA = {definicao[0]: definicao for definicao in cls.COLUNAS}  # Índice para o acesso por nome de coluna
+
+    def __init__(self, **valores):  # Cria um registro novo a partir de valores já tipados
+        for atributo, padrao in self.PADROES.items():  # Preenche todos os atributos
+            setattr(self, atributo, valores.pop(atributo, padrao))  # Usa o valor informado ou o padrão
+        if valores:  # Sobrou algum atributo desconhecido
+            raise TypeError(f"Atributos desconhecidos: {', '.join(valores)}")  # Evita erros de digitação silenciosos
+
+    @classmethod
+    def de_tupla(cls, tupla):  # Usado pelo motor de armazenamento no carregamento
+        """Cria o registro a partir dos textos de uma linha do CSV (na ordem das colunas)."""
+        registro = cls.__new__(cls)  # Cria sem passar pelo __init__
+        for (_, atributo, ler, _), texto in zip(cls.COLUNAS, tupla):  # Percorre coluna e valor lado a lado
+            setattr(registro, atributo, ler(texto))  # Interpreta o texto uma única vez
+        return registro  # Registro pronto
+
+    @classmethod
+    def de_dicionario(cls, linha):  # Converte um dicionário no formato antigo
+        """Cria o registro a partir de um dicionário com os nomes das colunas do CSV."""
+        registro = cls()  # Registro com os valores padrão
+        registro.update(linha)  # Interpreta cada coluna informada
+        return registro  # Registro pronto
+
+    def para_tupla(self):  # Usado pelo motor de armazenamento na gravação
+        """Serializa o registro de volta para os textos exatos das colunas do CSV."""
+        return tuple(escrever(getattr(self, atributo)) for _, atributo, _, escrever in self.COLUNAS)  # Mesma ordem das colunas
+
+    def copy(self):  # Cópia rasa (usada para desfazer edições)
+        """Retorna uma cópia independente do registro."""
+        copia = self.__class__.__new__(self.__class__)  # Nova instância vazia
+        copia.update(self)  # Copia todos os atributos
+        return copia  # Cópia pronta
+
+    def update(self, outro):  # Restaura valores a partir de outro registro (ou dicionário de colunas)
+        """Copia os valores de outro registro do mesmo tipo ou de um dicionário de colunas."""
+        if isinstance(outro, self.__class__):  # Mesmo tipo: copia os atributos tipados
+            for _, atributo, _, _ in self.COLUNAS:  # Percorre os atributos
+                setattr(self, atributo, getattr(outro, atributo))  # Copia o valor
+        else:  # Dicionário no formato antigo
+            for coluna, texto in outro.items():  # Percorre as colunas informadas
+                self[coluna] = texto  # Interpreta o texto
+
+    # --- Compatibilidade com o dicionário antigo (acesso por nome de coluna) ---
+
+    def __getitem__(self, coluna):  # pedido['Valor Total (R$)'] -> "915.90"
+        _, atributo, _, escrever = self._POR_COLUNA[coluna]  # Definição da coluna (KeyError se não existir)
+        return escrever(getattr(self, atributo))  # Texto no formato do CSV
+
+    def __setitem__(self, coluna, texto):  # pedido['Valor Pago (R$)'] = "10.00"
+        _, atributo, ler, _ = self._POR_COLUNA[coluna]  # Definição da coluna (KeyError se não existir)
+        setattr(self, atributo, ler(texto))  # Interpreta e guarda tipado
+
+    def __contains__(self, coluna):  # 'Produto' in item
+        return coluna in self._POR_COLUNA  # Verifica se a coluna existe
+
+    def __iter__(self):  # Percorre os nomes das colunas, como um dicionário
+        return iter(self.keys())  # Iterador das colunas
+
+    def get(self, coluna, padrao=None):  # pedido.get('Valor Pago (R$)', '0.00')
+        """Retorna o texto da coluna ou o padrão se a coluna não existir."""
+        try:  # Tenta localizar a coluna
+            return self[coluna]  # Texto no formato do CSV
+        except KeyError:  # Coluna inexistente
+            return padrao  # Valor padrão
+
+    def keys(self):  # Nomes das colunas
+        return [coluna for coluna, _, _, _ in self.COLUNAS]  # Lista na ordem do CSV
+
+    def values(self):  # Textos das colunas
+        return list(self.para_tupla())  # Lista na ordem do CSV
+
+    def items(self):  # Pares (coluna, texto)
+        return list(zip(self.keys(), self.para_tupla()))  # Lista na ordem do CSV
+
+    def __repr__(self):  # Representação para depuração
+        return f"{self.__class__.__name__}({dict(self.items())!r})"  # Mostra as colunas e valores
+
+
+class Pedido(Registro):  # Linha de pedidos_cabecalho.csv
+    """Cabeçalho de pedido com dinheiro em centavos e datas como datetime."""
+
+    __slots__ = (  # Atributos fixos (sem dicionário por instância)
+        'id_pedido', 'data_pedido', 'nome_cliente', 'valor_total', 'valor_pago',
+        'forma_pagamento', 'status_pagamento', 'data_pagamento', 'data_vencimento',
+        'status_pedido', 'data_entrega', 'versao',
+    )
+    COLUNAS = tuple((coluna,) + definicao for coluna, definicao in zip(CAMPOS_CABECALHO, (  # (coluna, atributo, ler, escrever)
+        ('id_pedido', ler_inteiro, escrever_inteiro),
+        ('data_pedido', ler_data_hora, escrever_data_hora),
+        ('nome_cliente', ler_texto, escrever_texto),
+        ('valor_total', texto_para_centavos, centavos_para_texto),
+        ('valor_pago', texto_para_centavos, centavos_para_texto),
+        ('forma_pagamento', ler_texto, escrever_texto),
+        ('status_pagamento', ler_texto, escrever_texto),
+        ('data_pagamento', ler_data_hora, escrever_data_hora),
+        ('data_vencimento', ler_data, escrever_data),
+        ('status_pedido', ler_texto, escrever_texto),
+        ('data_entrega', ler_data_hora, escrever_data_hora),
+        ('versao', ler_inteiro_opcional, escrever_inteiro_opcional),
+    )))
+    PADROES = {  # Valores iniciais de um pedido novo
+        'id_pedido': 0, 'data_pedido': None, 'nome_cliente': '', 'valor_total': 0, 'valor_pago': 0,
+        'forma_pagamento': '', 'status_pagamento': '', 'data_pagamento': None, 'data_vencimento': None,
+        'status_pedido': '', 'data_entrega': None, 'versao': 0,
+    }
+
+    @property
+    def saldo(self):  # Quanto falta pagar
+        """Saldo devedor do pedido em centavos."""
+        return self.valor_total - self.valor_pago  # Total menos o que já foi pago
+
+
+class ItemPedido(Registro):  # Linha de pedidos_itens.csv
+    """Item de pedido com valor em centavos e quantidade inteira."""
+
+    __slots__ = (  # Atributos fixos (sem dicionário por instância)
+        'id_item', 'id_pedido', 'produto', 'quantidade', 'valor_item',
+        'codigo_produto', 'tipo_venda',
+    )
+    COLUNAS = tuple((coluna,) + definicao for coluna, definicao in zip(CAMPOS_ITENS, (  # (coluna, atributo, ler, escrever)
+        ('id_item', ler_inteiro, escrever_inteiro),
+        ('id_pedido', ler_inteiro, escrever_inteiro),
+        ('produto', ler_texto, escrever_texto),
+        ('quantidade', ler_inteiro, escrever_inteiro),
+        ('valor_item', texto_para_centavos, centavos_para_texto),
+        ('codigo_produto', ler_texto, escrever_texto),
+        ('tipo_venda', ler_texto, escrever_texto),
+    )))
+    PADROES = {  # Valores iniciais de um item novo
+        'id_item': 0, 'id_pedido': 0, 'produto': '', 'quantidade': 0, 'valor_item': 0,
+        'codigo_produto': '', 'tipo_venda': '',
+    }
+
+
+class Pagamento(Registro):  # Linha de pedidos_pagamentos.csv
+    """Recebimento de um pedido (parcela) com valor em centavos; as linhas nunca são alteradas depois de gravadas."""
+
+    __slots__ = ('id_pagamento', 'id_pedido', 'valor', 'forma_pagamento', 'data_pagamento')  # Atributos fixos (sem dicionário por instância)
+    COLUNAS = tuple((coluna,) + definicao for coluna, definicao in zip(CAMPOS_PAGAMENTOS, (  # (coluna, atributo, ler, escrever)
+        ('id_pagamento', ler_inteiro, escrever_inteiro),
+        ('id_pedido', ler_inteiro, escrever_inteiro),
+        ('valor', texto_para_centavos, centavos_para_texto),
+        ('forma_pagamento', ler_texto, escrever_texto),
+        ('data_pagamento', ler_data_hora, escrever_data_hora),
+    )))
+    PADROES = {  # Valores iniciais de um pagamento novo
+        'id_pagamento': 0, 'id_pedido': 0, 'valor': 0, 'forma_pagamento': '', 'data_pagamento': None,
+    }
@@ -0,0 +1,91 @@
+from datetime import datetime  # Importa o tipo usado nas datas dos pedidos
+
+from configuracao import CAMPOS_CABECALHO, TAMANHO_PAGINA  # Importa as colunas e o tamanho da página
+from clientes import normalizar_nome  # Reaproveita a normalização de nomes de clientes (sem acentos)
+from registros import ler_data_hora  # Importa a leitura da data do pedido (para filtrar pelo texto da coluna)
+
+# =================================================================
+#        RELATÓRIO GERAL EM FLUXO (SEM CARREGAR TUDO NA MEMÓRIA)
+# =================================================================
+#
+# As larguras das colunas são fixas (não dependem dos dados), então a primeira
+# página aparece sem precisar percorrer o histórico inteiro. Textos maiores que
+# a coluna são cortados com "…".
+
+LARGURAS_COLUNAS = {  # Largura fixa de cada coluna do relatório
+    'ID do Pedido': 6, 'Data do Pedido': 16, 'Nome do Cliente': 20,
+    'Valor Total (R$)': 10, 'Valor Pago (R$)': 10, 'Forma de Pagamento': 8,
+    'Status do Pagamento': 9, 'Data do Pagamento': 16, 'Data Vencimento Prazo': 10,
+    'Status do Pedido': 9, 'Data/Hora Entrega': 16,
+}
+TITULOS_COLUNAS = [  # Títulos curtos (na ordem de CAMPOS_CABECALHO) que cabem nas larguras fixas
+    'ID', 'Data Pedido', 'Cliente', 'Total', 'Pago', 'Forma',
+    'Status Pg', 'Data Pagamento', 'Vencimento', 'Entrega', 'Data Entrega',
+]
+
+
+def ajustar(texto, largura):  # Encaixa um texto numa coluna
+    """Completa o texto com espaços ou corta com '…' para caber na largura."""
+    texto = texto or ''  # Campos vazios
+    return texto[:largura - 1] + '…' if len(texto) > largura else texto.ljust(largura)  # Corta ou completa
+
+
+def formatar_linha(valores):  # Monta uma linha da tabela
+    """Formata os valores (na ordem de CAMPOS_CABECALHO) nas larguras fixas; colunas internas (ex.: Versão) ficam de fora."""
+    return " | ".join(  # Colunas alinhadas
+        ajustar(valor, LARGURAS_COLUNAS[campo]) for campo, valor in zip(CAMPOS_CABECALHO, valores) if campo in LARGURAS_COLUNAS
+    )
+
+
+def no_periodo(data, data_inicial=None, data_final=None):  # Filtro por período
+    """Indica se a data do pedido está no período (datas inclusas); data ausente ou inválida fica de fora."""
+    if not isinstance(data, datetime):  # Data ausente ou inválida não entra no período
+        return False  # Fora
+    if data_inicial and data.date() < data_inicial.date():  # Antes do período
+        return False  # Fora
+    return not (data_final and data.date() > data_final.date())  # Depois do período (data final inclusa)
+
+
+def condicoes_pedidos(status_pagamento=None, status_pedido=None, data_inicial=None, data_final=None, cliente=None):  # Filtros sobre o texto das colunas
+    """Monta os mesmos filtros de filtrar_pedidos como {coluna: função(texto)}, para o motor aplicar antes de criar os pedidos."""
+    condicoes = {}  # Coluna -> teste do texto gravado
+    if status_pagamento:  # Status financeiro
+        condicoes['Status do Pagamento'] = status_pagamento.__eq__  # Igualdade direta
+    if status_pedido:  # Status de entrega
+        condicoes['Status do Pedido'] = status_pedido.__eq__  # Igualdade direta
+    if data_inicial or data_final:  # Período
+        condicoes['Data do Pedido'] = lambda texto: no_periodo(ler_data_hora(texto), data_inicial, data_final)  # Mesma leitura do Pedido
+    if cliente:  # Parte do nome
+        trecho_cliente = normalizar_nome(cliente)  # Normalizada uma vez
+        condicoes['Nome do Cliente'] = lambda nome: trecho_cliente in normalizar_nome(nome)  # Sem acentos e maiúsculas
+    return condicoes  # Vazio = sem filtro
+
+
+def filtrar_pedidos(pedidos, status_pagamento=None, status_pedido=None, data_inicial=None, data_final=None, cliente=None):  # Filtros do relatório
+    """Gera apenas os pedidos que atendem aos filtros informados (None = sem filtro), sem montar listas."""
+    trecho_cliente = normalizar_nome(cliente) if cliente else None  # Parte do nome, normalizada
+    for pedido in pedidos:  # Percorre sob demanda
+        if status_pagamento and pedido.status_pagamento != status_pagamento:  # Status financeiro diferente
+            continue  # Pula
+        if status_pedido and pedido.status_pedido != status_pedido:  # Status de entrega diferente
+            continue  # Pula
+        if (data_inicial or data_final) and not no_periodo(pedido.data_pedido, data_inicial, data_final):  # Fora do período
+            continue  # Pula
+        if trecho_cliente and trecho_cliente not in normalizar_nome(pedido.nome_cliente):  # Outro cliente
+            continue  # Pula
+        yield pedido  # Entrega o pedido
+
+
+def imprimir_paginado(pedidos, tamanho_pagina=TAMANHO_PAGINA, perguntar=input):  # Exibição página a página
+    """Imprime os pedidos em páginas de tamanho fixo, pedindo confirmação entre elas; retorna quantos foram exibidos."""
+    titulo = formatar_linha(TITULOS_COLUNAS)  # Linha de títulos
+    exibidos = 0  # Contador de pedidos exibidos
+    for pedido in pedidos:  # Consome o gerador sob demanda
+        if exibidos % tamanho_pagina == 0:  # Início de uma página
+            if exibidos and perguntar("\n[Enter] próxima página | [S] sair: ").strip().upper() == 'S':  # Usuário encerrou
+                return exibidos  # Para de ler o restante
+            print(titulo)  # Imprime títulos
+            print("-" * len(titulo))  # Imprime sublinhado
+        print(formatar_linha(pedido.values()))  # Imprime a linha do pedido assim que ela é lida
+        exibidos += 1  # Conta o pedido
+    return exibidos  # Total exibido
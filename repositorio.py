@@ -0,0 +1,448 @@
+import heapq  # Importa a fila de prioridade usada no índice de vencimentos
+from datetime import date, datetime, timedelta  # Importa os tipos de data para calcular valores vencidos
+
+from clientes import LIMITE_RESULTADOS, DiretorioClientes, normalizar_nome  # Importa o diretório de clientes e a normalização de nomes (sem acentos)
+from configuracao import DIAS_ALERTA_VENCIMENTO, STATUS_EM_ABERTO, STATUS_PEDIDO_PENDENTE  # Importa a janela dos alertas e os status com saldo a receber ou entrega pendente
+
+# =================================================================
+#         REPOSITÓRIO EM MEMÓRIA COM ÍNDICES (HASH) DE PEDIDOS
+# =================================================================
+
+def converter_id(id_texto):  # IDs digitados pelo usuário chegam como texto
+    """Converte o ID informado para inteiro (None se não for um número)."""
+    try:  # Tenta converter
+        return int(id_texto)  # ID numérico
+    except (TypeError, ValueError):  # Texto vazio ou com letras
+        return None  # Nenhum pedido terá esse ID
+
+
+class ResumoCliente:  # Contas a receber de um cliente, atualizadas a cada alteração de pedido
+    """Agregado por cliente: quantidade de pedidos, saldo em aberto, último pagamento e valor vencido."""
+
+    __slots__ = ('quantidade_pedidos', 'saldo_aberto', '_pagamentos', '_ultimo_pagamento', '_prazos', '_vencido_em')
+
+    def __init__(self):  # Cliente sem pedidos
+        self.quantidade_pedidos = 0  # Pedidos do cliente
+        self.saldo_aberto = 0  # Soma dos saldos devedores (centavos)
+        self._pagamentos = {}  # ID do Pedido -> data do pagamento (só pedidos com pagamento)
+        self._ultimo_pagamento = None  # Maior data de pagamento (None = recalcular)
+        self._prazos = {}  # ID do Pedido -> (vencimento, saldo) dos pedidos com saldo e prazo definido
+        self._vencido_em = None  # (dia, valor vencido) calculado por último
+
+    def somar_pedido(self, id_pedido, saldo, data_pagamento, vencimento, sinal):  # sinal = +1 inclui, -1 retira
+        """Inclui (sinal=1) ou retira (sinal=-1) a contribuição de um pedido no resumo."""
+        self.quantidade_pedidos += sinal  # Atualiza a contagem
+        self.saldo_aberto += sinal * saldo  # Atualiza o saldo em aberto
+        if data_pagamento is not None:  # Pedido com pagamento registrado
+            if sinal > 0:  # Inclusão
+                self._pagamentos[id_pedido] = data_pagamento  # Guarda a data
+                if self._ultimo_pagamento is not None and data_pagamento > self._ultimo_pagamento:  # Nova maior data
+                    self._ultimo_pagamento = data_pagamento  # Atualiza em O(1)
+            else:  # Retirada
+                self._pagamentos.pop(id_pedido, None)  # Esquece a data
+                if data_pagamento == self._ultimo_pagamento:  # Era a maior data
+                    self._ultimo_pagamento = None  # Recalcula só quando for consultado
+        if saldo > 0 and vencimento is not None:  # Pedido a prazo ainda em aberto
+            if sinal > 0:  # Inclusão
+                self._prazos[id_pedido] = (vencimento, saldo)  # Guarda o prazo
+            else:  # Retirada
+                self._prazos.pop(id_pedido, None)  # Esquece o prazo
+            self._vencido_em = None  # O valor vencido precisa ser recalculado
+
+    @property
+    def ultimo_pagamento(self):  # Data do pagamento mais recente
+        """Retorna a data do pagamento mais recente (ou None)."""
+        if self._ultimo_pagamento is None and self._pagamentos:  # Desconhecida após uma retirada
+            self._ultimo_pagamento = max(self._pagamentos.values())  # Recalcula uma única vez
+        return self._ultimo_pagamento  # Data (ou None)
+
+    def vencido(self, hoje=None):  # Valor com prazo já expirado
+        """Soma dos saldos com vencimento anterior a hoje (recalculado no máximo uma vez por dia)."""
+        hoje = hoje or date.today()  # Data de referência
+        if self._vencido_em is None or self._vencido_em[0] != hoje:  # Mudou o dia ou algum prazo
+            valor = sum(saldo for vencimento, saldo in self._prazos.values() if vencimento < hoje)  # Só os pedidos a prazo em aberto
+            self._vencido_em = (hoje, valor)  # Guarda o resultado do dia
+        return self._vencido_em[1]  # Valor vencido (centavos)
+
+
+class IndiceVencimentos:  # Pedidos em aberto ordenados pela data de vencimento
+    """Heap de (vencimento, ID do pedido) com remoção preguiçosa: atualização O(log n), consulta O(k log k)."""
+
+    def __init__(self):  # Índice vazio
+        self._heap = []  # Entradas (vencimento, ID do pedido, sequência), inclusive as já substituídas
+        self._vigentes = {}  # ID do Pedido -> (vencimento, sequência) da entrada válida
+        self._sequencia = 0  # Distingue entradas repetidas do mesmo pedido
+
+    def __len__(self):  # Quantidade de pedidos indexados
+        return len(self._vigentes)  # Só as entradas válidas
+
+    def atualizar(self, id_pedido, vencimento):  # vencimento None = retira o pedido
+        """Coloca (ou retira, com None) o pedido no índice com o vencimento informado."""
+        vigente = self._vigentes.get(id_pedido)  # Entrada atual do pedido
+        if (vigente[0] if vigente else None) == vencimento:  # Nada mudou
+            return  # Evita entradas repetidas
+        if vencimento is None:  # Pedido quitado ou sem prazo
+            del self._vigentes[id_pedido]  # A entrada antiga no heap passa a ser ignorada
+        else:  # Prazo novo ou alterado
+            self._sequencia += 1  # Nova entrada
+            self._vigentes[id_pedido] = (vencimento, self._sequencia)  # Marca como válida
+            heapq.heappush(self._heap, (vencimento, id_pedido, self._sequencia))  # O(log n)
+        if len(self._heap) > 2 * len(self._vigentes) + 64:  # Muitas entradas substituídas
+            self._heap = [(v, i, s) for i, (v, s) in self._vigentes.items()]  # Só as válidas
+            heapq.heapify(self._heap)  # Reconstrói em O(n) (amortizado nas atualizações)
+
+    def ate(self, limite):  # Percorre o heap em ordem sem desmontá-lo
+        """Gera (vencimento, ID do pedido) com vencimento <= limite, em ordem crescente de data."""
+        heap = self._heap  # Árvore do heap (filhos de i em 2i+1 e 2i+2)
+        fronteira = [(heap[0], 0)] if heap else []  # Nós candidatos, do menor para o maior
+        while fronteira:  # Visita só os nós até o limite
+            (vencimento, id_pedido, sequencia), posicao = heapq.heappop(fronteira)  # Menor candidato
+            if vencimento > limite:  # Todos os outros candidatos são maiores
+                return  # Fim da consulta
+            if self._vigentes.get(id_pedido) == (vencimento, sequencia):  # Entrada ainda válida
+                yield vencimento, id_pedido  # Entrega o pedido
+            for filho in (2 * posicao + 1, 2 * posicao + 2):  # Filhos no heap
+                if filho < len(heap):  # Filho existe
+                    heapq.heappush(fronteira, (heap[filho], filho))  # Vira candidato
+
+
+class AgendaEntregas:  # Entregas pendentes agrupadas por dia
+    """Índice dia -> {ID do pedido: data/hora da entrega}: atualização O(1), consulta de um dia O(k log k)."""
+
+    def __init__(self):  # Agenda vazia
+        self._por_dia = {}  # Dia -> {ID do Pedido: data/hora}
+        self._agendado = {}  # ID do Pedido -> data/hora indexada (para achar o dia antigo)
+
+    def __len__(self):  # Quantidade de entregas pendentes
+        return len(self._agendado)  # Pedidos agendados
+
+    def atualizar(self, id_pedido, data_hora):  # data_hora None = retira o pedido
+        """Coloca (ou retira, com None) o pedido na agenda no dia e horário informados."""
+        anterior = self._agendado.get(id_pedido)  # Horário indexado
+        if anterior == data_hora:  # Nada mudou
+            return  # Evita trabalho
+        if anterior is not None:  # Sai do dia antigo
+            dia = self._por_dia[anterior.date()]  # Entregas do dia antigo
+            del dia[id_pedido]  # Retira o pedido
+            if not dia:  # Dia ficou vazio
+                del self._por_dia[anterior.date()]  # Remove o dia
+            del self._agendado[id_pedido]  # Esquece o horário
+        if data_hora is not None:  # Entra no dia novo
+            self._por_dia.setdefault(data_hora.date(), {})[id_pedido] = data_hora  # Agrupa pelo dia
+            self._agendado[id_pedido] = data_hora  # Lembra o horário
+
+    def do_dia(self, dia):  # Entregas de um dia
+        """Retorna [(data/hora, ID do pedido)] do dia, em ordem de horário."""
+        return sorted((data_hora, id_pedido) for id_pedido, data_hora in self._por_dia.get(dia, {}).items())  # Só o dia pedido
+
+    def dias(self, desde=None):  # Resumo da agenda
+        """Retorna [(dia, quantidade de entregas)] dos dias com entregas (a partir de 'desde'), em ordem."""
+        return sorted((dia, len(entregas)) for dia, entregas in self._por_dia.items() if desde is None or dia >= desde)  # Um item por dia
+
+
+class RepositorioPedidos:  # Camada sobre as listas de cabeçalhos e itens carregadas do disco
+    """Mantém índices por ID do pedido, itens por pedido, pagamentos por pedido e pedidos por cliente."""
+
+    def __init__(self, cabecalhos, itens, pagamentos=None):  # Recebe as listas de Pedido/ItemPedido/Pagamento carregadas do disco
+        self.cabecalhos = cabecalhos  # Lista original de cabeçalhos (mesma referência)
+        self._pedido_por_id = {}  # ID do Pedido -> cabeçalho
+        self._itens_por_pedido = {}  # ID do Pedido -> lista de itens
+        self._pedidos_por_cliente = {}  # Nome normalizado -> lista de cabeçalhos
+        self._cliente_do_pedido = {}  # ID do Pedido -> nome normalizado (para detectar troca de nome)
+        self._nome_exibicao = {}  # Nome normalizado -> nome como foi digitado no cadastro
+        self._diretorio = DiretorioClientes()  # Busca de clientes (ID estável, prefixos e trigramas)
+        self._pedidos_alterados = {}  # Cabeçalhos novos/alterados ainda não gravados
+        self._itens_alterados = {}  # Itens novos/alterados ainda não gravados
+        self._itens_removidos = set()  # IDs de itens removidos ainda não gravados
+        self._pagamentos_por_pedido = {}  # ID do Pedido -> lista de pagamentos (ordem de lançamento)
+        self._pago_por_pedido = {}  # ID do Pedido -> soma dos pagamentos (centavos), mantida a cada lançamento
+        self._caixa_por_dia = {}  # Dia -> {forma de pagamento: valor recebido (centavos)}
+        self._pagamentos_novos = []  # Pagamentos lançados ainda não gravados
+        self._resumos = {}  # Nome normalizado -> ResumoCliente (contas a receber)
+        self._contribuicoes = {}  # ID do Pedido -> (cliente, saldo, data do pagamento, vencimento) somados no resumo
+        self._vencimentos = IndiceVencimentos()  # Pedidos em aberto com prazo, ordenados pelo vencimento
+        self._entregas = AgendaEntregas()  # Pedidos com entrega pendente agendada, agrupados por dia
+        self.geracao = None  # Geração do motor de armazenamento em que as listas foram lidas (detecta gravações de outros terminais)
+        self.maior_id_pedido = max((p.id_pedido for p in cabecalhos), default=0)  # Calculado uma vez: piso do alocador de IDs
+        self.maior_id_item = max((i.id_item for i in itens), default=0)  # Calculado uma vez: piso do alocador de IDs
+        self.maior_id_pagamento = max((p.id_pagamento for p in pagamentos or ()), default=0)  # Calculado uma vez: piso do alocador de IDs
+        for pagamento in pagamentos or ():  # Soma o histórico de pagamentos (a lista plana passa a vir do índice por pedido)
+            self._somar_pagamento(pagamento, 1)  # Atualiza os totais por pedido e por dia
+        for pedido in cabecalhos:  # Indexa todos os pedidos
+            self._derivar_pagamento(pedido)  # O valor pago vem do histórico de pagamentos
+            self._indexar_pedido(pedido)  # Atualiza os índices do pedido
+            self._contabilizar(pedido)  # Soma o pedido nas contas a receber do cliente
+        for item in itens:  # Indexa todos os itens (a lista plana passa a vir do índice por pedido)
+            self._itens_por_pedido.setdefault(item.id_pedido, []).append(item)  # Agrupa pelo pedido
+
+    @property
+    def itens(self):  # Lista plana derivada do índice
+        """Todos os itens em memória, agrupados por pedido (montada só quando pedida; remover um item não percorre o histórico)."""
+        return [item for lista in self._itens_por_pedido.values() for item in lista]  # O(n) apenas nesta consulta
+
+    @property
+    def pagamentos(self):  # Lista plana derivada do índice
+        """Todos os pagamentos em memória, agrupados por pedido (montada só quando pedida)."""
+        return [pagamento for lista in self._pagamentos_por_pedido.values() for pagamento in lista]  # O(n) apenas nesta consulta
+
+    # --- Índices ---
+
+    def _indexar_pedido(self, pedido):  # Inclui um pedido nos índices
+        """Registra o pedido nos índices por ID e por cliente."""
+        id_pedido = pedido.id_pedido  # Chave do pedido
+        chave_cliente = normalizar_nome(pedido.nome_cliente)  # Chave do cliente
+        self._pedido_por_id[id_pedido] = pedido  # Índice por ID
+        if chave_cliente not in self._pedidos_por_cliente:  # Primeiro pedido do cliente
+            self._diretorio.adicionar(chave_cliente)  # Entra no diretório de clientes
+        self._pedidos_por_cliente.setdefault(chave_cliente, []).append(pedido)  # Índice por cliente
+        self._cliente_do_pedido[id_pedido] = chave_cliente  # Lembra o cliente indexado
+        self._nome_exibicao.setdefault(chave_cliente, pedido.nome_cliente)  # Guarda o nome original
+
+    def _desindexar_cliente(self, pedido, chave_cliente):  # Retira o pedido do índice de um cliente
+        """Remove o pedido da lista do cliente informado."""
+        lista = self._pedidos_por_cliente.get(chave_cliente, [])  # Pedidos desse cliente
+        if pedido in lista:  # Se estiver indexado
+            lista.remove(pedido)  # Remove (O(pedidos do cliente))
+        if not lista:  # Cliente ficou sem pedidos
+            self._pedidos_por_cliente.pop(chave_cliente, None)  # Remove a chave
+            self._nome_exibicao.pop(chave_cliente, None)  # Remove o nome de exibição
+            self._diretorio.remover(chave_cliente)  # Sai do diretório de clientes
+
+    def _contabilizar(self, pedido):  # Atualiza as contas a receber com o estado atual do pedido
+        """Retira a contribuição anterior do pedido e soma a atual no resumo do cliente (O(1))."""
+        id_pedido = pedido.id_pedido  # Chave do pedido
+        anterior = self._contribuicoes.get(id_pedido)  # O que já estava somado
+        vencimento = pedido.data_vencimento  # Prazo (datetime, ou texto se inválido)
+        vencimento = vencimento.date() if isinstance(vencimento, datetime) else None  # Só prazos válidos contam como vencidos
+        pagamento = pedido.data_pagamento if isinstance(pedido.data_pagamento, datetime) and pedido.valor_pago > 0 else None  # Só pagamentos efetivos
+        em_aberto = pedido.status_pagamento in STATUS_EM_ABERTO and pedido.saldo > 0  # Ainda há o que receber
+        self._vencimentos.atualizar(id_pedido, vencimento if em_aberto else None)  # Mantém o índice de vencimentos (O(log n))
+        entrega = pedido.data_entrega if pedido.status_pedido == STATUS_PEDIDO_PENDENTE and isinstance(pedido.data_entrega, datetime) else None  # Só entregas agendadas e pendentes
+        self._entregas.atualizar(id_pedido, entrega)  # Mantém a agenda de entregas (O(1))
+        atual = (self._cliente_do_pedido[id_pedido], pedido.saldo, pagamento, vencimento)  # Contribuição nova
+        if anterior == atual:  # Nada mudou nas contas
+            return  # Evita trabalho
+        if anterior:  # Já havia sido somado
+            chave = anterior[0]  # Cliente anterior
+            self._resumos[chave].somar_pedido(id_pedido, *anterior[1:], sinal=-1)  # Retira a contribuição antiga
+            if not self._resumos[chave].quantidade_pedidos:  # Cliente ficou sem pedidos
+                del self._resumos[chave]  # Remove o resumo
+        self._resumos.setdefault(atual[0], ResumoCliente()).somar_pedido(id_pedido, *atual[1:], sinal=1)  # Soma a nova
+        self._contribuicoes[id_pedido] = atual  # Lembra o que foi somado
+
+    def _somar_pagamento(self, pagamento, sinal):  # sinal = +1 inclui, -1 retira
+        """Inclui (sinal=1) ou retira (sinal=-1) o pagamento nos índices por pedido e no caixa do dia (O(1))."""
+        id_pedido = pagamento.id_pedido  # Pedido pago
+        lista = self._pagamentos_por_pedido.setdefault(id_pedido, [])  # Pagamentos do pedido
+        if sinal > 0:  # Inclusão
+            lista.append(pagamento)  # Mantém a ordem de lançamento
+        else:  # Retirada
+            lista.remove(pagamento)  # O(pagamentos do pedido)
+        self._pago_por_pedido[id_pedido] = self._pago_por_pedido.get(id_pedido, 0) + sinal * pagamento.valor  # Soma incremental
+        if not lista:  # Pedido ficou sem pagamentos
+            del self._pagamentos_por_pedido[id_pedido]  # Remove a chave
+            del self._pago_por_pedido[id_pedido]  # Remove a soma
+        if isinstance(pagamento.data_pagamento, datetime):  # Só datas válidas entram no caixa
+            dia = self._caixa_por_dia.setdefault(pagamento.data_pagamento.date(), {})  # Recebimentos do dia
+            dia[pagamento.forma_pagamento] = dia.get(pagamento.forma_pagamento, 0) + sinal * pagamento.valor  # Soma por forma
+
+    def _derivar_pagamento(self, pedido):  # Valor pago e data a partir do histórico
+        """Copia para o cabeçalho a soma dos pagamentos do pedido e a data do último (pedidos sem histórico ficam como estão)."""
+        pagamentos = self._pagamentos_por_pedido.get(pedido.id_pedido)  # Histórico do pedido
+        if not pagamentos:  # Pedido sem pagamentos lançados
+            return  # Mantém o cabeçalho
+        pedido.valor_pago = self._pago_por_pedido[pedido.id_pedido]  # Soma mantida incrementalmente
+        ultimo = pagamentos[-1].data_pagamento  # Pagamento mais recente
+        if isinstance(ultimo, datetime):  # Data válida
+            pedido.data_pagamento = ultimo  # Data do último recebimento
+
+    # --- Consultas ---
+
+    def resumo_dos_clientes(self, nomes, hoje=None):  # Painel de contas a receber
+        """Retorna pedidos, saldo em aberto, último pagamento e valor vencido somados dos clientes (O(clientes))."""
+        resumo = {'pedidos': 0, 'saldo': 0, 'ultimo_pagamento': None, 'vencido': 0}  # Totais começam zerados
+        for nome in nomes:  # Normalmente um único cliente
+            cliente = self._resumos.get(normalizar_nome(nome))  # Resumo mantido incrementalmente
+            if not cliente:  # Cliente sem pedidos
+                continue  # Próximo
+            resumo['pedidos'] += cliente.quantidade_pedidos  # Soma a contagem
+            resumo['saldo'] += cliente.saldo_aberto  # Soma o saldo em aberto
+            resumo['vencido'] += cliente.vencido(hoje)  # Soma o valor vencido
+            ultimo = cliente.ultimo_pagamento  # Último pagamento desse cliente
+            if ultimo and (resumo['ultimo_pagamento'] is None or ultimo > resumo['ultimo_pagamento']):  # Mais recente
+                resumo['ultimo_pagamento'] = ultimo  # Guarda a maior data
+        return resumo  # Dicionário com os totais
+
+    def alertas_vencimento(self, dias=DIAS_ALERTA_VENCIMENTO, hoje=None):  # Tela de alertas
+        """Retorna (vencidos, a vencer nos próximos 'dias') como listas de pedidos em aberto, em ordem de vencimento (O(k))."""
+        hoje = hoje or date.today()  # Data de referência
+        vencidos, a_vencer = [], []  # Resultado
+        for vencimento, id_pedido in self._vencimentos.ate(hoje + timedelta(days=dias)):  # Só os pedidos dentro da janela
+            (vencidos if vencimento < hoje else a_vencer).append(self._pedido_por_id[id_pedido])  # Separa pelo dia de hoje
+        return vencidos, a_vencer  # Pedidos em aberto
+
+    def entregas_do_dia(self, dia):  # Planejamento de entregas
+        """Retorna os pedidos com entrega pendente no dia, em ordem de horário (O(k log k))."""
+        return [self._pedido_por_id[id_pedido] for _, id_pedido in self._entregas.do_dia(dia)]  # Só os pedidos do dia
+
+    def dias_com_entregas(self, desde=None):  # Resumo da agenda
+        """Retorna [(dia, quantidade)] dos dias com entregas pendentes a partir de 'desde'."""
+        return self._entregas.dias(desde)  # Um item por dia agendado
+
+    def pagamentos_do_pedido(self, id_pedido):  # Extrato de um pedido
+        """Retorna uma cópia da lista de pagamentos do pedido, na ordem de lançamento."""
+        return list(self._pagamentos_por_pedido.get(converter_id(id_pedido), []))  # Consulta no índice
+
+    def pagamentos_dos_pedidos(self, pedidos):  # Extrato de um cliente
+        """Retorna os pagamentos dos pedidos informados em ordem cronológica (sem data por último)."""
+        pagamentos = [p for pedido in pedidos for p in self._pagamentos_por_pedido.get(pedido.id_pedido, [])]  # Só os pedidos informados
+        return sorted(pagamentos, key=lambda p: (not isinstance(p.data_pagamento, datetime), p.data_pagamento if isinstance(p.data_pagamento, datetime) else datetime.min, p.id_pagamento))  # Data, depois ordem de lançamento
+
+    def fluxo_de_caixa(self, desde=None, ate=None):  # Recebimentos por dia
+        """Retorna [(dia, {forma: valor})] dos dias com recebimentos entre 'desde' e 'ate' (inclusive), em ordem."""
+        return sorted(  # Um item por dia (O(dias), sem percorrer os pedidos)
+            (dia, dict(formas)) for dia, formas in self._caixa_por_dia.items()
+            if (desde is None or dia >= desde) and (ate is None or dia <= ate) and any(formas.values())
+        )
+
+    def obter_pedido(self, id_pedido):  # Busca O(1) por ID
+        """Retorna o cabeçalho do pedido pelo ID (ou None)."""
+        return self._pedido_por_id.get(converter_id(id_pedido))  # Consulta no índice
+
+    def itens_do_pedido(self, id_pedido):  # Busca O(k) dos itens de um pedido
+        """Retorna uma cópia da lista de itens do pedido."""
+        return list(self._itens_por_pedido.get(converter_id(id_pedido), []))  # Cópia para permitir remoção durante a iteração
+
+    def pedidos_do_cliente(self, nome):  # Busca exata por cliente
+        """Retorna os pedidos do cliente com o nome informado (sem diferenciar maiúsculas)."""
+        return list(self._pedidos_por_cliente.get(normalizar_nome(nome), []))  # Consulta no índice
+
+    def buscar_clientes(self, trecho, limite=LIMITE_RESULTADOS):  # Busca por parte do nome
+        """Retorna os nomes dos clientes mais parecidos com o texto digitado, do melhor para o pior."""
+        return [nome for _, nome, _, _ in self.clientes_semelhantes(trecho, limite)]  # Só os nomes
+
+    def clientes_semelhantes(self, texto, limite=LIMITE_RESULTADOS):  # Busca ranqueada (sem acentos, com erros de digitação)
+        """Retorna [(ID do cliente, nome, quantidade de pedidos, pontuação)] dos clientes mais parecidos com o texto."""
+        resultados = self._diretorio.buscar(texto, limite, peso=lambda chave: len(self._pedidos_por_cliente[chave]))  # Empate: mais pedidos primeiro
+        return [(self._diretorio.id_de(chave), self._nome_exibicao[chave], len(self._pedidos_por_cliente[chave]), pontos) for chave, pontos in resultados]  # Dados para a tela
+
+    def cliente_por_id(self, id_cliente):  # Busca O(1) pelo ID estável
+        """Retorna o nome do cliente com o ID informado (ou None)."""
+        chave = self._diretorio.chave_de(id_cliente)  # Nome normalizado
+        return self._nome_exibicao.get(chave) if chave else None  # Nome como foi cadastrado
+
+    def id_do_cliente(self, nome):  # ID estável do cliente
+        """Retorna o ID do cliente com o nome informado (ou None se não tiver pedidos)."""
+        return self._diretorio.id_de(normalizar_nome(nome))  # Consulta O(1)
+
+    def pedidos_dos_clientes(self, nomes):  # Junta os pedidos de vários clientes
+        """Retorna os pedidos de todos os clientes informados, em ordem de ID."""
+        pedidos = []  # Lista acumulada
+        for nome in nomes:  # Percorre os clientes
+            pedidos.extend(self._pedidos_por_cliente.get(normalizar_nome(nome), []))  # Junta os pedidos de cada um
+        return sorted(pedidos, key=lambda p: p.id_pedido)  # Mantém a ordem cronológica dos IDs
+
+    # --- Carga parcial ---
+
+    def incorporar(self, cabecalhos, itens, pagamentos=()):  # Junta registros lidos de outro lugar (servidor local)
+        """Indexa pedidos, itens e pagamentos já gravados sem marcá-los para gravação (pedidos já conhecidos são ignorados)."""
+        novos = {p.id_pedido: p for p in cabecalhos if p.id_pedido not in self._pedido_por_id}  # Só pedidos ainda não carregados
+        for pagamento in pagamentos:  # Pagamentos primeiro (o cabeçalho deriva o valor pago deles)
+            if pagamento.id_pedido in novos:  # Pedido que está entrando agora
+                self._somar_pagamento(pagamento, 1)  # Atualiza o índice, os totais por pedido e por dia
+                self.maior_id_pagamento = max(self.maior_id_pagamento, pagamento.id_pagamento)  # Mantém o maior ID
+        for pedido in novos.values():  # Mesmo caminho da carga inicial
+            self.cabecalhos.append(pedido)  # Adiciona à lista em memória
+            self._derivar_pagamento(pedido)  # O valor pago vem do histórico de pagamentos
+            self._indexar_pedido(pedido)  # Atualiza os índices do pedido
+            self._contabilizar(pedido)  # Soma o pedido nas contas a receber do cliente
+            self.maior_id_pedido = max(self.maior_id_pedido, pedido.id_pedido)  # Mantém o maior ID
+        for item in itens:  # Itens dos pedidos novos
+            if item.id_pedido in novos:  # Ignora itens de pedidos já carregados
+                self._itens_por_pedido.setdefault(item.id_pedido, []).append(item)  # Agrupa pelo pedido
+                self.maior_id_item = max(self.maior_id_item, item.id_item)  # Mantém o maior ID
+        return list(novos.values())  # Pedidos incorporados
+
+    # --- Alterações ---
+
+    def adicionar_pedido(self, pedido):  # Inclui um pedido novo
+        """Acrescenta um cabeçalho novo à lista e aos índices."""
+        self.cabecalhos.append(pedido)  # Adiciona à lista em memória
+        self._indexar_pedido(pedido)  # Atualiza os índices
+        self._pedidos_alterados[pedido.id_pedido] = pedido  # Marca para gravação
+        self.maior_id_pedido = max(self.maior_id_pedido, pedido.id_pedido)  # Mantém o maior ID em O(1)
+        self._contabilizar(pedido)  # Soma o pedido nas contas a receber do cliente
+
+    def marcar_pedido_alterado(self, pedido):  # Avisa que um cabeçalho foi editado no lugar
+        """Registra que o cabeçalho mudou e reindexa o cliente se o nome foi trocado."""
+        id_pedido = pedido.id_pedido  # Chave do pedido
+        chave_antiga = self._cliente_do_pedido.get(id_pedido)  # Cliente indexado anteriormente
+        chave_nova = normalizar_nome(pedido.nome_cliente)  # Cliente atual
+        if chave_antiga != chave_nova:  # O nome do cliente mudou
+            self._desindexar_cliente(pedido, chave_antiga)  # Tira do cliente antigo
+            self._indexar_pedido(pedido)  # Indexa no cliente novo
+        self._pedidos_alterados[id_pedido] = pedido  # Marca para gravação
+        self._contabilizar(pedido)  # Atualiza as contas a receber (pagamento, total, prazo ou cliente)
+
+    def registrar_pagamento(self, pedido, pagamento):  # Lança um recebimento (só acréscimo)
+        """Acrescenta o pagamento ao histórico e atualiza o valor pago e a data do pagamento do pedido pela soma mantida."""
+        self._somar_pagamento(pagamento, 1)  # Atualiza o índice, os totais por pedido e por dia
+        self._pagamentos_novos.append(pagamento)  # Marca para gravação
+        self.maior_id_pagamento = max(self.maior_id_pagamento, pagamento.id_pagamento)  # Mantém o maior ID em O(1)
+        self._derivar_pagamento(pedido)  # Novo valor pago e data do último pagamento
+        if pedido.id_pedido in self._pedido_por_id:  # Pedido já registrado
+            self.marcar_pedido_alterado(pedido)  # Grava o cabeçalho com o novo valor pago
+
+    def descartar_pagamentos_novos(self, id_pedido):  # Desfaz lançamentos ainda não gravados
+        """Retira do histórico os pagamentos do pedido lançados desde a última gravação."""
+        id_pedido = converter_id(id_pedido)  # Chave do pedido
+        descartados = [p for p in self._pagamentos_novos if p.id_pedido == id_pedido]  # Só os do pedido
+        if not descartados:  # Nada lançado nesta edição
+            return  # Nada a desfazer
+        self._pagamentos_novos = [p for p in self._pagamentos_novos if p.id_pedido != id_pedido]  # Não grava mais (uma passada)
+        for pagamento in descartados:  # Cada lançamento desfeito
+            self._somar_pagamento(pagamento, -1)  # Sai do índice do pedido (O(k)) e dos totais
+
+    def adicionar_item(self, item):  # Inclui um item novo
+        """Acrescenta um item ao índice do pedido."""
+        self._itens_por_pedido.setdefault(item.id_pedido, []).append(item)  # Atualiza o índice
+        self._itens_alterados[item.id_item] = item  # Marca para gravação
+        self._itens_removidos.discard(item.id_item)  # Um ID reutilizado deixa de estar removido
+        self.maior_id_item = max(self.maior_id_item, item.id_item)  # Mantém o maior ID em O(1)
+
+    def marcar_item_alterado(self, item):  # Avisa que um item foi editado no lugar
+        """Registra que o item mudou (quantidade, tipo ou valor)."""
+        self._itens_alterados[item.id_item] = item  # Marca para gravação
+
+    def remover_item(self, item):  # Exclui um item
+        """Remove o item do índice do pedido (O(k), sem percorrer o histórico inteiro)."""
+        lista = self._itens_por_pedido.get(item.id_pedido, [])  # Itens do pedido
+        lista.remove(item)  # Remove do índice (O(k))
+        if not lista:  # Pedido ficou sem itens
+            self._itens_por_pedido.pop(item.id_pedido, None)  # Remove a chave
+        self._itens_alterados.pop(item.id_item, None)  # Não precisa mais gravar a alteração
+        self._itens_removidos.add(item.id_item)  # Marca a exclusão para gravação
+
+    def restaurar_pedido(self, pedido, copia_cabecalho, copia_itens):  # Desfaz uma edição cancelada
+        """Devolve o cabeçalho e os itens do pedido ao estado das cópias informadas."""
+        for item in self.itens_do_pedido(pedido.id_pedido):  # Remove os itens atuais do pedido
+            self.remover_item(item)  # Remove dos índices
+        self.descartar_pagamentos_novos(pedido.id_pedido)  # Pagamentos lançados na edição também são desfeitos
+        pedido.update(copia_cabecalho)  # Restaura os valores originais mantendo a mesma referência
+        self.marcar_pedido_alterado(pedido)  # Reindexa (a gravação não muda nada se for igual ao disco)
+        for item in copia_itens:  # Recoloca os itens originais
+            self.adicionar_item(item)  # Inclui nos índices
+
+    def extrair_alteracoes(self):  # Entrega o que precisa ser gravado
+        """Retorna (pedidos alterados, itens alterados, IDs de itens removidos, pagamentos novos) e limpa as marcas."""
+        alteracoes = (  # Monta a tupla de retorno
+            list(self._pedidos_alterados.values()),  # Cabeçalhos novos/alterados
+            list(self._itens_alterados.values()),  # Itens novos/alterados
+            list(self._itens_removidos),  # Itens excluídos
+            list(self._pagamentos_novos),  # Pagamentos lançados (nunca alterados nem excluídos)
+        )
+        self._pedidos_alterados.clear()  # Limpa as marcas de cabeçalhos
+        self._itens_alterados.clear()  # Limpa as marcas de itens
+        self._itens_removidos.clear()  # Limpa as marcas de exclusão
+        self._pagamentos_novos.clear()  # Limpa as marcas de pagamentos
+        return alteracoes  # Retorna as alterações pendentes
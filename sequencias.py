@@ -0,0 +1,69 @@
+import json  # Importa a biblioteca para ler e gravar o arquivo de contadores
+import os  # Importa a biblioteca para gravar o arquivo de forma atômica
+
+from travas import TravaArquivo  # Importa a trava entre terminais
+
+# =================================================================
+#          ALOCADOR DE IDs SEQUENCIAIS (O(1) POR NOVO ID)
+# =================================================================
+#
+# Os últimos IDs entregues ficam num pequeno arquivo de contadores ao lado dos
+# CSVs. Cada alocação trava esse arquivo, lê o contador, soma e regrava: assim
+# terminais diferentes nunca recebem o mesmo ID, e o valor sobrevive ao
+# reinício do programa. O maior ID encontrado nos dados (calculado uma única
+# vez no carregamento) serve de piso caso o arquivo seja apagado ou esteja
+# atrasado em relação aos CSVs.
+
+
+class AlocadorSequencias:  # Controla os contadores de IDs de pedidos e itens
+    """Entrega IDs crescentes e únicos, persistidos num arquivo de contadores."""
+
+    def __init__(self, caminho, tamanho_bloco=None):  # Recebe o caminho do arquivo de contadores
+        self.caminho = caminho  # Arquivo JSON com {"pedido": 12, "item": 340}
+        self.trava = TravaArquivo(caminho + '.trava')  # Trava entre terminais
+        self.tamanho_bloco = tamanho_bloco or {}  # Quantos IDs reservar de uma vez por sequência (ex.: itens)
+        self._pisos = {}  # Maior ID conhecido nos dados, por sequência
+        self._reservados = {}  # Sequência -> [próximo ID livre, último ID reservado] do bloco em memória
+
+    def garantir_minimo(self, nome, maior_id):  # Informa o maior ID já existente nos dados
+        """Garante que a sequência nunca entregue um ID menor ou igual a maior_id."""
+        if maior_id > self._pisos.get(nome, 0):  # Só aumenta o piso
+            self._pisos[nome] = maior_id  # Guarda o novo piso
+
+    def _ler(self):  # Lê os contadores do disco
+        """Lê o arquivo de contadores (vazio se ainda não existir)."""
+        try:  # O arquivo pode não existir ou estar vazio
+            with open(self.caminho, mode='r', encoding='utf-8') as f:  # Abre o arquivo
+                return json.load(f)  # Converte o JSON
+        except (FileNotFoundError, ValueError):  # Ausente ou corrompido
+            return {}  # Recomeça a partir dos pisos
+
+    def _gravar(self, contadores):  # Grava os contadores no disco
+        """Grava os contadores num temporário e troca pelo definitivo (atômico)."""
+        temporario = self.caminho + '.tmp'  # Arquivo temporário
+        with open(temporario, mode='w', encoding='utf-8') as f:  # Abre o temporário
+            json.dump(contadores, f)  # Grava os contadores
+            f.flush()  # Esvazia o buffer
+            os.fsync(f.fileno())  # Garante a gravação física
+        os.replace(temporario, self.caminho)  # Troca atômica
+
+    def reservar(self, nome, quantidade=1):  # Reserva uma faixa de IDs
+        """Reserva 'quantidade' IDs consecutivos e retorna o primeiro deles."""
+        with self.trava:  # Exclusivo entre terminais
+            contadores = self._ler()  # Valores atuais no disco
+            ultimo = max(contadores.get(nome, 0), self._pisos.get(nome, 0))  # Último ID já usado
+            contadores[nome] = ultimo + quantidade  # Avança o contador
+            self._gravar(contadores)  # Persiste antes de entregar
+        return ultimo + 1  # Primeiro ID da faixa reservada
+
+    def proximo(self, nome):  # Próximo ID da sequência
+        """Retorna o próximo ID livre da sequência (O(1))."""
+        bloco = self.tamanho_bloco.get(nome, 1)  # Tamanho da reserva para essa sequência
+        reservado = self._reservados.get(nome)  # Faixa já reservada em memória
+        if not reservado or reservado[0] > reservado[1] or reservado[0] <= self._pisos.get(nome, 0):  # Faixa esgotada ou ultrapassada
+            inicio = self.reservar(nome, bloco)  # Reserva uma nova faixa no disco
+            reservado = [inicio, inicio + bloco - 1]  # Guarda a faixa em memória
+            self._reservados[nome] = reservado  # Atualiza o estado
+        novo_id = reservado[0]  # ID entregue agora
+        reservado[0] += 1  # Avança dentro da faixa
+        return novo_id  # Retorna o ID
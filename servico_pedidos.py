@@ -0,0 +1,247 @@
+import csv  # Importa a biblioteca para ler arquivos de importação em CSV
+import json  # Importa a biblioteca para ler arquivos de importação em JSON-lines
+from datetime import datetime, timedelta  # Importa classes para manipulação de datas e horas
+
+from catalogo import TIPO_UNIDADE, TIPO_CAIXA  # Importa os tipos de venda aceitos
+from configuracao import OPCOES_FORMA_PAGAMENTO, FORMAS_RECEBIMENTO, PRAZO_MAXIMO_PAGAMENTO_DIAS  # Importa as regras fixas de pagamento
+from dinheiro import multiplicar, somar, status_por_valores, texto_para_centavos, validar_pagamento  # Importa a aritmética exata em centavos
+from registros import Pedido, ItemPedido, Pagamento, ler_data, ler_data_hora  # Importa os registros tipados e os leitores de datas
+
+# =================================================================
+#        CAMADA DE SERVIÇO (SEM input()): REGRAS E IMPORTAÇÃO EM LOTE
+# =================================================================
+#
+# As mesmas regras das telas interativas, sem perguntas ao usuário: erros são
+# informados com ValueError (a mensagem é a mesma mostrada na tela). O serviço
+# só altera o repositório em memória; quem chama decide quando gravar (um único
+# salvar_repositorio grava o lote inteiro de uma vez).
+
+
+# --- Regras de validação compartilhadas com as telas ---
+
+def validar_data_entrega(data_hora, agora=None):  # Agendamento de entrega
+    """Garante que a entrega não seja no passado (margem de 1 minuto); ValueError se for."""
+    agora = agora or datetime.now()  # Referência de horário
+    if data_hora < agora - timedelta(minutes=1):  # Compara com o horário atual (com margem de 1min)
+        raise ValueError("A data e hora de entrega não podem ser no passado.")  # Mensagem para o usuário
+    return data_hora  # Data validada
+
+
+def validar_data_vencimento(data_pedido, data_esperada, hoje=None):  # Prazo de pagamento
+    """Garante que o vencimento seja hoje ou depois e no máximo 30 dias após o pedido; ValueError se não for."""
+    hoje = hoje or datetime.now().date()  # Data atual
+    base = data_pedido.date() if isinstance(data_pedido, datetime) else hoje  # Pedidos sem data válida contam a partir de hoje
+    data_limite = base + timedelta(days=PRAZO_MAXIMO_PAGAMENTO_DIAS)  # Limite de dias à frente do pedido
+    if data_esperada.date() < hoje:  # Não pode ser no passado
+        raise ValueError("A data esperada deve ser hoje ou no futuro.")  # Mensagem para o usuário
+    if data_esperada.date() > data_limite:  # Respeita o limite de 30 dias
+        raise ValueError(f"A data de pagamento não pode ultrapassar {PRAZO_MAXIMO_PAGAMENTO_DIAS} dias após o pedido ({data_limite.strftime('%d-%m-%Y')}).")  # Mensagem para o usuário
+    return data_esperada  # Data validada
+
+
+def ler_data_obrigatoria(texto, leitor, formato):  # Converte datas vindas de arquivos
+    """Interpreta uma data no formato informado (ValueError se inválida)."""
+    data = leitor((texto or '').strip())  # Mesmo leitor usado no carregamento dos CSVs
+    if not isinstance(data, datetime):  # Vazia ou em outro formato
+        raise ValueError(f"Data inválida: {texto!r} (use {formato}).")  # Mensagem para o usuário
+    return data  # Data interpretada
+
+
+class ServicoPedidos:  # Operações de pedido sem interação com o usuário
+    """Cria pedidos, inclui itens, registra pagamentos e define entregas aplicando as regras do sistema."""
+
+    def __init__(self, repositorio, catalogo, sequencias):  # Recebe o repositório, o catálogo e o alocador de IDs
+        self.repositorio = repositorio  # Repositório indexado em memória
+        self.catalogo = catalogo  # Catálogo de produtos
+        self.sequencias = sequencias  # Alocador persistente de IDs
+
+    def _pedido(self, id_pedido):  # Busca obrigatória
+        """Retorna o pedido pelo ID (ValueError se não existir)."""
+        pedido = self.repositorio.obter_pedido(id_pedido)  # Busca O(1) no índice
+        if not pedido:  # Não encontrado
+            raise ValueError(f"Pedido ID {id_pedido} não encontrado.")  # Mensagem para o usuário
+        return pedido  # Pedido encontrado
+
+    def criar_pedido(self, nome_cliente, forma_pagamento, agora=None):  # Abre um pedido vazio
+        """Cria um pedido sem itens (pagamento pendente, entregue no balcão) e retorna o registro."""
+        nome_cliente = (nome_cliente or '').strip()  # Remove espaços nas pontas
+        if not nome_cliente:  # Nome obrigatório
+            raise ValueError("Nome não pode ser vazio.")  # Mensagem para o usuário
+        if forma_pagamento not in OPCOES_FORMA_PAGAMENTO:  # Só as formas aceitas pelo menu
+            raise ValueError(f"Forma de pagamento inválida: {forma_pagamento!r} (use {', '.join(OPCOES_FORMA_PAGAMENTO)}).")  # Mensagem para o usuário
+        self.sequencias.garantir_minimo('pedido', self.repositorio.maior_id_pedido)  # Nunca abaixo do maior ID já gravado
+        pedido = Pedido(  # Monta o registro do pedido (valor pago começa zerado)
+            id_pedido=self.sequencias.proximo('pedido'),
+            data_pedido=(agora or datetime.now()).replace(second=0, microsecond=0),
+            nome_cliente=nome_cliente,
+            forma_pagamento=forma_pagamento,
+            status_pagamento='Pendente',
+            status_pedido='Entregue'
+        )
+        self.repositorio.adicionar_pedido(pedido)  # Inclui nos índices e marca para gravação
+        return pedido  # Pedido criado
+
+    def _item(self, pedido, id_item):  # Busca obrigatória de um item do pedido
+        """Retorna o item do pedido pelo ID (ValueError se o pedido não tiver esse item)."""
+        for item in self.repositorio.itens_do_pedido(pedido.id_pedido):  # Itens do pedido (índice)
+            if str(item.id_item) == str(id_item).strip():  # ID informado como número ou texto
+                return item  # Item encontrado
+        raise ValueError(f"Item ID {id_item} não encontrado no pedido {pedido.id_pedido}.")  # Mensagem para o usuário
+
+    def _validar_item(self, codigo, tipo, quantidade):  # Regras de um item
+        """Retorna (produto, tipo, quantidade) validados (ValueError se algum for inválido)."""
+        produto = self.catalogo.por_codigo(str(codigo).strip())  # Busca O(1) pelo código
+        if not produto:  # Código desconhecido
+            raise ValueError(f"Produto com código {codigo!r} não encontrado.")  # Mensagem para o usuário
+        tipo = (tipo or '').strip().upper()  # Normaliza o tipo de venda
+        if tipo not in (TIPO_UNIDADE, TIPO_CAIXA):  # Só UN ou CX
+            raise ValueError(f"Tipo de venda inválido: {tipo!r} (use {TIPO_UNIDADE} ou {TIPO_CAIXA}).")  # Mensagem para o usuário
+        try:  # A quantidade pode vir como texto
+            quantidade = int(quantidade)  # Quantidade inteira
+        except (TypeError, ValueError):  # Texto que não é número
+            raise ValueError(f"Quantidade inválida: {quantidade!r}.")  # Mensagem para o usuário
+        if quantidade <= 0:  # Quantidade precisa ser positiva
+            raise ValueError("A quantidade deve ser maior que zero.")  # Mensagem para o usuário
+        return produto, tipo, quantidade  # Item validado
+
+    def _recalcular(self, pedido):  # Total e status depois de mexer nos itens
+        """Recalcula o total pelos itens e o status pelo valor pago, e marca o pedido para gravação."""
+        pedido.valor_total = somar(i.valor_item for i in self.repositorio.itens_do_pedido(pedido.id_pedido))  # Soma exata em centavos
+        pedido.status_pagamento = status_por_valores(pedido.valor_total, pedido.valor_pago)  # Status coerente com o novo total
+        self.repositorio.marcar_pedido_alterado(pedido)  # Marca para gravação (e atualiza as contas a receber)
+        return pedido  # Pedido atualizado
+
+    def adicionar_itens(self, id_pedido, itens):  # Inclui produtos no pedido
+        """Inclui itens (código, tipo UN/CX, quantidade) e recalcula o total e o status do pedido."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        novos = [self._validar_item(codigo, tipo, quantidade) for codigo, tipo, quantidade in itens]  # Valida todos antes de alterar o pedido
+        self.sequencias.garantir_minimo('item', self.repositorio.maior_id_item)  # Nunca abaixo do maior ID já gravado
+        for produto, tipo, quantidade in novos:  # Inclui os itens validados
+            self.repositorio.adicionar_item(ItemPedido(  # Mesmo formato dos itens lançados pela tela
+                id_item=self.sequencias.proximo('item'),
+                id_pedido=pedido.id_pedido,
+                produto=f"{produto['Nome do Produto']} ({tipo})",
+                quantidade=quantidade,
+                valor_item=multiplicar(quantidade, self.catalogo.preco_centavos(produto, tipo)),
+                codigo_produto=produto['Código'],
+                tipo_venda=tipo
+            ))
+        return self._recalcular(pedido)  # Novo total e status
+
+    def alterar_item(self, id_pedido, id_item, codigo, tipo, quantidade):  # Troca produto, tipo ou quantidade de um item
+        """Altera o produto, o tipo de venda (UN/CX) e a quantidade de um item e recalcula o total e o status do pedido."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        item = self._item(pedido, id_item)  # Item alvo
+        produto, tipo, quantidade = self._validar_item(codigo, tipo, quantidade)  # Valida antes de alterar
+        item.produto = f"{produto['Nome do Produto']} ({tipo})"  # Mesmo formato da tela de edição
+        item.codigo_produto = produto['Código']  # Código do produto
+        item.tipo_venda = tipo  # Tipo de venda
+        item.quantidade = quantidade  # Nova quantidade
+        item.valor_item = multiplicar(quantidade, self.catalogo.preco_centavos(produto, tipo))  # Subtotal exato em centavos
+        self.repositorio.marcar_item_alterado(item)  # Marca o item para gravação
+        return self._recalcular(pedido)  # Novo total e status
+
+    def remover_item(self, id_pedido, id_item):  # Exclui um item
+        """Remove um item do pedido e recalcula o total e o status."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        self.repositorio.remover_item(self._item(pedido, id_item))  # Remove da lista e dos índices
+        return self._recalcular(pedido)  # Novo total e status
+
+    def registrar_pagamento(self, id_pedido, valor_centavos, agora=None, forma_pagamento=None):  # Dá baixa num valor pago
+        """Lança um pagamento (Pix ou Dinheiro, positivo e sem exceder o saldo) no histórico e atualiza o status."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        forma = forma_pagamento or pedido.forma_pagamento  # Sem forma informada, vale a forma combinada na venda
+        if forma not in FORMAS_RECEBIMENTO:  # Venda a prazo (ou forma desconhecida): o meio do recebimento é obrigatório
+            raise ValueError(f"Forma do pagamento inválida: '{forma}' (use {' ou '.join(FORMAS_RECEBIMENTO)}).")  # Mensagem para o usuário
+        validar_pagamento(pedido.valor_total, pedido.valor_pago, valor_centavos)  # Mesma regra da tela
+        self.sequencias.garantir_minimo('pagamento', self.repositorio.maior_id_pagamento)  # Nunca abaixo do maior ID já gravado
+        self.repositorio.registrar_pagamento(pedido, Pagamento(  # O valor pago passa a ser a soma do histórico
+            id_pagamento=self.sequencias.proximo('pagamento'),
+            id_pedido=pedido.id_pedido,
+            valor=valor_centavos,
+            forma_pagamento=forma,
+            data_pagamento=(agora or datetime.now()).replace(second=0, microsecond=0)
+        ))
+        pedido.status_pagamento = status_por_valores(pedido.valor_total, pedido.valor_pago)  # 'Pago' se quitou, senão 'Parcial'
+        if pedido.status_pagamento == 'Pago':  # Quitou a dívida
+            pedido.data_vencimento = None  # Limpa o prazo pois já foi pago
+        self.repositorio.marcar_pedido_alterado(pedido)  # Marca para gravação
+        return pedido  # Pedido atualizado
+
+    def definir_vencimento(self, id_pedido, data_esperada):  # Prazo para pagar o saldo
+        """Define a data esperada de pagamento (até 30 dias após o pedido, nunca no passado)."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        pedido.data_vencimento = validar_data_vencimento(pedido.data_pedido, data_esperada).replace(hour=0, minute=0)  # Mesma regra da tela
+        self.repositorio.marcar_pedido_alterado(pedido)  # Marca para gravação
+        return pedido  # Pedido atualizado
+
+    def definir_entrega(self, id_pedido, data_hora=None, agora=None):  # Entrega agendada ou concluída
+        """Agenda a entrega para data_hora (só no futuro) ou, sem data, marca o pedido como entregue agora."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        agora = (agora or datetime.now()).replace(second=0, microsecond=0)  # Horário de referência
+        if data_hora is None:  # Entregue agora
+            pedido.status_pedido = 'Entregue'  # Atualiza o status logístico
+            pedido.data_entrega = pedido.data_entrega or agora  # Registra a data da entrega (se ainda não houver)
+        else:  # Entrega agendada
+            pedido.status_pedido = 'Pendente'  # Pedido para depois
+            pedido.data_entrega = validar_data_entrega(data_hora, agora)  # Mesma regra da tela
+        self.repositorio.marcar_pedido_alterado(pedido)  # Marca para gravação
+        return pedido  # Pedido atualizado
+
+    def concluir_pedido(self, id_pedido):  # Conferência final, como no fechamento da tela
+        """Confere se o pedido tem itens e, se não estiver quitado, se tem data esperada de pagamento."""
+        pedido = self._pedido(id_pedido)  # Pedido alvo
+        if pedido.valor_total <= 0:  # Sem itens
+            raise ValueError("Pedido sem itens.")  # Mensagem para o usuário
+        if pedido.saldo > 0 and not pedido.data_vencimento:  # Fiado sem prazo
+            raise ValueError("Informe a data esperada para o pagamento (pedido não quitado).")  # Mensagem para o usuário
+        return pedido  # Pedido pronto para gravação
+
+    def lancar_pedido(self, dados, agora=None):  # Pedido completo de uma vez (importação)
+        """Lança um pedido completo a partir de um dicionário (cliente, forma_pagamento, itens, valor_pago, forma_recebimento, vencimento, entrega)."""
+        pedido = self.criar_pedido(dados.get('cliente'), dados.get('forma_pagamento'), agora)  # Abre o pedido
+        itens = [(i.get('codigo'), i.get('tipo'), i.get('quantidade')) for i in dados.get('itens') or []]  # Itens informados
+        self.adicionar_itens(pedido.id_pedido, itens)  # Inclui os itens e calcula o total
+        valor_pago = texto_para_centavos(str(dados.get('valor_pago') or ''))  # Entrada/pagamento em centavos
+        if valor_pago:  # Houve pagamento
+            self.registrar_pagamento(pedido.id_pedido, valor_pago, agora, dados.get('forma_recebimento'))  # Mesma regra de pagamento da tela (a prazo exige a forma da entrada)
+        if dados.get('vencimento'):  # Prazo para o saldo
+            self.definir_vencimento(pedido.id_pedido, ler_data_obrigatoria(dados['vencimento'], ler_data, 'DD-MM-AAAA'))  # Valida o prazo
+        if dados.get('entrega'):  # Entrega agendada
+            self.definir_entrega(pedido.id_pedido, ler_data_obrigatoria(dados['entrega'], ler_data_hora, 'DD-MM-AAAA HH:MM'), agora)  # Valida o agendamento
+        return self.concluir_pedido(pedido.id_pedido)  # Conferência final
+
+
+# --- Importação em lote ---
+
+def ler_pedidos_arquivo(caminho):  # Lê o arquivo de importação sob demanda
+    """Gera um dicionário por pedido de um arquivo JSON-lines (.jsonl) ou CSV (uma linha por item)."""
+    if caminho.lower().endswith(('.jsonl', '.json')):  # Um pedido JSON por linha
+        with open(caminho, mode='r', encoding='utf-8') as f:  # Abre o arquivo
+            for texto in f:  # Linha a linha
+                if texto.strip():  # Ignora linhas em branco
+                    yield json.loads(texto)  # Pedido completo
+        return  # Fim do arquivo
+    with open(caminho, mode='r', newline='', encoding='utf-8-sig') as f:  # CSV (aceita o BOM do Excel)
+        atual, referencia = None, None  # Pedido em montagem e sua referência
+        for linha in csv.DictReader(f):  # Uma linha por item; linhas seguidas com a mesma coluna 'pedido' formam um pedido
+            if atual is None or linha.get('pedido') != referencia:  # Começou outro pedido
+                if atual is not None:  # Havia um pedido montado
+                    yield atual  # Entrega o anterior
+                referencia = linha.get('pedido')  # Referência do novo pedido
+                atual = {chave: linha.get(chave) for chave in ('cliente', 'forma_pagamento', 'valor_pago', 'forma_recebimento', 'vencimento', 'entrega')}  # Dados do pedido
+                atual['itens'] = []  # Itens do pedido
+            atual['itens'].append({'codigo': linha.get('codigo'), 'tipo': linha.get('tipo'), 'quantidade': linha.get('quantidade')})  # Item da linha
+        if atual is not None:  # Último pedido do arquivo
+            yield atual  # Entrega
+
+
+def importar_pedidos(servico, pedidos, agora=None):  # Lança vários pedidos
+    """Lança todos os pedidos no repositório; ao primeiro erro, levanta ValueError indicando o pedido (nada deve ser gravado)."""
+    lancados = []  # Pedidos lançados
+    for numero, dados in enumerate(pedidos, start=1):  # Numeração para a mensagem de erro
+        try:  # Aplica as mesmas regras da tela
+            lancados.append(servico.lancar_pedido(dados, agora))  # Lança o pedido
+        except (ValueError, TypeError, AttributeError) as erro:  # Dados inválidos ou incompletos
+            raise ValueError(f"Pedido nº {numero} do arquivo: {erro}") from erro  # Indica qual pedido falhou
+    return lancados  # Pedidos prontos para gravação
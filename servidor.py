@@ -0,0 +1,406 @@
+import asyncio  # Importa o laço de eventos que atende vários balcões ao mesmo tempo num único processo
+import json  # Importa a biblioteca para ler e escrever as mensagens (uma linha JSON por pedido/resposta)
+import sys  # Importa a saída de erros para registrar falhas inesperadas
+import traceback  # Importa a formatação do erro inesperado (o balcão recebe só uma mensagem genérica)
+
+from armazenamento import ConflitoVersao  # Importa o erro de edição concorrente
+from configuracao import ENDERECO_SERVIDOR, PORTA_SERVIDOR, JANELA_GRAVACAO, LIMITE_MENSAGEM, DIAS_ALERTA_VENCIMENTO  # Importa o endereço, a porta, a janela de gravação e o tamanho máximo das mensagens
+from dinheiro import texto_para_centavos  # Importa a conversão exata de reais (texto) para centavos
+from registros import Pedido, ItemPedido, Pagamento, ler_data, ler_data_hora  # Importa os registros tipados e os leitores de datas
+from servico_pedidos import ServicoPedidos, ler_data_obrigatoria  # Importa as regras de pedido sem input()
+
+# =================================================================
+#        SERVIDOR LOCAL DE PEDIDOS (ASYNCIO, JSON POR LINHA)
+# =================================================================
+#
+# Sem o servidor, cada balcão roda o seu próprio menu com o repositório inteiro
+# em memória e relê os arquivos sempre que outro balcão grava. Com ele, um único
+# processo mantém o repositório indexado e os balcões (cliente_remoto.py) pedem
+# só o que a tela vai mostrar, por uma conexão TCP em 127.0.0.1.
+#
+# Protocolo: cada mensagem é uma linha JSON. O balcão envia {"op": ..., campos}
+# e recebe {"ok": true, ...} ou {"ok": false, "erro": mensagem} (com
+# "conflito": [IDs] quando o pedido foi alterado por outro balcão). Os registros
+# viajam como as tuplas de texto das colunas do CSV.
+#
+# Consultas são respondidas na hora, direto dos índices em memória. Alterações
+# entram numa fila: a tarefa de gravação espera JANELA_GRAVACAO segundos
+# juntando o que chegar, aplica tudo no repositório e grava o lote inteiro com
+# um único registrar_lote (uma linha no diário, um fsync). Um pedido alterado
+# por várias mensagens na mesma janela é gravado uma vez. As operações avulsas
+# (pagamento, itens, entrega, vencimento) não carregam versão: são aplicadas em
+# sequência sobre o repositório em memória, cada uma vendo o efeito da
+# anterior. Já o "gravar" das telas traz a versão lida pelo balcão, que continua
+# sendo conferida, então um pedido já alterado na janela gera o conflito.
+# Só então cada balcão recebe a resposta, ou seja, nada é confirmado antes de
+# estar no disco. Não há autenticação: o servidor só escuta a máquina local.
+
+
+def linhas_dos_pedidos(repositorio, pedidos):  # Formato das respostas com pedidos
+    """Retorna {'pedidos', 'itens', 'pagamentos'} dos pedidos informados como tuplas de texto das colunas."""
+    return {  # Itens e pagamentos acompanham o pedido (as telas mostram tudo junto)
+        'pedidos': [pedido.para_tupla() for pedido in pedidos],
+        'itens': [item.para_tupla() for pedido in pedidos for item in repositorio.itens_do_pedido(pedido.id_pedido)],
+        'pagamentos': [pagamento.para_tupla() for pedido in pedidos for pagamento in repositorio.pagamentos_do_pedido(pedido.id_pedido)],
+    }
+
+
+def ler_dia(texto):  # Datas das consultas ("DD-MM-AAAA")
+    """Converte o texto DD-MM-AAAA num dia (date); ValueError se for inválido."""
+    return ler_data_obrigatoria(texto, ler_data, 'DD-MM-AAAA').date()  # Só o dia
+
+
+class Pendente:  # Alteração à espera da próxima gravação
+    """Operação de alteração recebida de um balcão, com o futuro que entrega a resposta depois da gravação."""
+
+    __slots__ = ('op', 'argumentos', 'futuro', 'pedidos', 'resposta')  # Atributos fixos
+
+    def __init__(self, op, argumentos, futuro):  # Recebe a operação e os campos da mensagem
+        self.op = op  # Nome da operação
+        self.argumentos = argumentos  # Campos da mensagem (sem 'op')
+        self.futuro = futuro  # Resolvido com a resposta (ou o erro) depois da gravação
+        self.pedidos = set()  # IDs dos pedidos alterados pela operação
+        self.resposta = None  # Montada depois da gravação (as versões só existem após gravar)
+
+
+class ServidorPedidos:  # Dono do repositório em memória
+    """Atende os balcões pela rede local: consultas na hora e alterações gravadas em lotes (uma gravação por janela)."""
+
+    CONSULTAS = {  # op -> método que responde na hora
+        'ping': '_ping',
+        'clientes': '_clientes',
+        'cliente_por_id': '_cliente_por_id',
+        'cliente': '_cliente',
+        'pedidos': '_pedidos',
+        'alertas': '_alertas',
+        'entregas': '_entregas',
+        'dias_entregas': '_dias_entregas',
+        'fluxo': '_fluxo',
+    }
+    ALTERACOES = {  # op -> método que aplica a alteração no repositório (a gravação é do lote)
+        'gravar': '_aplicar_gravacao',
+        'criar_pedido': '_criar_pedido',
+        'adicionar_itens': '_adicionar_itens',
+        'alterar_item': '_alterar_item',
+        'remover_item': '_remover_item',
+        'registrar_pagamento': '_registrar_pagamento',
+        'definir_entrega': '_definir_entrega',
+        'definir_vencimento': '_definir_vencimento',
+    }
+
+    def __init__(self, sistema, endereco=ENDERECO_SERVIDOR, porta=PORTA_SERVIDOR, janela=JANELA_GRAVACAO):  # Recebe o módulo do sistema
+        self.sistema = sistema  # gerenciador_pedidos (motor, cache, produtos e alocador de IDs)
+        self.endereco = endereco  # Só a máquina local
+        self.porta = porta  # Porta TCP
+        self.janela = janela  # Segundos juntando alterações antes de gravar
+        self._pendentes = []  # Alterações aguardando a próxima gravação
+        self._chegou = None  # Evento: há alterações na fila (criado dentro do laço de eventos)
+        self._servidor = None  # Servidor asyncio
+        self._gravador = None  # Tarefa de gravação em lotes
+        self.lotes = 0  # Gravações feitas (cada uma com todas as alterações da janela)
+        self.alteracoes = 0  # Alterações confirmadas
+
+    # --- Ciclo de vida ---
+
+    async def iniciar(self):  # Abre a porta e começa a gravar em lotes
+        """Aquece o repositório, abre a porta TCP e inicia a tarefa de gravação."""
+        repositorio = self.sistema.carregar_repositorio()  # Primeira leitura completa (fica em cache)
+        for sequencia, maior_id in (('pedido', repositorio.maior_id_pedido), ('item', repositorio.maior_id_item), ('pagamento', repositorio.maior_id_pagamento)):  # Os balcões só veem parte dos pedidos
+            self.sistema.sequencias.garantir_minimo(sequencia, maior_id)  # Nunca abaixo do maior ID já gravado
+            self.sistema.sequencias.reservar(sequencia, 0)  # Grava o piso no arquivo de contadores (compartilhado com os balcões)
+        self._chegou = asyncio.Event()  # Sinal para a tarefa de gravação
+        self._servidor = await asyncio.start_server(self._atender, self.endereco, self.porta, limit=LIMITE_MENSAGEM)  # Uma corrotina por balcão
+        self._gravador = asyncio.create_task(self._gravar_em_lotes())  # Grava as alterações da fila
+
+    async def encerrar(self):  # Ctrl+C ou fim do teste
+        """Fecha a porta, grava o que ainda estiver na fila e para a tarefa de gravação."""
+        if self._servidor:  # Servidor aberto
+            self._servidor.close()  # Não aceita novas conexões
+        if self._gravador:  # Tarefa ativa
+            self._gravador.cancel()  # Para de esperar por novos lotes
+            try:  # O cancelamento chega como exceção
+                await self._gravador  # Espera terminar
+            except asyncio.CancelledError:  # Esperado
+                pass  # Segue o encerramento
+        if self._pendentes:  # Alterações ainda não gravadas
+            self._processar(self._retirar_pendentes())  # Última gravação
+        if self._servidor:  # Servidor aberto
+            await self._servidor.wait_closed()  # Espera fechar
+
+    # --- Conexões ---
+
+    async def _atender(self, leitor, escritor):  # Uma corrotina por balcão conectado
+        """Lê uma mensagem por linha e responde na mesma ordem até o balcão desconectar."""
+        try:  # O balcão pode fechar a qualquer momento
+            while True:  # Uma mensagem por vez (o balcão espera a resposta)
+                linha = await leitor.readline()  # Próxima mensagem
+                if not linha:  # Conexão encerrada
+                    break  # Fim do atendimento
+                resposta = await self._responder(linha)  # Consulta na hora ou alteração após a gravação
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')  # Uma linha JSON
+                await escritor.drain()  # Respeita o ritmo do balcão
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):  # Balcão caiu ou mandou uma linha grande demais
+            pass  # Fecha só esta conexão
+        finally:  # Sempre libera o socket
+            escritor.close()  # Fecha a conexão
+
+    async def _responder(self, linha):  # Decide entre consulta e alteração
+        """Interpreta a mensagem e retorna o dicionário de resposta."""
+        try:  # Mensagem pode estar malformada
+            mensagem = json.loads(linha)  # Dicionário com 'op' e os campos
+            op = mensagem.pop('op')  # Operação pedida
+        except (ValueError, KeyError, TypeError, AttributeError):  # Não é JSON ou falta 'op'
+            return {'ok': False, 'erro': "Mensagem inválida."}  # Resposta de erro
+        if op in self.CONSULTAS:  # Leitura: responde direto dos índices
+            try:  # Campos podem estar errados
+                return dict(ok=True, **getattr(self, self.CONSULTAS[op])(self.sistema.carregar_repositorio(), **mensagem))  # Resposta imediata
+            except (ValueError, TypeError) as erro:  # Campo ausente, a mais ou inválido
+                return {'ok': False, 'erro': str(erro)}  # Mensagem para o balcão
+            except Exception:  # Falha inesperada
+                traceback.print_exc(file=sys.stderr)  # Registra no terminal do servidor
+                return {'ok': False, 'erro': "Erro interno do servidor."}  # Mensagem genérica
+        if op in self.ALTERACOES:  # Escrita: entra na fila da próxima gravação
+            futuro = asyncio.get_running_loop().create_future()  # Resolvido depois da gravação
+            self._pendentes.append(Pendente(op, mensagem, futuro))  # Fila do próximo lote
+            self._chegou.set()  # Acorda a tarefa de gravação
+            return await futuro  # Responde só depois de gravado
+        return {'ok': False, 'erro': f"Operação desconhecida: {op!r}."}  # Resposta de erro
+
+    # --- Gravação em lotes ---
+
+    def _retirar_pendentes(self):  # Fecha o lote atual
+        """Retorna as alterações da fila e começa uma fila nova."""
+        lote, self._pendentes = self._pendentes, []  # Troca a fila inteira
+        self._chegou.clear()  # Espera a próxima alteração
+        return lote  # Alterações do lote
+
+    async def _gravar_em_lotes(self):  # Tarefa que vive enquanto o servidor estiver aberto
+        """Espera a primeira alteração, junta as que chegarem durante a janela e grava tudo de uma vez."""
+        while True:  # Um lote por volta
+            await self._chegou.wait()  # Alguma alteração na fila
+            await asyncio.sleep(self.janela)  # Junta as que chegarem nesse intervalo
+            self._processar(self._retirar_pendentes())  # Aplica, grava e responde
+
+    def _processar(self, lote):  # Uma gravação para o lote inteiro
+        """Aplica as alterações do lote, grava tudo com um único registrar_lote e resolve os futuros."""
+        for tentativa in range(2):  # Segunda tentativa só se outro processo gravou no meio (fora do servidor)
+            try:  # O motor confere de novo as versões contra o disco
+                repositorio = self.sistema.carregar_repositorio()  # Repositório em cache (relido se algo mudou no disco)
+                aceitas = self._aplicar(repositorio, lote)  # Alterações válidas (as outras já receberam o erro)
+                self._gravar(repositorio)  # Uma linha no diário para o lote inteiro
+            except ConflitoVersao as erro:  # Alguém gravou nos CSVs sem passar pelo servidor
+                self.sistema.cache.invalidar('repositorio')  # As alterações em memória são descartadas
+                chaves = {int(chave) for chave in erro.chaves}  # Pedidos em conflito
+                lote = []  # Alterações que serão reaplicadas sobre os dados relidos
+                for pendente in aceitas:  # Cada alteração aceita
+                    if pendente.pedidos & chaves or tentativa:  # Tocou num pedido em conflito (ou já é a segunda tentativa)
+                        self._falhar(pendente, str(erro), sorted(pendente.pedidos & chaves) or sorted(chaves))  # Conflito para o balcão
+                    else:  # Independente do conflito
+                        pendente.pedidos.clear()  # Será recalculado na reaplicação
+                        lote.append(pendente)  # Tenta de novo
+                if not lote:  # Nada a reaplicar
+                    return  # Todas já responderam
+                continue  # Reaplica sobre o disco atual
+            except Exception:  # Falha inesperada (disco cheio, permissão, mensagem com registros malformados...)
+                traceback.print_exc(file=sys.stderr)  # Registra no terminal do servidor
+                self.sistema.cache.invalidar('repositorio')  # Memória pode ter ficado à frente do disco (ou pela metade)
+                for pendente in lote:  # Nada foi confirmado
+                    self._falhar(pendente, "Erro ao gravar no servidor; nada foi gravado.")  # Mensagem genérica
+                return  # Lote encerrado
+            self.lotes += 1  # Um lote gravado
+            self.alteracoes += len(aceitas)  # Alterações confirmadas
+            for pendente in aceitas:  # Responde a cada balcão
+                if not pendente.futuro.done():  # Balcão ainda esperando
+                    pendente.futuro.set_result(dict(ok=True, **pendente.resposta(repositorio)))  # Dados já com as versões gravadas
+            return  # Lote concluído
+
+    def _aplicar(self, repositorio, lote):  # Alterações do lote em memória
+        """Aplica cada alteração no repositório; as inválidas recebem o erro na hora. Retorna as aceitas."""
+        servico = ServicoPedidos(repositorio, self.sistema.carregar_produtos(), self.sistema.sequencias)  # Mesmas regras das telas
+        tocados = set()  # Pedidos já alterados neste lote (conferidos só pelo "gravar", que traz versão)
+        aceitas = []  # Alterações aplicadas
+        for pendente in lote:  # Na ordem de chegada
+            try:  # Cada alteração é validada antes de mexer no repositório
+                pendente.resposta = getattr(self, self.ALTERACOES[pendente.op])(repositorio, servico, pendente, tocados, **pendente.argumentos)  # Aplica e prepara a resposta
+            except ConflitoVersao as erro:  # Pedido alterado por outro balcão
+                self._falhar(pendente, str(erro), [int(chave) for chave in erro.chaves])  # Conflito para o balcão
+                continue  # Próxima alteração
+            except (ValueError, TypeError) as erro:  # Regra violada ou campo inválido
+                self._falhar(pendente, str(erro))  # Mensagem para o balcão
+                continue  # Próxima alteração
+            tocados |= pendente.pedidos  # Um "gravar" posterior destes pedidos traz uma versão já superada
+            aceitas.append(pendente)  # Será gravada
+        return aceitas  # Alterações do lote
+
+    def _gravar(self, repositorio):  # Mesmo caminho de salvar_repositorio, mas propagando o conflito
+        """Grava as alterações pendentes do repositório numa única chamada ao motor e confirma o cache."""
+        pedidos, itens, itens_removidos, pagamentos = repositorio.extrair_alteracoes()  # Tudo o que o lote mudou
+        armazenamento = self.sistema.armazenamento  # Motor ativo
+        with armazenamento.trava_arquivo:  # Nenhum outro processo grava entre a nossa gravação e a confirmação do cache
+            armazenamento.registrar_lote([  # Uma escrita no diário (ou uma transação) para o lote inteiro
+                ('cabecalhos', pedidos, ()),
+                ('itens', itens, itens_removidos),
+                ('pagamentos', pagamentos, ()),
+            ])
+            self.sistema.confirmar_repositorio(repositorio)  # Mantém o repositório em cache se só nós gravamos
+
+    @staticmethod
+    def _falhar(pendente, mensagem, conflito=None):  # Responde o erro ao balcão
+        """Resolve o futuro da alteração com a resposta de erro (e os IDs em conflito, se houver)."""
+        if pendente.futuro.done():  # Balcão já desconectou
+            return  # Nada a responder
+        resposta = {'ok': False, 'erro': mensagem}  # Mensagem para o balcão
+        if conflito:  # Edição concorrente
+            resposta['conflito'] = conflito  # IDs dos pedidos
+        pendente.futuro.set_result(resposta)  # Entrega a resposta
+
+    # --- Consultas ---
+
+    def _ping(self, repositorio):  # Teste de conexão
+        """Confirma que o servidor está no ar."""
+        return {'pedidos': len(repositorio.cabecalhos)}  # Pedidos ativos em memória
+
+    def _clientes(self, repositorio, texto, limite=None):  # Busca de clientes
+        """Clientes mais parecidos com o texto: [[ID, nome, pedidos, pontuação]]."""
+        if limite is None:  # Limite padrão da busca
+            return {'clientes': repositorio.clientes_semelhantes(texto)}  # Ranqueados
+        return {'clientes': repositorio.clientes_semelhantes(texto, int(limite))}  # Ranqueados
+
+    def _cliente_por_id(self, repositorio, id):  # ID estável do cliente
+        """Nome do cliente com o ID informado (ou null)."""
+        return {'nome': repositorio.cliente_por_id(id)}  # Consulta O(1)
+
+    def _cliente(self, repositorio, nome):  # Painel do cliente
+        """ID do cliente e os pedidos dele, com itens e pagamentos."""
+        return dict(id=repositorio.id_do_cliente(nome), **linhas_dos_pedidos(repositorio, repositorio.pedidos_do_cliente(nome)))  # Tudo o que o painel mostra
+
+    def _pedidos(self, repositorio, ids):  # Pedidos pelo ID
+        """Pedidos com os IDs informados (os inexistentes são ignorados), com itens e pagamentos."""
+        pedidos = [repositorio.obter_pedido(id_pedido) for id_pedido in ids]  # Busca O(1) cada
+        return linhas_dos_pedidos(repositorio, [pedido for pedido in pedidos if pedido])  # Só os encontrados
+
+    def _alertas(self, repositorio, dias=DIAS_ALERTA_VENCIMENTO, hoje=None):  # Cobranças
+        """Pedidos vencidos e a vencer nos próximos 'dias' (IDs em ordem de vencimento), com itens e pagamentos."""
+        vencidos, a_vencer = repositorio.alertas_vencimento(int(dias), ler_dia(hoje) if hoje else None)  # Índice de vencimentos
+        resposta = linhas_dos_pedidos(repositorio, vencidos + a_vencer)  # Registros das duas seções
+        resposta['vencidos'] = [pedido.id_pedido for pedido in vencidos]  # Ordem da seção
+        resposta['a_vencer'] = [pedido.id_pedido for pedido in a_vencer]  # Ordem da seção
+        return resposta  # Seções com os registros
+
+    def _entregas(self, repositorio, dia):  # Planejamento de entregas
+        """Pedidos com entrega pendente no dia (IDs em ordem de horário), com itens e pagamentos."""
+        pedidos = repositorio.entregas_do_dia(ler_dia(dia))  # Agenda de entregas
+        resposta = linhas_dos_pedidos(repositorio, pedidos)  # Registros do dia
+        resposta['ordem'] = [pedido.id_pedido for pedido in pedidos]  # Ordem de horário
+        return resposta  # Entregas do dia
+
+    def _dias_entregas(self, repositorio, desde=None):  # Resumo da agenda
+        """Dias com entregas pendentes a partir de 'desde': [[DD-MM-AAAA, quantidade]]."""
+        return {'dias': [(dia.strftime('%d-%m-%Y'), quantidade) for dia, quantidade in repositorio.dias_com_entregas(ler_dia(desde) if desde else None)]}  # Um item por dia
+
+    def _fluxo(self, repositorio, desde=None, ate=None):  # Recebimentos por dia
+        """Recebimentos por dia e forma de pagamento: [[DD-MM-AAAA, {forma: centavos}]]."""
+        fluxo = repositorio.fluxo_de_caixa(ler_dia(desde) if desde else None, ler_dia(ate) if ate else None)  # Totais mantidos a cada lançamento
+        return {'dias': [(dia.strftime('%d-%m-%Y'), valores) for dia, valores in fluxo]}  # Um item por dia
+
+    # --- Alterações ---
+    #
+    # Cada método valida tudo antes de mexer no repositório (um erro não deixa a
+    # alteração pela metade), preenche pendente.pedidos com os IDs alterados e
+    # retorna a função que monta a resposta depois da gravação.
+
+    def _aplicar_gravacao(self, repositorio, servico, pendente, tocados, cabecalhos=(), itens=(), itens_removidos=(), pagamentos=()):  # Alterações feitas pelas telas do balcão
+        """Aplica os cabeçalhos, itens e pagamentos enviados pelo balcão, conferindo a versão de cada pedido."""
+        cabecalhos = [Pedido.de_tupla(tupla) for tupla in cabecalhos]  # Registros enviados
+        itens = [ItemPedido.de_tupla(tupla) for tupla in itens]  # Itens novos/alterados
+        pagamentos = [Pagamento.de_tupla(tupla) for tupla in pagamentos]  # Pagamentos novos
+        enviados = {pedido.id_pedido: pedido for pedido in cabecalhos}  # Pedidos do envio
+        atuais = {id_pedido: repositorio.obter_pedido(id_pedido) for id_pedido in enviados}  # Pedidos em memória (None = novo)
+        conflitos = [  # Versão lida pelo balcão diferente da atual, ou pedido já alterado neste lote
+            str(id_pedido) for id_pedido, pedido in enviados.items()
+            if id_pedido in tocados or pedido.versao != (atuais[id_pedido].versao if atuais[id_pedido] else 0)
+        ]
+        if conflitos:  # Algum pedido desatualizado
+            raise ConflitoVersao('cabecalhos', conflitos)  # Nada deste envio é aplicado
+        for registro in itens + pagamentos:  # Itens e pagamentos precisam de um pedido
+            if registro.id_pedido not in enviados and not repositorio.obter_pedido(registro.id_pedido):  # Pedido inexistente
+                raise ValueError(f"Pedido ID {registro.id_pedido} não encontrado.")  # Mensagem para o balcão
+        for id_pedido, novo in enviados.items():  # Cabeçalhos: edição no lugar ou pedido novo
+            atual = atuais[id_pedido]  # Pedido em memória
+            if atual:  # Pedido existente
+                atual.update(novo)  # Mesma referência nos índices
+                repositorio.marcar_pedido_alterado(atual)  # Reindexa e marca para gravação
+            else:  # Pedido novo
+                repositorio.adicionar_pedido(novo)  # Inclui nos índices e marca para gravação
+        removidos = set(itens_removidos)  # IDs dos itens excluídos
+        for id_pedido in {item.id_pedido for item in itens} | set(enviados):  # Pedidos com itens mexidos
+            atuais = {item.id_item: item for item in repositorio.itens_do_pedido(id_pedido)}  # Itens em memória
+            for id_item in removidos & set(atuais):  # Itens excluídos no balcão
+                repositorio.remover_item(atuais.pop(id_item))  # Remove da lista e dos índices
+            for novo in itens:  # Itens deste pedido
+                if novo.id_pedido != id_pedido:  # De outro pedido
+                    continue  # Próximo
+                if novo.id_item in atuais:  # Item existente
+                    atuais[novo.id_item].update(novo)  # Edição no lugar
+                    repositorio.marcar_item_alterado(atuais[novo.id_item])  # Marca para gravação
+                else:  # Item novo
+                    repositorio.adicionar_item(novo)  # Inclui nos índices e marca para gravação
+        for pagamento in pagamentos:  # Lançamentos (só acréscimos)
+            repositorio.registrar_pagamento(repositorio.obter_pedido(pagamento.id_pedido), pagamento)  # Valor pago vem da soma do histórico
+        pendente.pedidos = set(enviados) | {registro.id_pedido for registro in itens + pagamentos}  # Pedidos alterados
+        return lambda repositorio: {'versoes': {str(id_pedido): repositorio.obter_pedido(id_pedido).versao for id_pedido in enviados}}  # Versões gravadas
+
+    def _resposta_pedido(self, pendente, pedido):  # Resposta comum das operações do serviço
+        """Guarda o ID alterado e retorna a função que devolve o pedido com itens e pagamentos após a gravação."""
+        pendente.pedidos = {pedido.id_pedido}  # Pedido alterado
+        return lambda repositorio: linhas_dos_pedidos(repositorio, [repositorio.obter_pedido(pedido.id_pedido)])  # Estado gravado
+
+    def _criar_pedido(self, repositorio, servico, pendente, tocados, cliente, forma_pagamento):  # Pedido vazio
+        """Cria um pedido sem itens para o cliente."""
+        return self._resposta_pedido(pendente, servico.criar_pedido(cliente, forma_pagamento))  # Regras do serviço
+
+    def _adicionar_itens(self, repositorio, servico, pendente, tocados, id_pedido, itens):  # Inclui produtos
+        """Inclui itens [[código, tipo, quantidade]] e recalcula o total e o status."""
+        return self._resposta_pedido(pendente, servico.adicionar_itens(id_pedido, [tuple(item) for item in itens]))  # Regras do serviço
+
+    def _alterar_item(self, repositorio, servico, pendente, tocados, id_pedido, id_item, codigo, tipo, quantidade):  # Troca um item
+        """Altera produto, tipo e quantidade de um item e recalcula o total e o status."""
+        return self._resposta_pedido(pendente, servico.alterar_item(id_pedido, id_item, codigo, tipo, quantidade))  # Regras do serviço
+
+    def _remover_item(self, repositorio, servico, pendente, tocados, id_pedido, id_item):  # Exclui um item
+        """Remove um item e recalcula o total e o status."""
+        return self._resposta_pedido(pendente, servico.remover_item(id_pedido, id_item))  # Regras do serviço
+
+    def _registrar_pagamento(self, repositorio, servico, pendente, tocados, id_pedido, valor, forma_pagamento):  # Dá baixa
+        """Lança um pagamento em reais (texto, ex.: "25.50") no histórico do pedido, pela forma informada (Pix ou Dinheiro)."""
+        return self._resposta_pedido(pendente, servico.registrar_pagamento(id_pedido, texto_para_centavos(str(valor)), None, forma_pagamento))  # Regras do serviço
+
+    def _definir_entrega(self, repositorio, servico, pendente, tocados, id_pedido, data_hora=None):  # Status de entrega
+        """Agenda a entrega ("DD-MM-AAAA HH:MM") ou, sem data, marca o pedido como entregue agora."""
+        data_hora = ler_data_obrigatoria(data_hora, ler_data_hora, 'DD-MM-AAAA HH:MM') if data_hora else None  # Agendamento ou entrega agora
+        return self._resposta_pedido(pendente, servico.definir_entrega(id_pedido, data_hora))  # Regras do serviço
+
+    def _definir_vencimento(self, repositorio, servico, pendente, tocados, id_pedido, data):  # Prazo do saldo
+        """Define a data esperada de pagamento ("DD-MM-AAAA")."""
+        return self._resposta_pedido(pendente, servico.definir_vencimento(id_pedido, ler_data_obrigatoria(data, ler_data, 'DD-MM-AAAA')))  # Regras do serviço
+
+
+def executar(sistema, porta=PORTA_SERVIDOR, endereco=ENDERECO_SERVIDOR):  # Chamado por gerenciador_pedidos.py --servidor
+    """Prepara os arquivos, sobe o servidor e atende os balcões até o Ctrl+C; ao sair, grava a fila e compacta."""
+    sistema.inicializar_csv()  # Recupera gravações interrompidas e cria os CSVs
+    servidor = ServidorPedidos(sistema, endereco, porta)  # Dono do repositório
+
+    async def principal():  # Vida do servidor dentro do laço de eventos
+        await servidor.iniciar()  # Abre a porta
+        print(f"🖥️ Servidor de pedidos em {endereco}:{porta} ({len(sistema.carregar_repositorio().cabecalhos)} pedido(s) em memória). Ctrl+C para encerrar.")  # Informa
+        try:  # Atende até ser interrompido
+            await asyncio.Event().wait()  # Nunca termina sozinho
+        finally:  # Ctrl+C cancela a espera
+            await servidor.encerrar()  # Grava o que estiver na fila
+
+    try:  # Ctrl+C encerra o laço de eventos
+        asyncio.run(principal())  # Laço de eventos do servidor
+    except KeyboardInterrupt:  # Encerramento pelo operador
+        pass  # Segue para a compactação
+    sistema.compactar_dados()  # Deixa os CSVs atualizados para consulta no Excel (arquivar é só com --arquivar)
+    print(f"\nServidor encerrado ({servidor.alteracoes} alteração(ões) em {servidor.lotes} gravação(ões)).")  # Resumo
@@ -0,0 +1,55 @@
+import os  # Importa a biblioteca para montar caminhos
+import shutil  # Importa a cópia do catálogo de produtos
+from datetime import datetime, timedelta  # Importa classes para as datas dos pedidos de teste
+
+import pytest  # Importa o executor dos testes
+
+import gerenciador_pedidos  # Importa o sistema testado (motor, cache e IDs globais)
+from configuracao import ARQUIVO_PRODUTOS, ARQUIVO_SEQUENCIAS, BACKEND_CSV, BLOCO_IDS_ITENS, COMPRIMIR_HISTORICO, PASTA_HISTORICO  # Importa os arquivos do sistema
+from historico import HistoricoArquivado  # Importa o histórico arquivado (um por pasta de dados)
+from sequencias import AlocadorSequencias  # Importa o alocador de IDs (um por pasta de dados)
+from servico_pedidos import ServicoPedidos  # Importa a camada de serviço usada para montar pedidos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Pasta do sistema (onde fica o produtos.csv de exemplo)
+
+# =================================================================
+#         PASTA DE DADOS DESCARTÁVEL PARA CADA TESTE
+# =================================================================
+#
+# Os caminhos dos arquivos são relativos à pasta atual, então cada teste roda
+# numa pasta temporária só com o catálogo de produtos, com motor, cache e
+# alocador de IDs novos (como o benchmark faz para cada escala).
+
+
+@pytest.fixture
+def sistema(tmp_path, monkeypatch):  # gerenciador_pedidos apontado para uma pasta vazia
+    """Retorna o módulo gerenciador_pedidos com os CSVs criados numa pasta temporária."""
+    shutil.copy(os.path.join(RAIZ, ARQUIVO_PRODUTOS), tmp_path)  # Catálogo real (código '01' em diante)
+    monkeypatch.chdir(tmp_path)  # Todos os arquivos passam a ser criados aqui
+    monkeypatch.setattr(gerenciador_pedidos, 'sequencias', AlocadorSequencias(ARQUIVO_SEQUENCIAS, {'item': BLOCO_IDS_ITENS}))  # Contadores da pasta nova
+    monkeypatch.setattr(gerenciador_pedidos, 'historico', HistoricoArquivado(PASTA_HISTORICO, COMPRIMIR_HISTORICO))  # Histórico da pasta nova
+    gerenciador_pedidos.configurar_armazenamento(BACKEND_CSV)  # Motor novo, sem nada lido
+    gerenciador_pedidos.inicializar_csv()  # CSVs só com os títulos
+    yield gerenciador_pedidos  # Sistema pronto
+    gerenciador_pedidos.armazenamento.aguardar_compactacao()  # Nenhuma compactação em segundo plano sobrevive ao teste
+    gerenciador_pedidos.configurar_armazenamento(BACKEND_CSV)  # Descarta o estado lido da pasta temporária
+
+
+@pytest.fixture
+def lancar_pedidos():  # Pedidos a prazo gravados pelo caminho normal
+    """Retorna a função que lança pedidos a prazo (sem pagamento, vencimento em 5 dias), grava e retorna os IDs."""
+    return _lancar_pedidos  # Uso: lancar_pedidos(sistema, quantidade)
+
+
+def _lancar_pedidos(sistema, quantidade=1, quantidade_itens=10):  # Lançamento pela camada de serviço
+    """Lança os pedidos com o código '01' e grava tudo numa única chamada."""
+    repositorio = sistema.carregar_repositorio()  # Repositório em cache
+    servico = ServicoPedidos(repositorio, sistema.carregar_produtos(), sistema.sequencias)  # Mesmas regras das telas
+    vencimento = (datetime.now() + timedelta(days=5)).strftime('%d-%m-%Y')  # Dentro do prazo de 30 dias
+    ids = [  # Um pedido por cliente
+        servico.lancar_pedido({'cliente': f"Cliente {numero}", 'forma_pagamento': 'Prazo', 'vencimento': vencimento,
+                               'itens': [{'codigo': '01', 'tipo': 'UN', 'quantidade': quantidade_itens}]}).id_pedido
+        for numero in range(1, quantidade + 1)
+    ]
+    assert sistema.salvar_repositorio(repositorio)  # Uma gravação para todos
+    return ids  # IDs lançados
@@ -0,0 +1,28 @@
+from analises import ColunasVendas, mix_unidade_caixa, produtos_mais_vendidos  # Importa as análises em colunas
+from catalogo import CatalogoProdutos  # Importa o catálogo que identifica os itens antigos
+
+PRODUTOS = {  # Catálogo mínimo (mesmas colunas do produtos.csv)
+    '01': {'Código': '01', 'Nome do Produto': 'Original 269ml', 'Valor Unidade (R$)': '2.76', 'Valor Caixa (R$)': '33.12'},
+    '02': {'Código': '02', 'Nome do Produto': 'Skol 269 ml', 'Valor Unidade (R$)': '2.66', 'Valor Caixa (R$)': '31.92'},
+}
+CABECALHOS = [('1', '27-01-2026 14:08', 'Ana', '112.20', '0.00', 'Pix', 'Pendente', '', '', 'Entregue', '', '1')]  # Um pedido
+ITENS = [  # Itens antigos (sem código, tipo no nome) e novos do mesmo produto
+    ('1', '1', 'Original 269ml', '10', '27.60', '', ''),
+    ('2', '1', 'Original 269ml (CX)', '1', '33.12', '', ''),
+    ('3', '1', 'Original 269ml', '3', '8.28', '01', 'UN'),
+    ('4', '1', 'skol  269 ML', '15', '39.90', '', ''),
+    ('5', '1', 'Skol 269 ml', '1', '3.30', '02', 'UN'),
+    ('6', '1', 'Brahma 350 ml', '2', '7.00', '', ''),
+]
+
+
+def test_itens_antigos_sem_codigo_somam_com_o_produto_do_catalogo():
+    colunas = ColunasVendas(CatalogoProdutos(PRODUTOS)).carregar(CABECALHOS, ITENS)  # Itens identificados pelo catálogo
+    ranking = {nome: quantidade for nome, quantidade, _ in produtos_mais_vendidos(colunas)}  # Nome -> quantidade
+    assert ranking == {'Original 269ml': 14, 'Skol 269 ml': 16, 'Brahma 350 ml': 2}  # Um produto por linha (fora do catálogo: pelo nome)
+    assert mix_unidade_caixa(colunas)['Original 269ml'] == {'': 10, 'CX': 1, 'UN': 3}  # Mix do mesmo produto ('' = item antigo sem tipo)
+
+
+def test_sem_catalogo_agrupa_pelo_nome():
+    colunas = ColunasVendas().carregar(CABECALHOS, ITENS[:3])  # Comportamento sem catálogo
+    assert sorted(quantidade for _, quantidade, _ in produtos_mais_vendidos(colunas)) == [3, 11]  # Nome e código separados
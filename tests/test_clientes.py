@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta  # Importa o vencimento dos pedidos de teste
+
+import pytest  # Importa as fixtures
+
+from servico_pedidos import ServicoPedidos  # Importa a camada de serviço usada para montar pedidos
+
+CLIENTES = ['José da Silva', 'Maria Silva', 'Mariana Souza', 'João Pereira', 'Marcos Oliveira']  # Nomes como foram digitados
+
+
+@pytest.fixture
+def repositorio(sistema):  # Um pedido a prazo para cada cliente
+    """Retorna o repositório com um pedido gravado para cada nome de CLIENTES."""
+    repositorio = sistema.carregar_repositorio()  # Repositório em cache
+    servico = ServicoPedidos(repositorio, sistema.carregar_produtos(), sistema.sequencias)  # Mesmas regras das telas
+    vencimento = (datetime.now() + timedelta(days=5)).strftime('%d-%m-%Y')  # Dentro do prazo de 30 dias
+    for cliente in CLIENTES:  # Um pedido por cliente
+        servico.lancar_pedido({'cliente': cliente, 'forma_pagamento': 'Prazo', 'vencimento': vencimento,
+                               'itens': [{'codigo': '01', 'tipo': 'UN', 'quantidade': 1}]})
+    assert sistema.salvar_repositorio(repositorio)  # Uma gravação para todos
+    return repositorio  # Repositório com os clientes
+
+
+@pytest.mark.parametrize('trecho, esperados', [
+    ('mari', ['Maria Silva', 'Mariana Souza']),  # Prefixo do primeiro nome
+    ('ma s', ['Maria Silva', 'Mariana Souza']),  # Prefixos de duas palavras
+    ('silv', ['José da Silva', 'Maria Silva']),  # Prefixo do sobrenome
+    ('maria silva', ['Maria Silva']),  # Nome idêntico (e nenhum semelhante com as duas palavras)
+])
+def test_busca_por_prefixo(repositorio, trecho, esperados):
+    assert sorted(repositorio.buscar_clientes(trecho)) == esperados
+
+
+def test_busca_ignora_acentos_e_maiusculas(repositorio):
+    assert repositorio.buscar_clientes('JOSE')[0] == 'José da Silva'  # Digitado sem acento
+    assert repositorio.buscar_clientes('joão pe') == ['João Pereira']  # Digitado com acento
+    assert repositorio.buscar_clientes('  Joao   Pereira ') == ['João Pereira']  # Espaços repetidos
+    assert repositorio.id_do_cliente('JOAO PEREIRA') == repositorio.id_do_cliente('João Pereira')  # Mesmo cliente
+    assert repositorio.cliente_por_id(repositorio.id_do_cliente('joao pereira').lower()) == 'João Pereira'  # ID digitado em minúsculas
+
+
+def test_busca_por_palavras_coladas_e_erros_de_digitacao(repositorio):
+    assert repositorio.buscar_clientes('mariasilva')[0] == 'Maria Silva'  # Duas palavras coladas
+    assert repositorio.buscar_clientes('josedasilva')[0] == 'José da Silva'  # Três palavras coladas
+    assert repositorio.buscar_clientes('marcso oliveria')[0] == 'Marcos Oliveira'  # Letras trocadas
+    assert repositorio.buscar_clientes('xyzw') == []  # Nada parecido
@@ -0,0 +1,47 @@
+import csv  # Importa a leitura direta dos CSVs para comparação
+import os  # Importa a troca da extensão do snapshot
+
+from cache_dados import assinatura_arquivo  # Importa a assinatura que liga a cópia ao CSV
+from colunar import SnapshotColunar, filtro_de_condicoes, gravar_colunar  # Importa a cópia colunar
+from configuracao import (  # Importa os snapshots e o nome das cópias colunares
+    ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_PAGAMENTOS, CAMPOS_CABECALHO, CAMPOS_ITENS, CAMPOS_PAGAMENTOS, SUFIXO_COLUNAR
+)
+
+CAMPOS = ['ID', 'Código', 'Valor', 'Data', 'Data/Hora', 'Nome']  # Colunas do teste
+TUPLAS = [  # Valores que uma codificação numérica perderia se não fosse conferida
+    ('1', '01', '210.00', '27-01-2026', '27-01-2026 14:09', 'Ariel'),
+    ('2', '007', '210.5', '', '', ''),
+    ('3', '7', '-3.00', '31-02-2026', '1-2-2026 9:05', 'José da Conceição'),
+    ('10', '', '0.00', '01-01-2026', '01-01-2026 00:00', 'Ariel'),
+    ('11', '2', '1234567.89', '2026-01-01', 'amanhã', ' espaço '),
+]
+
+
+def ler_csv(caminho, campos):  # Tuplas do CSV na ordem das colunas
+    """Retorna as linhas do CSV (sem os títulos) como tuplas de texto."""
+    with open(caminho, mode='r', newline='', encoding='utf-8') as f:  # Abre o CSV
+        return [tuple(linha[campo] for campo in campos) for linha in csv.DictReader(f)]  # Mesma ordem da cópia colunar
+
+
+def test_copia_colunar_reconstroi_as_mesmas_tuplas(tmp_path):
+    caminho = str(tmp_path / 'teste.colunas')  # Arquivo colunar
+    gravar_colunar(caminho, CAMPOS, TUPLAS, ('fonte', 1))  # Assinatura fictícia do CSV
+    with SnapshotColunar.abrir(caminho, ('fonte', 1), CAMPOS) as snapshot:  # Em dia com a fonte
+        assert list(snapshot.tuplas()) == TUPLAS  # Texto idêntico, campo a campo
+        condicoes = {'Nome': lambda nome: nome == 'Ariel'}  # Filtro aplicado nas colunas
+        assert list(snapshot.tuplas(condicoes)) == list(filter(filtro_de_condicoes(CAMPOS, condicoes), TUPLAS))  # Mesmo resultado do filtro linha a linha
+    assert SnapshotColunar.abrir(caminho, ('fonte', 2), CAMPOS) is None  # CSV mais novo: cópia ignorada
+    assert SnapshotColunar.abrir(caminho, ('fonte', 1), CAMPOS[:-1]) is None  # Colunas diferentes: cópia ignorada
+
+
+def test_snapshots_do_sistema_sao_reconstruidos_exatamente(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido a prazo
+    repositorio = sistema.carregar_repositorio()  # Repositório em cache
+    sistema.lancar_pagamento(repositorio, repositorio.obter_pedido(id_pedido), 250, 'Pix')  # Um pagamento com data e hora
+    assert sistema.salvar_repositorio(repositorio)  # Grava no diário
+    sistema.compactar_dados()  # Grava os CSVs e as cópias colunares
+    for caminho, campos in ((ARQUIVO_CABECALHO, CAMPOS_CABECALHO), (ARQUIVO_ITENS, CAMPOS_ITENS), (ARQUIVO_PAGAMENTOS, CAMPOS_PAGAMENTOS)):  # Cada tabela
+        snapshot = SnapshotColunar.abrir(os.path.splitext(caminho)[0] + SUFIXO_COLUNAR, assinatura_arquivo(caminho), campos)  # Cópia em dia
+        assert snapshot is not None  # Gerada pela compactação
+        with snapshot:  # Libera o mapeamento
+            assert list(snapshot.tuplas()) == ler_csv(caminho, campos)  # Mesmas tuplas do CSV
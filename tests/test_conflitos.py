@@ -0,0 +1,42 @@
+import pytest  # Importa a verificação de exceções
+
+from armazenamento import ConflitoVersao  # Importa o erro de edição concorrente
+from configuracao import BACKEND_CSV  # Importa o motor padrão
+from registros import ItemPedido, Pedido  # Importa os registros tipados
+
+# Dois motores na mesma pasta fazem o papel de dois terminais abertos.
+
+
+def test_segundo_terminal_a_gravar_o_mesmo_pedido_recebe_conflito(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido gravado (versão 1)
+    terminal_a, _ = sistema.criar_armazenamento(BACKEND_CSV)  # Primeiro terminal
+    terminal_b, _ = sistema.criar_armazenamento(BACKEND_CSV)  # Segundo terminal
+    [pedido_a] = terminal_a.carregar('cabecalhos', Pedido.de_tupla)  # Os dois leem a mesma versão
+    [pedido_b] = terminal_b.carregar('cabecalhos', Pedido.de_tupla)
+    [item_b] = terminal_b.carregar('itens', ItemPedido.de_tupla)
+    pedido_a.nome_cliente = 'Ana'  # Edição do primeiro terminal
+    terminal_a.registrar_lote([('cabecalhos', [pedido_a], ())])  # Grava primeiro
+    assert pedido_a.versao == pedido_b.versao + 1  # Versão seguinte na memória do primeiro terminal
+    pedido_b.nome_cliente = 'Bia'  # Edição do segundo terminal sobre a versão antiga
+    item_b.quantidade = 99  # Item gravado junto (mesmo lote)
+    with pytest.raises(ConflitoVersao) as erro:  # Não sobrescreve a edição do primeiro
+        terminal_b.registrar_lote([('cabecalhos', [pedido_b], ()), ('itens', [item_b], ())])
+    assert erro.value.chaves == [str(id_pedido)]  # Pedido em conflito
+    terceiro, _ = sistema.criar_armazenamento(BACKEND_CSV)  # Leitura limpa do disco
+    assert [p.nome_cliente for p in terceiro.carregar('cabecalhos', Pedido.de_tupla)] == ['Ana']  # Vale a primeira gravação
+    assert [i.quantidade for i in terceiro.carregar('itens', ItemPedido.de_tupla)] == [10]  # Nada do lote em conflito foi gravado
+
+
+def test_salvar_repositorio_desatualizado_nao_grava_e_descarta_o_cache(sistema, lancar_pedidos, capsys):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido gravado
+    repositorio = sistema.carregar_repositorio()  # Lido por este terminal
+    outro, _ = sistema.criar_armazenamento(BACKEND_CSV)  # Outro terminal
+    [pedido] = outro.carregar('cabecalhos', Pedido.de_tupla)  # Mesma versão
+    pedido.nome_cliente = 'Ana'  # Edição do outro terminal
+    outro.registrar_lote([('cabecalhos', [pedido], ())])  # Gravada primeiro
+    local = repositorio.obter_pedido(id_pedido)  # Pedido na memória deste terminal
+    local.nome_cliente = 'Bia'  # Edição sobre a versão antiga
+    repositorio.marcar_pedido_alterado(local)  # Marca para gravação
+    assert sistema.salvar_repositorio(repositorio) is False  # Nada gravado
+    assert 'alterado(s) em outro terminal' in capsys.readouterr().out  # Aviso na tela
+    assert sistema.carregar_repositorio().obter_pedido(id_pedido).nome_cliente == 'Ana'  # Cache relido do disco
@@ -0,0 +1,48 @@
+import os  # Importa o tamanho do diário
+
+from configuracao import ARQUIVO_DIARIO, BACKEND_CSV  # Importa o diário e o motor padrão
+from registros import Pedido  # Importa o registro tipado dos pedidos
+
+# Um terminal novo (motor recém-criado) relê os snapshots e o diário do disco,
+# como acontece depois de uma queda de energia.
+
+
+def pedidos_no_disco(sistema):  # Leitura de um terminal que acabou de abrir
+    """Retorna {ID: nome do cliente} lidos por um motor novo."""
+    motor, _ = sistema.criar_armazenamento(BACKEND_CSV)  # Nada em memória
+    return {pedido.id_pedido: pedido.nome_cliente for pedido in motor.carregar('cabecalhos', Pedido.de_tupla)}  # Estado do disco
+
+
+def renomear(sistema, id_pedido, nome):  # Uma gravação comum
+    """Troca o nome do cliente do pedido e grava pelo caminho normal."""
+    repositorio = sistema.carregar_repositorio()  # Repositório em cache
+    pedido = repositorio.obter_pedido(id_pedido)  # Pedido em memória
+    pedido.nome_cliente = nome  # Alteração
+    repositorio.marcar_pedido_alterado(pedido)  # Marca para gravação
+    assert sistema.salvar_repositorio(repositorio)  # Uma linha no diário
+
+
+def test_ultima_linha_cortada_e_descartada_e_a_proxima_gravacao_continua(sistema, lancar_pedidos):
+    ids = lancar_pedidos(sistema, 2)  # Primeira linha do diário
+    renomear(sistema, ids[0], 'Ana')  # Segunda linha
+    with open(ARQUIVO_DIARIO, mode='ab') as f:  # Queda no meio da terceira gravação
+        f.write(b'{"lote": [{"t": "cabecalhos", "op": "U", "v": ["1", "27-01')  # Linha sem o fim
+    assert pedidos_no_disco(sistema) == {ids[0]: 'Ana', ids[1]: 'Cliente 2'}  # O trecho cortado é ignorado
+    sistema.configurar_armazenamento(BACKEND_CSV)  # Terminal reaberto depois da queda
+    renomear(sistema, ids[1], 'Bia')  # Nova gravação depois da linha cortada
+    assert pedidos_no_disco(sistema) == {ids[0]: 'Ana', ids[1]: 'Bia'}  # Começou numa linha nova e foi lida inteira
+    sistema.compactar_dados()  # Consolida nos CSVs
+    assert not os.path.exists(ARQUIVO_DIARIO)  # Diário esvaziado
+    assert pedidos_no_disco(sistema) == {ids[0]: 'Ana', ids[1]: 'Bia'}  # Mesmo estado nos snapshots
+
+
+def test_lote_cortado_nao_aplica_nenhum_registro(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido já no diário
+    tamanho = os.path.getsize(ARQUIVO_DIARIO)  # Fim da gravação completa
+    repositorio = sistema.carregar_repositorio()  # Repositório em cache
+    for nome in ('Carla', 'Duda'):  # Dois pedidos novos na mesma gravação (um lote)
+        repositorio.adicionar_pedido(Pedido(id_pedido=sistema.gerar_novo_id_pedido(repositorio), nome_cliente=nome, forma_pagamento='Pix', status_pagamento='Pendente', status_pedido='Pendente'))  # Pedido novo
+    assert sistema.salvar_repositorio(repositorio)  # Uma linha com os dois registros
+    with open(ARQUIVO_DIARIO, mode='r+b') as f:  # Simula a queda no meio dessa linha
+        f.truncate(tamanho + (os.path.getsize(ARQUIVO_DIARIO) - tamanho) // 2)  # Metade da linha
+    assert pedidos_no_disco(sistema) == {id_pedido: 'Cliente 1'}  # Nenhum dos dois pedidos do lote cortado
@@ -0,0 +1,47 @@
+from decimal import Decimal, ROUND_HALF_UP  # Importa a conversão de referência
+
+import pytest  # Importa a parametrização e a verificação de exceções
+
+from dinheiro import centavos_para_texto, formatar_reais, ler_valor_digitado, texto_para_centavos  # Importa as conversões testadas
+
+
+def centavos_por_decimal(texto):  # Conversão de referência (sempre pelo Decimal)
+    """Converte o texto para centavos só pelo caminho lento, para comparar com o caminho rápido."""
+    return int((Decimal(texto.replace(',', '.')) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))  # Arredonda para o centavo
+
+
+@pytest.mark.parametrize('texto, centavos', [
+    ('1,50', 150),  # Vírgula como separador decimal
+    ('.5', 50),  # Sem parte inteira
+    ('5.', 500),  # Sem centavos depois do ponto
+    ('915.90', 91590),  # Formato do CSV
+    ('-0,05', -5),  # Negativo
+    ('', 0), (None, 0),  # Campo vazio
+    ('12.345', 1235),  # Três casas: cai no Decimal e arredonda meio para cima
+    ('1e2', 10000),  # Notação científica
+])
+def test_texto_para_centavos(texto, centavos):
+    assert texto_para_centavos(texto) == centavos
+
+
+@pytest.mark.parametrize('texto', ['abc', '-', '.', '1.2.3', '1 0', '12,34,5', 'inf', 'nan'])
+def test_texto_invalido_lanca_value_error(texto):
+    with pytest.raises(ValueError):  # Mesmo tipo de erro que float()
+        texto_para_centavos(texto)
+
+
+def test_caminho_rapido_concorda_com_o_decimal():
+    for reais in (0, 1, 9, 10, 99, 100, 12345, 10 ** 12):  # Partes inteiras variadas
+        for fracao in ('', '0', '5', '05', '50', '99'):  # Nenhuma, uma ou duas casas
+            for sinal in ('', '-', '+'):  # Com e sem sinal
+                texto = f"{sinal}{reais}.{fracao}" if fracao else f"{sinal}{reais}"  # Texto no formato do CSV
+                assert texto_para_centavos(texto) == centavos_por_decimal(texto), texto
+
+
+def test_ida_e_volta_pelo_texto_do_csv():
+    for centavos in (0, 5, 50, 150, 91590, -5, -91590, 10 ** 14 + 1):  # Valores pequenos, negativos e enormes
+        assert texto_para_centavos(centavos_para_texto(centavos)) == centavos  # Nada se perde na gravação
+    assert formatar_reais(150) == 'R$ 1.50'  # Exibição com duas casas
+    assert ler_valor_digitado(' r$ 12,3 ') == 1230  # Símbolo da moeda e vírgula digitados
+    with pytest.raises(ValueError):  # Nada digitado
+        ler_valor_digitado('R$')
@@ -0,0 +1,31 @@
+from datetime import datetime  # Importa a data do pagamento antigo
+
+import pytest  # Importa a verificação de exceções
+
+from configuracao import FORMA_NAO_INFORMADA  # Importa a forma dos pagamentos migrados sem meio registrado
+from registros import Pedido  # Importa o registro tipado dos pedidos
+from servico_pedidos import ServicoPedidos  # Importa a camada de serviço
+
+
+def test_pagamento_antigo_de_venda_a_prazo_e_migrado_sem_inventar_a_forma(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Venda a prazo
+    [pedido] = sistema.armazenamento.carregar('cabecalhos', Pedido.de_tupla)  # Cabeçalho como gravado antes do histórico existir
+    pedido.valor_pago, pedido.status_pagamento = 500, 'Parcial'  # Valor pago sem lançamentos
+    pedido.data_pagamento = datetime.now().replace(second=0, microsecond=0)  # Data do último pagamento (a única conhecida)
+    sistema.armazenamento.registrar_lote([('cabecalhos', [pedido], ())])  # Grava só o cabeçalho
+    sistema.cache.invalidar()  # Relê do disco
+    assert sistema.migrar_pagamentos() == 1  # Um pedido migrado
+    repositorio = sistema.carregar_repositorio()  # Estado gravado
+    [pagamento] = repositorio.pagamentos_do_pedido(id_pedido)  # Pagamento único
+    assert (pagamento.valor, pagamento.forma_pagamento) == (500, FORMA_NAO_INFORMADA)  # Nem Pix nem Dinheiro
+    assert [valores for _, valores in repositorio.fluxo_de_caixa()] == [{FORMA_NAO_INFORMADA: 500}]  # Separado no caixa
+    assert sistema.migrar_pagamentos() == 0  # Não migra duas vezes
+
+
+def test_novo_pagamento_exige_pix_ou_dinheiro(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Venda a prazo
+    servico = ServicoPedidos(sistema.carregar_repositorio(), sistema.carregar_produtos(), sistema.sequencias)  # Mesmas regras das telas
+    for forma in (None, 'Prazo', FORMA_NAO_INFORMADA):  # Sem forma, condição da venda ou marcador de migração
+        with pytest.raises(ValueError):  # Recusado
+            servico.registrar_pagamento(id_pedido, 100, forma_pagamento=forma)
+    assert servico.registrar_pagamento(id_pedido, 100, forma_pagamento='Pix').valor_pago == 100  # Forma válida
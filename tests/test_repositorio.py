@@ -0,0 +1,18 @@
+from servico_pedidos import ServicoPedidos  # Importa a camada de serviço
+
+
+def test_cancelar_edicao_restaura_so_o_pedido_editado(sistema, lancar_pedidos):
+    ids = lancar_pedidos(sistema, quantidade=3)  # Três pedidos a prazo (um item cada)
+    repositorio = sistema.carregar_repositorio()  # Repositório em cache
+    pedido = repositorio.obter_pedido(ids[1])  # Pedido do meio
+    copia_cabecalho = pedido.copy()  # Como a tela de edição guarda o original
+    copia_itens = [item.copy() for item in repositorio.itens_do_pedido(ids[1])]  # Itens originais
+    servico = ServicoPedidos(repositorio, sistema.carregar_produtos(), sistema.sequencias)  # Mesmas regras das telas
+    servico.registrar_pagamento(ids[1], 100, forma_pagamento='Pix')  # Lançamento feito durante a edição
+    for item in repositorio.itens_do_pedido(ids[1]):  # Itens excluídos durante a edição
+        repositorio.remover_item(item)  # Sai só do índice do pedido
+    repositorio.restaurar_pedido(pedido, copia_cabecalho, copia_itens)  # Edição cancelada
+    assert repositorio.itens_do_pedido(ids[1]) == copia_itens  # Itens originais de volta
+    assert not repositorio.pagamentos_do_pedido(ids[1]) and not repositorio.pagamentos  # Pagamento desfeito
+    assert sorted(item.id_pedido for item in repositorio.itens) == sorted(ids)  # Lista plana segue os índices
+    assert [len(repositorio.itens_do_pedido(i)) for i in ids] == [1, 1, 1]  # Outros pedidos intactos
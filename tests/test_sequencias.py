@@ -0,0 +1,51 @@
+import threading  # Importa as threads que disputam o mesmo arquivo de contadores
+
+from sequencias import AlocadorSequencias  # Importa o alocador testado
+
+
+def dois_terminais(tmp_path):  # Dois alocadores sobre o mesmo arquivo (como dois terminais)
+    """Retorna dois alocadores independentes que compartilham o arquivo de contadores, com blocos de 5 itens."""
+    caminho = str(tmp_path / 'sequencias.json')  # Arquivo de contadores compartilhado
+    return [AlocadorSequencias(caminho, {'item': 5}) for _ in range(2)]  # Cada um com o seu bloco em memória
+
+
+def test_terminais_intercalados_nunca_repetem_ids(tmp_path):
+    primeiro, segundo = dois_terminais(tmp_path)
+    itens, pedidos = [], []  # IDs entregues pelos dois, por sequência
+    for rodada in range(40):  # Alterna blocos, reservas avulsas e faixas
+        itens.append(primeiro.proximo('item'))  # Do bloco do primeiro
+        itens.append(segundo.proximo('item'))  # Do bloco do segundo
+        if rodada % 7 == 0:  # De vez em quando, uma faixa reservada direto no disco
+            inicio = segundo.reservar('item', 3)  # Três IDs de uma vez
+            itens.extend(range(inicio, inicio + 3))  # Faixa inteira entregue
+        pedidos.append(primeiro.proximo('pedido'))  # Sequência sem bloco
+        pedidos.append(segundo.proximo('pedido'))  # Do segundo terminal
+    assert len(itens) == len(set(itens)) == 98  # Nenhum ID de item repetido
+    assert sorted(pedidos) == list(range(1, 81))  # Sem bloco: nem repetição nem buracos
+
+
+def test_piso_dos_dados_vale_para_o_outro_terminal(tmp_path):
+    primeiro, segundo = dois_terminais(tmp_path)
+    assert primeiro.proximo('item') == 1  # Bloco 1..5 reservado no disco
+    segundo.garantir_minimo('item', 100)  # Segundo terminal leu dados com ID 100
+    assert segundo.proximo('item') == 101  # Acima do piso e do contador
+    assert primeiro.proximo('item') == 2  # Primeiro continua no seu bloco (2..5 já eram dele)
+    assert [primeiro.proximo('item') for _ in range(4)][-1] == 106  # Bloco esgotado: reserva depois do segundo
+
+
+def test_threads_de_dois_alocadores_nunca_repetem_ids(tmp_path):
+    alocadores = dois_terminais(tmp_path)
+    resultados = [[] for _ in range(4)]  # IDs entregues por thread
+
+    def alocar(alocador, destino):  # Cada thread reserva direto no disco
+        """Pede 100 IDs avulsos ao disco."""
+        for _ in range(100):  # Muitas disputas pela trava
+            destino.append(alocador.reservar('item'))  # Cada reserva passa pela trava do arquivo
+
+    threads = [threading.Thread(target=alocar, args=(alocadores[i % 2], resultados[i])) for i in range(4)]
+    for thread in threads:  # Disparam juntas
+        thread.start()
+    for thread in threads:  # Espera todas
+        thread.join()
+    entregues = [i for lista in resultados for i in lista]  # Todos os IDs
+    assert sorted(entregues) == list(range(1, 401))  # Sem repetição e sem buracos
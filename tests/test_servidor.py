@@ -0,0 +1,73 @@
+import asyncio  # Importa o laço de eventos do servidor
+import json  # Importa o formato das mensagens
+
+from servidor import ServidorPedidos  # Importa o servidor de pedidos
+
+# Várias mensagens no mesmo pedido chegam antes da janela fechar e viram um
+# único lote (uma linha no diário).
+
+
+def enviar_na_mesma_janela(sistema, mensagens):  # Lote único com todas as mensagens
+    """Sobe o servidor (porta livre), envia as mensagens juntas e retorna (respostas, servidor)."""
+    servidor = ServidorPedidos(sistema, porta=0, janela=0.05)  # Porta escolhida pelo sistema
+
+    async def principal():  # Vida do servidor no teste
+        await servidor.iniciar()  # Abre a porta e a tarefa de gravação
+        try:  # Sempre encerra
+            return await asyncio.gather(*(servidor._responder(json.dumps(mensagem)) for mensagem in mensagens))  # Todas entram na fila antes da gravação
+        finally:  # Fim do teste
+            await servidor.encerrar()  # Fecha a porta
+
+    return asyncio.run(principal()), servidor  # Respostas na ordem de envio
+
+
+def test_pagamentos_no_mesmo_pedido_sao_aplicados_em_sequencia(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido a prazo sem pagamento
+    total = sistema.carregar_repositorio().obter_pedido(id_pedido).valor_total  # Total em centavos
+    respostas, servidor = enviar_na_mesma_janela(sistema, [  # Três balcões dando baixa ao mesmo tempo
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '1.00', 'forma_pagamento': 'Pix'},
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '2.00', 'forma_pagamento': 'Dinheiro'},
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '3.00', 'forma_pagamento': 'Pix'},
+    ])
+    assert [resposta['ok'] for resposta in respostas] == [True, True, True]  # Nenhum conflito
+    assert servidor.lotes == 1  # Uma gravação para as três
+    sistema.cache.invalidar()  # Relê do disco
+    pedido = sistema.carregar_repositorio().obter_pedido(id_pedido)  # Estado gravado
+    assert pedido.valor_pago == 600  # Soma dos três lançamentos
+    assert pedido.saldo == total - 600  # Saldo recalculado
+    assert sorted(p.forma_pagamento for p in sistema.carregar_repositorio().pagamentos_do_pedido(id_pedido)) == ['Dinheiro', 'Pix', 'Pix']  # Formas informadas
+
+
+def test_operacoes_avulsas_misturadas_no_mesmo_pedido(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido a prazo com um item
+    respostas, servidor = enviar_na_mesma_janela(sistema, [  # Itens, pagamento e entrega na mesma janela
+        {'op': 'adicionar_itens', 'id_pedido': id_pedido, 'itens': [['01', 'UN', 2]]},
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '1.00', 'forma_pagamento': 'Pix'},
+        {'op': 'definir_entrega', 'id_pedido': id_pedido},
+    ])
+    assert all(resposta['ok'] for resposta in respostas), respostas  # Todas aplicadas
+    assert servidor.lotes == 1  # Uma gravação
+    assert len(respostas[-1]['itens']) == 2  # A última resposta já vê o item incluído antes dela
+
+
+def test_pagamento_sem_forma_ou_a_prazo_e_recusado(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido a prazo
+    respostas, _ = enviar_na_mesma_janela(sistema, [  # 'Prazo' não é meio de pagamento
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '1.00'},
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '1.00', 'forma_pagamento': 'Prazo'},
+    ])
+    assert [resposta['ok'] for resposta in respostas] == [False, False]  # Nada lançado
+    sistema.cache.invalidar()  # Relê do disco
+    assert not sistema.carregar_repositorio().pagamentos_do_pedido(id_pedido)  # Histórico vazio
+
+
+def test_gravar_com_versao_superada_na_janela_gera_conflito(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido lido pelos balcões
+    pedido = sistema.carregar_repositorio().obter_pedido(id_pedido).copy()  # Cópia lida pela tela do balcão
+    pedido.nome_cliente = 'Outro nome'  # Edição na tela
+    respostas, _ = enviar_na_mesma_janela(sistema, [  # Pagamento avulso chega antes da gravação da tela
+        {'op': 'registrar_pagamento', 'id_pedido': id_pedido, 'valor': '1.00', 'forma_pagamento': 'Pix'},
+        {'op': 'gravar', 'cabecalhos': [pedido.para_tupla()]},
+    ])
+    assert respostas[0]['ok']  # O pagamento é gravado
+    assert not respostas[1]['ok'] and respostas[1]['conflito'] == [id_pedido]  # A tela editou uma versão já superada
@@ -0,0 +1,65 @@
+import pytest  # Importa a verificação de exceções
+
+from armazenamento import ConflitoVersao  # Importa o erro de edição concorrente
+from configuracao import BACKEND_CSV, BACKEND_SQLITE  # Importa os nomes dos motores
+from registros import ItemPedido, Pagamento, Pedido  # Importa os registros tipados
+from servico_pedidos import ServicoPedidos  # Importa a camada de serviço
+
+# O banco é criado na pasta temporária do teste a partir dos CSVs, como em
+# "--importar-csv", e depois o sistema passa a trabalhar com "--backend sqlite".
+
+
+def linhas_no_banco(sistema):  # Tamanho de cada tabela do banco
+    """Retorna {tabela: linhas} das tabelas do banco SQLite."""
+    banco, _ = sistema.criar_armazenamento(BACKEND_SQLITE)  # Conexão nova (como outro terminal)
+    return {nome: banco.quantidade(nome) for nome in ('cabecalhos', 'itens', 'pagamentos', 'produtos')}  # Contagem de cada tabela
+
+
+def test_reimportar_csv_nao_apaga_pedidos_gravados_no_banco(sistema, lancar_pedidos, capsys):
+    lancar_pedidos(sistema)  # Um pedido nos CSVs
+    assert sistema.importar_csv_para_sqlite()  # Primeira importação (banco vazio)
+    sistema.configurar_armazenamento(BACKEND_SQLITE)  # Passa a trabalhar com o banco
+    lancar_pedidos(sistema)  # Segundo pedido, só no banco
+    produtos = linhas_no_banco(sistema)['produtos']  # Catálogo importado
+    assert produtos > 0  # produtos.csv copiado para a pasta do teste
+    assert sistema.importar_csv_para_sqlite() is False  # Recusa sobrescrever o banco em uso
+    assert 'nada foi importado' in capsys.readouterr().out  # Aviso na tela
+    assert linhas_no_banco(sistema) == {'cabecalhos': 2, 'itens': 2, 'pagamentos': 0, 'produtos': produtos}  # Banco intacto
+    assert sistema.importar_produtos_para_sqlite() == produtos  # Só o catálogo é trocado
+    assert linhas_no_banco(sistema)['cabecalhos'] == 2  # Pedidos do banco preservados
+    assert sistema.importar_csv_para_sqlite(forcar=True)  # Substituição pedida explicitamente
+    assert linhas_no_banco(sistema)['cabecalhos'] == 1  # Banco igual aos CSVs
+
+
+def test_importacao_preserva_pedidos_itens_e_pagamentos(sistema, lancar_pedidos):
+    ids = lancar_pedidos(sistema, quantidade=3)  # Pedidos nos CSVs
+    servico = ServicoPedidos(sistema.carregar_repositorio(), sistema.carregar_produtos(), sistema.sequencias)  # Mesmas regras das telas
+    servico.registrar_pagamento(ids[0], 150, forma_pagamento='Pix')  # Um pagamento no histórico
+    assert sistema.salvar_repositorio(servico.repositorio)  # Gravado nos CSVs
+    assert sistema.importar_csv_para_sqlite()  # Cópia para o banco
+    csv, _ = sistema.criar_armazenamento(BACKEND_CSV)  # Leitura limpa dos CSVs
+    banco, _ = sistema.criar_armazenamento(BACKEND_SQLITE)  # Leitura limpa do banco
+    for nome, fabrica in (('cabecalhos', Pedido.de_tupla), ('itens', ItemPedido.de_tupla), ('pagamentos', Pagamento.de_tupla)):  # Cada tabela
+        assert [r.para_tupla() for r in banco.carregar(nome, fabrica)] == [r.para_tupla() for r in csv.carregar(nome, fabrica)], nome
+    sistema.configurar_armazenamento(BACKEND_SQLITE)  # Passa a trabalhar com o banco
+    assert sistema.carregar_repositorio().obter_pedido(ids[0]).valor_pago == 150  # Pagamento derivado do histórico importado
+
+
+def test_segundo_terminal_a_gravar_no_banco_recebe_conflito(sistema, lancar_pedidos):
+    [id_pedido] = lancar_pedidos(sistema)  # Pedido gravado (versão 1)
+    assert sistema.importar_csv_para_sqlite()  # Banco com o pedido
+    terminal_a, _ = sistema.criar_armazenamento(BACKEND_SQLITE)  # Primeiro terminal
+    terminal_b, _ = sistema.criar_armazenamento(BACKEND_SQLITE)  # Segundo terminal (outra conexão)
+    [pedido_a] = terminal_a.carregar('cabecalhos', Pedido.de_tupla)  # Os dois leem a mesma versão
+    [pedido_b] = terminal_b.carregar('cabecalhos', Pedido.de_tupla)
+    [item_b] = terminal_b.carregar('itens', ItemPedido.de_tupla)
+    pedido_a.nome_cliente = 'Ana'  # Edição do primeiro terminal
+    terminal_a.registrar_lote([('cabecalhos', [pedido_a], ())])  # Grava primeiro
+    pedido_b.nome_cliente = 'Bia'  # Edição do segundo terminal sobre a versão antiga
+    item_b.quantidade = 99  # Item gravado junto (mesma transação)
+    with pytest.raises(ConflitoVersao) as erro:  # Não sobrescreve a edição do primeiro
+        terminal_b.registrar_lote([('cabecalhos', [pedido_b], ()), ('itens', [item_b], ())])
+    assert erro.value.chaves == [str(id_pedido)]  # Pedido em conflito
+    terceiro, _ = sistema.criar_armazenamento(BACKEND_SQLITE)  # Leitura limpa do banco
+    assert [p.nome_cliente for p in terceiro.carregar('cabecalhos', Pedido.de_tupla)] == ['Ana']  # Vale a primeira gravação
+    assert [i.quantidade for i in terceiro.carregar('itens', ItemPedido.de_tupla)] == [10]  # Transação desfeita por inteiro
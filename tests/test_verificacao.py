@@ -0,0 +1,50 @@
+import csv  # Importa a leitura e a gravação dos CSVs danificados
+from pathlib import Path  # Importa a leitura dos bytes (fecha o arquivo sozinha)
+
+from configuracao import ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_ITENS_ORFAOS  # Importa os snapshots verificados
+
+# Os CSVs são danificados como um editor externo faria (Excel, cópia manual)
+# e o reparo roda duas vezes: a segunda não pode encontrar nem mudar nada.
+
+
+def ler_csv(caminho):  # Linhas do arquivo (com os títulos)
+    """Retorna todas as linhas do CSV como listas de texto."""
+    with open(caminho, mode='r', newline='', encoding='utf-8') as f:  # Abre o CSV
+        return list(csv.reader(f))  # Todas as linhas
+
+
+def gravar_csv(caminho, linhas):  # Regrava o arquivo inteiro
+    """Substitui o CSV pelas linhas informadas."""
+    with open(caminho, mode='w', newline='', encoding='utf-8') as f:  # Abre o CSV
+        csv.writer(f).writerows(linhas)  # Grava as linhas
+
+
+def conteudo(*caminhos):  # Bytes de cada arquivo
+    """Retorna o conteúdo binário de cada arquivo, na ordem informada."""
+    return [Path(caminho).read_bytes() for caminho in caminhos]  # Para comparar antes e depois
+
+
+def test_reparo_e_idempotente(sistema, lancar_pedidos, capsys):
+    ids = lancar_pedidos(sistema, 2)  # Dois pedidos com um item cada
+    sistema.compactar_dados()  # Tudo nos CSVs
+    cabecalhos = ler_csv(ARQUIVO_CABECALHO)  # Pedidos
+    cabecalhos[1][cabecalhos[0].index('Valor Total (R$)')] = '1.00'  # Total diferente da soma dos itens
+    gravar_csv(ARQUIVO_CABECALHO, cabecalhos)
+    itens = ler_csv(ARQUIVO_ITENS)  # Itens
+    copia = list(itens[1])  # Gravação repetida do primeiro item
+    repetido = list(itens[2])  # Item diferente com o mesmo ID do primeiro
+    repetido[0] = itens[1][0]
+    orfao = list(itens[1])  # Item de um pedido inexistente
+    orfao[0], orfao[1] = '900', '999'
+    gravar_csv(ARQUIVO_ITENS, itens + [copia, repetido, orfao])
+    assert sistema.verificar_integridade(reparar=True, processos=1) == 0  # Tudo era corrigível
+    arquivos = (ARQUIVO_CABECALHO, ARQUIVO_ITENS, ARQUIVO_ITENS_ORFAOS)  # Resultado do reparo
+    reparados = conteudo(*arquivos)  # Estado depois do primeiro reparo
+    assert len(ler_csv(ARQUIVO_ITENS_ORFAOS)) == 2  # Títulos e o item órfão
+    repositorio = sistema.carregar_repositorio()  # Relido depois do reparo
+    assert [len(repositorio.itens_do_pedido(id_pedido)) for id_pedido in ids] == [1, 2]  # Cópia descartada, item repetido renumerado
+    assert all(sistema.calcular_valor_total_pedido(p.id_pedido, repositorio) == p.valor_total for p in repositorio.cabecalhos)  # Totais pelos itens
+    capsys.readouterr()  # Descarta o primeiro relatório
+    assert sistema.verificar_integridade(reparar=True, processos=1) == 0  # Segunda passada: nada a corrigir
+    assert 'corrigido' not in capsys.readouterr().out  # Nenhuma correção anunciada
+    assert conteudo(*arquivos) == reparados  # Nenhum arquivo mudou
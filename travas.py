@@ -0,0 +1,60 @@
+import os  # Importa a biblioteca para identificar o sistema operacional
+import threading  # Importa a biblioteca para serializar as threads do mesmo processo
+
+if os.name == 'nt':  # Windows
+    import msvcrt  # Travamento de arquivos no Windows
+else:  # Linux / macOS
+    import fcntl  # Travamento de arquivos em sistemas POSIX
+
+# =================================================================
+#            TRAVAS DE ARQUIVO (ENTRE PROCESSOS E THREADS)
+# =================================================================
+
+_travas_processo = {}  # caminho -> [RLock da thread, profundidade, arquivo aberto]
+_trava_registro = threading.Lock()  # Protege o dicionário acima
+
+
+class TravaArquivo:  # Trava exclusiva e consultiva (advisory) baseada num arquivo ".trava"
+    """Trava exclusiva entre terminais; pode ser reaberta pela mesma thread sem travar a si mesma."""
+
+    def __init__(self, caminho):  # Recebe o caminho do arquivo de trava
+        self.caminho = os.path.abspath(caminho)  # Caminho absoluto para não duplicar travas
+        with _trava_registro:  # Cria (uma vez) o estado compartilhado desse caminho
+            self._estado = _travas_processo.setdefault(self.caminho, [threading.RLock(), 0, None])  # Estado por caminho
+
+    def __enter__(self):  # Início do bloco "with"
+        self._estado[0].acquire()  # Primeiro serializa as threads deste processo
+        if self._estado[1] == 0:  # Primeira entrada desta thread: trava também no sistema operacional
+            arquivo = open(self.caminho, 'a+b')  # Cria o arquivo de trava se não existir
+            try:  # Trava o arquivo
+                if os.name == 'nt':  # Windows
+                    arquivo.seek(0)  # A trava é sobre o primeiro byte
+                    while True:  # LK_LOCK desiste após ~10 s; tenta de novo até conseguir
+                        try:  # Tenta travar
+                            msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)  # Trava 1 byte
+                            break  # Conseguiu
+                        except OSError:  # Outro terminal ainda segura a trava
+                            continue  # Tenta novamente
+                else:  # POSIX
+                    fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)  # Espera até obter a trava exclusiva
+            except BaseException:  # Falhou (ex.: Ctrl+C durante a espera)
+                arquivo.close()  # Fecha o arquivo
+                self._estado[0].release()  # Libera a trava da thread
+                raise  # Repassa o erro
+            self._estado[2] = arquivo  # Guarda o arquivo aberto
+        self._estado[1] += 1  # Aumenta a profundidade (reentrância)
+        return self  # Permite "with TravaArquivo(...) as trava"
+
+    def __exit__(self, *excecao):  # Fim do bloco "with"
+        self._estado[1] -= 1  # Diminui a profundidade
+        if self._estado[1] == 0:  # Saída da última entrada: libera a trava do sistema operacional
+            arquivo = self._estado[2]  # Arquivo travado
+            if os.name == 'nt':  # Windows
+                arquivo.seek(0)  # Mesmo byte travado
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)  # Destrava
+            else:  # POSIX
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)  # Destrava
+            arquivo.close()  # Fecha o arquivo
+            self._estado[2] = None  # Limpa a referência
+        self._estado[0].release()  # Libera a trava da thread
+        return False  # Não suprime exceções
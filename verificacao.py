@@ -0,0 +1,452 @@
+import csv  # Importa a biblioteca para ler e regravar os CSVs
+import io  # Importa o buffer de texto que entrega um trecho do arquivo ao leitor CSV
+import os  # Importa o tamanho dos arquivos, a quantidade de processadores e o fsync
+from array import array  # Importa os vetores compactos indexados pelo ID do pedido
+from bisect import bisect_right  # Importa a busca nas faixas de IDs de itens que se sobrepõem entre trechos
+from collections import Counter  # Importa a contagem dos problemas e dos IDs repetidos
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait  # Importa o pool de processos
+from itertools import compress  # Importa a seleção (feita em C) das posições preenchidas dos vetores
+
+from configuracao import CAMPOS_CABECALHO, CAMPOS_ITENS  # Importa a ordem das colunas gravadas nos snapshots
+from dinheiro import centavos_para_texto, formatar_reais, status_por_valores, texto_para_centavos  # Importa a aritmética em centavos e a regra do status
+
+# =================================================================
+#     VERIFICAÇÃO DE INTEGRIDADE (ITENS x CABEÇALHOS x PAGAMENTOS)
+# =================================================================
+#
+# O arquivo de itens é dividido em trechos de tamanho fixo (sempre terminando
+# numa quebra de linha) e cada trecho é somado por pedido num processo do pool.
+# Cada processo devolve só vetores compactos (pedidos, somas, quantidades) e a
+# faixa de IDs de itens do trecho; o processo principal junta tudo em vetores
+# indexados pelo ID do pedido e percorre cabeçalhos e pagamentos linha a linha.
+# A memória depende do maior ID de pedido (cerca de 21 bytes por pedido) e do
+# tamanho do trecho, nunca da quantidade de linhas de itens.
+#
+# IDs de itens repetidos: cada trecho acha os repetidos dentro dele; como os
+# IDs crescem ao longo do arquivo, os trechos quase nunca têm faixas em comum.
+# Só quando há repetidos (ou faixas em comum) uma passada extra relê essas
+# linhas: cópias idênticas (gravação repetida) saem das somas e são descartadas
+# no reparo; itens diferentes com o mesmo ID ganham um ID novo.
+#
+# O reparo regrava os CSVs em temporários e os troca pelo mesmo manifesto da
+# compactação (à prova de queda). Corrige o que os próprios dados determinam:
+# total = soma dos itens, valor pago = soma dos pagamentos, status pelos valores,
+# cópias descartadas, IDs repetidos renumerados e itens órfãos movidos para um CSV à parte. O resto
+# (pago acima do total, pedido sem itens...) fica só no relatório.
+
+TAMANHO_TRECHO = 8 * 1024 * 1024  # Bytes do arquivo de itens por tarefa do pool (limita a memória de cada processo)
+LIMITE_ID_DENSO = 1 << 25  # IDs até aqui ficam em vetores densos; os maiores (raros), num dicionário
+LIMITE_EXEMPLOS = 10  # Exemplos exibidos por tipo de problema
+
+PROBLEMAS = {  # tipo -> descrição no relatório (na ordem de exibição)
+    'linha_invalida': "Linhas com ID ou valor ilegível",
+    'pedido_duplicado': "Pedidos com 'ID do Pedido' repetido",
+    'item_duplicado': "Itens com 'ID do Item' repetido",
+    'item_orfao': "Itens de pedidos inexistentes (órfãos)",
+    'pagamento_orfao': "Pagamentos de pedidos inexistentes",
+    'pedido_sem_itens': "Pedidos com valor e sem nenhum item",
+    'total_divergente': "Total do pedido diferente da soma dos itens",
+    'pago_divergente': "Valor pago diferente da soma dos pagamentos",
+    'pago_acima_total': "Valor pago acima do total",
+    'status_divergente': "Status do pagamento incompatível com os valores",
+}
+CORRIGIVEIS = ('item_duplicado', 'item_orfao', 'total_divergente', 'pago_divergente', 'status_divergente')  # Tipos que o reparo resolve
+
+P_ID_ITEM = CAMPOS_ITENS.index('ID do Item')  # Posições nas tuplas dos snapshots (ordem das colunas configuradas)
+P_PEDIDO_ITEM = CAMPOS_ITENS.index('ID do Pedido')
+P_ID_PEDIDO = CAMPOS_CABECALHO.index('ID do Pedido')
+P_TOTAL = CAMPOS_CABECALHO.index('Valor Total (R$)')
+P_PAGO = CAMPOS_CABECALHO.index('Valor Pago (R$)')
+P_STATUS = CAMPOS_CABECALHO.index('Status do Pagamento')
+P_VERSAO = CAMPOS_CABECALHO.index('Versão')
+
+
+# --- Leitura dos CSVs ---
+
+def posicoes_colunas(titulos, colunas, caminho):  # Mapeia colunas pelo título (arquivos antigos têm menos colunas)
+    """Retorna a posição de cada coluna na linha de títulos (ValueError se faltar alguma)."""
+    faltando = [coluna for coluna in colunas if coluna not in titulos]  # Colunas obrigatórias ausentes
+    if faltando:  # Arquivo de outro formato
+        raise ValueError(f"Coluna(s) {', '.join(faltando)} ausente(s) em '{caminho}'.")  # Mensagem para o usuário
+    return [titulos.index(coluna) for coluna in colunas]  # Posições na linha do arquivo
+
+
+def ler_titulos(caminho):  # Primeira linha do CSV
+    """Retorna a lista de títulos das colunas do arquivo (vazia se o arquivo estiver vazio)."""
+    with open(caminho, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Mesmo modo de leitura dos snapshots
+        return next(csv.reader(f), None) or []  # Títulos
+
+
+def percorrer_csv(caminho, campos=None):  # Linha a linha, sem carregar o arquivo
+    """Gera as linhas de dados como estão no arquivo ou, com 'campos', como tuplas na ordem desses campos."""
+    with open(caminho, mode='r', newline='', encoding='utf-8', errors='ignore') as f:  # Mesmo modo de leitura dos snapshots
+        leitor = csv.reader(f)  # Leitor simples
+        titulos = next(leitor, None) or []  # Primeira linha
+        posicoes = campos and [titulos.index(c) if c in titulos else None for c in campos]  # Colunas ausentes ficam vazias
+        for linha in leitor:  # Linha a linha
+            if not linha:  # Linha em branco
+                continue  # Próxima
+            yield tuple(linha[p] if p is not None and p < len(linha) else '' for p in posicoes) if posicoes else linha  # Mesma conversão do motor de armazenamento
+
+
+def dividir_arquivo(caminho, tamanho_trecho):  # Trechos para o pool
+    """Retorna (títulos, [(início, fim)]) com os trechos em bytes depois da linha de títulos, cada um terminando numa quebra de linha."""
+    with open(caminho, mode='rb') as f:  # Bytes: as posições são exatas
+        titulos = next(csv.reader([f.readline().decode('utf-8', errors='ignore')]), [])  # Linha de títulos
+        inicio, tamanho = f.tell(), os.fstat(f.fileno()).st_size  # Primeiro byte de dados e fim do arquivo
+        trechos = []  # Trechos encontrados
+        while inicio < tamanho:  # Até o fim do arquivo
+            f.seek(min(inicio + tamanho_trecho, tamanho))  # Ponto aproximado de corte
+            f.readline()  # Avança até o fim da linha (nenhuma linha é cortada)
+            fim = min(f.tell(), tamanho)  # Fim do trecho
+            trechos.append((inicio, fim))  # Guarda
+            inicio = fim  # Próximo trecho
+    return titulos, trechos  # Títulos e trechos
+
+
+def agregar_trecho(caminho, inicio, fim, posicoes):  # Executado num processo do pool
+    """Soma por pedido os itens de um trecho do CSV; retorna (linhas, pedidos, somas, quantidades, menor ID, maior ID, IDs repetidos, inválidas, exemplos)."""
+    p_item, p_pedido, p_valor = posicoes  # Colunas usadas
+    with open(caminho, mode='rb') as f:  # Cada processo abre o arquivo
+        f.seek(inicio)  # Início do trecho
+        texto = f.read(fim - inicio).decode('utf-8', errors='ignore')  # Só o trecho (tamanho limitado)
+    somas = {}  # ID do Pedido -> [centavos, itens]
+    ids = []  # IDs dos itens do trecho
+    invalidas, exemplos = 0, []  # Linhas ilegíveis
+    for linha in csv.reader(io.StringIO(texto, newline='')):  # Mesmo leitor dos snapshots
+        if not linha:  # Linha em branco
+            continue  # Próxima
+        try:  # ID ou valor podem estar corrompidos
+            id_item, id_pedido, valor = int(linha[p_item]), int(linha[p_pedido]), texto_para_centavos(linha[p_valor])  # Campos do item
+        except (IndexError, ValueError):  # Linha curta ou texto inválido
+            invalidas += 1  # Conta
+            if len(exemplos) < LIMITE_EXEMPLOS:  # Poucos exemplos bastam
+                exemplos.append(f"Itens: {','.join(linha)}")  # Linha como está no arquivo
+            continue  # Próxima
+        ids.append(id_item)  # Para os repetidos
+        soma = somas.get(id_pedido)  # Acumulado do pedido
+        if soma is None:  # Primeiro item do pedido no trecho
+            somas[id_pedido] = [valor, 1]  # Começa a somar
+        else:  # Itens seguintes
+            soma[0] += valor  # Centavos
+            soma[1] += 1  # Quantidade de itens
+    repetidos = [] if len(set(ids)) == len(ids) else [i for i, n in Counter(ids).items() if n > 1]  # Caso comum: nenhum
+    return (  # Vetores compactos (baratos de enviar entre processos)
+        len(ids) + invalidas, array('q', somas), array('q', (s[0] for s in somas.values())), array('q', (s[1] for s in somas.values())),
+        min(ids, default=0), max(ids, default=-1), repetidos, invalidas, exemplos,
+    )
+
+
+def executar_em_paralelo(funcao, tarefas, processos):  # Pool com fila limitada
+    """Gera os resultados de funcao(*tarefa), em qualquer ordem, com no máximo duas tarefas por processo em andamento."""
+    if processos <= 1:  # Um processo só (ou um único trecho): sem o custo de abrir o pool
+        for tarefa in tarefas:  # Em sequência
+            yield funcao(*tarefa)  # Resultado
+        return  # Fim
+    with ProcessPoolExecutor(max_workers=processos) as pool:  # Processos do pool
+        pendentes = set()  # Tarefas em andamento
+        for tarefa in tarefas:  # Envia aos poucos (os resultados não se acumulam na memória)
+            if len(pendentes) >= 2 * processos:  # Fila cheia
+                prontas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)  # Espera alguma terminar
+                for futuro in prontas:  # Terminadas
+                    yield futuro.result()  # Resultado (erros do processo são repassados aqui)
+            pendentes.add(pool.submit(funcao, *tarefa))  # Envia a tarefa
+        for futuro in as_completed(pendentes):  # As últimas
+            yield futuro.result()  # Resultado
+
+
+def unir_faixas(faixas):  # Junta faixas [a, b] que se tocam
+    """Retorna as faixas de inteiros unidas, em ordem e sem sobreposição."""
+    unidas = []  # Resultado
+    for inicio, fim in sorted(faixas):  # Em ordem de início
+        if unidas and inicio <= unidas[-1][1] + 1:  # Encosta na anterior
+            unidas[-1][1] = max(unidas[-1][1], fim)  # Estende
+        else:  # Faixa nova
+            unidas.append([inicio, fim])  # Guarda
+    return unidas  # Faixas unidas
+
+
+class VetorPorId:  # Inteiros indexados pelo ID (IDs numerados de 1 em diante)
+    """Vetor denso (array) para IDs até LIMITE_ID_DENSO e dicionário para os demais; cresce sob demanda."""
+
+    __slots__ = ('_vetor', '_fora')  # Atributos fixos
+
+    def __init__(self, tipo='q'):  # Tipo do array ('q' centavos, 'i' contagens, 'B' marcas)
+        self._vetor = array(tipo)  # Posição = ID
+        self._fora = {}  # IDs negativos ou muito grandes
+
+    def somar(self, ident, valor):  # Acumula no ID
+        """Soma 'valor' na posição do ID."""
+        vetor = self._vetor  # Vetor denso
+        if 0 <= ident < LIMITE_ID_DENSO:  # Caso comum
+            if ident >= len(vetor):  # Precisa crescer
+                novo = min(max(ident + 1, 2 * len(vetor)), LIMITE_ID_DENSO)  # Dobra (custo amortizado O(1))
+                vetor.frombytes(bytes(vetor.itemsize * (novo - len(vetor))))  # Zeros no fim
+            vetor[ident] += valor  # Acumula
+        else:  # ID fora da faixa
+            self._fora[ident] = self._fora.get(ident, 0) + valor  # Acumula no dicionário
+
+    def __getitem__(self, ident):  # Valor do ID (0 se nunca somado)
+        if 0 <= ident < len(self._vetor):  # Dentro do vetor
+            return self._vetor[ident]  # Valor
+        return self._fora.get(ident, 0)  # Fora do vetor
+
+    def preenchidos(self):  # IDs com valor
+        """Gera os IDs com valor diferente de zero, em ordem."""
+        yield from compress(range(len(self._vetor)), self._vetor)  # Seleção feita em C
+        yield from sorted(ident for ident, valor in self._fora.items() if valor)  # Os demais
+
+
+class VerificadorIntegridade:  # Uma verificação (e o reparo opcional) dos snapshots CSV
+    """Cruza itens, cabeçalhos e pagamentos e anota os problemas encontrados e as correções possíveis."""
+
+    def __init__(self, caminho_cabecalhos, caminho_itens, caminho_pagamentos, tamanho_trecho=TAMANHO_TRECHO):  # Recebe os CSVs
+        self.caminho_cabecalhos = caminho_cabecalhos  # Snapshot dos pedidos
+        self.caminho_itens = caminho_itens  # Snapshot dos itens
+        self.caminho_pagamentos = caminho_pagamentos  # Snapshot dos pagamentos
+        self.tamanho_trecho = tamanho_trecho  # Bytes por tarefa do pool
+        self.somas = VetorPorId('q')  # ID do Pedido -> soma dos itens (centavos)
+        self.quantidades = VetorPorId('i')  # ID do Pedido -> quantidade de itens
+        self.pagos = VetorPorId('q')  # ID do Pedido -> soma dos pagamentos (centavos)
+        self.cabecalhos = VetorPorId('B')  # ID do Pedido -> 1 se o pedido existe
+        self.itens_repetidos = set()  # IDs de itens que aparecem mais de uma vez
+        self.maior_id_item = 0  # Piso para os IDs novos dos itens renumerados
+        self.orfaos = set()  # IDs de pedidos inexistentes que têm itens
+        self.correcoes = {}  # ID do Pedido -> (total, pago, status) corrigidos
+        self.linhas = Counter()  # Tabela -> linhas verificadas
+        self.trechos = 0  # Trechos do arquivo de itens
+        self.processos = 1  # Processos usados
+        self.quantidade = Counter()  # Tipo de problema -> ocorrências
+        self.exemplos = {}  # Tipo de problema -> primeiros exemplos
+
+    def _anotar(self, tipo, texto):  # Registra um problema
+        """Conta o problema e guarda o texto entre os primeiros exemplos do tipo."""
+        self.quantidade[tipo] += 1  # Conta
+        exemplos = self.exemplos.setdefault(tipo, [])  # Exemplos do tipo
+        if len(exemplos) < LIMITE_EXEMPLOS:  # Poucos bastam
+            exemplos.append(texto)  # Guarda
+
+    # --- Verificação ---
+
+    def verificar(self, processos=None):  # Ponto de entrada
+        """Soma os itens no pool de processos, confere pagamentos e cabeçalhos linha a linha e retorna self."""
+        self._agregar_itens(processos or os.cpu_count() or 1)  # Itens (a parte pesada, em paralelo)
+        self._agregar_pagamentos()  # Pagamentos por pedido
+        self._conferir_cabecalhos()  # Cabeçalhos contra as somas
+        self._conferir_orfaos()  # Itens e pagamentos sem pedido
+        return self  # Para encadear
+
+    def _agregar_itens(self, processos):  # Passada paralela sobre os itens
+        """Soma os itens por pedido, trecho a trecho, e acha os IDs de itens repetidos."""
+        titulos, trechos = dividir_arquivo(self.caminho_itens, self.tamanho_trecho)  # Trechos em bytes
+        posicoes = posicoes_colunas(titulos, ('ID do Item', 'ID do Pedido', 'Valor Item (R$)'), self.caminho_itens)  # Colunas usadas
+        self.trechos, self.processos = len(trechos), max(1, min(processos, len(trechos)))  # Um trecho não abre o pool
+        faixas, sobrepostas, candidatos = [], [], set()  # Faixas de IDs de itens dos trechos, as interseções entre elas e os repetidos de cada trecho
+        tarefas = ((self.caminho_itens, inicio, fim, posicoes) for inicio, fim in trechos)  # Uma tarefa por trecho
+        for linhas, pedidos, somas, quantidades, menor, maior, repetidos, invalidas, exemplos in executar_em_paralelo(agregar_trecho, tarefas, self.processos):  # Resultados em qualquer ordem
+            self.linhas['itens'] += linhas  # Conta
+            for id_pedido, soma, itens in zip(pedidos, somas, quantidades):  # Pedidos do trecho
+                self.somas.somar(id_pedido, soma)  # Junta as somas
+                self.quantidades.somar(id_pedido, itens)  # Junta as quantidades
+            candidatos.update(repetidos)  # Repetidos dentro do trecho
+            if invalidas:  # Linhas ilegíveis no trecho
+                self.quantidade['linha_invalida'] += invalidas  # Conta
+                for exemplo in exemplos[:LIMITE_EXEMPLOS - len(self.exemplos.setdefault('linha_invalida', []))]:  # Poucos exemplos
+                    self.exemplos['linha_invalida'].append(exemplo)  # Guarda
+            if menor <= maior:  # Trecho com itens
+                sobrepostas.extend((max(menor, a), min(maior, b)) for a, b in faixas if menor <= b and a <= maior)  # Faixas em comum com trechos anteriores
+                faixas.append((menor, maior))  # Faixa deste trecho
+                self.maior_id_item = max(self.maior_id_item, maior)  # Maior ID
+        if sobrepostas:  # Pode haver repetidos entre trechos
+            candidatos.update(self._repetidos_nas_faixas(unir_faixas(sobrepostas), posicoes[0]))  # Passada extra só nessas faixas
+        if candidatos:  # Há IDs repetidos
+            self._classificar_repetidos(candidatos, posicoes)  # Cópias ou itens diferentes
+
+    def _ids_dos_itens(self, p_item):  # IDs do arquivo de itens, em sequência
+        """Gera (ID do item, linha) das linhas com ID legível."""
+        for linha in percorrer_csv(self.caminho_itens):  # Arquivo inteiro
+            try:  # ID corrompido já foi contado como inválido
+                yield int(linha[p_item]), linha  # ID e linha
+            except (IndexError, ValueError):  # Linha ilegível
+                continue  # Próxima
+
+    def _repetidos_nas_faixas(self, faixas, p_item):  # Passada extra (rara)
+        """Retorna os IDs de itens que aparecem mais de uma vez dentro das faixas sobrepostas."""
+        inicios = [inicio for inicio, _ in faixas]  # Para a busca binária
+        contagem = Counter()  # Só os IDs das faixas
+        for ident, _ in self._ids_dos_itens(p_item):  # Em sequência
+            posicao = bisect_right(inicios, ident) - 1  # Faixa candidata
+            if posicao >= 0 and ident <= faixas[posicao][1]:  # Dentro de uma faixa sobreposta
+                contagem[ident] += 1  # Conta
+        return [ident for ident, n in contagem.items() if n > 1]  # Repetidos entre trechos
+
+    def _classificar_repetidos(self, repetidos, posicoes):  # Passada extra (rara)
+        """Relê as linhas dos IDs repetidos: cópias idênticas saem das somas; itens diferentes com o mesmo ID continuam somados."""
+        p_item, p_pedido, p_valor = posicoes  # Colunas usadas
+        linhas_por_id = {}  # ID repetido -> linhas, na ordem do arquivo
+        for ident, linha in self._ids_dos_itens(p_item):  # Em sequência
+            if ident in repetidos:  # Só os repetidos
+                linhas_por_id.setdefault(ident, []).append(linha)  # Guarda a linha
+        for ident, linhas in sorted(linhas_por_id.items()):  # Em ordem de ID
+            copias = [linha for linha in linhas[1:] if linha == linhas[0]]  # Gravações repetidas da primeira linha
+            for copia in copias:  # Contadas uma vez a mais pelo pool
+                try:  # Valor ilegível não foi somado
+                    valor = texto_para_centavos(copia[p_valor])  # Valor da cópia
+                except ValueError:  # Linha inválida (já anotada)
+                    continue  # Nada a descontar
+                self.somas.somar(int(copia[p_pedido]), -valor)  # Desconta da soma do pedido
+                self.quantidades.somar(int(copia[p_pedido]), -1)  # E da quantidade de itens
+            self.itens_repetidos.add(ident)  # Corrigido no reparo
+            self._anotar('item_duplicado', f"Item {ident}: {len(copias)} cópia(s) idêntica(s), {len(linhas) - 1 - len(copias)} item(ns) diferente(s) com o mesmo ID")  # Anota
+
+    def _agregar_pagamentos(self):  # Passada sobre os pagamentos
+        """Soma os pagamentos por pedido."""
+        p_pedido, p_valor = posicoes_colunas(ler_titulos(self.caminho_pagamentos), ('ID do Pedido', 'Valor (R$)'), self.caminho_pagamentos)  # Colunas usadas
+        for linha in percorrer_csv(self.caminho_pagamentos):  # Linha a linha
+            self.linhas['pagamentos'] += 1  # Conta
+            try:  # Campos podem estar corrompidos
+                self.pagos.somar(int(linha[p_pedido]), texto_para_centavos(linha[p_valor]))  # Soma no pedido
+            except (IndexError, ValueError):  # Linha ilegível
+                self._anotar('linha_invalida', f"Pagamentos: {','.join(linha)}")  # Anota
+
+    def _conferir_cabecalhos(self):  # Passada sobre os cabeçalhos
+        """Compara total, valor pago e status de cada pedido com as somas de itens e pagamentos."""
+        p_id, p_total, p_pago, p_status = posicoes_colunas(  # Colunas usadas
+            ler_titulos(self.caminho_cabecalhos), ('ID do Pedido', 'Valor Total (R$)', 'Valor Pago (R$)', 'Status do Pagamento'), self.caminho_cabecalhos
+        )
+        for linha in percorrer_csv(self.caminho_cabecalhos):  # Linha a linha
+            self.linhas['cabecalhos'] += 1  # Conta
+            try:  # Campos podem estar corrompidos
+                id_pedido, total, pago, status = int(linha[p_id]), texto_para_centavos(linha[p_total]), texto_para_centavos(linha[p_pago]), linha[p_status]  # Campos do pedido
+            except (IndexError, ValueError):  # Linha ilegível
+                self._anotar('linha_invalida', f"Pedidos: {','.join(linha)}")  # Anota
+                continue  # Próxima
+            if self.cabecalhos[id_pedido]:  # Já visto
+                self._anotar('pedido_duplicado', f"Pedido {id_pedido}")  # Anota
+                continue  # Só a primeira linha é conferida
+            self.cabecalhos.somar(id_pedido, 1)  # Marca como existente
+            novo_total, novo_pago = total, pago  # Valores corrigidos
+            soma, pagamentos = self.somas[id_pedido], self.pagos[id_pedido]  # Somas do pedido
+            if not self.quantidades[id_pedido]:  # Sem itens: não dá para saber se falta item ou sobra valor
+                if total:  # Pedido com valor
+                    self._anotar('pedido_sem_itens', f"Pedido {id_pedido}: total {formatar_reais(total)}, nenhum item")  # Só relatório
+            elif soma != total:  # Total desatualizado
+                self._anotar('total_divergente', f"Pedido {id_pedido}: total {formatar_reais(total)}, itens somam {formatar_reais(soma)}")  # Anota
+                novo_total = soma  # Mesmo recálculo do "Salvar e Sair" da edição
+            if pagamentos and pagamentos != pago:  # Cabeçalho diferente do histórico de pagamentos
+                self._anotar('pago_divergente', f"Pedido {id_pedido}: pago {formatar_reais(pago)}, pagamentos somam {formatar_reais(pagamentos)}")  # Anota
+                novo_pago = pagamentos  # O histórico é a fonte do valor pago
+            if novo_pago > novo_total:  # Pagou mais que o total
+                self._anotar('pago_acima_total', f"Pedido {id_pedido}: pago {formatar_reais(novo_pago)} de {formatar_reais(novo_total)}")  # Só relatório
+            novo_status = status_por_valores(novo_total, novo_pago) if novo_total > 0 else status  # Regra única do status (pedido zerado fica como está)
+            if novo_status != status:  # Status incompatível
+                self._anotar('status_divergente', f"Pedido {id_pedido}: '{status}', os valores indicam '{novo_status}'")  # Anota
+            if (novo_total, novo_pago, novo_status) != (total, pago, status):  # Algo a corrigir
+                self.correcoes[id_pedido] = (novo_total, novo_pago, novo_status)  # Guarda a correção
+
+    def _conferir_orfaos(self):  # Itens e pagamentos sem pedido
+        """Anota os pedidos inexistentes que têm itens ou pagamentos."""
+        for id_pedido in self.quantidades.preenchidos():  # Pedidos com itens
+            if not self.cabecalhos[id_pedido]:  # Sem cabeçalho
+                self.orfaos.add(id_pedido)  # Itens a mover no reparo
+                self._anotar('item_orfao', f"Pedido {id_pedido}: {self.quantidades[id_pedido]} item(ns), {formatar_reais(self.somas[id_pedido])}")  # Anota
+        for id_pedido in self.pagos.preenchidos():  # Pedidos com pagamentos
+            if not self.cabecalhos[id_pedido]:  # Sem cabeçalho (dinheiro recebido não é apagado)
+                self._anotar('pagamento_orfao', f"Pedido {id_pedido}: {formatar_reais(self.pagos[id_pedido])} recebido(s)")  # Só relatório
+
+    # --- Resultado ---
+
+    def corrigiveis(self):  # Quantos problemas o reparo resolve
+        """Retorna a quantidade de problemas dos tipos que o reparo corrige."""
+        return sum(self.quantidade[tipo] for tipo in CORRIGIVEIS)  # Soma dos tipos corrigíveis
+
+    def imprimir(self):  # Relatório na tela
+        """Imprime as linhas verificadas e, por tipo de problema, a quantidade e os primeiros exemplos."""
+        print("\n" + "=" * 50)  # Decorativo
+        print("      VERIFICAÇÃO DE INTEGRIDADE")  # Título
+        print("=" * 50)  # Decorativo
+        print(f"{self.linhas['cabecalhos']} pedido(s), {self.linhas['itens']} item(ns) e {self.linhas['pagamentos']} pagamento(s) verificados")  # Volume
+        print(f"Itens divididos em {self.trechos} trecho(s), somados em {self.processos} processo(s)")  # Paralelismo
+        if not self.quantidade:  # Tudo certo
+            print("\n✅ Nenhum problema encontrado.")  # Informa
+            return  # Fim
+        for tipo, descricao in PROBLEMAS.items():  # Na ordem do relatório
+            total = self.quantidade[tipo]  # Ocorrências
+            if not total:  # Tipo sem problemas
+                continue  # Próximo
+            print(f"\n⚠️ {descricao}: {total} ({'corrigido com --reparar' if tipo in CORRIGIVEIS else 'só relatório'})")  # Resumo do tipo
+            exemplos = self.exemplos.get(tipo, [])  # Primeiros exemplos
+            for exemplo in exemplos:  # Exibe
+                print(f"   - {exemplo}")  # Um por linha
+            if total > len(exemplos):  # Há mais
+                print(f"   ... e mais {total - len(exemplos)}")  # Quantos faltam
+
+    # --- Reparo ---
+
+    def reparar(self, sequencias, caminho_orfaos):  # Regrava os CSVs corrigidos em temporários
+        """Grava cabeçalhos e itens corrigidos em arquivos .tmp (com fsync) e retorna as trocas [(temporário, definitivo)]; os itens órfãos vão para 'caminho_orfaos'."""
+        trocas = []  # Snapshots a trocar
+        if self.correcoes:  # Totais, valores pagos ou status a corrigir
+            trocas.append(self._regravar(self.caminho_cabecalhos, CAMPOS_CABECALHO, self._corrigir_cabecalho))  # Cabeçalhos
+        if self.orfaos or self.itens_repetidos:  # Itens a mover ou renumerar
+            sequencias.garantir_minimo('item', self.maior_id_item)  # IDs novos acima de todos os existentes
+            novo_arquivo = not os.path.exists(caminho_orfaos)  # Títulos só na primeira vez
+            with open(caminho_orfaos, mode='a', newline='', encoding='utf-8') as saida:  # Itens órfãos não são apagados
+                escritor = csv.writer(saida)  # Gravador CSV
+                if novo_arquivo:  # Arquivo novo
+                    escritor.writerow(CAMPOS_ITENS)  # Títulos
+                trocas.append(self._regravar(self.caminho_itens, CAMPOS_ITENS, self._corretor_itens(sequencias, escritor)))  # Itens
+                saida.flush()  # Esvazia o buffer
+                os.fsync(saida.fileno())  # Órfãos gravados antes de saírem do CSV de itens
+        return trocas  # Trocas a confirmar
+
+    def _corrigir_cabecalho(self, tupla):  # Uma linha de pedidos
+        """Retorna a tupla do pedido com total, valor pago e status corrigidos (e a versão incrementada)."""
+        try:  # ID corrompido fica como está
+            correcao = self.correcoes.get(int(tupla[P_ID_PEDIDO]))  # Correção do pedido
+        except ValueError:  # ID ilegível
+            return tupla  # Sem alteração
+        if not correcao:  # Pedido correto
+            return tupla  # Sem alteração
+        linha = list(tupla)  # Campos editáveis
+        total, pago, status = correcao  # Valores corrigidos
+        linha[P_TOTAL], linha[P_PAGO], linha[P_STATUS] = centavos_para_texto(total), centavos_para_texto(pago), status  # Corrige
+        linha[P_VERSAO] = str(int(linha[P_VERSAO] or 0) + 1)  # Outro terminal com o pedido aberto recebe o aviso de edição concorrente
+        self.correcoes.pop(int(tupla[P_ID_PEDIDO]))  # Linhas repetidas do mesmo pedido não são corrigidas duas vezes
+        return tuple(linha)  # Linha corrigida
+
+    def _corretor_itens(self, sequencias, escritor_orfaos):  # Monta a correção das linhas de itens
+        """Retorna a função que move os itens órfãos para o outro CSV, descarta cópias idênticas e renumera itens diferentes com o mesmo ID."""
+        primeiras = {}  # ID repetido -> primeira linha com esse ID
+
+        def corrigir(tupla):  # Uma linha de itens
+            try:  # IDs corrompidos ficam como estão
+                id_item, id_pedido = int(tupla[P_ID_ITEM]), int(tupla[P_PEDIDO_ITEM])  # IDs
+            except ValueError:  # Linha ilegível
+                return tupla  # Sem alteração
+            if id_pedido in self.orfaos:  # Pedido inexistente
+                escritor_orfaos.writerow(tupla)  # Guarda no CSV dos órfãos
+                return None  # Sai do CSV de itens
+            if id_item in self.itens_repetidos:  # ID repetido
+                primeira = primeiras.setdefault(id_item, tupla)  # A primeira linha mantém o ID
+                if primeira is not tupla:  # Linha seguinte com o mesmo ID
+                    if primeira == tupla:  # Cópia idêntica (gravação repetida)
+                        return None  # Descartada
+                    return tupla[:P_ID_ITEM] + (str(sequencias.proximo('item')),) + tupla[P_ID_ITEM + 1:]  # Item diferente: ID novo (o motor passa a enxergá-lo)
+            return tupla  # Sem alteração
+
+        return corrigir  # Função de correção
+
+    def _regravar(self, caminho, campos, corrigir):  # Cópia corrigida de um CSV
+        """Grava 'caminho.tmp' com as linhas corrigidas (None = linha removida) e retorna (temporário, definitivo)."""
+        temporario = caminho + '.tmp'  # Mesmo nome dos temporários da compactação (descartados numa queda)
+        with open(temporario, mode='w', newline='', encoding='utf-8') as f:  # Abre o temporário
+            escritor = csv.writer(f)  # Gravador CSV
+            escritor.writerow(campos)  # Títulos
+            for tupla in percorrer_csv(caminho, campos):  # Tuplas na ordem das colunas configuradas
+                tupla = corrigir(tupla)  # Corrige
+                if tupla is not None:  # Linha mantida
+                    escritor.writerow(tupla)  # Grava
+            f.flush()  # Esvazia o buffer
+            os.fsync(f.fileno())  # Garante a gravação física
+        return temporario, caminho  # Troca a confirmar